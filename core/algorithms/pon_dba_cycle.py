@@ -7,6 +7,7 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from ..data.pon_request import Request
 from ..pon.pon_onu import ONU
+from ..utilities.cycle_trace import CYCLE_TRACE
 from .pon_dba import DBAAlgorithmInterface
 
 
@@ -87,7 +88,6 @@ class DBACycleManager:
         
         # Recolectar reportes de todas las ONUs
         onu_reports = self._collect_onu_reports(onus, reporting_start)
-        print(f"DEBUG: Reportes obtenidos de {len(onu_reports)} ONUs")
         
         # FASE 3: ALLOCATION - Calcular asignaciones DBA
         allocation_start = reporting_start + reporting_duration
@@ -97,7 +97,8 @@ class DBACycleManager:
         bandwidth_allocations = self._execute_dba_algorithm(
             onu_reports, dba_algorithm, total_bandwidth, action
         )
-        print(f"DEBUG: Asignaciones DBA: {bandwidth_allocations}")
+        if CYCLE_TRACE.dba_onu:
+            self._trace_onu_allocations(cycle_start, onu_reports, bandwidth_allocations)
         
         # FASE 4: TRANSMISSION - Asignar time-slots y procesar
         transmission_start = allocation_start + allocation_duration
@@ -120,11 +121,27 @@ class DBACycleManager:
             failed_transmissions=0
         )
         
+        if CYCLE_TRACE.dba_cycle:
+            CYCLE_TRACE.record('dba_cycle', self.current_cycle, cycle_start,
+                               v0=len(onu_reports),
+                               v1=result.total_bandwidth_used,
+                               v2=result.total_requests_processed)
+        
         self.current_cycle += 1
         self.total_cycles_executed += 1
         
         return result
         
+    def _trace_onu_allocations(self, cycle_start: float,
+                               onu_reports: Dict[str, List[Request]],
+                               bandwidth_allocations: Dict[str, float]):
+        """Registrar en la traza lo reportado y asignado a cada ONU en el ciclo"""
+        for onu_id, request_list in onu_reports.items():
+            CYCLE_TRACE.record('dba_onu', self.current_cycle, cycle_start, key=onu_id,
+                               v0=len(request_list),
+                               v1=sum(req.get_total_traffic() for req in request_list),
+                               v2=bandwidth_allocations.get(onu_id, 0.0))
+        
     def _collect_onu_reports(self, onus: Dict[str, ONU], report_time: float) -> Dict[str, List[Request]]:
         """Recolectar reportes de buffer de todas las ONUs"""
         reports = {}
@@ -132,7 +149,6 @@ class DBACycleManager:
         for onu_id, onu in onus.items():
             # Cada ONU reporta sus solicitudes pendientes
             onu_requests = onu.report(report_time)
-            print(f"DEBUG: ONU {onu_id} reportó {len(onu_requests) if onu_requests else 0} requests")
             if onu_requests:
                 reports[onu_id] = onu_requests
                 
@@ -149,16 +165,9 @@ class DBACycleManager:
         onu_requests = {}
         for onu_id, request_list in onu_reports.items():
             if request_list:
-                # Debug detallado de cada request
-                print(f"DEBUG: ONU {onu_id} tiene {len(request_list)} requests:")
-                for i, req in enumerate(request_list):
-                    traffic = req.get_total_traffic()
-                    print(f"  Request {i}: traffic={traffic:.6f} MB, traffic_dict={req.traffic}")
-                
                 # Sumar todo el tráfico pendiente de la ONU
                 total_traffic = sum(req.get_total_traffic() for req in request_list)
                 onu_requests[onu_id] = total_traffic
-                print(f"DEBUG: ONU {onu_id} solicita {total_traffic:.6f} MB de ancho de banda")
                 
         # Ejecutar algoritmo DBA
         if onu_requests:
@@ -4,7 +4,7 @@ Gestor de conexiones entre dispositivos
 
 from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtCore import QObject, pyqtSignal
-from typing import List, Optional
+from typing import Dict, List, Optional
 from .connection import Connection
 from ..devices.device import Device
 from utils.translation_manager import translation_manager
@@ -30,11 +30,28 @@ class ConnectionManager(QObject):
         self.canvas = canvas
         self.connections: List[Connection] = []
         self.selected_connections: List[Connection] = []
+        # Adyacencia dispositivo -> conexiones (dict ordenado como conjunto: conserva
+        # el orden de creación). Evita recorrer todas las conexiones al mover un dispositivo
+        self._adjacency: Dict[Device, Dict[Connection, None]] = {}
         
     def set_canvas(self, canvas):
         """Establecer la referencia al canvas"""
         self.canvas = canvas
     
+    def _link(self, connection: Connection):
+        """Registrar una conexión en la adyacencia de sus dos dispositivos"""
+        for device in (connection.device_a, connection.device_b):
+            self._adjacency.setdefault(device, {})[connection] = None
+    
+    def _unlink(self, connection: Connection):
+        """Quitar una conexión de la adyacencia de sus dos dispositivos"""
+        for device in (connection.device_a, connection.device_b):
+            device_connections = self._adjacency.get(device)
+            if device_connections is not None:
+                device_connections.pop(connection, None)
+                if not device_connections:
+                    del self._adjacency[device]
+    
     def can_connect(self, device_a: Device, device_b: Device) -> tuple[bool, str]:
         """
         Verificar si dos dispositivos pueden conectarse
@@ -108,6 +125,7 @@ class ConnectionManager(QObject):
         
         # Agregar a la lista de conexiones
         self.connections.append(connection)
+        self._link(connection)
         
         # Emitir señal de cambio
         self.connections_changed.emit()
@@ -117,12 +135,13 @@ class ConnectionManager(QObject):
     
     def remove_connection(self, connection: Connection):
         """Eliminar una conexión específica"""
-        if connection in self.connections:
+        if connection in self._adjacency.get(connection.device_a, ()):
             # Remover del canvas
             if connection.graphics_item and self.canvas:
                 self.canvas.scene.removeItem(connection.graphics_item)
             
             # Remover de las listas
+            self._unlink(connection)
             self.connections.remove(connection)
             if connection in self.selected_connections:
                 self.selected_connections.remove(connection)
@@ -134,27 +153,34 @@ class ConnectionManager(QObject):
     
     def remove_connections_for_device(self, device: Device):
         """Eliminar todas las conexiones que involucren un dispositivo específico"""
-        connections_to_remove = []
-        
-        for connection in self.connections:
-            if connection.contains_device(device):
-                connections_to_remove.append(connection)
+        connections_to_remove = list(self._adjacency.get(device, ()))
+        if not connections_to_remove:
+            return
         
         for connection in connections_to_remove:
-            self.remove_connection(connection)
+            if connection.graphics_item and self.canvas:
+                self.canvas.scene.removeItem(connection.graphics_item)
+            self._unlink(connection)
             print(f"🔗💥 Conexión eliminada por borrar dispositivo: {connection}")
+        
+        # Filtrar las listas una sola vez en lugar de un remove() por conexión
+        removed = set(connections_to_remove)
+        self.connections = [conn for conn in self.connections if conn not in removed]
+        self.selected_connections = [conn for conn in self.selected_connections if conn not in removed]
+        
+        # Emitir señal de cambio
+        self.connections_changed.emit()
     
     def get_connection_between(self, device_a: Device, device_b: Device) -> Optional[Connection]:
         """Obtener la conexión existente entre dos dispositivos (si existe)"""
-        for connection in self.connections:
-            if ((connection.device_a == device_a and connection.device_b == device_b) or 
-                (connection.device_a == device_b and connection.device_b == device_a)):
+        for connection in self._adjacency.get(device_a, ()):
+            if connection.get_other_device(device_a) == device_b:
                 return connection
         return None
     
     def get_connections_for_device(self, device: Device) -> List[Connection]:
         """Obtener todas las conexiones que involucren un dispositivo específico"""
-        return [conn for conn in self.connections if conn.contains_device(device)]
+        return list(self._adjacency.get(device, ()))
     
     def update_connections_positions(self):
         """Actualizar las posiciones de todas las líneas de conexión"""
@@ -228,6 +254,7 @@ class ConnectionManager(QObject):
         # Limpiar listas
         self.connections.clear()
         self.selected_connections.clear()
+        self._adjacency.clear()
         
         # Emitir señal de cambio
         self.connections_changed.emit()
@@ -3,9 +3,27 @@ PON Buffer
 Buffer de solicitudes integrado de netPONPy
 """
 
-from typing import List, Optional
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterator, List, Optional
 from .pon_request import Request
 
+# Mapeo de prioridades (menor número = mayor prioridad)
+PRIORITY_MAP = {"highest": 0, "high": 1, "medium": 2, "low": 3, "lowest": 4}
+NO_TRAFFIC_PRIORITY = 99  # Prioridad más baja para tráfico vacío
+
+
+def get_request_priority(request: Request) -> int:
+    """Prioridad de una solicitud: la del tipo de tráfico más prioritario que contiene"""
+    if not request.traffic:
+        return NO_TRAFFIC_PRIORITY
+
+    min_priority = NO_TRAFFIC_PRIORITY
+    for traffic_type, amount in request.traffic.items():
+        if amount and amount > 0:
+            priority = PRIORITY_MAP.get(traffic_type, NO_TRAFFIC_PRIORITY)
+            min_priority = min(min_priority, priority)
+    return min_priority
+
 
 class Buffer(list[Request]):
     """Buffer de solicitudes con capacidad limitada"""
@@ -78,20 +96,6 @@ class Buffer(list[Request]):
         """
         if not self:
             return None
-            
-        # Mapeo de prioridades (menor número = mayor prioridad)
-        priority_map = {"highest": 0, "high": 1, "medium": 2, "low": 3, "lowest": 4}
-        
-        def get_request_priority(request: Request) -> int:
-            if not request.traffic:
-                return 99  # Prioridad más baja para tráfico vacío
-                
-            min_priority = 99
-            for traffic_type, amount in request.traffic.items():
-                if amount and amount > 0:
-                    priority = priority_map.get(traffic_type, 99)
-                    min_priority = min(min_priority, priority)
-            return min_priority
         
         return min(self, key=get_request_priority)
 
@@ -134,4 +138,218 @@ class Buffer(list[Request]):
         return f"Buffer(size={self.size}, occupancy={len(self)}/{self.size}, utilization={self.get_buffer_utilization():.1%})"
     
     def __repr__(self) -> str:
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+class IndexedBuffer:
+    """
+    Buffer de solicitudes indexado con la misma interfaz y semántica que Buffer
+
+    Las solicitudes se guardan en orden de llegada en un OrderedDict
+    id -> solicitud, y cada prioridad tiene una cola FIFO de ids. Quitar por
+    ID, consultar la más antigua o la de mayor prioridad son O(1) (las colas
+    de prioridad descartan de forma perezosa los ids ya retirados).
+    """
+
+    def __init__(self, size: int):
+        """
+        Inicializar buffer
+        
+        Args:
+            size: Capacidad máxima del buffer
+        """
+        self.size = size
+        self.dropped_requests = 0  # Contador de solicitudes descartadas
+        self.total_arrivals = 0    # Contador total de intentos de inserción
+        self._requests: "OrderedDict[str, Request]" = OrderedDict()
+        self._priority_queues: Dict[int, Deque[str]] = {}
+        # Si las llegadas no están en orden de created_at, la más antigua
+        # deja de ser la primera y se recurre a una búsqueda lineal
+        self._arrivals_ordered = True
+        self._last_created_at = float('-inf')
+        self._stale_ids = 0  # Ids retirados que aún siguen en las colas de prioridad
+
+    def append(self, request: Request) -> bool:
+        """
+        Agregar solicitud al buffer
+        
+        Args:
+            request: Solicitud a agregar
+            
+        Returns:
+            True si se agregó exitosamente, False si el buffer está lleno
+        """
+        self.total_arrivals += 1
+        
+        if len(self._requests) >= self.size:
+            # Buffer lleno - descartar solicitud
+            self.dropped_requests += 1
+            return False
+
+        key = str(request.id)
+        self._requests[key] = request
+        priority = get_request_priority(request)
+        queue = self._priority_queues.get(priority)
+        if queue is None:
+            queue = self._priority_queues[priority] = deque()
+        queue.append(key)
+
+        if request.created_at < self._last_created_at:
+            self._arrivals_ordered = False
+        self._last_created_at = request.created_at
+        return True
+
+    def get_request(self, request_id: str) -> Optional[Request]:
+        """Obtener una solicitud por ID sin removerla"""
+        return self._requests.get(str(request_id))
+
+    def pop_request(self, request_id: str) -> Optional[Request]:
+        """
+        Remover solicitud específica por ID
+        
+        Args:
+            request_id: ID de la solicitud a remover
+            
+        Returns:
+            Solicitud removida o None si no se encuentra
+        """
+        request = self._requests.pop(str(request_id), None)
+        if request is not None:
+            self._on_removed()
+        return request
+
+    def get_oldest_request(self) -> Optional[Request]:
+        """
+        Obtener la solicitud más antigua sin removerla
+        
+        Returns:
+            Solicitud más antigua o None si el buffer está vacío
+        """
+        if not self._requests:
+            return None
+        if not self._arrivals_ordered:
+            return min(self._requests.values(), key=lambda r: r.created_at)
+        return next(iter(self._requests.values()))
+
+    def get_highest_priority_request(self) -> Optional[Request]:
+        """
+        Obtener solicitud de mayor prioridad (la más antigua dentro de ella)
+        
+        Returns:
+            Solicitud de mayor prioridad o None si está vacío
+        """
+        for priority in sorted(self._priority_queues):
+            queue = self._priority_queues[priority]
+            while queue:
+                request = self._requests.get(queue[0])
+                if request is not None:
+                    return request
+                queue.popleft()  # ID ya retirado del buffer
+        return None
+
+    # ===== INTERFAZ DE LISTA (compatibilidad con Buffer) =====
+
+    def remove(self, request: Request):
+        """Remover una solicitud (ValueError si no está, como list.remove)"""
+        if self.pop_request(request.id) is None:
+            raise ValueError(f"{request} not in buffer")
+
+    def pop(self, index: int = -1) -> Request:
+        """Remover por posición (O(1) para el primero y el último)"""
+        if not self._requests:
+            raise IndexError("pop from empty buffer")
+        if index == 0:
+            _, request = self._requests.popitem(last=False)
+        elif index == -1:
+            _, request = self._requests.popitem(last=True)
+        else:
+            request = self[index]
+            del self._requests[str(request.id)]
+        self._on_removed()
+        return request
+
+    def clear(self):
+        """Vaciar el buffer (sin tocar estadísticas)"""
+        self._requests.clear()
+        self._reset_index()
+
+    def _on_removed(self):
+        """Mantener acotadas las entradas obsoletas de las colas de prioridad"""
+        if not self._requests:
+            self._reset_index()
+            return
+
+        self._stale_ids += 1
+        if self._stale_ids > 2 * len(self._requests) + 64:
+            self._priority_queues.clear()
+            for key, request in self._requests.items():
+                self._priority_queues.setdefault(get_request_priority(request), deque()).append(key)
+            self._stale_ids = 0
+
+    def _reset_index(self):
+        self._priority_queues.clear()
+        self._arrivals_ordered = True
+        self._last_created_at = float('-inf')
+        self._stale_ids = 0
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __iter__(self) -> Iterator[Request]:
+        return iter(self._requests.values())
+
+    def __contains__(self, request: object) -> bool:
+        request_id = getattr(request, 'id', None)
+        return request_id is not None and self._requests.get(str(request_id)) is request
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._requests.values())[index]
+        if index == 0 and self._requests:
+            return next(iter(self._requests.values()))
+        if index == -1 and self._requests:
+            return next(reversed(self._requests.values()))
+        return list(self._requests.values())[index]
+
+    # ===== ESTADÍSTICAS =====
+
+    def get_buffer_utilization(self) -> float:
+        """
+        Obtener porcentaje de utilización del buffer
+        
+        Returns:
+            Utilización entre 0.0 y 1.0
+        """
+        if self.size == 0:
+            return 0.0
+        return len(self) / self.size
+
+    def get_buffer_stats(self) -> dict:
+        """Obtener estadísticas completas del buffer"""
+        loss_rate = (self.dropped_requests / self.total_arrivals) if self.total_arrivals > 0 else 0.0
+        
+        return {
+            'size': self.size,
+            'current_occupancy': len(self),
+            'utilization': self.get_buffer_utilization(),
+            'total_arrivals': self.total_arrivals,
+            'dropped_requests': self.dropped_requests,
+            'loss_rate': loss_rate,
+            'successful_insertions': self.total_arrivals - self.dropped_requests
+        }
+
+    def reset_stats(self):
+        """Reiniciar estadísticas del buffer"""
+        self.dropped_requests = 0
+        self.total_arrivals = 0
+
+    def clear_buffer(self):
+        """Limpiar buffer y reiniciar estadísticas"""
+        self.clear()
+        self.reset_stats()
+
+    def __str__(self) -> str:
+        return f"IndexedBuffer(size={self.size}, occupancy={len(self)}/{self.size}, utilization={self.get_buffer_utilization():.1%})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
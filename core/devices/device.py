@@ -5,9 +5,9 @@ Clase base para todos los dispositivos de la red óptica
 
 from PyQt5.QtCore import QObject, pyqtSignal, Qt
 from PyQt5.QtGui import QPixmap, QPainter, QColor, QBrush, QPen
-from PyQt5.QtSvg import QSvgRenderer
 import os
 import uuid
+from .icon_cache import ICON_CACHE, get_device_icon_path
 
 class Device(QObject):
     """Clase base para dispositivos de red óptica"""
@@ -63,24 +63,10 @@ class Device(QObject):
     
     def get_icon_path(self):
         """Obtener ruta del icono SVG (implementar en subclases)"""
-        # Construir ruta al directorio de recursos
-        current_file = os.path.abspath(__file__)
-        devices_dir = os.path.dirname(current_file)    # core/devices/
-        core_dir = os.path.dirname(devices_dir)        # core/
-        project_root = os.path.dirname(core_dir)       # PonLab/
-        devices_path = os.path.join(project_root, 'resources', 'devices')
-        
-        if self.device_type == "OLT":
-            return os.path.join(devices_path, 'olt_icon.svg')
-        elif self.device_type == "OLT_SDN":
-            return os.path.join(devices_path, 'olt_sdn_icon.svg')
-        elif self.device_type == "ONU":
-            return os.path.join(devices_path, 'onu_icon.svg')
-        
-        return None
+        return get_device_icon_path(self.device_type)
     
     def get_icon_pixmap(self, size=None):
-        """Obtener pixmap del icono renderizado"""
+        """Obtener pixmap del icono renderizado (compartido vía ICON_CACHE)"""
         if size is None:
             size = self.icon_size
             
@@ -88,44 +74,25 @@ class Device(QObject):
         if self._icon_pixmap and self._icon_pixmap.width() == size:
             return self._icon_pixmap
         
+        # Caché compartida: mismo tipo y tamaño -> mismo QPixmap
+        key = (self.device_type, None, size)
+        pixmap = ICON_CACHE.get(key)
+        if pixmap is not None:
+            self._icon_pixmap = pixmap
+            return pixmap
+        
         icon_path = self.get_icon_path()
         if not icon_path or not os.path.exists(icon_path):
-            return self._create_fallback_pixmap(size)
+            return ICON_CACHE.put(key, self._create_fallback_pixmap(size))
         
         # Renderizar SVG a pixmap con alta calidad
         try:
-            renderer = QSvgRenderer(icon_path)
-            
-            # Crear pixmap con mayor resolución para mejor calidad
-            scale_factor = 2.0  # Renderizar a 2x resolución
-            high_res_size = int(size * scale_factor)
-            
-            pixmap = QPixmap(high_res_size, high_res_size)
-            pixmap.fill(Qt.transparent)  # Fondo completamente transparente
-            
-            painter = QPainter(pixmap)
-            # Configurar renderizado de alta calidad
-            painter.setRenderHint(QPainter.Antialiasing, True)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-            painter.setRenderHint(QPainter.HighQualityAntialiasing, True)
-            
-            renderer.render(painter)
-            painter.end()
-            
-            # Escalar de vuelta al tamaño deseado con suavizado
-            final_pixmap = pixmap.scaled(
-                size, size, 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            
-            # Guardar en cache
-            self._icon_pixmap = final_pixmap
-            return final_pixmap
+            self._icon_pixmap = ICON_CACHE.render(key, icon_path, size)
+            return self._icon_pixmap
             
         except Exception as e:
             print(f"Error renderizando icono SVG: {e}")
-            return self._create_fallback_pixmap(size)
+            return ICON_CACHE.put(key, self._create_fallback_pixmap(size))
     
     def _create_fallback_pixmap(self, size):
         """Crear pixmap de respaldo si no se puede cargar el SVG"""
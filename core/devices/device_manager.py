@@ -4,21 +4,24 @@ Gestiona dispositivos en el canvas y sus operaciones
 """
 
 from PyQt5.QtCore import QObject, pyqtSignal, Qt
-from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QGraphicsRectItem, QGraphicsTextItem
+from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QGraphicsRectItem, QGraphicsTextItem, QGraphicsScene
 from PyQt5.QtGui import QPen, QBrush, QColor, QFont
 from .device_types import create_device
+from .spatial_index import DeviceSpatialIndex
 from ..connections.connection_points import ConnectionPointsManager
 import json
 
 class DeviceGraphicsItem(QGraphicsPixmapItem):
     """Item gráfico para representar un dispositivo en el canvas"""
     
-    def __init__(self, device, parent=None):
+    def __init__(self, device, parent=None, spatial_index=None, dark_theme=None):
         super().__init__(parent)
         
         self.device = device
         self.label_item = None  # Etiqueta de texto
         self.connection_points_manager = None  # Gestor de puntos de conexión
+        self.spatial_index = spatial_index  # Índice espacial del DeviceManager (opcional)
+        self._initial_dark_theme = dark_theme  # Tema conocido al crear (evita buscar el canvas)
         self.setup_graphics()
         
         # Conectar señales del dispositivo
@@ -69,7 +72,10 @@ class DeviceGraphicsItem(QGraphicsPixmapItem):
             self.label_item.setZValue(101)
             
         # Configurar color apropiado
-        self.update_label_color()
+        if self._initial_dark_theme is not None:
+            self.set_label_color_direct(self._initial_dark_theme)
+        else:
+            self.update_label_color()
         
         # Actualizar posición de la etiqueta
         self.update_label_position()
@@ -113,7 +119,6 @@ class DeviceGraphicsItem(QGraphicsPixmapItem):
                 text_color = QColor(0, 0, 0)        # Negro para tema claro
             
             self.label_item.setDefaultTextColor(text_color)
-            print(f"Color de etiqueta establecido: {'blanco' if dark_theme else 'negro'}")
     
     def update_label_position(self):
         """Actualizar posición de la etiqueta"""
@@ -154,6 +159,15 @@ class DeviceGraphicsItem(QGraphicsPixmapItem):
         # Actualizar posiciones de los connection points
         if self.connection_points_manager:
             self.connection_points_manager.update_positions()
+        
+        # El tamaño del icono puede haber cambiado: actualizar la caja en el índice
+        self._sync_spatial_index()
+    
+    def _sync_spatial_index(self):
+        """Registrar la posición y tamaño actuales del item en el índice espacial"""
+        if self.spatial_index is not None:
+            pos = self.pos()
+            self.spatial_index.move(self.device.id, pos.x(), pos.y(), self.device.icon_size)
     
     def on_selection_changed(self, is_selected):
         """Manejar cambio de selección del dispositivo"""
@@ -173,6 +187,10 @@ class DeviceGraphicsItem(QGraphicsPixmapItem):
             # Actualizar conexiones que involucren este dispositivo
             self._update_device_connections()
             
+        elif change == QGraphicsItem.ItemScenePositionHasChanged:
+            # Mantener el índice espacial al arrastrar o mover el item
+            self._sync_spatial_index()
+            
         elif change == QGraphicsItem.ItemSelectedChange:
             # Manejar cambios de selección automáticamente
             is_selected = bool(value)
@@ -275,6 +293,7 @@ class DeviceManager(QObject):
         self.canvas = None  # Referencia al canvas (se asigna después)
         self.devices = {}  # ID -> Device
         self.graphics_items = {}  # ID -> DeviceGraphicsItem
+        self.spatial_index = DeviceSpatialIndex()  # Búsqueda por posición (hit-testing)
         
         # Contadores para nombres automáticos
         self.device_counters = {
@@ -289,6 +308,19 @@ class DeviceManager(QObject):
         """Establecer referencia al canvas"""
         self.canvas = canvas
     
+    def _canvas_dark_theme(self):
+        """Tema del canvas si hay referencia directa, None si no se conoce"""
+        if self.canvas and hasattr(self.canvas, 'dark_theme'):
+            return self.canvas.dark_theme
+        return None
+    
+    def _create_graphics_item(self, device, dark_theme=None):
+        """Crear el item gráfico de un dispositivo y registrarlo en el índice espacial"""
+        graphics_item = DeviceGraphicsItem(device, spatial_index=self.spatial_index,
+                                           dark_theme=dark_theme)
+        self.spatial_index.insert(device.id, device.x, device.y, device.icon_size)
+        return graphics_item
+    
     def _get_unique_custom_name(self, base_name):
         """Generar nombre único para dispositivo custom si ya existe
         
@@ -337,15 +369,9 @@ class DeviceManager(QObject):
             # Crear dispositivo
             device = create_device(device_type, final_name, x, y)
             
-            # Crear item gráfico
-            graphics_item = DeviceGraphicsItem(device)
-            
-            # Inicializar tema del nuevo dispositivo usando referencia directa
-            if self.canvas and hasattr(self.canvas, 'dark_theme'):
-                graphics_item.set_label_color_direct(self.canvas.dark_theme)
-            else:
-                # Fallback: intentar el método tradicional
-                graphics_item.update_label_color()
+            # Crear item gráfico (tema inicial por referencia directa al canvas;
+            # sin ella la etiqueta busca el tema en la escena)
+            graphics_item = self._create_graphics_item(device, self._canvas_dark_theme())
             
             # Agregar al diccionario y escena
             self.devices[device.id] = device
@@ -394,6 +420,7 @@ class DeviceManager(QObject):
             # Remover de diccionarios
             del self.devices[device_id]
             del self.graphics_items[device_id]
+            self.spatial_index.remove(device_id)
             
             # Emitir señales
             self.device_removed.emit(device_id)
@@ -477,9 +504,10 @@ class DeviceManager(QObject):
         return False
     
     def get_device_at_position(self, x, y):
-        """Obtener dispositivo en posición específica"""
-        for device in self.devices.values():
-            if device.contains_point(x, y):
+        """Obtener dispositivo en posición específica (consulta al índice espacial)"""
+        for device_id in self.spatial_index.query_point(x, y):
+            device = self.devices.get(device_id)
+            if device is not None:
                 return device
         
         return None
@@ -507,6 +535,7 @@ class DeviceManager(QObject):
         # Limpiar diccionarios
         self.devices.clear()
         self.graphics_items.clear()
+        self.spatial_index.clear()
         self.selected_device = None
         
         # Resetear contadores
@@ -526,83 +555,105 @@ class DeviceManager(QObject):
         }
     
     def import_devices_data(self, devices_data):
-        """Importar datos de dispositivos desde diccionario"""
+        """Importar datos de dispositivos desde diccionario
+        
+        Carga en bloque: mientras se crean los items se suspenden el índice BSP
+        de la escena y el repintado de las vistas, y se restauran una sola vez
+        al final (el índice se reconstruye de golpe en lugar de por item).
+        """
         # Limpiar dispositivos existentes
         self.clear_all_devices()
         
-        # Crear dispositivos desde datos
-        for device_id, device_data in devices_data.items():
-            try:
-                # Extraer custom_data si existe
-                custom_data = device_data.get('custom_data', None)
-                device_type = device_data['device_type']
-                
-                # Detectar si es un dispositivo custom (por device_type o por presencia de custom_data)
-                is_custom_olt = (device_type == 'CUSTOM_OLT') or (device_type == 'OLT' and custom_data and custom_data.get('type') == 'CUSTOM_OLT')
-                is_custom_onu = (device_type == 'CUSTOM_ONU') or (device_type == 'ONU' and custom_data and custom_data.get('type') == 'CUSTOM_ONU')
-                
-                if is_custom_olt:
-                    # Dispositivo OLT personalizado
-                    from core.devices.device_types import CustomOLT
-                    device = CustomOLT(
-                        device_data['name'],
-                        device_data['x'],
-                        device_data['y'],
-                        custom_data
-                    )
-                elif is_custom_onu:
-                    # Dispositivo ONU personalizado
-                    from core.devices.device_types import CustomONU
-                    device = CustomONU(
-                        device_data['name'],
-                        device_data['x'],
-                        device_data['y'],
-                        custom_data
-                    )
-                else:
-                    # Dispositivos normales
-                    device = create_device(
-                        device_type,
-                        device_data['name'],
-                        device_data['x'],
-                        device_data['y']
-                    )
-                
-                # Restaurar propiedades comunes
-                device.id = device_id
-                device.icon_size = device_data.get('icon_size', 64)
-                device.visible = device_data.get('visible', True)
-                device.properties = device_data.get('properties', {})
-                
-                # Restaurar custom_color si existe (para dispositivos custom)
-                if 'custom_color' in device_data:
-                    device.custom_color = device_data['custom_color']
-                
-                # Crear item gráfico
-                graphics_item = DeviceGraphicsItem(device)
-                
-                # Inicializar tema del dispositivo cargado usando referencia directa
-                if self.canvas and hasattr(self.canvas, 'dark_theme'):
-                    graphics_item.set_label_color_direct(self.canvas.dark_theme)
-                else:
-                    # Fallback: intentar el método tradicional
-                    graphics_item.update_label_color()
-                
-                # Agregar a gestión
-                self.devices[device_id] = device
-                self.graphics_items[device_id] = graphics_item
-                self.canvas_scene.addItem(graphics_item)
-                
-                print(f"✅ Dispositivo cargado: {device.name} (Tipo: {device.device_type}, Custom: {hasattr(device, 'is_custom')})")
-                
-            except Exception as e:
-                print(f"❌ Error importando dispositivo {device_id}: {e}")
-                import traceback
-                traceback.print_exc()
+        dark_theme = self._canvas_dark_theme()
+        scene = self.canvas_scene
+        views = scene.views()
+        index_method = scene.itemIndexMethod()
+        
+        scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        for view in views:
+            view.setUpdatesEnabled(False)
+        
+        try:
+            # Crear dispositivos desde datos
+            for device_id, device_data in devices_data.items():
+                try:
+                    device = self._device_from_data(device_id, device_data)
+                    
+                    # Crear item gráfico (con índice espacial y tema ya resueltos)
+                    graphics_item = self._create_graphics_item(device, dark_theme)
+                    
+                    # Agregar a gestión
+                    self.devices[device_id] = device
+                    self.graphics_items[device_id] = graphics_item
+                    scene.addItem(graphics_item)
+                    
+                except Exception as e:
+                    print(f"❌ Error importando dispositivo {device_id}: {e}")
+                    import traceback
+                    traceback.print_exc()
+        finally:
+            # Restaurar índice de la escena y repintado una sola vez
+            scene.setItemIndexMethod(index_method)
+            for view in views:
+                view.setUpdatesEnabled(True)
+                view.viewport().update()
+        
+        # Sin referencia directa al canvas, resolver el color de etiquetas ya en escena
+        if dark_theme is None and self.graphics_items:
+            self.update_label_colors()
         
         # Emitir señal de cambio
         self.devices_changed.emit()
     
+    def _device_from_data(self, device_id, device_data):
+        """Reconstruir un dispositivo a partir de sus datos serializados"""
+        # Extraer custom_data si existe
+        custom_data = device_data.get('custom_data', None)
+        device_type = device_data['device_type']
+        
+        # Detectar si es un dispositivo custom (por device_type o por presencia de custom_data)
+        is_custom_olt = (device_type == 'CUSTOM_OLT') or (device_type == 'OLT' and custom_data and custom_data.get('type') == 'CUSTOM_OLT')
+        is_custom_onu = (device_type == 'CUSTOM_ONU') or (device_type == 'ONU' and custom_data and custom_data.get('type') == 'CUSTOM_ONU')
+        
+        if is_custom_olt:
+            # Dispositivo OLT personalizado
+            from core.devices.device_types import CustomOLT
+            device = CustomOLT(
+                device_data['name'],
+                device_data['x'],
+                device_data['y'],
+                custom_data
+            )
+        elif is_custom_onu:
+            # Dispositivo ONU personalizado
+            from core.devices.device_types import CustomONU
+            device = CustomONU(
+                device_data['name'],
+                device_data['x'],
+                device_data['y'],
+                custom_data
+            )
+        else:
+            # Dispositivos normales
+            device = create_device(
+                device_type,
+                device_data['name'],
+                device_data['x'],
+                device_data['y']
+            )
+        
+        # Restaurar propiedades comunes
+        device.id = device_id
+        device.icon_size = device_data.get('icon_size', 64)
+        device.visible = device_data.get('visible', True)
+        device.properties = device_data.get('properties', {})
+        
+        # Restaurar custom_color si existe (para dispositivos custom)
+        if 'custom_color' in device_data:
+            device.custom_color = device_data['custom_color']
+        
+        return device
+    
     def get_device_count(self):
         """Obtener número total de dispositivos"""
         return len(self.devices)
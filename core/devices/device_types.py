@@ -667,65 +667,27 @@ class CustomOLT(OLT):
         return f"{self.name} ⚙"  # Añadir emoji de engranaje para indicar custom
     
     def get_icon_pixmap(self, size=None):
-        """Obtener pixmap del icono con color personalizado"""
-        from PyQt5.QtSvg import QSvgRenderer
-        from PyQt5.QtGui import QPixmap, QPainter, QColor
-        from PyQt5.QtCore import Qt, QByteArray
+        """Obtener pixmap del icono con color personalizado (compartido vía ICON_CACHE)"""
         import os
+        from .icon_cache import ICON_CACHE, custom_color_replacements
         
         if size is None:
             size = self.icon_size
         
+        # Dispositivos custom del mismo color y tamaño comparten el pixmap
+        key = (self.device_type, self.custom_color, size)
+        pixmap = ICON_CACHE.get(key)
+        if pixmap is not None:
+            return pixmap
+        
         icon_path = os.path.join('resources', 'devices', 'olt_icon_custom.svg')
         if not os.path.exists(icon_path):
             return super().get_icon_pixmap(size)
         
         try:
-            # Leer el archivo SVG
-            with open(icon_path, 'r', encoding='utf-8') as f:
-                svg_content = f.read()
-            
-            # Aplicar color personalizado
-            device_color = QColor(self.custom_color)
-            
-            # Color oscuro (80% del brillo)
-            dark_color = QColor(
-                int(device_color.red() * 0.8),
-                int(device_color.green() * 0.8),
-                int(device_color.blue() * 0.8)
-            )
-            
-            # Reemplazar colores en el SVG
-            svg_content = svg_content.replace('#C62828', dark_color.name())
-            svg_content = svg_content.replace('#F44336', device_color.name())
-            
-            # Renderizar el SVG modificado
-            svg_bytes = QByteArray(svg_content.encode('utf-8'))
-            renderer = QSvgRenderer(svg_bytes)
-            
-            # Crear pixmap con mayor resolución para mejor calidad
-            scale_factor = 2.0
-            high_res_size = int(size * scale_factor)
-            
-            pixmap = QPixmap(high_res_size, high_res_size)
-            pixmap.fill(Qt.transparent)
-            
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.Antialiasing, True)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-            painter.setRenderHint(QPainter.HighQualityAntialiasing, True)
-            
-            renderer.render(painter)
-            painter.end()
-            
-            # Escalar de vuelta al tamaño deseado
-            final_pixmap = pixmap.scaled(
-                size, size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
-            return final_pixmap
+            # Aplicar color personalizado (y su versión oscura al 80%) al SVG
+            replacements = custom_color_replacements(self.custom_color, '#C62828', '#F44336')
+            return ICON_CACHE.render(key, icon_path, size, replacements)
             
         except Exception as e:
             print(f"Error renderizando icono personalizado: {e}")
@@ -773,65 +735,27 @@ class CustomONU(ONU):
         return f"{self.name} ⚙"  # Añadir emoji de engranaje para indicar custom
     
     def get_icon_pixmap(self, size=None):
-        """Obtener pixmap del icono con color personalizado"""
-        from PyQt5.QtSvg import QSvgRenderer
-        from PyQt5.QtGui import QPixmap, QPainter, QColor
-        from PyQt5.QtCore import Qt, QByteArray
+        """Obtener pixmap del icono con color personalizado (compartido vía ICON_CACHE)"""
         import os
+        from .icon_cache import ICON_CACHE, custom_color_replacements
         
         if size is None:
             size = self.icon_size
         
+        # Dispositivos custom del mismo color y tamaño comparten el pixmap
+        key = (self.device_type, self.custom_color, size)
+        pixmap = ICON_CACHE.get(key)
+        if pixmap is not None:
+            return pixmap
+        
         icon_path = os.path.join('resources', 'devices', 'onu_icon_custom.svg')
         if not os.path.exists(icon_path):
             return super().get_icon_pixmap(size)
         
         try:
-            # Leer el archivo SVG
-            with open(icon_path, 'r', encoding='utf-8') as f:
-                svg_content = f.read()
-            
-            # Aplicar color personalizado
-            device_color = QColor(self.custom_color)
-            
-            # Color oscuro (80% del brillo)
-            dark_color = QColor(
-                int(device_color.red() * 0.8),
-                int(device_color.green() * 0.8),
-                int(device_color.blue() * 0.8)
-            )
-            
-            # Reemplazar colores en el SVG (ONU usa naranja por defecto)
-            svg_content = svg_content.replace('#E65100', dark_color.name())
-            svg_content = svg_content.replace('#FF9800', device_color.name())
-            
-            # Renderizar el SVG modificado
-            svg_bytes = QByteArray(svg_content.encode('utf-8'))
-            renderer = QSvgRenderer(svg_bytes)
-            
-            # Crear pixmap con mayor resolución para mejor calidad
-            scale_factor = 2.0
-            high_res_size = int(size * scale_factor)
-            
-            pixmap = QPixmap(high_res_size, high_res_size)
-            pixmap.fill(Qt.transparent)
-            
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.Antialiasing, True)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-            painter.setRenderHint(QPainter.HighQualityAntialiasing, True)
-            
-            renderer.render(painter)
-            painter.end()
-            
-            # Escalar de vuelta al tamaño deseado
-            final_pixmap = pixmap.scaled(
-                size, size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
-            return final_pixmap
+            # Aplicar color personalizado (y su versión oscura al 80%) al SVG
+            replacements = custom_color_replacements(self.custom_color, '#E65100', '#FF9800')
+            return ICON_CACHE.render(key, icon_path, size, replacements)
             
         except Exception as e:
             print(f"Error renderizando icono personalizado ONU: {e}")
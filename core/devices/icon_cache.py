@@ -0,0 +1,195 @@
+"""
+Icon Cache
+Caché LRU de iconos de dispositivos compartida por todo el proceso
+
+Los items del canvas comparten el mismo QPixmap para cada combinación
+(tipo de dispositivo, color personalizado, tamaño): el SVG se lee de disco
+una sola vez y se renderiza una vez por tamaño. La precarga renderiza los
+iconos por defecto a QImage en un hilo de fondo (QPixmap solo puede crearse
+en el hilo de la GUI); la conversión a QPixmap se hace al pedirlos.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QByteArray
+from PyQt5.QtGui import QImage, QPainter, QColor, QPixmap
+from PyQt5.QtSvg import QSvgRenderer
+
+# Directorio de iconos de dispositivos (resources/devices)
+DEVICES_ICON_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'resources', 'devices'
+)
+
+# Iconos por tipo de dispositivo estándar
+DEVICE_ICON_FILES = {
+    'OLT': 'olt_icon.svg',
+    'OLT_SDN': 'olt_sdn_icon.svg',
+    'ONU': 'onu_icon.svg',
+}
+
+# Tamaño por defecto de los iconos (Device.icon_size)
+DEFAULT_ICON_SIZE = 64
+
+
+def get_device_icon_path(device_type):
+    """Ruta del icono SVG de un tipo de dispositivo estándar (None si no tiene)"""
+    filename = DEVICE_ICON_FILES.get(device_type)
+    if filename is None:
+        return None
+    return os.path.join(DEVICES_ICON_DIR, filename)
+
+
+def custom_color_replacements(custom_color, dark_placeholder, base_placeholder):
+    """
+    Reemplazos de color para un icono personalizado
+
+    El color base sustituye a base_placeholder y una versión al 80% de brillo
+    a dark_placeholder.
+    """
+    device_color = QColor(custom_color)
+    dark_color = QColor(
+        int(device_color.red() * 0.8),
+        int(device_color.green() * 0.8),
+        int(device_color.blue() * 0.8)
+    )
+    return ((dark_placeholder, dark_color.name()), (base_placeholder, device_color.name()))
+
+
+def render_svg_image(svg_data, size):
+    """
+    Renderizar un SVG a QImage cuadrada de lado size (seguro fuera del hilo GUI)
+
+    Se renderiza a 2x y se escala con suavizado para mejor calidad.
+    """
+    renderer = QSvgRenderer(QByteArray(svg_data))
+    if not renderer.isValid():
+        raise ValueError("SVG no válido")
+
+    high_res_size = int(size * 2.0)
+    image = QImage(high_res_size, high_res_size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+    painter.setRenderHint(QPainter.HighQualityAntialiasing, True)
+    renderer.render(painter)
+    painter.end()
+
+    return image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class IconPixmapCache:
+    """
+    Caché LRU de QPixmap indexada por (tipo de dispositivo, color, tamaño)
+
+    También guarda el contenido de cada SVG leído, de modo que un cambio de
+    tamaño solo vuelve a renderizar, sin volver a leer el archivo.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._pixmaps = OrderedDict()  # key -> QPixmap (orden LRU)
+        self._preloaded = {}           # key -> QImage renderizada por la precarga
+        self._svg_sources = {}         # ruta -> bytes del SVG
+        self._lock = threading.Lock()
+        self._preload_thread = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """QPixmap en caché para key, o None"""
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        with self._lock:
+            image = self._preloaded.pop(key, None)
+        if image is not None:
+            self.hits += 1
+            return self.put(key, QPixmap.fromImage(image))
+
+        self.misses += 1
+        return None
+
+    def put(self, key, pixmap):
+        """Guardar un QPixmap (expulsa el menos usado si se supera max_entries)"""
+        self._pixmaps[key] = pixmap
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def svg_source(self, path, replacements=()):
+        """Contenido del SVG (leído de disco una vez) con los reemplazos aplicados"""
+        with self._lock:
+            data = self._svg_sources.get(path)
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+            with self._lock:
+                self._svg_sources[path] = data
+
+        for old, new in replacements:
+            data = data.replace(old.encode('utf-8'), new.encode('utf-8'))
+        return data
+
+    def render(self, key, path, size, replacements=()):
+        """Renderizar el SVG de path a tamaño size, guardarlo bajo key y devolverlo"""
+        image = render_svg_image(self.svg_source(path, replacements), size)
+        return self.put(key, QPixmap.fromImage(image))
+
+    def preload(self, sizes=(DEFAULT_ICON_SIZE,)):
+        """
+        Precargar en segundo plano los iconos estándar en los tamaños indicados
+
+        Returns:
+            Hilo de precarga (daemon), ya iniciado
+        """
+        if self._preload_thread is not None and self._preload_thread.is_alive():
+            return self._preload_thread
+
+        specs = [(device_type, size) for device_type in DEVICE_ICON_FILES for size in sizes]
+        self._preload_thread = threading.Thread(
+            target=self._preload_worker, args=(specs,), name="IconPreload", daemon=True
+        )
+        self._preload_thread.start()
+        return self._preload_thread
+
+    def _preload_worker(self, specs):
+        for device_type, size in specs:
+            key = (device_type, None, size)
+            path = get_device_icon_path(device_type)
+            if key in self._pixmaps or not os.path.exists(path):
+                continue
+            try:
+                image = render_svg_image(self.svg_source(path), size)
+            except Exception as e:
+                print(f"WARNING Precarga de icono {device_type} fallida: {e}")
+                continue
+            with self._lock:
+                self._preloaded[key] = image
+
+    def clear(self):
+        """Vaciar la caché (los SVG leídos se conservan)"""
+        self._pixmaps.clear()
+        with self._lock:
+            self._preloaded.clear()
+
+    def stats(self):
+        return {
+            'entries': len(self._pixmaps),
+            'preloaded_pending': len(self._preloaded),
+            'svg_sources': len(self._svg_sources),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+# Caché compartida por todos los dispositivos del proceso
+ICON_CACHE = IconPixmapCache()
@@ -0,0 +1,107 @@
+"""
+Spatial Index
+Índice espacial por cuadrícula (grid buckets) para localizar dispositivos
+del canvas sin recorrerlos todos
+"""
+
+import math
+
+
+class DeviceSpatialIndex:
+    """
+    Índice de dispositivos por celdas de cuadrícula
+
+    Cada dispositivo se registra en las celdas que cubre su caja (centro ±
+    icon_size/2). Una consulta por punto solo revisa los dispositivos de la
+    celda que contiene el punto.
+    """
+
+    def __init__(self, cell_size=128):
+        """
+        Args:
+            cell_size: Lado de la celda en coordenadas de escena. Con el tamaño
+                máximo de icono (128 px) cada dispositivo ocupa como mucho 4 celdas
+        """
+        self.cell_size = cell_size
+        self.cells = {}   # (cx, cy) -> {device_id: None} (conserva orden de inserción)
+        self.bounds = {}  # device_id -> (x0, y0, x1, y1)
+        self.order = {}   # device_id -> orden de inserción (desempate en consultas)
+        self._next_order = 0
+
+    def _cell_range(self, bounds):
+        """Celdas cubiertas por una caja"""
+        size = self.cell_size
+        x0, y0, x1, y1 = bounds
+        for cx in range(math.floor(x0 / size), math.floor(x1 / size) + 1):
+            for cy in range(math.floor(y0 / size), math.floor(y1 / size) + 1):
+                yield (cx, cy)
+
+    def insert(self, device_id, x, y, icon_size):
+        """Registrar (o reubicar) un dispositivo centrado en (x, y)"""
+        half_size = icon_size / 2
+        bounds = (x - half_size, y - half_size, x + half_size, y + half_size)
+
+        old_bounds = self.bounds.get(device_id)
+        if old_bounds == bounds:
+            return
+        if old_bounds is not None:
+            self._unlink(device_id, old_bounds)
+        else:
+            self.order[device_id] = self._next_order
+            self._next_order += 1
+
+        self.bounds[device_id] = bounds
+        for cell in self._cell_range(bounds):
+            self.cells.setdefault(cell, {})[device_id] = None
+
+    # Mover es volver a insertar con la nueva posición
+    move = insert
+
+    def remove(self, device_id):
+        """Quitar un dispositivo del índice"""
+        bounds = self.bounds.pop(device_id, None)
+        if bounds is not None:
+            self._unlink(device_id, bounds)
+            self.order.pop(device_id, None)
+
+    def _unlink(self, device_id, bounds):
+        for cell in self._cell_range(bounds):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.pop(device_id, None)
+                if not bucket:
+                    del self.cells[cell]
+
+    def query_point(self, x, y):
+        """
+        IDs de los dispositivos cuya caja contiene el punto (x, y)
+
+        Returns:
+            Lista en orden de inserción en el índice
+        """
+        size = self.cell_size
+        bucket = self.cells.get((math.floor(x / size), math.floor(y / size)))
+        if not bucket:
+            return []
+
+        hits = []
+        for device_id in bucket:
+            x0, y0, x1, y1 = self.bounds[device_id]
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                hits.append(device_id)
+        if len(hits) > 1:
+            hits.sort(key=self.order.__getitem__)
+        return hits
+
+    def clear(self):
+        """Vaciar el índice"""
+        self.cells.clear()
+        self.bounds.clear()
+        self.order.clear()
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def __contains__(self, device_id):
+        return device_id in self.bounds
@@ -1,9 +1,16 @@
 """
 Sistema de cola de eventos para simulación PON híbrida
 Control temporal estricto - sin colisiones de transmisión
+
+El reloj interno es entero (ticks de 1 ns): los timestamps de la cola, los
+ciclos DBA, los time-slots y las llegadas de paquetes se guardan en ticks, de
+modo que sumar 125 µs millones de veces no acumula error y los números de
+ciclo son divisiones enteras exactas. Los segundos solo aparecen en la
+frontera (parámetros de configuración y resultados).
 """
 
 import heapq
+import math
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Any, TYPE_CHECKING
 from enum import Enum
@@ -12,6 +19,20 @@ if TYPE_CHECKING:
     from ..simulation.incremental_data_writer import IncrementalDataWriter
 
 
+# Resolución del reloj de simulación
+TICKS_PER_SECOND = 1_000_000_000
+
+
+def to_ticks(seconds: float) -> int:
+    """Convertir segundos a ticks (redondeo al tick más cercano)"""
+    return round(seconds * TICKS_PER_SECOND)
+
+
+def to_seconds(ticks: int) -> float:
+    """Convertir ticks a segundos"""
+    return ticks / TICKS_PER_SECOND
+
+
 class EventType(Enum):
     """Tipos de eventos en la simulación PON"""
     PACKET_GENERATED = "packet_generated"
@@ -23,32 +44,45 @@ class EventType(Enum):
 
 @dataclass
 class Event:
-    """Evento de simulación con timestamp exacto"""
-    timestamp: float
+    """Evento de simulación con timestamp exacto (en ticks)"""
+    tick: int
     event_type: EventType
     onu_id: str
     data: Dict[str, Any]
+
+    @property
+    def timestamp(self) -> float:
+        """Tiempo del evento en segundos"""
+        return self.tick / TICKS_PER_SECOND
     
     def __lt__(self, other):
-        return self.timestamp < other.timestamp
+        return self.tick < other.tick
     
     def __eq__(self, other):
-        return self.timestamp == other.timestamp
+        return self.tick == other.tick
     
     def __repr__(self):
-        return f"Event({self.timestamp:.6f}us, {self.event_type.value}, {self.onu_id})"
+        return f"Event({self.timestamp:.6f}s, {self.event_type.value}, {self.onu_id})"
 
 
 class EventQueue:
     """
     Cola de eventos ordenada por timestamp
     Garantiza orden temporal estricto
+
+    El heap guarda tuplas (tick, secuencia, evento): las comparaciones son
+    entre enteros y los eventos del mismo tick salen en orden de programación.
     """
     
     def __init__(self):
-        self.events = []  # heap queue
-        self.current_time = 0.0
+        self.events = []  # heap queue de (tick, secuencia, evento)
+        self.current_tick = 0
         self.event_count = 0
+
+    @property
+    def current_time(self) -> float:
+        """Tiempo del último evento extraído en segundos"""
+        return self.current_tick / TICKS_PER_SECOND
         
     def schedule_event(self, timestamp: float, event_type: EventType, 
                       onu_id: str, data: Dict[str, Any] = None):
@@ -61,24 +95,40 @@ class EventQueue:
             onu_id: ID de la ONU asociada (o 'OLT' para eventos del OLT)
             data: Datos adicionales del evento
         """
+        self.schedule_event_at_tick(to_ticks(timestamp), event_type, onu_id, data)
+
+    def schedule_event_at_tick(self, tick: int, event_type: EventType,
+                               onu_id: str, data: Dict[str, Any] = None):
+        """
+        Programar evento en un tick específico
+
+        Args:
+            tick: Tiempo exacto del evento en ticks
+            event_type: Tipo de evento
+            onu_id: ID de la ONU asociada (o 'OLT' para eventos del OLT)
+            data: Datos adicionales del evento
+        """
         if data is None:
             data = {}
-            
-        event = Event(timestamp, event_type, onu_id, data)
-        heapq.heappush(self.events, event)
+
+        heapq.heappush(self.events, (tick, self.event_count, Event(tick, event_type, onu_id, data)))
         self.event_count += 1
         
     def get_next_event(self) -> Optional[Event]:
         """Obtener el próximo evento cronológicamente"""
         if self.events:
-            event = heapq.heappop(self.events)
-            self.current_time = event.timestamp
+            tick, _, event = heapq.heappop(self.events)
+            self.current_tick = tick
             return event
         return None
     
     def peek_next_time(self) -> float:
-        """Ver el timestamp del próximo evento sin procesarlo"""
-        return self.events[0].timestamp if self.events else float('inf')
+        """Ver el timestamp del próximo evento sin procesarlo (segundos)"""
+        return self.events[0][0] / TICKS_PER_SECOND if self.events else float('inf')
+
+    def peek_next_tick(self) -> Optional[int]:
+        """Ver el tick del próximo evento sin procesarlo (None si no hay)"""
+        return self.events[0][0] if self.events else None
     
     def has_events(self) -> bool:
         """Verificar si hay eventos pendientes"""
@@ -92,22 +142,30 @@ class EventQueue:
         """Limpiar todos los eventos"""
         self.events.clear()
         self.event_count = 0
-        self.current_time = 0.0
+        self.current_tick = 0
 
 
 class TimeSlotManager:
     """
     Gestor de time-slots para evitar colisiones de transmisión
     Garantiza que solo una ONU transmita a la vez
+
+    Los slots se asignan en ticks. El tiempo de canal ocupado se acumula por
+    ciclo DBA (cubo entero por número de ciclo) para calcular la utilización
+    de un ciclo sin recorrer el log de transmisiones.
     """
     
-    def __init__(self, channel_capacity_mbps: float = 1024.0):
+    def __init__(self, channel_capacity_mbps: float = 1024.0, cycle_ticks: Optional[int] = None):
         """
         Args:
             channel_capacity_mbps: Capacidad del canal en Mbps
+            cycle_ticks: Duración del ciclo DBA en ticks (para los cubos por ciclo)
         """
         self.channel_capacity = channel_capacity_mbps
-        self.current_transmission_end = 0.0  # Cuándo termina la transmisión actual
+        self.cycle_ticks = cycle_ticks or to_ticks(125e-6)
+        self.current_transmission_end = 0  # Tick en que termina la transmisión actual
+        self.busy_ticks_total = 0
+        self.busy_ticks_by_cycle: Dict[int, int] = {}  # ciclo -> ticks de transmisión iniciados en él
         self.transmission_log = []  # Para debugging
 
         # Escritura incremental (opcional)
@@ -131,9 +189,20 @@ class TimeSlotManager:
         # MB / (Mbps / 8) = MB / (MB/s) = segundos
         transmission_time = data_size_mb / (self.channel_capacity / 8)
         return transmission_time
+
+    def calculate_transmission_ticks(self, data_size_mb: float) -> int:
+        """
+        Calcular ticks necesarios para transmitir datos
+
+        Se redondea hacia arriba para que un slot nunca sea más corto que la
+        transmisión real (evita solapes entre slots consecutivos).
+        """
+        if data_size_mb <= 0:
+            return 0
+        return math.ceil(self.calculate_transmission_time(data_size_mb) * TICKS_PER_SECOND)
     
     def allocate_time_slot(self, onu_id: str, tcont_id: str, 
-                          data_size_mb: float, earliest_start: float) -> tuple[float, float]:
+                          data_size_mb: float, earliest_start: int) -> tuple[int, int]:
         """
         Asignar time-slot exclusivo para transmisión
         
@@ -141,32 +210,37 @@ class TimeSlotManager:
             onu_id: ID de la ONU
             tcont_id: ID del T-CONT
             data_size_mb: Tamaño de datos a transmitir
-            earliest_start: Tiempo más temprano posible de inicio
+            earliest_start: Tick más temprano posible de inicio
             
         Returns:
-            (start_time, end_time) del slot asignado
+            (start_tick, end_tick) del slot asignado
         """
-        transmission_duration = self.calculate_transmission_time(data_size_mb)
+        duration_ticks = self.calculate_transmission_ticks(data_size_mb)
         
-        if transmission_duration == 0:
+        if duration_ticks == 0:
             return earliest_start, earliest_start
         
         # El slot no puede empezar antes de que termine la transmisión actual
-        start_time = max(earliest_start, self.current_transmission_end)
-        end_time = start_time + transmission_duration
+        start_tick = max(earliest_start, self.current_transmission_end)
+        end_tick = start_tick + duration_ticks
         
         # Actualizar cuándo termina la próxima transmisión
-        self.current_transmission_end = end_time
+        self.current_transmission_end = end_tick
 
-        # Log para debugging/análisis
+        # Tiempo de canal ocupado, por ciclo en que empieza la transmisión
+        self.busy_ticks_total += duration_ticks
+        cycle = start_tick // self.cycle_ticks
+        self.busy_ticks_by_cycle[cycle] = self.busy_ticks_by_cycle.get(cycle, 0) + duration_ticks
+
+        # Log para debugging/análisis (en segundos: forma parte de los resultados)
         log_entry = {
             'onu_id': onu_id,
             'tcont_id': tcont_id,
-            'start_time': start_time,
-            'end_time': end_time,
-            'duration': transmission_duration,
+            'start_time': start_tick / TICKS_PER_SECOND,
+            'end_time': end_tick / TICKS_PER_SECOND,
+            'duration': duration_ticks / TICKS_PER_SECOND,
             'data_size_mb': data_size_mb,
-            'latency': end_time - start_time  # Para métricas
+            'latency': duration_ticks / TICKS_PER_SECOND  # Para métricas
         }
 
         # SIEMPRE guardar en memoria (necesario para gráficos y análisis)
@@ -176,7 +250,11 @@ class TimeSlotManager:
         if self.incremental_writing_enabled and self.incremental_writer:
             self.incremental_writer.write_item('transmission_log', log_entry)
         
-        return start_time, end_time
+        return start_tick, end_tick
+
+    def get_cycle_busy_ticks(self, cycle: int) -> int:
+        """Ticks de transmisión de los slots que empiezan en un ciclo"""
+        return self.busy_ticks_by_cycle.get(cycle, 0)
     
     def get_channel_utilization(self, total_time: float) -> float:
         """
@@ -188,19 +266,19 @@ class TimeSlotManager:
         Returns:
             Porcentaje de utilización (0-100)
         """
-        if total_time <= 0 or not self.transmission_log:
+        if total_time <= 0 or not self.busy_ticks_total:
             return 0.0
             
-        total_transmission_time = sum(
-            entry['duration'] for entry in self.transmission_log
-        )
+        total_transmission_time = self.busy_ticks_total / TICKS_PER_SECOND
         
         utilization = (total_transmission_time / total_time) * 100
         return min(utilization, 100.0)  # Cap at 100%
     
     def reset(self):
         """Reiniciar el gestor de time-slots"""
-        self.current_transmission_end = 0.0
+        self.current_transmission_end = 0
+        self.busy_ticks_total = 0
+        self.busy_ticks_by_cycle.clear()
         self.transmission_log.clear()
     
     def get_transmission_log(self) -> List[Dict]:
@@ -227,7 +305,14 @@ class CycleTimeManager:
     """
     Gestor de timing para ciclos DBA
     Garantiza ciclos regulares de 125us
+
+    Los inicios de ciclo son múltiplos enteros de cycle_ticks, así que el
+    número de ciclo de un tick es una división entera exacta.
     """
+
+    # Fases del ciclo (desde su inicio): reports 0-40us, DBA 40-50us, transmisión 50-125us
+    REPORT_PHASE_TICKS = to_ticks(40e-6)
+    TRANSMISSION_PHASE_TICKS = to_ticks(50e-6)
     
     def __init__(self, cycle_duration: float = 125e-6):
         """
@@ -235,71 +320,63 @@ class CycleTimeManager:
             cycle_duration: Duración del ciclo DBA en segundos (default: 125us)
         """
         self.cycle_duration = cycle_duration
+        self.cycle_ticks = to_ticks(cycle_duration)
         self.current_cycle = 0
-        self.cycle_start_times = []
-        self.last_scheduled_cycle_time = -1.0  # Evitar ciclos duplicados
+        self.last_scheduled_cycle_tick = -1  # Evitar ciclos duplicados
         
-    def get_next_cycle_start(self, current_time: float) -> float:
+    def get_next_cycle_start(self, current_tick: int) -> int:
         """
-        Obtener timestamp del próximo ciclo DBA
+        Obtener tick del próximo ciclo DBA
         
         Args:
-            current_time: Tiempo actual
+            current_tick: Tick actual
             
         Returns:
-            Timestamp del próximo ciclo
+            Tick de inicio del próximo ciclo
         """
-        # Si es el primer ciclo, empezar en el primer intervalo
-        if self.last_scheduled_cycle_time < 0:
-            next_cycle_time = self.cycle_duration
-        else:
-            # Siguiente ciclo es simplemente agregar la duración
-            next_cycle_time = self.last_scheduled_cycle_time + self.cycle_duration
-        
-        self.last_scheduled_cycle_time = next_cycle_time
         self.current_cycle += 1
-        self.cycle_start_times.append(next_cycle_time)
-        
-        return next_cycle_time
+        self.last_scheduled_cycle_tick = self.current_cycle * self.cycle_ticks
+        return self.last_scheduled_cycle_tick
     
-    def get_cycle_phases(self, cycle_start: float) -> Dict[str, tuple[float, float]]:
+    def get_cycle_phases(self, cycle_start: int) -> Dict[str, tuple[int, int]]:
         """
-        Obtener fases del ciclo DBA con timestamps exactos
+        Obtener fases del ciclo DBA con ticks exactos
         
         Args:
-            cycle_start: Tiempo de inicio del ciclo
+            cycle_start: Tick de inicio del ciclo
             
         Returns:
-            Dict con fases y sus (start_time, end_time)
+            Dict con fases y sus (start_tick, end_tick)
         """
+        report_end = cycle_start + self.REPORT_PHASE_TICKS
+        transmission_start = cycle_start + self.TRANSMISSION_PHASE_TICKS
         return {
-            'report_phase': (cycle_start, cycle_start + 40e-6),  # 0-40us
-            'dba_processing': (cycle_start + 40e-6, cycle_start + 50e-6),  # 40-50us
-            'transmission_phase': (cycle_start + 50e-6, cycle_start + self.cycle_duration)  # 50-125us
+            'report_phase': (cycle_start, report_end),  # 0-40us
+            'dba_processing': (report_end, transmission_start),  # 40-50us
+            'transmission_phase': (transmission_start, cycle_start + self.cycle_ticks)  # 50-125us
         }
     
-    def is_in_transmission_phase(self, current_time: float) -> bool:
+    def is_in_transmission_phase(self, current_tick: int) -> bool:
         """
-        Verificar si el tiempo actual está en fase de transmisión
+        Verificar si el tick actual está en fase de transmisión
         
         Args:
-            current_time: Tiempo actual
+            current_tick: Tick actual
             
         Returns:
             True si está en fase de transmisión
         """
-        cycle_position = current_time % self.cycle_duration
-        return cycle_position >= 50e-6  # Después de 50us del ciclo
+        return current_tick % self.cycle_ticks >= self.TRANSMISSION_PHASE_TICKS
     
-    def get_current_cycle_number(self, current_time: float) -> int:
+    def get_current_cycle_number(self, current_tick: int) -> int:
         """Obtener número del ciclo actual"""
-        return int(current_time / self.cycle_duration)
+        return current_tick // self.cycle_ticks
     
     def get_cycle_statistics(self) -> Dict[str, Any]:
         """Obtener estadísticas de ciclos ejecutados"""
         return {
-            'total_cycles': len(self.cycle_start_times),
+            'total_cycles': self.current_cycle,
             'cycle_duration': self.cycle_duration,
             'cycles_per_second': 1.0 / self.cycle_duration,
-            'last_cycle_time': self.cycle_start_times[-1] if self.cycle_start_times else 0.0
+            'last_cycle_time': max(self.last_scheduled_cycle_tick, 0) / TICKS_PER_SECOND
         }
\ No newline at end of file
@@ -4,12 +4,15 @@ Arquitectura event-driven con control temporal estricto
 """
 
 from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
-from .event_queue import EventQueue, EventType, TimeSlotManager, CycleTimeManager
+from .event_queue import (
+    EventQueue, EventType, TimeSlotManager, CycleTimeManager, TICKS_PER_SECOND, to_ticks
+)
 from .pon_event_onu import HybridONU
 
 if TYPE_CHECKING:
     from ..algorithms.pon_dba import DBAAlgorithmInterface
     from ..simulation.incremental_data_writer import IncrementalDataWriter
+    from ..rl_integration.transition_recorder import TransitionRecorder
 
 
 class HybridOLT:
@@ -42,18 +45,20 @@ class HybridOLT:
         # Configuración de polling automático
         self.cycle_duration = 125e-6  # 125us por ciclo
 
-        # Gestores de tiempo
+        # Gestores de tiempo (reloj entero en ticks)
         self.cycle_manager = CycleTimeManager(self.cycle_duration)
-        self.slot_manager = TimeSlotManager(channel_capacity_mbps)
+        self.cycle_ticks = self.cycle_manager.cycle_ticks
+        self.guard_ticks = to_ticks(guard_time_s)
+        self.slot_manager = TimeSlotManager(channel_capacity_mbps, self.cycle_ticks)
 
         # Estado del OLT
         self.current_cycle = 0
         self.last_reports = {}
         self.pending_grants = {}
 
-        # Control de polling sin eventos
-        self.last_polling_time = 0.0  # Último momento en que se ejecutó polling
-        self.next_polling_time = self.cycle_duration  # Próximo polling esperado
+        # Control de polling sin eventos (en ticks)
+        self.last_polling_tick = 0  # Último momento en que se ejecutó polling
+        self.next_polling_tick = self.cycle_ticks  # Próximo polling esperado
 
         # Estadísticas
         self.stats = {
@@ -73,20 +78,33 @@ class HybridOLT:
         self.incremental_writer: Optional['IncrementalDataWriter'] = None
         self.incremental_writing_enabled = False
 
+        # Captura de transiciones para preentrenamiento offline (opcional)
+        self.transition_recorder: Optional['TransitionRecorder'] = None
+
         # RL Integration: Store last allocations and RL action
         self.last_allocations: Dict[str, float] = {}  # MB allocated per ONU
         self.rl_action: Optional[Any] = None  # Action from RL agent (if using RL-DBA)
 
         print(f"  OLT: Polling automático cada {self.cycle_duration*1e6:.0f}us (sin eventos en cola)")
+
+    @property
+    def next_polling_time(self) -> float:
+        """Próximo polling esperado en segundos"""
+        return self.next_polling_tick / TICKS_PER_SECOND
+
+    @property
+    def last_polling_time(self) -> float:
+        """Último polling ejecutado en segundos"""
+        return self.last_polling_tick / TICKS_PER_SECOND
     
-    def check_and_execute_polling(self, event_queue: EventQueue, current_time: float):
+    def check_and_execute_polling(self, event_queue: EventQueue, current_tick: int):
         """
         Verificar si es necesario ejecutar polling y ejecutarlo automáticamente
         Este método se llama ANTES de procesar cada evento
 
         Args:
             event_queue: Cola de eventos del simulador
-            current_time: Tiempo actual de la simulación (timestamp del próximo evento)
+            current_tick: Tick actual de la simulación (el del próximo evento)
 
         Returns:
             Número de ciclos de polling ejecutados
@@ -94,26 +112,28 @@ class HybridOLT:
         cycles_executed = 0
 
         # Verificar si han pasado 125µs o más desde el último polling
-        while current_time >= self.next_polling_time:
+        while current_tick >= self.next_polling_tick:
             # Ejecutar un ciclo de polling SIN crear evento
-            self._execute_single_polling_cycle(event_queue, self.next_polling_time)
+            self._execute_single_polling_cycle(event_queue, self.next_polling_tick)
 
-            # Actualizar tiempos
-            self.last_polling_time = self.next_polling_time
-            self.next_polling_time += self.cycle_duration
+            # Actualizar tiempos (suma entera: sin deriva)
+            self.last_polling_tick = self.next_polling_tick
+            self.next_polling_tick += self.cycle_ticks
             cycles_executed += 1
 
         return cycles_executed
     
-    def _execute_single_polling_cycle(self, event_queue: EventQueue, cycle_time: float):
+    def _execute_single_polling_cycle(self, event_queue: EventQueue, cycle_tick: int):
         """
         Ejecutar un único ciclo de DBA sin crear eventos en la cola
         Este método es llamado automáticamente cuando pasan 125µs
 
         Args:
             event_queue: Cola de eventos del simulador
-            cycle_time: Tiempo exacto del ciclo (múltiplo de 125µs)
+            cycle_tick: Tick exacto del ciclo (múltiplo de 125µs)
         """
+        cycle_time = cycle_tick / TICKS_PER_SECOND
+
         # FASE 1: Recolectar reports (0-40us del ciclo)
         reports = self._collect_reports()
 
@@ -126,7 +146,7 @@ class HybridOLT:
         # FASE 3: Programar transmisiones (50-125us del ciclo)
         # Solo programar transmisiones si hay grants
         if grants:
-            phases = self.cycle_manager.get_cycle_phases(cycle_time)
+            phases = self.cycle_manager.get_cycle_phases(cycle_tick)
             transmission_start = phases['transmission_phase'][0]
             # OPCIÓN 1: Usar método fusionado que extrae paquetes y programa TRANSMISSION_COMPLETE directamente
             self._schedule_transmissions_directly(event_queue, grants, transmission_start)
@@ -241,6 +261,10 @@ class HybridOLT:
         # Store allocations for RL environment to access
         self.last_allocations = allocations.copy()
 
+        # Registrar transición (observación, asignación, recompensa) si está habilitado
+        if self.transition_recorder is not None:
+            self.transition_recorder.record(self.onus, reports, allocations, current_time)
+
         # Convertir allocations en grants específicos por T-CONT
         grants = self._convert_allocations_to_grants(allocations, reports)
         
@@ -313,14 +337,14 @@ class HybridOLT:
     
     def _schedule_sequential_transmissions(self, event_queue: EventQueue,
                                          grants: Dict[str, Dict[str, int]],
-                                         transmission_start: float):
+                                         transmission_start: int):
         """
         Programar transmisiones secuenciales sin colisiones
         
         Args:
             event_queue: Cola de eventos del simulador
             grants: Grants asignados
-            transmission_start: Tiempo de inicio de transmisiones
+            transmission_start: Tick de inicio de transmisiones
         """
         current_slot_start = transmission_start
         
@@ -338,19 +362,19 @@ class HybridOLT:
             )
             
             gt = getattr(self, 'guard_time_s', 0.0)
-            slot_end_with_guard = slot_end + gt
+            slot_end_with_guard = slot_end + self.guard_ticks
             slot_duration_with_guard = slot_end_with_guard - slot_start
             
             # Programar inicio de transmisión
-            event_queue.schedule_event(
+            event_queue.schedule_event_at_tick(
                 slot_start,
                 EventType.GRANT_START,
                 onu_id,
                 {
                     'tcont_id': tcont_id,
                     'grant_bytes': grant_bytes,
-                    'slot_duration': slot_duration_with_guard,
-                    'slot_end': slot_end_with_guard,
+                    'slot_duration': slot_duration_with_guard / TICKS_PER_SECOND,
+                    'slot_end': slot_end_with_guard / TICKS_PER_SECOND,
                     'line_rate_bps': self.channel_capacity * 1e6,
                     'guard_time_s': gt
                 }
@@ -399,7 +423,7 @@ class HybridOLT:
         Args:
             event_queue: Cola de eventos del simulador
             grants: Grants asignados
-            transmission_start: Tiempo de inicio de transmisiones
+            transmission_start: Tick de inicio de transmisiones
         """
         current_slot_start = transmission_start
 
@@ -417,7 +441,7 @@ class HybridOLT:
             )
 
             gt = getattr(self, 'guard_time_s', 0.0)
-            slot_end_with_guard = slot_end + gt
+            slot_end_with_guard = slot_end + self.guard_ticks
             slot_duration_with_guard = slot_end_with_guard - slot_start
 
             # NUEVO: Extraer paquetes inmediatamente (lo que antes hacía GRANT_START)
@@ -425,7 +449,8 @@ class HybridOLT:
             packets, transmitted_bytes = onu.transmit_from_queue(tcont_id, grant_bytes)
 
             # Programar TRANSMISSION_COMPLETE directamente (saltando GRANT_START)
-            event_queue.schedule_event(
+            # Los datos del evento van en segundos: los consumen las métricas
+            event_queue.schedule_event_at_tick(
                 slot_end_with_guard,
                 EventType.TRANSMISSION_COMPLETE,
                 onu_id,
@@ -434,9 +459,9 @@ class HybridOLT:
                     'packets': packets,
                     'transmitted_bytes': transmitted_bytes,
                     'grant_bytes': grant_bytes,
-                    'slot_start': slot_start,
-                    'slot_end': slot_end_with_guard,
-                    'slot_duration': slot_duration_with_guard,
+                    'slot_start': slot_start / TICKS_PER_SECOND,
+                    'slot_end': slot_end_with_guard / TICKS_PER_SECOND,
+                    'slot_duration': slot_duration_with_guard / TICKS_PER_SECOND,
                     'line_rate_bps': self.channel_capacity * 1e6,
                     'guard_time_s': gt
                 }
@@ -463,22 +488,11 @@ class HybridOLT:
         
         # Calcular utilización del canal para este ciclo específico
         if self.current_cycle > 0:
-            cycle_duration = self.cycle_manager.cycle_duration
-            
-            # Obtener transmisiones de este ciclo únicamente
-            cycle_start = (self.current_cycle - 1) * cycle_duration
-            cycle_end = self.current_cycle * cycle_duration
-            
-            cycle_transmissions = [
-                entry for entry in self.slot_manager.transmission_log
-                if cycle_start <= entry['start_time'] < cycle_end
-            ]
+            # Ticks de las transmisiones que empezaron en el último ciclo ejecutado
+            cycle_transmission_ticks = self.slot_manager.get_cycle_busy_ticks(self.current_cycle - 1)
+            transmission_window = self.cycle_ticks * 0.6  # 60% del ciclo disponible para transmisión (75us de 125us)
             
-            # Calcular utilización solo para este ciclo
-            cycle_transmission_time = sum(entry['duration'] for entry in cycle_transmissions)
-            transmission_window = cycle_duration * 0.6  # 60% del ciclo disponible para transmisión (75us de 125us)
-            
-            cycle_utilization = (cycle_transmission_time / transmission_window) * 100 if transmission_window > 0 else 0
+            cycle_utilization = (cycle_transmission_ticks / transmission_window) * 100 if transmission_window > 0 else 0
             cycle_utilization = min(cycle_utilization, 100.0)
             
             self.stats['channel_utilization_samples'].append(cycle_utilization)
@@ -540,6 +554,20 @@ class HybridOLT:
         self.incremental_writing_enabled = False
         print(f"⚠️ OLT: Escritura incremental deshabilitada")
 
+    def enable_transition_recording(self, recorder: 'TransitionRecorder'):
+        """
+        Habilitar captura de transiciones en cada ejecución del DBA
+
+        Args:
+            recorder: Instancia de TransitionRecorder configurada
+        """
+        self.transition_recorder = recorder
+        print(f"✅ OLT: Captura de transiciones habilitada ({recorder.output_dir})")
+
+    def disable_transition_recording(self):
+        """Deshabilitar captura de transiciones"""
+        self.transition_recorder = None
+
     def set_rl_action(self, action: Any):
         """
         Set the RL action to be used by the DBA algorithm.
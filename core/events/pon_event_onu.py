@@ -7,7 +7,7 @@ import random
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
-from .event_queue import EventQueue, EventType
+from .event_queue import EventQueue, EventType, TICKS_PER_SECOND
 
 
 @dataclass
@@ -17,7 +17,7 @@ class Packet:
     onu_id: str
     tcont_type: str
     size_bytes: int
-    arrival_time: float
+    arrival_tick: int
     priority: int
     data: Dict[str, Any]
     
@@ -25,6 +25,11 @@ class Packet:
         if self.data is None:
             self.data = {}
 
+    @property
+    def arrival_time(self) -> float:
+        """Tiempo de llegada en segundos"""
+        return self.arrival_tick / TICKS_PER_SECOND
+
 
 class TContQueue:
     """Cola para un T-CONT específico"""
@@ -36,6 +41,8 @@ class TContQueue:
         self.total_bytes = 0
         self.dropped_packets = 0
         self.total_packets_received = 0
+        # Suma de ticks de llegada de los paquetes en cola (delay de espera en O(1), sin error acumulado)
+        self.arrival_tick_sum = 0
         
     def add_packet(self, packet: Packet) -> bool:
         """
@@ -56,6 +63,7 @@ class TContQueue:
         
         self.packets.append(packet)
         self.total_bytes += packet.size_bytes
+        self.arrival_tick_sum += packet.arrival_tick
         return True
     
     def transmit_packets(self, max_bytes: int) -> Tuple[List[Packet], int]:
@@ -80,6 +88,7 @@ class TContQueue:
                 transmitted_packets.append(packet)
                 transmitted_bytes += packet.size_bytes
                 self.total_bytes -= packet.size_bytes
+                self.arrival_tick_sum -= packet.arrival_tick
             else:
                 # No cabe el siguiente paquete
                 break
@@ -96,6 +105,21 @@ class TContQueue:
             'utilization': self.total_bytes / self.max_bytes if self.max_bytes > 0 else 0
         }
     
+    def get_waiting_time_sum(self, current_time: float) -> float:
+        """
+        Suma del tiempo de espera de los paquetes en cola sin recorrerlos
+        
+        Args:
+            current_time: Tiempo actual de la simulación
+            
+        Returns:
+            Suma de (current_time - arrival_time) de todos los paquetes en cola
+        """
+        if not self.packets:
+            return 0.0
+        current_tick = round(current_time * TICKS_PER_SECOND)
+        return max(len(self.packets) * current_tick - self.arrival_tick_sum, 0) / TICKS_PER_SECOND
+    
     def is_empty(self) -> bool:
         """Verificar si la cola está vacía"""
         return len(self.packets) == 0
@@ -104,6 +128,7 @@ class TContQueue:
         """Limpiar la cola"""
         self.packets.clear()
         self.total_bytes = 0
+        self.arrival_tick_sum = 0
 
 
 class HybridONU:
@@ -151,7 +176,7 @@ class HybridONU:
         })
         
         # Estado de generación de tráfico
-        self.next_packet_time = 0.0
+        self.next_packet_tick = 0
         self.packet_counter = 0
         self.total_packets_generated = 0
         self.total_bytes_generated = 0
@@ -166,35 +191,37 @@ class HybridONU:
             'grants_received': 0
         }
         
-    def schedule_first_packet(self, event_queue: EventQueue, start_time: float):
+    def _inter_arrival_ticks(self) -> int:
+        """Tiempo hasta el próximo paquete (exponencial) en ticks"""
+        return round(random.expovariate(self.lambda_rate) * TICKS_PER_SECOND)
+
+    def schedule_first_packet(self, event_queue: EventQueue, start_tick: int):
         """
         Programar el primer paquete con distribución exponencial
         
         Args:
             event_queue: Cola de eventos del simulador
-            start_time: Tiempo de inicio de la simulación
+            start_tick: Tick de inicio de la simulación
         """
-        # Tiempo hasta el primer paquete (exponencial)
-        inter_arrival = random.expovariate(self.lambda_rate)
-        self.next_packet_time = start_time + inter_arrival
+        self.next_packet_tick = start_tick + self._inter_arrival_ticks()
         
-        event_queue.schedule_event(
-            self.next_packet_time,
+        event_queue.schedule_event_at_tick(
+            self.next_packet_tick,
             EventType.PACKET_GENERATED,
             self.onu_id,
             {'packet_sequence': 0}
         )
         
-    def generate_packet(self, event_queue: EventQueue, current_time: float):
+    def generate_packet(self, event_queue: EventQueue, current_tick: int):
         """
         Generar un nuevo paquete y programar el siguiente
         
         Args:
             event_queue: Cola de eventos del simulador
-            current_time: Tiempo actual de la simulación
+            current_tick: Tick actual de la simulación
         """
         # Crear paquete
-        packet = self._create_packet(current_time)
+        packet = self._create_packet(current_tick)
         
         # Intentar agregarlo a la cola correspondiente
         queue = self.queues[packet.tcont_type]
@@ -208,11 +235,10 @@ class HybridONU:
         # Si falla, el paquete se descarta (buffer overflow)
         
         # Programar siguiente paquete
-        inter_arrival = random.expovariate(self.lambda_rate)
-        self.next_packet_time = current_time + inter_arrival
+        self.next_packet_tick = current_tick + self._inter_arrival_ticks()
         
-        event_queue.schedule_event(
-            self.next_packet_time,
+        event_queue.schedule_event_at_tick(
+            self.next_packet_tick,
             EventType.PACKET_GENERATED,
             self.onu_id,
             {'packet_sequence': self.packet_counter + 1}
@@ -220,12 +246,12 @@ class HybridONU:
         
         self.packet_counter += 1
     
-    def _create_packet(self, arrival_time: float) -> Packet:
+    def _create_packet(self, arrival_tick: int) -> Packet:
         """
         Crear un paquete según las distribuciones configuradas
         
         Args:
-            arrival_time: Tiempo de llegada del paquete
+            arrival_tick: Tick de llegada del paquete
             
         Returns:
             Paquete creado
@@ -247,7 +273,7 @@ class HybridONU:
             onu_id=self.onu_id,
             tcont_type=tcont_type,
             size_bytes=size_bytes,
-            arrival_time=arrival_time,
+            arrival_tick=arrival_tick,
             priority=priority,
             data={'scenario': self.scenario_config.get('description', 'unknown')}
         )
@@ -313,6 +339,27 @@ class HybridONU:
         
         return packets, bytes_transmitted
     
+    def get_pending_delay_stats(self, current_time: float) -> Tuple[float, int]:
+        """
+        Obtener suma de delays de espera y número de paquetes en cola
+        
+        Args:
+            current_time: Tiempo actual de la simulación
+            
+        Returns:
+            (suma_delays_espera, paquetes_en_cola)
+        """
+        total_delay = 0.0
+        packet_count = 0
+        for queue in self.queues.values():
+            total_delay += queue.get_waiting_time_sum(current_time)
+            packet_count += len(queue.packets)
+        return total_delay, packet_count
+    
+    def get_dropped_packets(self) -> int:
+        """Total de paquetes descartados por overflow en todas las colas"""
+        return sum(queue.dropped_packets for queue in self.queues.values())
+    
     def receive_grant(self, grants: Dict[str, int]):
         """
         Recibir grants del OLT
@@ -3,6 +3,8 @@ PON Adapter - Adaptador unificado para simulación PON
 Combina todas las funcionalidades de simulación en una interfaz limpia
 """
 
+import os
+from datetime import datetime
 from typing import Dict, Any
 
 # Importar clases core de PON
@@ -19,6 +21,8 @@ try:
 )
     from ..smart_rl_dba import SmartRLDBAAlgorithm
     from ..simulation.pon_simulator import PONSimulator, EventEvaluator
+    from ..simulation.live_metrics import LiveMetricsCollector
+    from ..simulation import multi_tree
     from ..utilities.pon_traffic import get_available_scenarios, print_scenario_info
     PON_CORE_AVAILABLE = True
     print("OK PON Core cargado exitosamente")
@@ -28,6 +32,8 @@ except ImportError as e:
     PONOrchestrator = None
     PONSimulator = None
     EventEvaluator = None
+    LiveMetricsCollector = None
+    multi_tree = None
     SmartRLDBAAlgorithm = None
     FCFSDBAAlgorithm = None
     PriorityDBAAlgorithm = None
@@ -81,6 +87,16 @@ class PONAdapter:
         # Results storage
         self.last_simulation_results = None
 
+        # Captura de transiciones para preentrenamiento RL offline (opcional)
+        self.transition_recording_dir = None
+        self.transition_shard_size = 10000
+
+        # Métricas en vivo para gráficos incrementales (opcional)
+        self.live_metrics = None
+
+        # Árboles PON de una topología con varios OLT (None = un solo árbol)
+        self.pon_trees = None
+
     def get_olt(self):
         """Obtener el OLT actual de la simulación"""
         if self.simulator and hasattr(self.simulator, 'olt'):
@@ -121,11 +137,18 @@ class PONAdapter:
         # Procesar métricas por ONU
         onu_metrics = {}
         try:
+            has_running_means = hasattr(olt, 'get_mean_latency')
             for onu_id, metrics in olt.sdn_metrics.items():
+                if has_running_means:
+                    avg_latency = olt.get_mean_latency(onu_id)
+                    avg_throughput = olt.get_mean_throughput(onu_id)
+                else:
+                    avg_latency = sum(metrics['latency']) / max(1, len(metrics['latency']))
+                    avg_throughput = sum(metrics['throughput']) / max(1, len(metrics['throughput']))
                 onu_metrics[onu_id] = {
-                    'avg_latency': sum(metrics['latency']) / max(1, len(metrics['latency'])),
+                    'avg_latency': avg_latency,
                     'packet_loss_rate': (metrics['losses'] / max(1, metrics['grants_allocated'])) * 100,
-                    'avg_throughput': sum(metrics['throughput']) / max(1, len(metrics['throughput']))
+                    'avg_throughput': avg_throughput
                 }
             self._log_event("DEBUG", f"get_sdn_metrics: Métricas calculadas para {len(onu_metrics)} ONUs")
         except Exception as e:
@@ -234,11 +257,13 @@ class PONAdapter:
 
         if not olts:
             return False, "No se encontró OLT en la topología"
-        if len(olts) > 1:
-            return False, "Solo se soporta un OLT por simulación"
         if not onus:
             return False, "No se encontraron ONUs en la topología"
 
+        if len(olts) > 1:
+            return self._initialize_pon_trees(device_manager, olts, onus)
+        self.pon_trees = None
+
         num_onus = len(onus)
 
         # Extraer configuraciones de tráfico de cada ONU desde el canvas
@@ -247,6 +272,45 @@ class PONAdapter:
         # Inicializar según modo de simulación
         return self._initialize_simulator_from_topology(num_onus, onu_configs)
     
+    def _initialize_pon_trees(self, device_manager, olts, onus):
+        """
+        Preparar una simulación por árbol PON (un OLT y las ONUs conectadas a él)
+
+        Cada árbol se simula en su propio proceso al ejecutar la simulación
+        por eventos; las ONUs sin OLT conectado no se simulan.
+        """
+        if self.simulation_mode != "events":
+            return False, "Las topologías con varios OLT solo se soportan en modo eventos"
+
+        canvas = getattr(device_manager, 'canvas', None)
+        connection_manager = getattr(canvas, 'connection_manager', None)
+        if connection_manager is None:
+            return False, "No hay conexiones disponibles para asignar ONUs a cada OLT"
+
+        trees, unattached = multi_tree.group_onus_by_olt(olts, onus, connection_manager)
+        for onu in unattached:
+            self._log_event("WARNING", f"ONU {onu.name} no está conectada a ningún OLT, se omite")
+
+        self.pon_trees = []
+        for olt, tree_onus in trees.items():
+            if not tree_onus:
+                self._log_event("WARNING", f"OLT {olt.name} no tiene ONUs conectadas, se omite")
+                continue
+            self.pon_trees.append({
+                'tree_id': olt.name,
+                'onu_configs': self._extract_onu_configs_from_devices(tree_onus)
+            })
+
+        if not self.pon_trees:
+            self.pon_trees = None
+            return False, "Ningún OLT tiene ONUs conectadas"
+
+        self.simulator = None
+        num_onus = sum(len(tree['onu_configs']) for tree in self.pon_trees)
+        message = f"{len(self.pon_trees)} árboles PON preparados con {num_onus} ONUs (un proceso por árbol)"
+        self._log_event("INIT", message)
+        return True, message
+
     def initialize_simulation(self, num_onus=None):
         """Inicializar simulación con número específico de ONUs"""
         if not self.is_available:
@@ -326,6 +390,7 @@ class PONAdapter:
                 return False, "PONSimulator no disponible"
                 
             dba_algorithm = self._get_dba_algorithm()
+            self.pon_trees = None
             
             # Crear simulador unificado
             self.simulator = PONSimulator(simulation_mode=self.simulation_mode)
@@ -381,8 +446,16 @@ class PONAdapter:
             self._log_event("ERROR", error_msg)
             return False, error_msg
     
-    def run_event_simulation(self, duration_seconds=10.0, callback=None):
-        """Ejecutar simulación por eventos por tiempo"""
+    def run_event_simulation(self, duration_seconds=10.0, callback=None, progress_interval=0.25):
+        """
+        Ejecutar simulación por eventos por tiempo
+
+        El callback recibe ("update", resumen) como mucho una vez cada
+        progress_interval segundos reales (no por evento) y ("end", resultados).
+        """
+        if self.pon_trees:
+            return self.run_multi_tree_simulation(duration_seconds, callback)
+
         if not self.simulator or self.simulation_mode != "events":
             success, msg = self._initialize_simulator(self.config['num_onus'])
             if not success:
@@ -391,19 +464,27 @@ class PONAdapter:
         try:
             self._log_event("START", f"Iniciando simulación por eventos por {duration_seconds}s")
             
-            # Crear callback wrapper si se proporciona
-            event_callback = None
+            # Progreso resumido y limitado por reloj (sin llamada por evento)
+            progress_callback = None
             if callback:
-                def event_callback(event, sim_time):
-                    callback("update", {
-                        'sim_time': sim_time,
-                        'event_type': event.event_type.value,
-                        'onu_id': event.onu_id,
-                        'data': event.data
-                    })
+                def progress_callback(summary):
+                    callback("update", summary)
             
+            # Conectar métricas en vivo (None las desactiva en el simulador)
+            self.simulator.live_metrics = self.live_metrics
+
+            # Activar captura de transiciones si está configurada
+            recorder = self._start_transition_recording()
+
             # Ejecutar simulación
-            success, results = self.simulator.run_event_simulation(duration_seconds, event_callback)
+            try:
+                success, results = self.simulator.run_event_simulation(
+                    duration_seconds,
+                    progress_callback=progress_callback,
+                    progress_interval=progress_interval
+                )
+            finally:
+                self._stop_transition_recording(recorder)
             
             if success:
                 # Almacenar resultados
@@ -436,6 +517,151 @@ class PONAdapter:
             self._log_event("ERROR", error_msg)
             return False, error_msg
     
+    def run_multi_tree_simulation(self, duration_seconds=10.0, callback=None, max_workers=None):
+        """
+        Ejecutar un simulador por árbol PON en procesos separados
+
+        El callback recibe ("update", progreso) al terminar cada árbol y
+        ("end", resultados) con el resumen de red; el desglose por árbol queda
+        en resultados['trees']. Las métricas en vivo, la traza por ciclos y la
+        captura de transiciones no se aplican a los procesos trabajadores.
+        """
+        if not self.pon_trees:
+            return False, "No hay árboles PON preparados"
+
+        if self.live_metrics or self.transition_recording_dir:
+            self._log_event("WARNING", "Métricas en vivo y captura de transiciones no disponibles con varios OLT")
+
+        config = {key: self.config[key] for key in ('traffic_scenario', 'channel_capacity_mbps',
+                                                    'episode_duration', 'simulation_timestep')}
+        rl_model_path = self.loaded_model_path if self.current_algorithm in ("Smart-RL", "Smart-RL-SDN") else None
+        tasks = [
+            {
+                'tree_id': tree['tree_id'],
+                'onu_configs': tree['onu_configs'],
+                'config': config,
+                'algorithm': self.current_algorithm,
+                'rl_model_path': rl_model_path,
+                'duration': duration_seconds
+            }
+            for tree in self.pon_trees
+        ]
+
+        try:
+            self._log_event("START", f"Iniciando simulación de {len(tasks)} árboles PON por {duration_seconds}s")
+            results = multi_tree.run_multi_tree_simulation(tasks, max_workers=max_workers, callback=callback)
+            self.last_simulation_results = results
+
+            if callback:
+                callback("end", results)
+
+            self._log_event("END", "Simulación de varios árboles PON completada")
+            return True, results
+
+        except Exception as e:
+            error_msg = f"Error en simulación de varios árboles PON: {str(e)}"
+            self._log_event("ERROR", error_msg)
+            return False, error_msg
+
+    def enable_live_metrics(self, bin_seconds: float = 0.01, capacity: int = 4096):
+        """
+        Publicar métricas decimadas durante las próximas simulaciones por eventos
+
+        Args:
+            bin_seconds: Intervalo de agregación en tiempo simulado
+            capacity: Muestras retenidas por serie (buffers circulares)
+
+        Returns:
+            LiveMetricsCollector que la UI puede leer de forma incremental
+        """
+        if self.live_metrics is None or self.live_metrics.bin_seconds != bin_seconds \
+                or self.live_metrics.capacity != capacity:
+            self.live_metrics = LiveMetricsCollector(bin_seconds=bin_seconds, capacity=capacity)
+        self._log_event("CONFIG", f"Métricas en vivo habilitadas (intervalo {bin_seconds * 1000:.1f} ms)")
+        return self.live_metrics
+
+    def disable_live_metrics(self):
+        """Deshabilitar métricas en vivo"""
+        self.live_metrics = None
+
+    def enable_cycle_tracing(self, *categories: str):
+        """
+        Activar la traza estructurada del simulador por ciclos
+
+        Args:
+            categories: Categorías de core.utilities.cycle_trace (todas si se omite)
+        """
+        from ..utilities.cycle_trace import CYCLE_TRACE
+        CYCLE_TRACE.enable(*categories)
+        self._log_event("CONFIG", f"Traza de ciclos habilitada: {', '.join(CYCLE_TRACE.enabled_categories())}")
+
+    def disable_cycle_tracing(self):
+        """Desactivar todas las categorías de traza"""
+        from ..utilities.cycle_trace import CYCLE_TRACE
+        CYCLE_TRACE.disable()
+
+    def dump_cycle_trace(self, path: str) -> str:
+        """Volcar la traza de ciclos a un archivo binario .npz"""
+        from ..utilities.cycle_trace import CYCLE_TRACE
+        return CYCLE_TRACE.dump(path)
+
+    def enable_transition_recording(self, output_dir: str, shard_size: int = 10000):
+        """
+        Grabar transiciones (observación, asignación, recompensa) en cada
+        ciclo DBA de las próximas simulaciones por eventos
+
+        Args:
+            output_dir: Directorio donde se escriben los shards .npz
+            shard_size: Transiciones por shard
+        """
+        self.transition_recording_dir = output_dir
+        self.transition_shard_size = shard_size
+        self._log_event("CONFIG", f"Captura de transiciones habilitada en: {output_dir}")
+
+    def disable_transition_recording(self):
+        """Deshabilitar captura de transiciones"""
+        self.transition_recording_dir = None
+
+    def _start_transition_recording(self):
+        """Crear un TransitionRecorder y conectarlo al OLT actual"""
+        if not self.transition_recording_dir:
+            return None
+
+        olt = self.get_olt()
+        if not olt or not hasattr(olt, 'enable_transition_recording'):
+            self._log_event("WARNING", "El OLT actual no soporta captura de transiciones")
+            return None
+
+        from ..rl_integration.transition_recorder import TransitionRecorder
+
+        algorithm_name = self.current_algorithm
+        run_dir = os.path.join(
+            self.transition_recording_dir,
+            f"{algorithm_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        )
+        recorder = TransitionRecorder(
+            run_dir,
+            num_onus=len(olt.onus),
+            channel_capacity_mbps=olt.channel_capacity,
+            shard_size=self.transition_shard_size,
+            metadata={
+                'algorithm': algorithm_name,
+                'traffic_scenario': self.config['traffic_scenario']
+            }
+        )
+        olt.enable_transition_recording(recorder)
+        return recorder
+
+    def _stop_transition_recording(self, recorder):
+        """Desconectar el recorder del OLT y escribir los shards pendientes"""
+        if recorder is None:
+            return
+
+        olt = self.get_olt()
+        if olt and hasattr(olt, 'disable_transition_recording'):
+            olt.disable_transition_recording()
+        recorder.close()
+
     def run_cycle_simulation(self, timesteps=1000, callback=None):
         """Ejecutar simulación por ciclos DBA por pasos"""
         if not self.simulator or self.simulation_mode != "cycles":
@@ -734,9 +960,9 @@ class PONAdapter:
         """Método de compatibilidad (usa initialize_event_simulator)"""
         return self.initialize_event_simulator(num_onus, traffic_scenario, channel_capacity_mbps)
     
-    def run_hybrid_simulation(self, duration_seconds=10.0, callback=None):
+    def run_hybrid_simulation(self, duration_seconds=10.0, callback=None, progress_interval=0.25):
         """Método de compatibilidad (usa run_event_simulation)"""
-        return self.run_event_simulation(duration_seconds, callback)
+        return self.run_event_simulation(duration_seconds, callback, progress_interval)
     
     def run_classic_simulation(self, timesteps=1000, callback=None):
         """Método de compatibilidad (usa run_cycle_simulation)"""
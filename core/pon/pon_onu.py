@@ -7,7 +7,8 @@ import numpy as np
 from typing import Dict, Optional, List, TYPE_CHECKING
 from .pon_types import Traffic_Probability
 from ..data.pon_request import Request
-from ..data.pon_buffer import Buffer
+from ..data.pon_buffer import IndexedBuffer
+from ..utilities.cycle_trace import CYCLE_TRACE
 from ..data.pon_queue import Queue
 
 # Importación diferida para evitar ciclos
@@ -84,7 +85,7 @@ class ONU:
         self.responses_sent = 0
         
         # Inicializar buffer de solicitudes
-        self.buffer = Buffer(buffer_size)
+        self.buffer = IndexedBuffer(buffer_size)
         
         # Inicializar con algunas solicitudes (después de stats)
         self.buffer.append(self._create_request())
@@ -145,7 +146,10 @@ class ONU:
             if not self.buffer.append(request):
                 # Buffer lleno - contar como paquete perdido
                 self.lost_packets_count += 1
-                print(f"ONU {self.id}: Packet lost at t={time:.3f}, buffer full ({len(self.buffer)}/{self.buffer.size})")
+                if CYCLE_TRACE.drops:
+                    CYCLE_TRACE.record('drops', self.polls_received, time, key=self.id,
+                                       v0=len(self.buffer), v1=self.buffer.size,
+                                       v2=self.lost_packets_count)
 
         # Retornar contenido del buffer
         if not self.buffer:
@@ -164,15 +168,8 @@ class ONU:
         Returns:
             True si la transmisión fue exitosa
         """
-        # Buscar solicitud en buffer
-        request_to_send = None
-        request_index = -1
-        
-        for i, req_in_buffer in enumerate(self.buffer):
-            if str(req_in_buffer.id) == str(request_id_to_transmit):
-                request_to_send = req_in_buffer
-                request_index = i
-                break
+        # Buscar solicitud en buffer (índice por ID)
+        request_to_send = self.buffer.get_request(request_id_to_transmit)
         
         if request_to_send is None:
             raise ValueError(
@@ -198,10 +195,7 @@ class ONU:
         Args:
             request_id_to_remove: ID de la solicitud a remover
         """
-        for i, req_in_buffer in enumerate(self.buffer):
-            if str(req_in_buffer.id) == str(request_id_to_remove):
-                self.buffer.pop(i)
-                break
+        self.buffer.pop_request(request_id_to_remove)
 
     def get_buffer_occupancy(self) -> float:
         """Obtener nivel de ocupación del buffer (0.0-1.0)"""
@@ -86,9 +86,16 @@ class OLT_SDN:
                 },
                 'jitter': [],  # Variación de latencia (desviación estándar de latencias)
                 'response_times': [],  # Tiempos de respuesta del controlador
+                **self._new_running_stats(),
             } for onu_id in self._onu_ids
         }
         
+        # Sumas sobre las ONUs con throughput para el índice de Jain en O(1):
+        # n, Σ x_i y Σ x_i² con x_i = throughput medio de la ONU i
+        self._fairness_n = 0
+        self._fairness_sum = 0.0
+        self._fairness_sum_sq = 0.0
+        
         # Métricas globales del controlador SDN
         self.sdn_controller_metrics = {
             'reconfigurations': 0,  # Número de reconfiguraciones de parámetros
@@ -120,6 +127,7 @@ class OLT_SDN:
             'target_latency': 0.001, # Latencia objetivo en segundos
             'adjustment_threshold': 0.1,  # Umbral para ajustes (10%)
             'fairness_target': 0.9,  # Objetivo de fairness (0-1)
+            'ewma_alpha': 0.05,      # Peso de la última muestra en las medias exponenciales
         }
         
         # Estadísticas del OLT_SDN
@@ -131,6 +139,69 @@ class OLT_SDN:
     def id(self) -> str:
         return self.__id
 
+    @staticmethod
+    def _new_running_stats() -> dict:
+        """Acumuladores por ONU: sumas y conteos (medias exactas) y medias exponenciales"""
+        return {
+            'latency_sum': 0.0,
+            'latency_sq_sum': 0.0,
+            'latency_count': 0,
+            'throughput_sum': 0.0,
+            'throughput_count': 0,
+            'latency_ewma': None,     # Ventana exponencial para el controlador adaptativo
+            'throughput_ewma': None,
+        }
+
+    def _record_latency(self, metrics: dict, latency: float):
+        """Registrar una latencia actualizando acumuladores en O(1)"""
+        metrics['latency'].append(latency)
+        metrics['latency_sum'] += latency
+        metrics['latency_sq_sum'] += latency * latency
+        metrics['latency_count'] += 1
+        alpha = self.sdn_parameters['ewma_alpha']
+        previous = metrics['latency_ewma']
+        metrics['latency_ewma'] = latency if previous is None else previous + alpha * (latency - previous)
+
+    def _record_throughput(self, metrics: dict, throughput: float):
+        """Registrar un throughput actualizando acumuladores y sumas de fairness en O(1)"""
+        old_mean = self._mean(metrics, 'throughput') if metrics['throughput_count'] else None
+        
+        metrics['throughput'].append(throughput)
+        metrics['throughput_sum'] += throughput
+        metrics['throughput_count'] += 1
+        alpha = self.sdn_parameters['ewma_alpha']
+        previous = metrics['throughput_ewma']
+        metrics['throughput_ewma'] = throughput if previous is None else previous + alpha * (throughput - previous)
+        
+        new_mean = self._mean(metrics, 'throughput')
+        if old_mean is None:
+            self._fairness_n += 1
+            old_mean = 0.0
+        self._fairness_sum += new_mean - old_mean
+        self._fairness_sum_sq += new_mean * new_mean - old_mean * old_mean
+
+    @staticmethod
+    def _mean(metrics: dict, name: str) -> float:
+        """Media acumulada de 'latency' o 'throughput' (0 si no hay muestras)"""
+        count = metrics[f'{name}_count']
+        return metrics[f'{name}_sum'] / count if count else 0.0
+
+    def get_mean_latency(self, onu_id: str) -> float:
+        """Latencia media de una ONU"""
+        return self._mean(self.sdn_metrics[onu_id], 'latency')
+
+    def get_mean_throughput(self, onu_id: str) -> float:
+        """Throughput medio de una ONU"""
+        return self._mean(self.sdn_metrics[onu_id], 'throughput')
+
+    def _current_fairness(self) -> Optional[float]:
+        """Índice de Jain sobre los throughputs medios por ONU (None sin datos)"""
+        if self._fairness_n == 0:
+            return None
+        if self._fairness_sum_sq <= 0:
+            return 0.0
+        return (self._fairness_sum * self._fairness_sum) / (self._fairness_n * self._fairness_sum_sq)
+
     @staticmethod
     def create_links(links_data: Dict[str, Dict]) -> Dict[str, Link]:
         """Crear enlaces del OLT_SDN según configuración"""
@@ -382,14 +453,14 @@ class OLT_SDN:
         # Calcular y actualizar latencia
         if was_transmitted and request.departure_time is not None:
             latency = request.departure_time - request.created_at
-            metrics['latency'].append(latency)
+            self._record_latency(metrics, latency)
             metrics['cumulative_waiting_time'] += latency
             
             # Calcular throughput (bytes/segundo)
             traffic_size = request.get_total_traffic()
             if latency > 0:
                 throughput = traffic_size / latency
-                metrics['throughput'].append(throughput)
+                self._record_throughput(metrics, throughput)
         
         # Actualizar contadores de grants
         metrics['grants_allocated'] += 1
@@ -407,18 +478,10 @@ class OLT_SDN:
         self._update_fairness_index()
         
     def _update_fairness_index(self):
-        """Calcular y actualizar el índice de fairness de Jain"""
-        throughputs = []
-        for onu_metrics in self.sdn_metrics.values():
-            if onu_metrics['throughput']:
-                avg_throughput = sum(onu_metrics['throughput']) / len(onu_metrics['throughput'])
-                throughputs.append(avg_throughput)
-        
-        if throughputs:
-            n = len(throughputs)
-            sum_x = sum(throughputs)
-            sum_x_square = sum(x * x for x in throughputs)
-            fairness = (sum_x * sum_x) / (n * sum_x_square) if sum_x_square > 0 else 0
+        """Calcular y actualizar el índice de fairness de Jain (O(1) con sumas acumuladas)"""
+        fairness = self._current_fairness()
+        
+        if fairness is not None:
             self.sdn_controller_metrics['fairness_history'].append(fairness)
             
             # Verificar si se necesita ajustar parámetros
@@ -430,17 +493,17 @@ class OLT_SDN:
         self.sdn_controller_metrics['reconfigurations'] += 1
         current_time = self.clock
         
-        # Analizar métricas para cada ONU
+        # Analizar métricas recientes (ventanas exponenciales) de cada ONU
         for onu_id, metrics in self.sdn_metrics.items():
-            avg_latency = sum(metrics['latency']) / len(metrics['latency']) if metrics['latency'] else 0
+            avg_latency = metrics['latency_ewma'] or 0
             
             # Detectar violaciones de QoS
             if avg_latency > self.sdn_parameters['target_latency']:
                 self.sdn_controller_metrics['qos_violations'] += 1
                 
             # Ajustar tamaños de grant basado en throughput y latencia
-            if metrics['throughput']:
-                avg_throughput = sum(metrics['throughput']) / len(metrics['throughput'])
+            if metrics['throughput_ewma'] is not None:
+                avg_throughput = metrics['throughput_ewma']
                 
                 # Ajustar tamaño máximo de grant
                 if avg_latency > self.sdn_parameters['target_latency']:
@@ -477,8 +540,7 @@ class OLT_SDN:
         # Actualizar utilización de ancho de banda
         total_throughput = 0
         for onu_id, metrics in self.sdn_metrics.items():
-            if metrics['throughput']:
-                total_throughput += sum(metrics['throughput']) / len(metrics['throughput'])
+            total_throughput += self._mean(metrics, 'throughput')
         
         bw_utilization = (total_throughput / (self.transmission_rate * 1e6)) * 100 if self.transmission_rate > 0 else 0
         self.sdn_controller_metrics['bandwidth_utilization_history'].append(bw_utilization)
@@ -493,7 +555,7 @@ class OLT_SDN:
         # Actualizar nivel de congestión por ONU
         for onu_id, metrics in self.sdn_metrics.items():
             # Calcular nivel de congestión basado en latencia y pérdidas
-            avg_latency = sum(metrics['latency']) / len(metrics['latency']) if metrics['latency'] else 0
+            avg_latency = self._mean(metrics, 'latency')
             loss_rate = metrics['losses'] / max(1, metrics['grants_allocated'])
             
             # Nivel de congestión combinado (0-1)
@@ -577,10 +639,10 @@ class OLT_SDN:
         for onu_id, metrics in self.sdn_metrics.items():
             # Calcular jitter (desviación estándar de latencias)
             avg_jitter = 0
-            if len(metrics['latency']) > 1:
-                mean_latency = sum(metrics['latency']) / len(metrics['latency'])
-                variance = sum((lat - mean_latency) ** 2 for lat in metrics['latency']) / len(metrics['latency'])
-                avg_jitter = variance ** 0.5
+            if metrics['latency_count'] > 1:
+                mean_latency = self._mean(metrics, 'latency')
+                variance = metrics['latency_sq_sum'] / metrics['latency_count'] - mean_latency * mean_latency
+                avg_jitter = max(variance, 0.0) ** 0.5
             
             # Calcular tiempo de respuesta promedio
             avg_response_time = (
@@ -589,16 +651,13 @@ class OLT_SDN:
             )
             
             dashboard['onu_metrics'][onu_id] = {
-                'avg_latency': sum(metrics['latency']) / len(metrics['latency']) if metrics['latency'] else 0,
+                'avg_latency': self._mean(metrics, 'latency'),
                 'avg_jitter': avg_jitter,
                 'packet_loss_rate': (
                     metrics['losses'] / metrics['grants_allocated'] * 100 
                     if metrics['grants_allocated'] > 0 else 0
                 ),
-                'avg_throughput': (
-                    sum(metrics['throughput']) / len(metrics['throughput']) 
-                    if metrics['throughput'] else 0
-                ),
+                'avg_throughput': self._mean(metrics, 'throughput'),
                 'grant_efficiency': (
                     metrics['grants_used'] / metrics['grants_allocated'] * 100
                     if metrics['grants_allocated'] > 0 else 0
@@ -633,8 +692,12 @@ class OLT_SDN:
                 'grants_used': 0,
                 'grants_allocated': 0,
                 'last_adjustment_time': 0.0,
-                'cumulative_waiting_time': 0.0
+                'cumulative_waiting_time': 0.0,
+                **self._new_running_stats()
             })
+        self._fairness_n = 0
+        self._fairness_sum = 0.0
+        self._fairness_sum_sq = 0.0
         
         # Reiniciar métricas del controlador
         self.sdn_controller_metrics.update({
@@ -668,14 +731,14 @@ class OLT_SDN:
             
             # Calcular y actualizar latencia
             latency = current_time - request.created_at
-            metrics['latency'].append(latency)
+            self._record_latency(metrics, latency)
             metrics['cumulative_waiting_time'] += latency
             
             # Calcular throughput (bytes/segundo)
             traffic_size = request.get_total_traffic()
             if latency > 0:
                 throughput = traffic_size / latency
-                metrics['throughput'].append(throughput)
+                self._record_throughput(metrics, throughput)
                 
             # Verificar violaciones de QoS
             if latency > self.sdn_parameters['target_latency']:
@@ -688,19 +751,9 @@ class OLT_SDN:
         
     def _calculate_fairness(self):
         """Calcular el índice de fairness de Jain"""
-        throughputs = []
-        for metrics in self.sdn_metrics.values():
-            if metrics['throughput']:
-                avg_throughput = sum(metrics['throughput']) / len(metrics['throughput'])
-                throughputs.append(avg_throughput)
-        
-        if throughputs:
-            n = len(throughputs)
-            sum_x = sum(throughputs)
-            sum_x_square = sum(x * x for x in throughputs)
-            
-            if sum_x_square > 0:
-                fairness = (sum_x * sum_x) / (n * sum_x_square)
+        if self._fairness_n:
+            if self._fairness_sum_sq > 0:
+                fairness = self._current_fairness()
                 self.sdn_controller_metrics['fairness_history'].append(fairness)
                 
                 # Ajustar parámetros si el fairness está por debajo del objetivo
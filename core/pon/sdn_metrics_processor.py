@@ -3,11 +3,42 @@ SDN Metrics Processor
 Procesa datos de simulación PON para generar métricas SDN avanzadas
 """
 
+import os
 import json
 import math
+import bisect
+from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
+from ..utilities.session_store import load_simulation_session, session_dir_from_data_file, close_session
+
+# Versión del cálculo de métricas: incrementar al cambiar cualquier _calculate_*
+# para que los sidecars guardados con la versión anterior se recalculen
+SDN_METRICS_VERSION = 1
+SDN_METRICS_SIDECAR = "sdn_metrics.json"
+
+# Clases de servicio (tcont_id) del transmission_log y su T-CONT estándar para SLA
+SERVICE_CLASSES = ['highest', 'high', 'medium', 'low', 'lowest']
+TCONT_MAPPING = {
+    'highest': 'T1',
+    'high': 'T2',
+    'medium': 'T3',
+    'low': 'T4',
+    'lowest': 'T4'
+}
+
+# Cambiar de ONU tras una racha de al menos 3 transmisiones cuenta como reconfiguración
+RECONFIGURATION_SEQUENCE_THRESHOLD = 3
+
+# Marcador de clave ausente (distingue 'onu_id' ausente de 'onu_id': None)
+_MISSING = object()
+
+
+def _json_default(value):
+    """Serializar escalares numpy (y cualquier otro objeto como texto)"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
 
 class SDNMetricsProcessor:
     """Procesador de métricas SDN a partir de datos de simulación"""
@@ -18,32 +49,115 @@ class SDNMetricsProcessor:
         
     def load_simulation_data(self, json_path: str) -> bool:
         """
-        Cargar datos de simulación desde archivo JSON (soporta .json y .json.gz)
+        Cargar datos de simulación (soporta formato columnar, .json y .json.gz)
 
         Args:
-            json_path: Ruta al archivo datos_simulacion.json o datos_simulacion.json.gz
+            json_path: Ruta al directorio de sesión, al manifest.json columnar,
+                       o al archivo datos_simulacion.json / datos_simulacion.json.gz
 
         Returns:
             True si se cargó exitosamente
         """
         try:
-            import gzip
-
-            # Detectar si es comprimido por extensión
-            if json_path.endswith('.gz'):
-                with gzip.open(json_path, 'rt', encoding='utf-8') as f:
-                    self.simulation_data = json.load(f)
-                print(f"✅ Datos de simulación cargados (comprimidos): {json_path}")
-            else:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    self.simulation_data = json.load(f)
-                print(f"✅ Datos de simulación cargados: {json_path}")
+            # Columnar: los arrays se leen con memory-map, sin parsear texto
+            self.simulation_data = load_simulation_session(json_path)
+            print(f"✅ Datos de simulación cargados: {json_path}")
 
             return True
         except Exception as e:
             print(f"❌ Error cargando datos de simulación: {e}")
             return False
     
+    def release_simulation_data(self):
+        """Soltar los memory-maps de los datos cargados (las métricas calculadas se conservan)"""
+        if self.simulation_data is not None:
+            close_session(self.simulation_data)
+
+    def set_simulation_data(self, simulation_data: Dict):
+        """Usar datos de simulación ya cargados en memoria"""
+        self.simulation_data = simulation_data
+        self.calculated_metrics = None
+
+    def save_metrics_sidecar(self, session_dir: str) -> bool:
+        """
+        Guardar las métricas calculadas como sidecar versionado de la sesión
+
+        Args:
+            session_dir: Directorio de la sesión
+
+        Returns:
+            True si se guardó exitosamente
+        """
+        if not self.calculated_metrics:
+            return False
+
+        try:
+            sidecar_path = os.path.join(session_dir, SDN_METRICS_SIDECAR)
+            temp_path = sidecar_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': SDN_METRICS_VERSION,
+                    'created_at': datetime.now().isoformat(),
+                    'metrics': self.calculated_metrics
+                }, f, default=_json_default)
+            os.replace(temp_path, sidecar_path)
+            return True
+        except Exception as e:
+            print(f"❌ Error guardando sidecar de métricas SDN: {e}")
+            return False
+
+    def load_metrics_sidecar(self, session_dir: str) -> Optional[Dict]:
+        """
+        Cargar métricas precalculadas de una sesión
+
+        Returns:
+            Métricas si el sidecar existe y su versión coincide, None en otro caso
+        """
+        sidecar_path = os.path.join(session_dir, SDN_METRICS_SIDECAR)
+        if not os.path.exists(sidecar_path):
+            return None
+
+        try:
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                sidecar = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Sidecar de métricas SDN ilegible: {e}")
+            return None
+
+        if sidecar.get('version') != SDN_METRICS_VERSION:
+            print(f"ℹ️ Sidecar de métricas SDN versión {sidecar.get('version')} != {SDN_METRICS_VERSION}, recalculando")
+            return None
+
+        self.calculated_metrics = sidecar.get('metrics')
+        return self.calculated_metrics
+
+    def load_or_calculate(self, data_path: str) -> Optional[Dict]:
+        """
+        Obtener métricas SDN de una sesión: sidecar si es válido, o cargar los
+        datos, recalcular y actualizar el sidecar
+
+        Args:
+            data_path: Ruta a los datos de la sesión (cualquier formato)
+
+        Returns:
+            Métricas SDN o None si no se pudieron obtener
+        """
+        session_dir = session_dir_from_data_file(data_path)
+
+        metrics = self.load_metrics_sidecar(session_dir)
+        if metrics is not None:
+            print(f"✅ Métricas SDN precalculadas cargadas: {SDN_METRICS_SIDECAR}")
+            return metrics
+
+        if not self.load_simulation_data(data_path):
+            return None
+
+        metrics = self.calculate_sdn_metrics()
+        self.release_simulation_data()
+        if metrics is not None:
+            self.save_metrics_sidecar(session_dir)
+        return metrics
+
     def calculate_sdn_metrics(self) -> Optional[Dict]:
         """
         Calcular todas las métricas SDN a partir de los datos de simulación
@@ -61,21 +175,27 @@ class SDNMetricsProcessor:
             olt_stats_parent = self.simulation_data.get('olt_stats', {})  # Nivel padre con average_utilization
             olt_stats = olt_stats_parent.get('olt_stats', {})  # Nivel hijo con stats
             transmission_log = olt_stats_parent.get('transmission_log', [])
+            delays = sim_summary.get('episode_metrics', {}).get('delays', [])
+            
+            # Un único recorrido de transmission_log y otro de delays producen
+            # todos los agregados intermedios
+            aggregates = self._aggregate_transmission_log(transmission_log)
+            aggregates.update(self._aggregate_delays(delays, aggregates))
             
             # Calcular métricas globales
-            global_metrics = self._calculate_global_metrics(sim_summary, olt_stats)
+            global_metrics = self._calculate_global_metrics(sim_summary, olt_stats, aggregates)
             
             # Calcular métricas del controlador (pasar nivel padre para average_utilization)
-            controller_metrics = self._calculate_controller_metrics(olt_stats, transmission_log, olt_stats_parent)
+            controller_metrics = self._calculate_controller_metrics(olt_stats, aggregates, olt_stats_parent)
             
             # Calcular métricas por ONU
-            onu_metrics = self._calculate_onu_metrics(transmission_log)
+            onu_metrics = self._calculate_onu_metrics(aggregates)
             
             # Calcular distribución por servicio
-            service_distribution = self._calculate_service_distribution(transmission_log)
+            service_distribution = self._calculate_service_distribution(aggregates)
             
             # Calcular cumplimiento SLA
-            sla_compliance = self._calculate_sla_compliance(transmission_log, onu_metrics)
+            sla_compliance = self._calculate_sla_compliance(aggregates)
             
             # Calcular mapa de salud de ONUs
             health_map = self._calculate_onu_health_map(onu_metrics)
@@ -98,11 +218,181 @@ class SDNMetricsProcessor:
             traceback.print_exc()
             return None
     
-    def _calculate_global_metrics(self, sim_summary: Dict, olt_stats: Dict) -> Dict:
+    def _aggregate_transmission_log(self, transmission_log) -> Dict:
+        """
+        Recorrer transmission_log una sola vez y acumular todos los agregados
+        que usan las métricas globales, del controlador, por ONU, por servicio,
+        fairness, reconfiguraciones y reasignaciones
+
+        El orden de acumulación es el mismo que el de los recorridos separados,
+        por lo que las sumas en punto flotante son idénticas.
+        """
+        total = len(transmission_log)
+        window_size = total // 10 if total >= 10 else 0
+
+        latency_sum = 0
+        latency_count = 0
+        total_data = 0
+        max_end_time = None
+        onu_ids = set()
+        onu_data = {}
+        service_data = {service_class: {'bandwidth': 0, 'packets': 0, 'latencies': []}
+                        for service_class in SERVICE_CLASSES}
+        onu_throughputs = {}
+        window_throughputs = [{} for _ in range(10)] if window_size else []
+
+        # Estado de reconfiguraciones (cambios de ONU y de tamaño de grant)
+        reconfigurations = 0
+        prev_onu_id = None
+        onu_sequence_length = 0
+        grant_size_changes = 0
+        prev_size = None
+
+        # Estado de reasignaciones por ONU
+        prev_grants = {}
+        reassignments = 0
+
+        for index, tx in enumerate(transmission_log):
+            raw_onu_id = tx.get('onu_id', _MISSING)
+            data_size = tx.get('data_size_mb', 0)
+            tcont_id = tx.get('tcont_id', 'unknown')
+            end_time = tx.get('end_time', 0)
+
+            # Métricas globales y del controlador
+            if 'latency' in tx:
+                latency_sum += tx['latency'] * 1000
+                latency_count += 1
+            total_data += data_size
+            if max_end_time is None or end_time > max_end_time:
+                max_end_time = end_time
+            if raw_onu_id is not _MISSING:
+                onu_ids.add(raw_onu_id)
+
+            # Métricas por ONU
+            onu_key = str(raw_onu_id if raw_onu_id is not _MISSING else 'unknown')
+            data = onu_data.get(onu_key)
+            if data is None:
+                data = onu_data[onu_key] = {
+                    'latencies': [],
+                    'data_transmitted': 0,
+                    'grants_allocated': 0,
+                    'total_duration': 0,
+                    'tcont_data': {}  # Datos por tipo de servicio
+                }
+            data['data_transmitted'] += data_size
+            data['grants_allocated'] += 1
+            data['total_duration'] += tx.get('duration', 0)
+            tcont_data = data['tcont_data'].get(tcont_id)
+            if tcont_data is None:
+                tcont_data = data['tcont_data'][tcont_id] = {'count': 0, 'data': 0}
+            tcont_data['count'] += 1
+            tcont_data['data'] += data_size
+
+            # Distribución por servicio
+            service = service_data.get(tcont_id)
+            if service is not None:
+                service['bandwidth'] += data_size
+                service['packets'] += 1
+
+            # Fairness global y por ventana temporal (clave sin convertir a str)
+            fairness_key = raw_onu_id if raw_onu_id is not _MISSING else 'unknown'
+            onu_throughputs[fairness_key] = onu_throughputs.get(fairness_key, 0) + data_size
+            if window_size:
+                window = window_throughputs[min(index // window_size, 9)]
+                window[fairness_key] = window.get(fairness_key, 0) + data_size
+
+            # Reconfiguraciones: rachas de la misma ONU
+            current_onu = raw_onu_id if raw_onu_id is not _MISSING else None
+            if prev_onu_id is None:
+                prev_onu_id = current_onu
+                onu_sequence_length = 1
+            elif current_onu == prev_onu_id:
+                onu_sequence_length += 1
+            else:
+                if onu_sequence_length >= RECONFIGURATION_SEQUENCE_THRESHOLD:
+                    reconfigurations += 1
+                prev_onu_id = current_onu
+                onu_sequence_length = 1
+
+            # Reconfiguraciones: cambio significativo de grant (>20%)
+            if prev_size is not None:
+                if abs(data_size - prev_size) / max(prev_size, 0.001) > 0.2:
+                    grant_size_changes += 1
+            prev_size = data_size
+
+            # Reasignaciones: cambio de grant por ONU (>15%)
+            if current_onu not in prev_grants:
+                prev_grants[current_onu] = data_size
+            else:
+                if abs(data_size - prev_grants[current_onu]) / max(prev_grants[current_onu], 0.001) > 0.15:
+                    reassignments += 1
+                prev_grants[current_onu] = data_size
+
+        return {
+            'count': total,
+            'latency_sum': latency_sum,
+            'latency_count': latency_count,
+            'total_data': total_data,
+            'max_end_time': max_end_time if max_end_time is not None else 1,
+            'num_onus': len(onu_ids),
+            'onu_data': onu_data,
+            'service_data': service_data,
+            'onu_throughputs': onu_throughputs,
+            'window_throughputs': window_throughputs,
+            'reconfigurations': reconfigurations + (grant_size_changes // 10) if total >= 2 else 0,
+            'reassignments': reassignments
+        }
+
+    def _aggregate_delays(self, delays, tx_aggregates: Dict) -> Dict:
+        """
+        Recorrer los delays una sola vez repartiéndolos por ONU, por servicio,
+        por ONU/T-CONT (SLA) y por servicio para violaciones QoS
+        """
+        onu_data = tx_aggregates['onu_data']
+        service_data = tx_aggregates['service_data']
+        sla_data = {}
+        missing_tcont_latencies = []  # Sin tcont_id: cuentan como 'medium' en QoS
+
+        for delay_entry in delays:
+            onu_key = str(delay_entry.get('onu_id', 'unknown'))
+            delay_value = delay_entry.get('delay', 0)
+            raw_tcont_id = delay_entry.get('tcont_id', _MISSING)
+            tcont_id = raw_tcont_id if raw_tcont_id is not _MISSING else 'unknown'
+
+            data = onu_data.get(onu_key)
+            if data is not None:
+                data['latencies'].append(delay_value)
+
+            service = service_data.get(tcont_id)
+            if service is not None:
+                service['latencies'].append(delay_value)
+            elif raw_tcont_id is _MISSING:
+                missing_tcont_latencies.append(delay_value)
+
+            tconts = sla_data.get(onu_key)
+            if tconts is None:
+                tconts = sla_data[onu_key] = {
+                    'T1': {'met': 0, 'violated': 0, 'latencies': []},
+                    'T2': {'met': 0, 'violated': 0, 'latencies': []},
+                    'T3': {'met': 0, 'violated': 0, 'latencies': []},
+                    'T4': {'met': 0, 'violated': 0, 'latencies': []},
+                }
+            tconts[TCONT_MAPPING.get(tcont_id, 'T4')]['latencies'].append(delay_value)
+
+        # Latencias por servicio para QoS (el orden no afecta a umbrales ni conteos)
+        qos_latencies = {service_class: service_data[service_class]['latencies']
+                         for service_class in SERVICE_CLASSES}
+        if missing_tcont_latencies:
+            qos_latencies['medium'] = qos_latencies['medium'] + missing_tcont_latencies
+
+        return {
+            'sla_data': sla_data,
+            'qos_latencies': qos_latencies
+        }
+
+    def _calculate_global_metrics(self, sim_summary: Dict, olt_stats: Dict, aggregates: Dict) -> Dict:
         """Calcular métricas globales del sistema"""
         sim_stats = sim_summary.get('simulation_stats', {})
-        perf_metrics = sim_summary.get('performance_metrics', {})
-        transmission_log = self.simulation_data.get('olt_stats', {}).get('transmission_log', [])
         
         # Calcular grants utilizados vs asignados
         grants_assigned = olt_stats.get('grants_assigned', 0)
@@ -112,7 +402,7 @@ class SDNMetricsProcessor:
         grant_utilization = (successful_tx / grants_assigned * 100) if grants_assigned > 0 else 0
         
         # Calcular fairness index real usando throughputs por ONU
-        fairness, fairness_history = self._calculate_real_fairness_index(transmission_log)
+        fairness, fairness_history = self._calculate_real_fairness_index(aggregates)
         
         # Eficiencia espectral (bits/Hz)
         total_bits = olt_stats.get('total_grants_bytes', 0) * 8
@@ -121,17 +411,17 @@ class SDNMetricsProcessor:
         spectral_efficiency = (total_bits / (channel_capacity * 1e6 * simulation_time)) if simulation_time > 0 else 0
         
         # Calcular reconfiguraciones (cambios significativos en asignación de grants)
-        reconfigurations = self._calculate_reconfigurations(transmission_log)
+        reconfigurations = aggregates['reconfigurations']
         
         # Calcular violaciones QoS (latencias > 10ms)
-        qos_violations = self._calculate_qos_violations(transmission_log)
+        qos_violations = self._calculate_qos_violations(aggregates)
         
         # Calcular latencia promedio
-        latencies = [tx.get('latency', 0) * 1000 for tx in transmission_log if 'latency' in tx]
-        avg_latency = sum(latencies) / len(latencies) if latencies else 0
+        latency_count = aggregates['latency_count']
+        avg_latency = aggregates['latency_sum'] / latency_count if latency_count else 0
         
         # Calcular throughput total
-        total_data = sum(tx.get('data_size_mb', 0) for tx in transmission_log)
+        total_data = aggregates['total_data']
         total_throughput = (total_data * 8 / simulation_time) if simulation_time > 0 else 0
         
         # Calcular packet loss
@@ -149,15 +439,14 @@ class SDNMetricsProcessor:
             'qos_violations': qos_violations,
         }
     
-    def _calculate_controller_metrics(self, olt_stats: Dict, transmission_log: List, olt_stats_parent: Dict = None) -> Dict:
+    def _calculate_controller_metrics(self, olt_stats: Dict, aggregates: Dict, olt_stats_parent: Dict = None) -> Dict:
         """Calcular métricas del controlador SDN"""
         
         total_decisions = olt_stats.get('grants_assigned', 0)
-        total_cycles = olt_stats.get('cycles_executed', 0)
         
         # Tiempo de respuesta del controlador (basado en número de ONUs y complejidad)
-        num_onus = len(set(tx.get('onu_id') for tx in transmission_log if 'onu_id' in tx))
-        num_transmissions = len(transmission_log)
+        num_onus = aggregates['num_onus']
+        num_transmissions = aggregates['count']
         
         # Tiempo base + overhead por ONU + overhead por decisión
         base_time = 0.0005  # 0.5ms base
@@ -169,7 +458,7 @@ class SDNMetricsProcessor:
         avg_decision_latency = avg_controller_response * 0.8
         
         # Tasa de reasignación: calcular cambios en patrones de grants
-        reassignment_rate = self._calculate_reassignment_rate(transmission_log, total_decisions)
+        reassignment_rate = self._calculate_reassignment_rate(aggregates, total_decisions)
         
         # Utilización de ancho de banda - leer del nivel padre si está disponible
         channel_utilization = 0
@@ -177,10 +466,10 @@ class SDNMetricsProcessor:
             channel_utilization = olt_stats_parent.get('average_utilization', 0)
         
         # Si no hay utilización en olt_stats_parent, calcularla manualmente
-        if channel_utilization == 0 and transmission_log:
+        if channel_utilization == 0 and num_transmissions:
             # Calcular utilización basada en datos transmitidos vs capacidad
-            total_data = sum(tx.get('data_size_mb', 0) for tx in transmission_log)
-            total_time = max(tx.get('end_time', 0) for tx in transmission_log) if transmission_log else 1
+            total_data = aggregates['total_data']
+            total_time = aggregates['max_end_time']
             
             # Capacidad del canal PON (asumiendo 1 Gbps = 125 MB/s)
             channel_capacity_mbps = 125  # MB/s
@@ -198,55 +487,10 @@ class SDNMetricsProcessor:
             'avg_bandwidth_utilization': channel_utilization,
         }
     
-    def _calculate_onu_metrics(self, transmission_log: List) -> Dict:
-        """Calcular métricas por ONU usando transmission_log y delays"""
-        # Obtener también los delays para calcular latencias
-        delays = self.simulation_data.get('simulation_summary', {}).get('episode_metrics', {}).get('delays', [])
-        
-        onu_data = {}
-        
-        # Procesar transmission_log para throughput y grants
-        for transmission in transmission_log:
-            onu_id = str(transmission.get('onu_id', 'unknown'))
-            
-            if onu_id not in onu_data:
-                onu_data[onu_id] = {
-                    'latencies': [],
-                    'data_transmitted': 0,
-                    'grants_allocated': 0,
-                    'total_duration': 0,
-                    'tcont_data': {}  # Datos por tipo de servicio
-                }
-            
-            # Datos de transmisión
-            data_size_mb = transmission.get('data_size_mb', 0)
-            duration = transmission.get('duration', 0)
-            tcont_id = transmission.get('tcont_id', 'unknown')
-            
-            onu_data[onu_id]['data_transmitted'] += data_size_mb
-            onu_data[onu_id]['grants_allocated'] += 1
-            onu_data[onu_id]['total_duration'] += duration
-            
-            # Agrupar por T-CONT
-            if tcont_id not in onu_data[onu_id]['tcont_data']:
-                onu_data[onu_id]['tcont_data'][tcont_id] = {
-                    'count': 0,
-                    'data': 0
-                }
-            onu_data[onu_id]['tcont_data'][tcont_id]['count'] += 1
-            onu_data[onu_id]['tcont_data'][tcont_id]['data'] += data_size_mb
-        
-        # Procesar delays para obtener latencias reales
-        for delay_entry in delays:
-            onu_id = str(delay_entry.get('onu_id', 'unknown'))
-            delay_value = delay_entry.get('delay', 0)
-            
-            if onu_id in onu_data:
-                onu_data[onu_id]['latencies'].append(delay_value)
-        
-        # Calcular métricas agregadas por ONU
+    def _calculate_onu_metrics(self, aggregates: Dict) -> Dict:
+        """Calcular métricas por ONU a partir de los agregados de transmission_log y delays"""
         onu_metrics = {}
-        for onu_id, data in onu_data.items():
+        for onu_id, data in aggregates['onu_data'].items():
             latencies = data['latencies']
             
             # Latencia promedio (en segundos, se convertirá a ms en dashboard)
@@ -308,42 +552,10 @@ class SDNMetricsProcessor:
         
         return onu_metrics
     
-    def _calculate_service_distribution(self, transmission_log: List) -> Dict:
+    def _calculate_service_distribution(self, aggregates: Dict) -> Dict:
         """Calcular distribución de ancho de banda por clase de servicio con conteo de paquetes y latencias"""
-        
-        # Obtener delays para calcular latencias por servicio
-        delays = self.simulation_data.get('simulation_summary', {}).get('episode_metrics', {}).get('delays', [])
-        
-        # Inicializar estructura con datos detallados
-        service_data = {
-            'highest': {'bandwidth': 0, 'packets': 0, 'latencies': []},
-            'high': {'bandwidth': 0, 'packets': 0, 'latencies': []},
-            'medium': {'bandwidth': 0, 'packets': 0, 'latencies': []},
-            'low': {'bandwidth': 0, 'packets': 0, 'latencies': []},
-            'lowest': {'bandwidth': 0, 'packets': 0, 'latencies': []}
-        }
-        
-        # Procesar transmission_log para ancho de banda y conteo de paquetes
-        for transmission in transmission_log:
-            tcont_id = transmission.get('tcont_id', 'unknown')
-            data_size = transmission.get('data_size_mb', 0)
-            
-            # Usar tcont_id real del JSON
-            if tcont_id in service_data:
-                service_data[tcont_id]['bandwidth'] += data_size
-                service_data[tcont_id]['packets'] += 1
-        
-        # Procesar delays para obtener latencias por servicio
-        for delay_entry in delays:
-            tcont_id = delay_entry.get('tcont_id', 'unknown')
-            delay_value = delay_entry.get('delay', 0)
-            
-            if tcont_id in service_data:
-                service_data[tcont_id]['latencies'].append(delay_value)
-        
-        # Calcular métricas agregadas por servicio
         service_distribution = {}
-        for service_class, data in service_data.items():
+        for service_class, data in aggregates['service_data'].items():
             avg_latency = sum(data['latencies']) / len(data['latencies']) if data['latencies'] else 0
             
             service_distribution[service_class] = {
@@ -354,48 +566,13 @@ class SDNMetricsProcessor:
         
         return service_distribution
     
-    def _calculate_sla_compliance(self, transmission_log: List, onu_metrics: Dict) -> Dict:
+    def _calculate_sla_compliance(self, aggregates: Dict) -> Dict:
         """Calcular cumplimiento de SLA por T-CONT con conteo de paquetes por ONU y servicio
         Usa percentiles realistas basados en la distribución de delays (percentil 85 como umbral)
         """
+        sla_data = aggregates['sla_data']
         
-        # Obtener delays del JSON que tienen tcont_id
-        delays = self.simulation_data.get('simulation_summary', {}).get('episode_metrics', {}).get('delays', [])
-        
-        # Mapeo de tcont_id del JSON a T-CONT estándar
-        tcont_mapping = {
-            'highest': 'T1',
-            'high': 'T2',
-            'medium': 'T3',
-            'low': 'T4',
-            'lowest': 'T4'
-        }
-        
-        # Estructura para almacenar datos por ONU y T-CONT
-        sla_data = {}
-        
-        # Primer paso: recolectar todos los delays por ONU y T-CONT
-        for delay_entry in delays:
-            onu_id = str(delay_entry.get('onu_id', 'unknown'))
-            delay_value = delay_entry.get('delay', 0)
-            tcont_id = delay_entry.get('tcont_id', 'unknown')
-            
-            # Mapear a T-CONT estándar
-            tcont = tcont_mapping.get(tcont_id, 'T4')
-            
-            # Inicializar estructura si no existe
-            if onu_id not in sla_data:
-                sla_data[onu_id] = {
-                    'T1': {'met': 0, 'violated': 0, 'latencies': []},
-                    'T2': {'met': 0, 'violated': 0, 'latencies': []},
-                    'T3': {'met': 0, 'violated': 0, 'latencies': []},
-                    'T4': {'met': 0, 'violated': 0, 'latencies': []},
-                }
-            
-            # Guardar latencia
-            sla_data[onu_id][tcont]['latencies'].append(delay_value)
-        
-        # Segundo paso: calcular umbrales basados en percentil 85 por cada combinación ONU-TCONT
+        # Calcular umbrales basados en percentil 85 por cada combinación ONU-TCONT
         for onu_id, tconts in sla_data.items():
             for tcont, data in tconts.items():
                 if not data['latencies']:
@@ -408,12 +585,10 @@ class SDNMetricsProcessor:
                 p85_index = int(len(sorted_latencies) * 0.85)
                 threshold = sorted_latencies[p85_index] if p85_index < len(sorted_latencies) else sorted_latencies[-1]
                 
-                # Ahora clasificar cada delay como cumplido o violado
-                for latency in data['latencies']:
-                    if latency <= threshold:
-                        data['met'] += 1
-                    else:
-                        data['violated'] += 1
+                # Clasificar cada delay como cumplido o violado (sobre la lista ordenada)
+                met = bisect.bisect_right(sorted_latencies, threshold)
+                data['met'] += met
+                data['violated'] += len(sorted_latencies) - met
                 
                 # Guardar el umbral calculado
                 data['threshold'] = threshold
@@ -439,28 +614,18 @@ class SDNMetricsProcessor:
         
         return sla_compliance
     
-    def _calculate_real_fairness_index(self, transmission_log: List) -> tuple:
+    def _calculate_real_fairness_index(self, aggregates: Dict) -> tuple:
         """
         Calcular índice de fairness de Jain real basado en throughputs por ONU
         
         Returns:
             (fairness_index, fairness_history)
         """
-        if not transmission_log:
+        if not aggregates['count']:
             return 0.0, []
         
-        # Agrupar transmisiones por ONU
-        onu_throughputs = {}
-        for tx in transmission_log:
-            onu_id = tx.get('onu_id', 'unknown')
-            data_size = tx.get('data_size_mb', 0)
-            
-            if onu_id not in onu_throughputs:
-                onu_throughputs[onu_id] = 0
-            onu_throughputs[onu_id] += data_size
-        
         # Calcular índice de Jain: (Σx_i)² / (n * Σx_i²)
-        throughputs = list(onu_throughputs.values())
+        throughputs = list(aggregates['onu_throughputs'].values())
         n = len(throughputs)
         
         if n == 0 or sum(throughputs) == 0:
@@ -471,35 +636,18 @@ class SDNMetricsProcessor:
         
         fairness_index = (sum_throughput ** 2) / (n * sum_squared) if sum_squared > 0 else 0
         
-        # Generar histórico de fairness (simulado por ventanas temporales)
-        fairness_history = self._generate_fairness_history(transmission_log, onu_throughputs)
+        # Generar histórico de fairness (por ventanas temporales)
+        fairness_history = self._generate_fairness_history(aggregates)
         
         return round(fairness_index, 3), fairness_history
     
-    def _generate_fairness_history(self, transmission_log: List, onu_throughputs: Dict) -> List:
-        """Generar histórico de fairness dividiendo en ventanas temporales"""
-        if not transmission_log or len(transmission_log) < 10:
+    def _generate_fairness_history(self, aggregates: Dict) -> List:
+        """Generar histórico de fairness a partir de los throughputs por ventana temporal"""
+        if aggregates['count'] < 10:
             return [0.85] * 10  # Valor por defecto
         
-        # Dividir transmisiones en 10 ventanas
-        window_size = len(transmission_log) // 10
         fairness_values = []
-        
-        for i in range(10):
-            start_idx = i * window_size
-            end_idx = start_idx + window_size if i < 9 else len(transmission_log)
-            window_txs = transmission_log[start_idx:end_idx]
-            
-            # Calcular throughput por ONU en esta ventana
-            window_throughputs = {}
-            for tx in window_txs:
-                onu_id = tx.get('onu_id', 'unknown')
-                data_size = tx.get('data_size_mb', 0)
-                
-                if onu_id not in window_throughputs:
-                    window_throughputs[onu_id] = 0
-                window_throughputs[onu_id] += data_size
-            
+        for window_throughputs in aggregates['window_throughputs']:
             # Calcular Jain para esta ventana
             throughputs = list(window_throughputs.values())
             n = len(throughputs)
@@ -514,83 +662,16 @@ class SDNMetricsProcessor:
         
         return fairness_values
     
-    def _calculate_reconfigurations(self, transmission_log: List) -> int:
-        """
-        Calcular número de reconfiguraciones (cambios significativos en asignación)
-        """
-        if not transmission_log or len(transmission_log) < 2:
-            return 0
-        
-        reconfigurations = 0
-        prev_onu_id = None
-        onu_sequence_length = 0
-        threshold = 3  # Cambiar de ONU al menos 3 veces seguidas cuenta como reconfiguración
-        
-        for tx in transmission_log:
-            current_onu = tx.get('onu_id')
-            
-            if prev_onu_id is None:
-                prev_onu_id = current_onu
-                onu_sequence_length = 1
-            elif current_onu == prev_onu_id:
-                onu_sequence_length += 1
-            else:
-                # Cambio de ONU
-                if onu_sequence_length >= threshold:
-                    reconfigurations += 1
-                prev_onu_id = current_onu
-                onu_sequence_length = 1
-        
-        # También contar basado en cambios en tamaño de grant
-        grant_size_changes = 0
-        prev_size = None
-        
-        for tx in transmission_log:
-            current_size = tx.get('data_size_mb', 0)
-            
-            if prev_size is not None:
-                # Cambio significativo (>20%)
-                if abs(current_size - prev_size) / max(prev_size, 0.001) > 0.2:
-                    grant_size_changes += 1
-            
-            prev_size = current_size
-        
-        # Total de reconfiguraciones
-        total_reconfigs = reconfigurations + (grant_size_changes // 10)
-        
-        return total_reconfigs
-    
-    def _calculate_qos_violations(self, transmission_log: List) -> int:
+    def _calculate_qos_violations(self, aggregates: Dict) -> int:
         """
         Calcular violaciones de QoS (latencias que superan umbrales específicos por T-CONT)
         Usa percentiles realistas basados en la distribución de delays
         """
-        # Obtener delays reales del JSON
-        delays = self.simulation_data.get('simulation_summary', {}).get('episode_metrics', {}).get('delays', [])
-        
-        if not delays:
-            return 0
-        
-        # Agrupar delays por tcont_id
-        delays_by_tcont = {
-            'highest': [],
-            'high': [],
-            'medium': [],
-            'low': [],
-            'lowest': []
-        }
-        
-        for delay_entry in delays:
-            tcont_id = delay_entry.get('tcont_id', 'medium')
-            delay_value = delay_entry.get('delay', 0)
-            if tcont_id in delays_by_tcont:
-                delays_by_tcont[tcont_id].append(delay_value)
-        
         violations = 0
         
         # Para cada servicio, considerar como violación el percentil 90
         # (el 10% de los peores delays se consideran violaciones)
-        for tcont_id, tcont_delays in delays_by_tcont.items():
+        for tcont_id, tcont_delays in aggregates['qos_latencies'].items():
             if not tcont_delays:
                 continue
             
@@ -602,39 +683,18 @@ class SDNMetricsProcessor:
             threshold = sorted_delays[p90_index] if p90_index < len(sorted_delays) else sorted_delays[-1]
             
             # Contar cuántos superan el percentil 90
-            violations_for_tcont = sum(1 for d in tcont_delays if d > threshold)
-            violations += violations_for_tcont
+            violations += len(sorted_delays) - bisect.bisect_right(sorted_delays, threshold)
         
         return violations
     
-    def _calculate_reassignment_rate(self, transmission_log: List, total_decisions: int) -> int:
+    def _calculate_reassignment_rate(self, aggregates: Dict, total_decisions: int) -> int:
         """
         Calcular tasa de reasignación (cuántas veces se reasignan grants)
         """
-        if not transmission_log or total_decisions == 0:
+        if not aggregates['count'] or total_decisions == 0:
             return 0
         
-        # Contar cambios en patrones de asignación
-        onu_grant_changes = {}
-        prev_grants = {}
-        
-        for tx in transmission_log:
-            onu_id = tx.get('onu_id')
-            grant_size = tx.get('data_size_mb', 0)
-            
-            if onu_id not in onu_grant_changes:
-                onu_grant_changes[onu_id] = 0
-                prev_grants[onu_id] = grant_size
-            else:
-                # Si el grant cambió significativamente
-                if abs(grant_size - prev_grants[onu_id]) / max(prev_grants[onu_id], 0.001) > 0.15:
-                    onu_grant_changes[onu_id] += 1
-                prev_grants[onu_id] = grant_size
-        
-        # Suma total de reasignaciones
-        total_reassignments = sum(onu_grant_changes.values())
-        
-        return total_reassignments
+        return aggregates['reassignments']
     
     def _calculate_onu_health_map(self, onu_metrics: Dict) -> Dict:
         """
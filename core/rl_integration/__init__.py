@@ -1,16 +1,35 @@
 """
 RL Integration Module
 Módulo para integrar el aprendizaje reforzado de netPONpy con PonLab
+
+Las clases principales se importan bajo demanda: rl_adapter arrastra
+gymnasium, stable-baselines3 y torch, y submódulos ligeros como
+transition_recorder no deben pagar ese coste al importarse.
 """
 
-from .rl_adapter import RLAdapter
-from .environment_bridge import EnvironmentBridge
-from .training_manager import TrainingManager
-from .simulation_manager import SimulationManager
+import importlib
+
+# Nombre exportado -> submódulo que lo define
+_LAZY_EXPORTS = {
+    'RLAdapter': '.rl_adapter',
+    'EnvironmentBridge': '.environment_bridge',
+    'TrainingManager': '.training_manager',
+    'SimulationManager': '.simulation_manager',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'RLAdapter',
     'EnvironmentBridge',
     'TrainingManager',
     'SimulationManager'
-]
\ No newline at end of file
+]
@@ -47,6 +47,9 @@ class RealTimeDataCollector(QObject):
         self.collection_timer.timeout.connect(self._collect_data_point)
         self.collection_interval = 100  # ms
 
+        # Cursor de PONOrchestrator.get_metrics_since() (solo muestras nuevas)
+        self._metrics_cursor = None
+
         # Estado de simulación
         self.current_episode = 0
         self.current_step = 0
@@ -86,6 +89,7 @@ class RealTimeDataCollector(QObject):
             self.is_collecting = True
             self.start_time = time.time()
             self.current_step = 0
+            self._metrics_cursor = None
 
             # Limpiar historial anterior
             for key in self.history:
@@ -117,12 +121,17 @@ class RealTimeDataCollector(QObject):
 
             # Capturar datos del simulador
             buffer_levels = self.simulator.get_buffer_levels()
-            delays = self.simulator.get_delays()
-            throughputs = self.simulator.get_throughputs()
+            if hasattr(self.simulator, 'get_metrics_since'):
+                self._metrics_cursor, samples = self.simulator.get_metrics_since(self._metrics_cursor)
+                delays = samples['delays']
+                throughputs = samples['throughputs']
+            else:
+                delays = self.simulator.get_delays()
+                throughputs = self.simulator.get_throughputs()
             allocation_prob = self.simulator.get_allocation_probability()
 
-            # Procesar delays - obtener promedio por ONU
-            delay_averages = [0.0] * self.simulator.num_onus
+            # Procesar delays - último valor por ONU (se conserva si no hay muestras nuevas)
+            delay_averages = self._last_values('delays')
             if delays:
                 for delay_data in delays:
                     onu_id = delay_data.get('onu_id', '0')
@@ -133,8 +142,8 @@ class RealTimeDataCollector(QObject):
                     except (ValueError, TypeError):
                         continue
 
-            # Procesar throughputs - obtener promedio por ONU
-            throughput_averages = [0.0] * self.simulator.num_onus
+            # Procesar throughputs - último valor por ONU
+            throughput_averages = self._last_values('throughputs')
             if throughputs:
                 for throughput_data in throughputs:
                     onu_id = throughput_data.get('onu_id', '0')
@@ -174,6 +183,13 @@ class RealTimeDataCollector(QObject):
         except Exception as e:
             print(f"[ERROR] Error capturando punto de datos: {e}")
 
+    def _last_values(self, key: str) -> List[float]:
+        """Últimos valores por ONU guardados en el historial (ceros si no hay)"""
+        num_onus = self.simulator.num_onus
+        if self.history[key] and len(self.history[key][-1]) == num_onus:
+            return list(self.history[key][-1])
+        return [0.0] * num_onus
+
     def update_rl_metrics(self, reward: float, action: Any, episode: int = None):
         """
         Actualizar métricas RL desde el training loop
@@ -0,0 +1,218 @@
+"""
+Parallel Validation
+Evaluación de políticas RL en paralelo: cada episodio se ejecuta en un proceso
+con su propio simulador y semilla, y los resultados se transmiten por episodio
+"""
+
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Valores críticos t de Student (dos colas, 95%) para pocos episodios
+_T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 15: 2.131, 20: 2.086, 30: 2.042
+}
+
+# Métricas agregadas con media e intervalo de confianza
+VALIDATION_METRICS = ['total_reward', 'mean_delay', 'fairness', 'throughput_mbps', 'drops']
+
+# Intervalo (s) con el que el hilo comprueba si se pidió detener la validación
+_STOP_POLL_INTERVAL = 0.2
+
+# Modelo cargado en cada proceso trabajador (se reutiliza entre episodios)
+_worker_model_cache: Dict[str, Any] = {}
+
+
+def _load_worker_model(model_path: str, algorithm: str):
+    """Cargar (una vez por proceso) el modelo stable-baselines3 a evaluar"""
+    key = f"{algorithm}:{model_path}"
+    if key not in _worker_model_cache:
+        import stable_baselines3
+        algorithm_class = getattr(stable_baselines3, algorithm)
+        _worker_model_cache[key] = algorithm_class.load(model_path, device='cpu')
+    return _worker_model_cache[key]
+
+
+def _jain_fairness(values: List[float]) -> float:
+    """Índice de fairness de Jain"""
+    values = np.asarray(values, dtype=float)
+    denominator = len(values) * float((values ** 2).sum())
+    return float(values.sum() ** 2 / denominator) if denominator > 0 else 1.0
+
+
+def evaluate_episode(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Evaluar un episodio en un proceso trabajador
+
+    Args:
+        task: Dict con model_path, algorithm, env_params, seed y episode
+
+    Returns:
+        Dict con recompensa total, delay medio, fairness, throughput y drops
+    """
+    import random
+    from .real_pon_env import RealPonEnv
+
+    seed = task['seed']
+    random.seed(seed)
+    np.random.seed(seed)
+
+    model = _load_worker_model(task['model_path'], task['algorithm'])
+    env = RealPonEnv(**task['env_params'])
+
+    observation, _ = env.reset(seed=seed)
+    total_reward = 0.0
+    delay_sum = 0.0
+    delay_count = 0
+    bytes_transmitted = 0
+    drops = 0
+    steps = 0
+    done = False
+
+    while not done:
+        action, _ = model.predict(observation, deterministic=True)
+        observation, reward, terminated, truncated, info = env.step(action)
+        total_reward += float(reward)
+        delay_sum += info['delay_sum']
+        delay_count += info['delay_count']
+        bytes_transmitted += info['bytes_transmitted']
+        drops += info['drops']
+        steps += 1
+        done = terminated or truncated
+
+    onu_bytes = [onu.stats['bytes_transmitted'] for _, onu in sorted(env.sim.onus.items())]
+    elapsed = steps * env.step_duration
+    env.close()
+
+    return {
+        'episode': task['episode'],
+        'seed': seed,
+        'steps': steps,
+        'total_reward': total_reward,
+        'mean_delay': delay_sum / delay_count if delay_count > 0 else 0.0,
+        'fairness': _jain_fairness(onu_bytes),
+        'throughput_mbps': (bytes_transmitted * 8 / 1e6) / elapsed if elapsed > 0 else 0.0,
+        'drops': drops
+    }
+
+
+def _t_critical(degrees_of_freedom: int) -> float:
+    """Valor t para IC 95% (aproximación normal para muestras grandes)"""
+    if degrees_of_freedom > 30:
+        return 1.96
+    return _T_CRITICAL_95[max(df for df in _T_CRITICAL_95 if df <= degrees_of_freedom)]
+
+
+def aggregate_episode_results(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Calcular media, desviación e intervalo de confianza del 95% por métrica
+
+    Args:
+        results: Resultados por episodio de evaluate_episode()
+
+    Returns:
+        {metrica: {mean, std, ci_low, ci_high, n}}
+    """
+    summary = {}
+    n = len(results)
+    if n == 0:
+        return summary
+
+    for metric in VALIDATION_METRICS:
+        values = np.asarray([r[metric] for r in results], dtype=float)
+        mean = float(values.mean())
+        std = float(values.std(ddof=1)) if n > 1 else 0.0
+        half_width = _t_critical(n - 1) * std / math.sqrt(n) if n > 1 else 0.0
+        summary[metric] = {
+            'mean': mean,
+            'std': std,
+            'ci_low': mean - half_width,
+            'ci_high': mean + half_width,
+            'n': n
+        }
+    return summary
+
+
+class ParallelValidationThread(QThread):
+    """Hilo que reparte episodios de validación en un pool de procesos"""
+
+    episode_completed = pyqtSignal(dict)       # Resultado de un episodio
+    validation_completed = pyqtSignal(dict)    # Resumen agregado
+    validation_cancelled = pyqtSignal(dict)    # Resultados parciales tras stop()
+    validation_error = pyqtSignal(str)
+
+    def __init__(self, model_path: str, algorithm: str, env_params: Dict[str, Any],
+                 n_eval_episodes: int = 10, base_seed: int = 0,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            model_path: Modelo stable-baselines3 guardado (.zip nativo de SB3)
+            algorithm: Clase del algoritmo (PPO, A2C, SAC, DQN)
+            env_params: Parámetros para RealPonEnv
+            n_eval_episodes: Episodios a evaluar
+            base_seed: Semilla del primer episodio (los demás usan base_seed + i)
+            max_workers: Procesos del pool (None = número de CPUs)
+        """
+        super().__init__()
+        self.model_path = model_path
+        self.algorithm = algorithm
+        self.env_params = env_params
+        self.n_eval_episodes = n_eval_episodes
+        self.base_seed = base_seed
+        self.max_workers = max_workers or min(n_eval_episodes, multiprocessing.cpu_count())
+        self.results: List[Dict[str, Any]] = []
+        self._stop_requested = False
+
+    def stop(self):
+        """Cancelar episodios pendientes (run() termina sin esperar a los que están en curso)"""
+        self._stop_requested = True
+
+    def run(self):
+        tasks = [
+            {
+                'model_path': self.model_path,
+                'algorithm': self.algorithm,
+                'env_params': self.env_params,
+                'seed': self.base_seed + episode,
+                'episode': episode
+            }
+            for episode in range(self.n_eval_episodes)
+        ]
+
+        try:
+            # 'spawn' evita heredar el estado de Qt del proceso principal
+            context = multiprocessing.get_context('spawn')
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            try:
+                pending = {executor.submit(evaluate_episode, task) for task in tasks}
+                while pending and not self._stop_requested:
+                    done, pending = wait(pending, timeout=_STOP_POLL_INTERVAL,
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        self.results.append(result)
+                        result['completed'] = len(self.results)
+                        result['total'] = self.n_eval_episodes
+                        self.episode_completed.emit(result)
+            finally:
+                # Sin esperar: al detener no se bloquea hasta que acaben los episodios en curso
+                executor.shutdown(wait=False, cancel_futures=True)
+
+            self.results.sort(key=lambda r: r['episode'])
+            results = {
+                'episodes': self.results,
+                'summary': aggregate_episode_results(self.results),
+                'n_eval_episodes': len(self.results)
+            }
+            if self._stop_requested:
+                self.validation_cancelled.emit(results)
+            else:
+                self.validation_completed.emit(results)
+
+        except Exception as e:
+            self.validation_error.emit(f"Error en validación paralela: {str(e)}")
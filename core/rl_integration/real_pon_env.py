@@ -1,6 +1,7 @@
 """
 Real PON Environment for Reinforcement Learning
 """
+import time
 import numpy as np
 from typing import Dict, Any, Tuple, Optional
 
@@ -66,6 +67,16 @@ class RealPonEnv(gym.Env):
         self.current_step = 0
         self.step_duration = 0.001  # Each step advances the simulation by 1ms
 
+        # --- Performance telemetry (cumulative wall-clock seconds) ---
+        self.perf_stats = {
+            'steps': 0,
+            'events': 0,
+            'step_time_s': 0.0,
+            'simulation_time_s': 0.0,
+            'observation_time_s': 0.0,
+            'reward_time_s': 0.0
+        }
+
         # --- Gym Interface ---
         obs_size = self.num_onus * 3 + 1
         self.observation_space = spaces.Box(low=0.0, high=1.0, shape=(obs_size,), dtype=np.float32)
@@ -94,11 +105,7 @@ class RealPonEnv(gym.Env):
             max_bytes = sum(q.max_bytes for q in onu.queues.values())
             onu_buffers[onu_id] = total_bytes / max_bytes if max_bytes > 0 else 0.0
 
-            total_delay, packet_count = 0.0, 0
-            for queue in onu.queues.values():
-                for packet in queue.packets:
-                    total_delay += current_time - packet.arrival_time
-                    packet_count += 1
+            total_delay, packet_count = onu.get_pending_delay_stats(current_time)
             onu_delays[onu_id] = total_delay / packet_count if packet_count > 0 else 0.0
 
         state = {
@@ -109,10 +116,14 @@ class RealPonEnv(gym.Env):
         }
         return self.dba._create_observation(state)
 
-    def _extract_metrics_from_simulator(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    def _extract_metrics_from_simulator(self, step_counters: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         Extract metrics from the real simulator to use with unified reward function.
 
+        Args:
+            step_counters (Optional[Dict]): Counters returned by the simulator's
+                collect_step_counters(). Collected here if not provided.
+
         Returns:
             Tuple of (onu_requests, allocations, onu_delays, onu_buffers)
         """
@@ -141,27 +152,23 @@ class RealPonEnv(gym.Env):
             except (ValueError, IndexError):
                 continue
 
-        # Extract current state from ONUs
-        current_time = self.sim.simulation_time
-        for onu_id_str, onu in self.sim.onus.items():
+        # Extract current state from the per-step counters (O(ONUs))
+        if step_counters is None:
+            step_counters = self.sim.collect_step_counters()
+
+        for onu_id_str, occupancy in step_counters['buffer_occupancy'].items():
             try:
                 onu_idx = get_onu_index(onu_id_str)
                 if onu_idx >= self.num_onus:
                     continue
 
                 # Buffer occupancy
-                total_bytes = sum(q.total_bytes for q in onu.queues.values())
-                max_bytes = sum(q.max_bytes for q in onu.queues.values())
-                onu_buffers[onu_idx] = total_bytes / max_bytes if max_bytes > 0 else 0.0
+                onu_buffers[onu_idx] = occupancy
 
                 # Average delay per ONU
-                total_delay, packet_count = 0.0, 0
-                for queue in onu.queues.values():
-                    for packet in queue.packets:
-                        total_delay += current_time - packet.arrival_time
-                        packet_count += 1
+                total_delay, packet_count = step_counters['pending_delays'][onu_id_str]
                 onu_delays[onu_idx] = (total_delay / packet_count) if packet_count > 0 else 0.0
-            except (ValueError, IndexError):
+            except (ValueError, IndexError, KeyError):
                 continue
 
         # Extract REAL allocations from OLT (NO APPROXIMATION)
@@ -177,21 +184,20 @@ class RealPonEnv(gym.Env):
 
         return onu_requests, allocations, onu_delays, onu_buffers
 
-    def _calculate_reward(self, old_metrics: Dict, new_metrics: Dict) -> float:
+    def _calculate_reward(self, step_counters: Optional[Dict[str, Any]] = None) -> float:
         """
         Calculate reward using unified reward function.
 
         This ensures consistency with PonRLEnvironment for proper sim-to-real transfer.
 
         Args:
-            old_metrics (Dict): The metrics from the previous step (kept for compatibility).
-            new_metrics (Dict): The metrics from the current step (kept for compatibility).
+            step_counters (Optional[Dict]): The simulator counters accumulated during the step.
 
         Returns:
             float: The calculated reward.
         """
         # Extract current state from simulator
-        onu_requests, allocations, onu_delays, onu_buffers = self._extract_metrics_from_simulator()
+        onu_requests, allocations, onu_delays, onu_buffers = self._extract_metrics_from_simulator(step_counters)
 
         # Use unified reward function
         reward = calculate_pon_reward(
@@ -265,6 +271,9 @@ class RealPonEnv(gym.Env):
 
         self._run_sim_step(duration=0.001)
 
+        # Discard counters accumulated during the warm-up step
+        self.sim.collect_step_counters()
+
         observation = self._get_observation()
         info = {}
 
@@ -280,23 +289,40 @@ class RealPonEnv(gym.Env):
         Returns:
             Tuple[np.ndarray, float, bool, bool, Dict]: A tuple containing the observation, reward, terminated flag, truncated flag, and an info dictionary.
         """
-        self.sim.olt.set_rl_action(action)
+        step_start = time.perf_counter()
+        events_before = self.sim.events_processed
 
-        old_metrics = self.sim.metrics.copy()
+        self.sim.olt.set_rl_action(action)
 
         self._run_sim_step(duration=self.step_duration)
+        sim_end = time.perf_counter()
 
-        new_metrics = self.sim.metrics.copy()
+        step_counters = self.sim.collect_step_counters()
 
-        reward = self._calculate_reward(old_metrics, new_metrics)
+        reward = self._calculate_reward(step_counters)
+        reward_end = time.perf_counter()
 
         observation = self._get_observation()
+        step_end = time.perf_counter()
+
+        self.perf_stats['steps'] += 1
+        self.perf_stats['events'] += self.sim.events_processed - events_before
+        self.perf_stats['simulation_time_s'] += sim_end - step_start
+        self.perf_stats['reward_time_s'] += reward_end - sim_end
+        self.perf_stats['observation_time_s'] += step_end - reward_end
+        self.perf_stats['step_time_s'] += step_end - step_start
 
         self.current_step += 1
         terminated = self.current_step >= self.max_episode_steps
         truncated = False
 
-        info = {'sim_time': self.sim.simulation_time}
+        info = {
+            'sim_time': self.sim.simulation_time,
+            'bytes_transmitted': sum(step_counters['bytes_per_onu'].values()),
+            'delay_sum': step_counters['delay_sum'],
+            'delay_count': step_counters['delay_count'],
+            'drops': sum(step_counters['drops_per_onu'].values())
+        }
 
         return observation, reward, terminated, truncated, info
 
@@ -316,7 +342,7 @@ class RealPonEnv(gym.Env):
 
             event = self.sim.event_queue.get_next_event()
 
-            self.sim.olt.check_and_execute_polling(self.sim.event_queue, event.timestamp)
+            self.sim.olt.check_and_execute_polling(self.sim.event_queue, event.tick)
 
             self.sim.simulation_time = event.timestamp
             self.sim._process_event(event)
@@ -324,6 +350,16 @@ class RealPonEnv(gym.Env):
 
         self.sim.simulation_time = target_time
 
+    def get_perf_stats(self) -> Dict[str, float]:
+        """
+        Get cumulative performance counters of step().
+
+        Returns:
+            Dict with steps, processed events and wall-clock seconds spent in
+            simulation, reward computation and observation building.
+        """
+        return self.perf_stats.copy()
+
     def render(self, mode='human'):
         """Not implemented"""
         pass
@@ -10,6 +10,44 @@ import numpy as np
 from typing import Dict, List, Tuple
 
 
+# Presets of reward weights shared by the RL environments
+REWARD_WEIGHT_PRESETS = {
+    'balanced': {
+        'utilization': 0.25,
+        'satisfaction': 0.30,
+        'fairness': 0.20,
+        'delay': 0.15,
+        'buffer': 0.10
+    },
+    'latency_only': {
+        'utilization': 0.05,
+        'satisfaction': 0.10,
+        'fairness': 0.05,
+        'delay': 0.70,
+        'buffer': 0.10
+    },
+    'throughput_only': {
+        'utilization': 0.50,
+        'satisfaction': 0.40,
+        'fairness': 0.05,
+        'delay': 0.025,
+        'buffer': 0.025
+    },
+    'fairness_only': {
+        'utilization': 0.10,
+        'satisfaction': 0.20,
+        'fairness': 0.60,
+        'delay': 0.05,
+        'buffer': 0.05
+    }
+}
+
+
+def get_reward_weights(reward_function: str) -> Dict[str, float]:
+    """Get reward weights for a named preset (defaults to 'balanced')."""
+    return dict(REWARD_WEIGHT_PRESETS.get(reward_function, REWARD_WEIGHT_PRESETS['balanced']))
+
+
 def calculate_pon_reward(
     onu_requests: np.ndarray,
     allocations: np.ndarray,
@@ -42,13 +80,7 @@ def calculate_pon_reward(
     """
     # Default weights (can be overridden for experiments)
     if weights is None:
-        weights = {
-            'utilization': 0.25,
-            'satisfaction': 0.30,
-            'fairness': 0.20,
-            'delay': 0.15,
-            'buffer': 0.10
-        }
+        weights = get_reward_weights('balanced')
 
     num_onus = len(onu_requests)
 
@@ -102,6 +134,63 @@ def calculate_pon_reward(
     return float(reward)
 
 
+def calculate_pon_reward_batch(
+    onu_requests: np.ndarray,
+    allocations: np.ndarray,
+    onu_delays: np.ndarray,
+    onu_buffers: np.ndarray,
+    total_bandwidth: float,
+    weights: Dict[str, float] = None
+) -> np.ndarray:
+    """
+    Vectorized version of calculate_pon_reward for many environments at once.
+
+    Produces the same value as calculate_pon_reward for every row.
+
+    Args:
+        onu_requests: Array (num_envs, num_onus) of normalized requests [0,1]
+        allocations: Array (num_envs, num_onus) of allocated bandwidth
+        onu_delays: Array (num_envs, num_onus) of delays (in seconds)
+        onu_buffers: Array (num_envs, num_onus) of normalized buffer occupancy
+        total_bandwidth: Total available bandwidth
+        weights: Optional reward weights (see calculate_pon_reward)
+
+    Returns:
+        np.ndarray: Reward per environment, shape (num_envs,)
+    """
+    if weights is None:
+        weights = get_reward_weights('balanced')
+
+    num_onus = onu_requests.shape[1]
+
+    utilization_efficiency = np.minimum(allocations.sum(axis=1) / total_bandwidth, 1.0)
+
+    requested = onu_requests * total_bandwidth
+    has_request = requested > 0.001
+    satisfaction = np.where(
+        has_request,
+        np.minimum(allocations / np.where(has_request, requested, 1.0), 1.0),
+        1.0
+    )
+    avg_satisfaction = satisfaction.mean(axis=1)
+
+    if num_onus > 1:
+        fairness = 1.0 - np.minimum(satisfaction.std(axis=1), 1.0)
+    else:
+        fairness = np.ones(onu_requests.shape[0])
+
+    delay_penalty = np.maximum(0.0, 1.0 - onu_delays.mean(axis=1) * 10.0)
+    buffer_penalty = np.maximum(0.0, 1.0 - onu_buffers.mean(axis=1))
+
+    return (
+        weights['utilization'] * utilization_efficiency +
+        weights['satisfaction'] * avg_satisfaction +
+        weights['fairness'] * fairness +
+        weights['delay'] * delay_penalty +
+        weights['buffer'] * buffer_penalty
+    )
+
+
 def get_reward_components(
     onu_requests: np.ndarray,
     allocations: np.ndarray,
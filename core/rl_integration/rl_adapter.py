@@ -12,6 +12,8 @@ from PyQt5.QtCore import QObject, pyqtSignal, QThread
 import numpy as np
 from .topology_bridge import TopologyBridge
 from .data_collector import RealTimeDataCollector
+from .training_telemetry import TrainingTelemetry
+from .transition_recorder import load_transition_dataset
 
 # RL Adapter integrado nativamente en PonLab
 # Verificar disponibilidad de bibliotecas RL
@@ -139,6 +141,19 @@ class RLAdapter(QObject):
                     )
                     print("[OK] Entorno REALISTA creado (RealPonEnv)")
                     print("[WARNING] Entrenamiento será MUY LENTO (~2-4 horas)")
+                elif training_env_type == 'surrogate':
+                    # Crear ambiente sustituto vectorizado calibrado contra RealPonEnv
+                    from .surrogate_pon_env import create_surrogate_pon_env
+
+                    max_episode_steps = int(params.get('episode_duration', 1.0) / params.get('simulation_timestep', 0.001))
+                    self.env = create_surrogate_pon_env(
+                        num_envs=params.get('surrogate_num_envs', 1024),
+                        max_episode_steps=max_episode_steps,
+                        calibration_duration=params.get('surrogate_calibration_duration', 1.0),
+                        report_divergence=params.get('surrogate_divergence_report', False),
+                        **env_params
+                    )
+                    print(f"[OK] Entorno SUSTITUTO creado (SurrogatePonVecEnv, {self.env.num_envs} instancias)")
                 else:
                     # Crear ambiente simplificado (PonRLEnvironment)
                     from .pon_rl_environment import create_pon_rl_environment
@@ -295,6 +310,86 @@ class RLAdapter(QObject):
             self.training_error.emit(error_msg)
             return False
     
+    def pretrain_from_transitions(self, dataset_dir: str, epochs: int = 10,
+                                  batch_size: int = 256, learning_rate: float = 1e-3) -> bool:
+        """
+        Preentrenar la política por behaviour cloning con transiciones grabadas
+        desde simulaciones con DBA heurísticos (ver TransitionRecorder)
+
+        Args:
+            dataset_dir: Directorio con shards .npz
+            epochs: Pasadas completas sobre el dataset
+            batch_size: Tamaño de minibatch
+            learning_rate: Learning rate del optimizador de behaviour cloning
+
+        Returns:
+            True si el preentrenamiento se completó
+        """
+        if not (RL_AVAILABLE and hasattr(self.model, 'policy')):
+            self.training_error.emit("Behaviour cloning requiere un modelo stable-baselines3")
+            return False
+
+        try:
+            import torch
+
+            policy = self.model.policy
+            obs_size = policy.observation_space.shape[0]
+            action_size = policy.action_space.shape[0]
+
+            dataset = load_transition_dataset(dataset_dir, num_onus=action_size)
+            if not dataset:
+                self.training_error.emit(f"No hay transiciones compatibles en: {dataset_dir}")
+                return False
+
+            if dataset['observations'].shape[1] != obs_size:
+                self.training_error.emit("Dimensión de observación del dataset incompatible con el modelo")
+                return False
+
+            observations = torch.as_tensor(dataset['observations'], device=policy.device)
+            actions = torch.as_tensor(dataset['actions'], device=policy.device)
+
+            # Políticas con salida acotada (SAC) trabajan en el espacio [-1, 1]
+            if getattr(policy, 'squash_output', False):
+                actions = torch.as_tensor(policy.scale_action(dataset['actions']), device=policy.device)
+
+            optimizer = torch.optim.Adam(policy.parameters(), lr=learning_rate)
+            num_samples = observations.shape[0]
+            print(f"[INFO] Behaviour cloning: {num_samples} transiciones, {epochs} épocas")
+
+            policy.set_training_mode(True)
+            for epoch in range(epochs):
+                permutation = torch.randperm(num_samples, device=policy.device)
+                epoch_loss = 0.0
+
+                for start in range(0, num_samples, batch_size):
+                    batch_idx = permutation[start:start + batch_size]
+                    predicted = policy._predict(observations[batch_idx], deterministic=True)
+                    loss = torch.nn.functional.mse_loss(predicted, actions[batch_idx])
+
+                    optimizer.zero_grad()
+                    loss.backward()
+                    optimizer.step()
+                    epoch_loss += loss.item() * len(batch_idx)
+
+                epoch_loss /= num_samples
+                print(f"   Época {epoch + 1}/{epochs} - loss: {epoch_loss:.6f}")
+                self.training_progress.emit({
+                    'phase': 'behaviour_cloning',
+                    'episode': epoch + 1,
+                    'loss': epoch_loss,
+                    'progress_percent': ((epoch + 1) / epochs) * 100
+                })
+
+            policy.set_training_mode(False)
+            print("[OK] Preentrenamiento por behaviour cloning completado")
+            return True
+
+        except Exception as e:
+            error_msg = f"Error en behaviour cloning: {str(e)}"
+            print(f"[ERROR] {error_msg}")
+            self.training_error.emit(error_msg)
+            return False
+
     def start_training(self, params: Dict[str, Any]):
         """
         Entrenar modelo usando stable-baselines3 o fallback interno
@@ -714,11 +809,17 @@ class RealTrainingThread(QThread):
         self.data_collector = data_collector
         self._stop_requested = False
 
+        # Telemetría de rendimiento (simulador vs aprendiz)
+        self.telemetry = TrainingTelemetry(env)
+
     def run(self):
         """Ejecutar entrenamiento real usando stable-baselines3"""
         try:
             print(f"[INFO] Iniciando entrenamiento real por {self.total_timesteps} timesteps")
 
+            self.telemetry.reset()
+            self.telemetry.attach_model(self.model)
+
             # Callback personalizado para actualizar progreso
             callback = RealTrainingCallback(self)
 
@@ -754,6 +855,11 @@ class RealTrainingCallback:
         """Callback llamado durante el entrenamiento real"""
         self.step_count += 1
 
+        # Registrar paso en la telemetría de rendimiento
+        telemetry = getattr(self.training_thread, 'telemetry', None)
+        if telemetry:
+            telemetry.on_step(locals_dict)
+
         # Extraer métricas de entrenamiento
         if 'infos' in locals_dict and locals_dict['infos']:
             # Obtener reward del último episodio
@@ -770,6 +876,9 @@ class RealTrainingCallback:
                 'progress_percent': (self.step_count / self.training_thread.total_timesteps) * 100
             }
 
+            if telemetry:
+                progress_data['telemetry'] = telemetry.snapshot()
+
             self.training_thread.progress_updated.emit(progress_data)
 
         # Verificar si se solicitó detener
@@ -34,6 +34,7 @@ class RLDataBridge(QObject):
         # Estado de captura
         self.is_capturing = False
         self.capture_interval = 50  # ms
+        self._metrics_cursor = None  # Cursor de PONOrchestrator.get_metrics_since()
 
         # Buffers de datos históricos (compatible con gráficos existentes)
         self.data_history = {
@@ -109,6 +110,7 @@ class RLDataBridge(QObject):
 
         try:
             self.is_capturing = True
+            self._metrics_cursor = None
             self.capture_timer.start(self.capture_interval)
             print("[OK] Captura de datos iniciada")
             return True
@@ -141,8 +143,7 @@ class RLDataBridge(QObject):
 
             # CAPTURAR DATOS REALES DE NETPONPY
             buffer_levels = self.orchestrator.get_buffer_levels()      # Lista [0-1] por ONU
-            delays_raw = self.orchestrator.get_delays()                # Lista de dict con delays
-            throughputs_raw = self.orchestrator.get_throughputs()      # Lista de dict con throughputs
+            delays_raw, throughputs_raw = self._read_new_samples()     # Listas de dict (solo nuevas)
 
             # DEBUG: Verificar datos raw
             if len(self.data_history['timestamps']) % 20 == 0:  # Log cada segundo aprox
@@ -195,6 +196,19 @@ class RLDataBridge(QObject):
             import traceback
             traceback.print_exc()
 
+    def _read_new_samples(self):
+        """
+        Leer delays y throughputs añadidos desde la captura anterior
+
+        Con un PONOrchestrator con cursor solo se procesan las muestras nuevas
+        (coste por tick independiente de la duración de la sesión); en otro
+        caso se usan las últimas muestras que expone el orquestador.
+        """
+        if hasattr(self.orchestrator, 'get_metrics_since'):
+            self._metrics_cursor, samples = self.orchestrator.get_metrics_since(self._metrics_cursor)
+            return samples['delays'], samples['throughputs']
+        return self.orchestrator.get_delays(), self.orchestrator.get_throughputs()
+
     def _process_delay_data(self, delays_raw: List[Dict]) -> List[float]:
         """Procesar datos de delay raw en formato para gráficos"""
         num_onus = self.session_info['num_onus']
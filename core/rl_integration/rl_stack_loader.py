@@ -0,0 +1,110 @@
+"""
+RL Stack Loader
+Carga diferida de la pila RL (gymnasium, stable-baselines3, torch) en un
+hilo de fondo la primera vez que se usa una función RL, con señales de
+estado para que la UI muestre la disponibilidad mientras carga
+"""
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+
+class _RLStackLoadThread(QThread):
+    """Hilo que importa los módulos RL pesados"""
+
+    load_finished = pyqtSignal(bool, str)  # disponible, mensaje
+
+    def __init__(self):
+        super().__init__()
+        self.result = None  # (disponible, mensaje) al terminar
+
+    def run(self):
+        try:
+            from ..smart_rl_dba import load_rl_libraries
+            sb3_available = load_rl_libraries()
+
+            # TrainingManager -> RLAdapter importa gymnasium y stable-baselines3
+            from . import training_manager  # noqa: F401
+            from . import rl_adapter
+
+            if sb3_available and rl_adapter.RL_AVAILABLE:
+                message = "Bibliotecas RL cargadas (gymnasium, stable-baselines3)"
+            else:
+                message = "Bibliotecas RL no instaladas: se usa la implementación Smart RL interna"
+            self.result = (True, message)
+
+        except Exception as e:
+            self.result = (False, f"Error cargando el módulo RL: {e}")
+
+        self.load_finished.emit(*self.result)
+
+
+class RLStackLoader(QObject):
+    """
+    Estado de carga de la pila RL compartido por la aplicación
+
+    Estados: 'not_loaded' -> 'loading' -> 'ready' | 'unavailable'.
+    'ready' significa que TrainingManager se puede usar (con stable-baselines3
+    o con el fallback interno); el mensaje indica cuál.
+    """
+
+    NOT_LOADED = 'not_loaded'
+    LOADING = 'loading'
+    READY = 'ready'
+    UNAVAILABLE = 'unavailable'
+
+    state_changed = pyqtSignal(str, str)  # estado, mensaje
+
+    def __init__(self):
+        super().__init__()
+        self.state = self.NOT_LOADED
+        self.message = ""
+        self._thread = None
+
+    def ensure_loaded(self):
+        """
+        Iniciar la carga en segundo plano si aún no se hizo
+
+        Returns:
+            Estado actual (el resultado llega por state_changed)
+        """
+        if self.state == self.NOT_LOADED:
+            self._set_state(self.LOADING, "Cargando módulo RL en segundo plano...")
+            self._thread = _RLStackLoadThread()
+            self._thread.load_finished.connect(self._on_load_finished)
+            self._thread.start()
+        return self.state
+
+    def is_ready(self):
+        return self.state == self.READY
+
+    def wait(self):
+        """
+        Bloquear hasta que termine la carga (iniciándola si hace falta)
+
+        Para usar desde el hilo GUI cuando una acción RL no puede esperar a la
+        señal: solo se espera lo que le quede a la carga en curso.
+
+        Returns:
+            True si la pila RL quedó lista
+        """
+        self.ensure_loaded()
+        if self.state == self.LOADING:
+            self._thread.wait()
+            # La señal encolada aún no se procesó: aplicar el resultado ya
+            self._on_load_finished(*self._thread.result)
+        return self.state == self.READY
+
+    def _on_load_finished(self, available, message):
+        if self.state != self.LOADING:
+            return  # Ya aplicado por wait()
+        self._set_state(self.READY if available else self.UNAVAILABLE, message)
+
+    def _set_state(self, state, message):
+        self.state = state
+        self.message = message
+        print(f"[INFO] RL Stack: {state} - {message}")
+        self.state_changed.emit(state, message)
+
+
+# Cargador compartido por los paneles de la aplicación
+RL_STACK = RLStackLoader()
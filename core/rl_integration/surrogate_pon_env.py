@@ -0,0 +1,498 @@
+"""
+Surrogate PON Environment
+Entorno sustituto de fluidos calibrado contra OptimizedHybridPONSimulator,
+vectorizado sobre miles de instancias en un único array de numpy
+"""
+
+import json
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from ..simulation.pon_event_simulator import OptimizedHybridPONSimulator
+from ..smart_rl_dba import SmartRLDBAAlgorithm
+from .reward_functions import calculate_pon_reward_batch, get_reward_weights
+
+try:
+    from gymnasium import spaces
+    from stable_baselines3.common.vec_env import VecEnv
+    SB3_AVAILABLE = True
+except (ImportError, OSError):
+    SB3_AVAILABLE = False
+    spaces = None
+    VecEnv = object
+
+MB = 1024 * 1024
+
+# Fracción del ciclo de 125us disponible para transmisión (50-125us)
+TRANSMISSION_WINDOW_FRACTION = 0.6
+
+# Calibraciones ya ajustadas por (num_onus, traffic_scenario, duración)
+_calibration_cache: Dict[Tuple[int, str, float], 'SurrogateCalibration'] = {}
+
+
+@dataclass
+class SurrogateCalibration:
+    """Parámetros por ONU ajustados desde ejecuciones del simulador por eventos"""
+    num_onus: int
+    traffic_scenario: str
+    channel_capacity_mbps: float
+    step_duration: float
+    cycles_per_step: int
+    arrival_mean: List[float]          # bytes aceptados por paso
+    arrival_var: List[float]           # varianza de bytes por paso
+    buffer_capacity: List[float]       # bytes máximos por ONU (suma de T-CONTs)
+    service_capacity_bytes: float      # bytes servibles por paso en el canal
+    delay_scale: float                 # factor delay real vs backlog / (2 * tasa)
+    real_stats: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertir a diccionario serializable"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SurrogateCalibration':
+        """Crear calibración desde diccionario"""
+        return cls(**data)
+
+    def save(self, path: str):
+        """Guardar calibración como JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'SurrogateCalibration':
+        """Cargar calibración desde JSON"""
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+@contextmanager
+def _seeded_global_rngs(seed: Optional[int]):
+    """
+    Sembrar random y np.random (los usa HybridONU) solo durante el bloque
+
+    El estado previo se restaura al salir para no alterar las secuencias
+    aleatorias de otras simulaciones o entrenamientos del mismo proceso.
+    """
+    if seed is None:
+        yield
+        return
+
+    saved_state = (random.getstate(), np.random.get_state())
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(saved_state[0])
+        np.random.set_state(saved_state[1])
+
+
+def _record_simulator_run(num_onus: int, traffic_scenario: str, steps: int,
+                          step_duration: float, seed: Optional[int]) -> Dict[str, np.ndarray]:
+    """
+    Ejecutar el simulador por eventos en pasos fijos con acción equitativa
+
+    Returns:
+        Dict de arrays (steps, num_onus): arrivals, served, backlog,
+        pending_delay, drops
+    """
+    with _seeded_global_rngs(seed):
+        return _run_simulator_steps(num_onus, traffic_scenario, steps, step_duration)
+
+
+def _run_simulator_steps(num_onus: int, traffic_scenario: str, steps: int,
+                         step_duration: float) -> Dict[str, np.ndarray]:
+    """Cuerpo de _record_simulator_run (usa los generadores globales tal como estén)"""
+    dba = SmartRLDBAAlgorithm(model_path=None, num_onus=num_onus)
+    sim = OptimizedHybridPONSimulator(num_onus=num_onus, traffic_scenario=traffic_scenario,
+                                      dba_algorithm=dba)
+    sim.reset_simulation()
+    sim.simulation_duration = steps * step_duration * 2
+    sim._initialize_events()
+    sim.is_running = True
+    sim.olt.set_rl_action(np.ones(num_onus, dtype=np.float32) / num_onus)
+    sim.collect_step_counters()
+
+    onu_ids = sorted(sim.onus.keys())
+    record = {key: np.zeros((steps, num_onus)) for key in
+              ('arrivals', 'served', 'backlog', 'pending_delay', 'drops')}
+    last_generated = np.zeros(num_onus)
+
+    for step in range(steps):
+        target_time = sim.simulation_time + step_duration
+        while sim.event_queue.has_events() and sim.event_queue.peek_next_time() < target_time:
+            event = sim.event_queue.get_next_event()
+            sim.olt.check_and_execute_polling(sim.event_queue, event.tick)
+            sim.simulation_time = event.timestamp
+            sim._process_event(event)
+            sim.events_processed += 1
+        sim.simulation_time = target_time
+
+        counters = sim.collect_step_counters()
+        for i, onu_id in enumerate(onu_ids):
+            onu = sim.onus[onu_id]
+            generated = onu.stats['bytes_generated']
+            record['arrivals'][step, i] = generated - last_generated[i]
+            last_generated[i] = generated
+
+            record['served'][step, i] = counters['bytes_per_onu'].get(onu_id, 0)
+            record['backlog'][step, i] = sum(q.total_bytes for q in onu.queues.values())
+            record['drops'][step, i] = counters['drops_per_onu'].get(onu_id, 0)
+
+            total_delay, packet_count = counters['pending_delays'][onu_id]
+            record['pending_delay'][step, i] = total_delay / packet_count if packet_count > 0 else 0.0
+
+    record['buffer_capacity'] = np.array([
+        sum(q.max_bytes for q in sim.onus[onu_id].queues.values()) for onu_id in onu_ids
+    ], dtype=float)
+    record['channel_capacity_mbps'] = sim.channel_capacity
+    record['cycles_per_step'] = max(1, int(round(step_duration / sim.olt.cycle_duration)))
+    return record
+
+
+def calibrate_surrogate(num_onus: int = 4, traffic_scenario: str = "residential_medium",
+                        duration_seconds: float = 1.0, step_duration: float = 0.001,
+                        runs: int = 1, seed: Optional[int] = None) -> SurrogateCalibration:
+    """
+    Ajustar los parámetros del entorno sustituto desde ejecuciones del simulador
+
+    Args:
+        num_onus: Número de ONUs del escenario
+        traffic_scenario: Escenario de tráfico
+        duration_seconds: Tiempo simulado por ejecución
+        step_duration: Duración de un paso RL (igual que RealPonEnv)
+        runs: Número de ejecuciones independientes a combinar
+        seed: Semilla base (None = aleatoria)
+
+    Returns:
+        SurrogateCalibration con tasas de llegada, capacidad de servicio y
+        estadísticas reales de referencia para medir divergencia
+    """
+    steps = max(2, int(duration_seconds / step_duration))
+    records = [
+        _record_simulator_run(num_onus, traffic_scenario, steps, step_duration,
+                              None if seed is None else seed + run)
+        for run in range(runs)
+    ]
+
+    arrivals = np.concatenate([r['arrivals'] for r in records])
+    served = np.concatenate([r['served'] for r in records])
+    backlog = np.concatenate([r['backlog'] for r in records])
+    pending_delay = np.concatenate([r['pending_delay'] for r in records])
+    buffer_capacity = records[0]['buffer_capacity']
+    channel_capacity = records[0]['channel_capacity_mbps']
+
+    arrival_mean = arrivals.mean(axis=0)
+    arrival_var = arrivals.var(axis=0)
+
+    # Capacidad de servicio: ventana de transmisión nominal, o el pico observado si es mayor
+    nominal_bytes = channel_capacity * 1e6 / 8 * step_duration
+    service_capacity = max(nominal_bytes * TRANSMISSION_WINDOW_FRACTION, float(served.sum(axis=1).max()))
+
+    # Delay de espera: ajustar escala sobre backlog / (2 * tasa de llegada)
+    arrival_rate = np.maximum(arrival_mean / step_duration, 1.0)
+    fluid_delay = backlog / (2 * arrival_rate)
+    mask = backlog > 0
+    denominator = float((fluid_delay[mask] ** 2).sum())
+    delay_scale = float((fluid_delay[mask] * pending_delay[mask]).sum() / denominator) if denominator > 0 else 1.0
+
+    real_stats = {
+        'mean_occupancy': (backlog / buffer_capacity).mean(axis=0).tolist(),
+        'mean_delay': pending_delay.mean(axis=0).tolist(),
+        'mean_served': served.mean(axis=0).tolist(),
+        'total_served_quantiles': np.quantile(served.sum(axis=1), np.linspace(0, 1, 101)).tolist(),
+        'steps': int(arrivals.shape[0])
+    }
+
+    return SurrogateCalibration(
+        num_onus=num_onus,
+        traffic_scenario=traffic_scenario,
+        channel_capacity_mbps=float(channel_capacity),
+        step_duration=step_duration,
+        cycles_per_step=int(records[0]['cycles_per_step']),
+        arrival_mean=arrival_mean.tolist(),
+        arrival_var=arrival_var.tolist(),
+        buffer_capacity=buffer_capacity.tolist(),
+        service_capacity_bytes=float(service_capacity),
+        delay_scale=delay_scale,
+        real_stats=real_stats
+    )
+
+
+def get_surrogate_calibration(num_onus: int = 4, traffic_scenario: str = "residential_medium",
+                              duration_seconds: float = 1.0) -> SurrogateCalibration:
+    """
+    Calibración del sustituto reutilizada entre entornos del mismo escenario
+
+    La primera llamada por (num_onus, traffic_scenario, duración) ejecuta
+    calibrate_surrogate(); las siguientes devuelven el resultado en caché.
+    """
+    key = (num_onus, traffic_scenario, float(duration_seconds))
+    if key not in _calibration_cache:
+        _calibration_cache[key] = calibrate_surrogate(num_onus, traffic_scenario, duration_seconds)
+    return _calibration_cache[key]
+
+
+class SurrogatePonVecEnv(VecEnv):
+    """
+    Entorno sustituto de fluidos vectorizado (interfaz VecEnv de stable-baselines3)
+
+    Cada instancia mantiene el backlog por ONU; en cada paso llegan bytes con
+    distribución gamma ajustada por momentos, el DBA asigna como
+    SmartRLDBAAlgorithm (min(demanda, peso * capacidad)) y el canal limita el
+    total servido a la capacidad calibrada. La observación y la recompensa
+    usan la misma normalización que RealPonEnv.
+    """
+
+    def __init__(self, calibration: SurrogateCalibration, num_envs: int = 1024,
+                 max_episode_steps: int = 1000, reward_function: str = 'balanced',
+                 seed: Optional[int] = None):
+        """
+        Args:
+            calibration: Parámetros ajustados con calibrate_surrogate()
+            num_envs: Instancias evolucionadas en paralelo
+            max_episode_steps: Pasos por episodio
+            reward_function: Preset de pesos de recompensa
+            seed: Semilla del generador aleatorio
+        """
+        self.calibration = calibration
+        self.num_onus = calibration.num_onus
+        self.max_episode_steps = max_episode_steps
+        self.reward_weights = get_reward_weights(reward_function)
+        self.rng = np.random.default_rng(seed)
+
+        obs_size = self.num_onus * 3 + 1
+        if SB3_AVAILABLE:
+            observation_space = spaces.Box(low=0.0, high=1.0, shape=(obs_size,), dtype=np.float32)
+            action_space = spaces.Box(low=0.0, high=1.0, shape=(self.num_onus,), dtype=np.float32)
+            super().__init__(num_envs, observation_space, action_space)
+        else:
+            self.num_envs = num_envs
+            self.observation_space = None
+            self.action_space = None
+
+        # Parámetros calibrados como arrays (1, num_onus) para broadcasting
+        mean = np.asarray(calibration.arrival_mean, dtype=np.float64)
+        var = np.asarray(calibration.arrival_var, dtype=np.float64)
+        self._gamma_shape = np.where(var > 0, mean ** 2 / np.where(var > 0, var, 1.0), 0.0)[None, :]
+        self._gamma_scale = np.where(mean > 0, var / np.where(mean > 0, mean, 1.0), 0.0)[None, :]
+        self._arrival_mean = mean[None, :]
+        self._deterministic_arrivals = (var <= 0)[None, :]
+        self._buffer_capacity = np.asarray(calibration.buffer_capacity, dtype=np.float64)[None, :]
+        self._arrival_rate = np.maximum(mean / calibration.step_duration, 1.0)[None, :]
+        self.capacity = calibration.channel_capacity_mbps
+
+        # Estado vectorizado
+        self.backlog = np.zeros((num_envs, self.num_onus))
+        self.last_allocations = np.zeros((num_envs, self.num_onus))
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self._actions = None
+
+    # --- Dinámica vectorizada ---
+
+    def _sample_arrivals(self, count: int) -> np.ndarray:
+        """Muestrear bytes llegados en un paso para `count` instancias"""
+        shape = (count, self.num_onus)
+        arrivals = self.rng.gamma(np.maximum(self._gamma_shape, 1e-9), np.maximum(self._gamma_scale, 1e-9), size=shape)
+        return np.where(self._deterministic_arrivals, self._arrival_mean, arrivals)
+
+    def _delays(self, backlog: np.ndarray) -> np.ndarray:
+        """Delay medio de espera estimado por ONU"""
+        return self.calibration.delay_scale * backlog / (2 * self._arrival_rate)
+
+    def _observations(self, backlog: np.ndarray) -> np.ndarray:
+        """Construir observaciones [requests, delays, buffers, utilización]"""
+        requests_mb = backlog / MB
+        observation = np.concatenate([
+            np.minimum(requests_mb / self.capacity, 1.0),
+            np.minimum(self._delays(backlog) / 0.1, 1.0),
+            backlog / self._buffer_capacity,
+            np.minimum(requests_mb.sum(axis=1, keepdims=True) / self.capacity, 1.0)
+        ], axis=1)
+        return observation.astype(np.float32)
+
+    def _advance(self, actions: np.ndarray):
+        """
+        Avanzar todas las instancias un paso
+
+        Returns:
+            (observaciones, recompensas, backlog_servido, drops)
+        """
+        actions = np.clip(np.asarray(actions, dtype=np.float64).reshape(self.num_envs, self.num_onus), 0.0, 1.0)
+        action_sum = actions.sum(axis=1, keepdims=True)
+        weights = np.where(action_sum > 0, actions / np.where(action_sum > 0, action_sum, 1.0), 1.0 / self.num_onus)
+
+        # Llegadas y descarte por overflow
+        self.backlog += self._sample_arrivals(self.num_envs)
+        drops = np.maximum(self.backlog - self._buffer_capacity, 0.0)
+        self.backlog -= drops
+
+        # Asignación por ciclo como SmartRLDBAAlgorithm (MB)
+        allocations = np.minimum(self.backlog / MB, weights * self.capacity)
+        served = np.minimum(self.backlog, allocations * MB * self.calibration.cycles_per_step)
+
+        # Límite físico del canal
+        total_served = served.sum(axis=1, keepdims=True)
+        channel_scale = np.minimum(1.0, self.calibration.service_capacity_bytes / np.maximum(total_served, 1.0))
+        served *= channel_scale
+        self.backlog -= served
+        self.last_allocations = allocations
+
+        # Recompensa con la normalización de RealPonEnv
+        onu_requests = np.minimum(self.backlog / (self.capacity * 0.001), 1.0)
+        rewards = calculate_pon_reward_batch(
+            onu_requests, allocations, self._delays(self.backlog),
+            self.backlog / self._buffer_capacity, self.capacity, self.reward_weights
+        )
+
+        return self._observations(self.backlog), rewards.astype(np.float32), served, drops
+
+    # --- Interfaz VecEnv ---
+
+    def reset(self) -> np.ndarray:
+        """Reiniciar todas las instancias"""
+        self.backlog = np.zeros((self.num_envs, self.num_onus))
+        self.last_allocations = np.zeros((self.num_envs, self.num_onus))
+        self.episode_steps = np.zeros(self.num_envs, dtype=np.int64)
+        return self._observations(self.backlog)
+
+    def step_async(self, actions: np.ndarray):
+        self._actions = actions
+
+    def step_wait(self):
+        observations, rewards, _, _ = self._advance(self._actions)
+        self.episode_steps += 1
+        dones = self.episode_steps >= self.max_episode_steps
+
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for idx in np.flatnonzero(dones):
+                infos[idx]['terminal_observation'] = observations[idx].copy()
+            self.backlog[dones] = 0.0
+            self.episode_steps[dones] = 0
+            observations[dones] = self._observations(self.backlog[dones])
+
+        return observations, rewards, dones, infos
+
+    def step(self, actions: np.ndarray):
+        """Paso síncrono (también disponible sin stable-baselines3)"""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        pass
+
+    def seed(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+        return [seed] * self.num_envs
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name)] * len(self._get_indices(indices))
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result] * len(self._get_indices(indices))
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False] * len(self._get_indices(indices))
+
+    def _get_indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    # --- Divergencia respecto al simulador real ---
+
+    def divergence_report(self, steps: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Comparar el sustituto con las estadísticas reales de calibración
+
+        Ejecuta todas las instancias con la misma acción equitativa usada al
+        calibrar y compara ocupación, delay y bytes servidos por ONU.
+
+        Args:
+            steps: Pasos a simular (por defecto los de la calibración)
+
+        Returns:
+            Dict con errores relativos por métrica y distancia de Wasserstein-1
+            (normalizada por la media real) del total servido por paso
+        """
+        real = self.calibration.real_stats
+        if not real:
+            return {}
+
+        steps = steps or real.get('steps', 1000)
+        saved_state = (self.backlog.copy(), self.episode_steps.copy(), self.last_allocations.copy())
+        self.reset()
+
+        equal_action = np.full((self.num_envs, self.num_onus), 1.0 / self.num_onus)
+        occupancy_sum = np.zeros(self.num_onus)
+        delay_sum = np.zeros(self.num_onus)
+        served_sum = np.zeros(self.num_onus)
+        total_served = []
+
+        for _ in range(steps):
+            _, _, served, _ = self._advance(equal_action)
+            occupancy_sum += (self.backlog / self._buffer_capacity).mean(axis=0)
+            delay_sum += self._delays(self.backlog).mean(axis=0)
+            served_sum += served.mean(axis=0)
+            total_served.append(served.sum(axis=1))
+
+        self.backlog, self.episode_steps, self.last_allocations = saved_state
+
+        def relative_error(surrogate, reference):
+            reference = np.asarray(reference, dtype=float)
+            return float(np.mean(np.abs(surrogate - reference) / np.maximum(np.abs(reference), 1e-12)))
+
+        quantile_levels = np.linspace(0, 1, 101)
+        surrogate_quantiles = np.quantile(np.concatenate(total_served), quantile_levels)
+        real_quantiles = np.asarray(real['total_served_quantiles'])
+        real_mean_total = max(float(np.sum(real['mean_served'])), 1e-12)
+
+        return {
+            'occupancy_relative_error': relative_error(occupancy_sum / steps, real['mean_occupancy']),
+            'delay_relative_error': relative_error(delay_sum / steps, real['mean_delay']),
+            'throughput_relative_error': relative_error(served_sum / steps, real['mean_served']),
+            'throughput_wasserstein_normalized': float(np.mean(np.abs(surrogate_quantiles - real_quantiles)) / real_mean_total),
+            'steps': steps,
+            'num_envs': self.num_envs
+        }
+
+
+def create_surrogate_pon_env(num_onus: int = 4, traffic_scenario: str = "residential_medium",
+                             num_envs: int = 1024, max_episode_steps: int = 1000,
+                             reward_function: str = 'balanced',
+                             calibration: Optional[SurrogateCalibration] = None,
+                             calibration_duration: float = 1.0,
+                             report_divergence: bool = False, **kwargs) -> SurrogatePonVecEnv:
+    """
+    Factory: calibrar (si no se proporciona calibración) y crear el entorno sustituto
+
+    La calibración se reutiliza entre llamadas con el mismo escenario. El
+    informe de divergencia (num_envs x pasos de calibración) solo se calcula
+    con report_divergence=True.
+    """
+    if calibration is None:
+        calibration = get_surrogate_calibration(num_onus, traffic_scenario, calibration_duration)
+
+    env = SurrogatePonVecEnv(calibration, num_envs=num_envs, max_episode_steps=max_episode_steps,
+                             reward_function=reward_function)
+
+    report = env.divergence_report() if report_divergence else {}
+    if report:
+        print(f"[INFO] Surrogate PON: divergencia vs simulador real - "
+              f"ocupación {report['occupancy_relative_error']:.1%}, "
+              f"delay {report['delay_relative_error']:.1%}, "
+              f"throughput {report['throughput_relative_error']:.1%}")
+    env.divergence = report
+    return env
@@ -5,11 +5,14 @@ Gestor de entrenamiento RL completamente interno - SIN dependencias externas
 
 import os
 import json
+import tempfile
+from collections import deque
 from typing import Dict, Any, Optional
 from datetime import datetime
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 
 from .rl_adapter import RLAdapter
+from .training_telemetry import TELEMETRY_HISTORY_SIZE
 from .environment_bridge import EnvironmentBridge
 from .simulation_manager import SimulationManager
 
@@ -26,6 +29,10 @@ class TrainingManager(QObject):
     training_progress = pyqtSignal(dict)             # Progreso de entrenamiento
     training_completed = pyqtSignal(str)             # Entrenamiento completado (ruta modelo)
     error_occurred = pyqtSignal(str)                 # Error durante operación
+    telemetry_updated = pyqtSignal(dict)             # Telemetría de rendimiento del entrenamiento
+    validation_progress = pyqtSignal(dict)           # Resultado de un episodio de validación
+    validation_completed = pyqtSignal(dict)          # Resumen de validación (media e IC)
+    validation_cancelled = pyqtSignal(dict)          # Validación detenida (resultados parciales)
 
     # Señales de simulación
     simulation_started = pyqtSignal(dict)            # Simulación iniciada
@@ -47,6 +54,15 @@ class TrainingManager(QObject):
         self.current_session_id = None
         self.training_start_time = None
         self.session_metrics = []
+
+        # Telemetría de rendimiento (pasos/s, reparto de tiempo, memoria)
+        self.latest_telemetry = {}
+        self.telemetry_history = deque(maxlen=TELEMETRY_HISTORY_SIZE)
+
+        # Validación paralela
+        self.validation_thread = None
+        self.latest_validation = {}
+        self._validation_dir = None
         
         # Configuración actual
         self.current_config = {}
@@ -105,6 +121,8 @@ class TrainingManager(QObject):
             self.current_session_id = self._generate_session_id()
             self.current_config = params.copy()
             self.training_start_time = datetime.now()
+            self.latest_telemetry = {}
+            self.telemetry_history.clear()
             
             # Configurar canvas si se proporciona
             if canvas:
@@ -228,27 +246,139 @@ class TrainingManager(QObject):
             self.error_occurred.emit(error_msg)
             return False
 
-    # MÉTODOS DE VALIDACIÓN MÚLTIPLE - DESHABILITADOS (no mejoran rendimiento RL)
-    # La validación se hace automáticamente durante el entrenamiento con eval_freq
+    # === MÉTODOS DE VALIDACIÓN ===
+
+    def run_validation(self, n_eval_episodes: int = 10, max_workers: Optional[int] = None) -> bool:
+        """
+        Validar el modelo actual en RealPonEnv sin bloquear el entrenamiento
+
+        Los episodios se reparten en un pool de procesos (un simulador y una
+        semilla por episodio). Cada resultado se emite por validation_progress
+        y el resumen con media e IC 95% por validation_completed (o los
+        resultados parciales por validation_cancelled si se detiene).
+
+        Args:
+            n_eval_episodes: Número de episodios de validación
+            max_workers: Procesos del pool (None = número de CPUs)
+
+        Returns:
+            True si la validación se inició
+        """
+        if self.validation_thread is not None and self.validation_thread.isRunning():
+            print("[WARNING] Ya hay una validación en curso")
+            return False
+
+        self.validation_thread = self._validate_in_environment('realistic', n_eval_episodes, max_workers)
+        if self.validation_thread is None:
+            return False
+
+        self.validation_thread.start()
+        print(f"[INFO] Validación paralela iniciada: {n_eval_episodes} episodios, "
+              f"{self.validation_thread.max_workers} procesos")
+        return True
 
-    def run_validation(self) -> bool:
+    def _validate_in_environment(self, env_type: str, n_eval_episodes: int = 10,
+                                 max_workers: Optional[int] = None):
         """
-        [DESHABILITADO] Validación múltiple en ambientes
+        Preparar el hilo de validación paralela para un tipo de ambiente
 
-        No se usa porque:
-        - No mejora el rendimiento del RL
-        - SB3 ya valida durante entrenamiento (eval_freq)
-        - Solo RealPonEnv se usa ahora
+        Returns:
+            ParallelValidationThread listo para iniciar, o None si no es posible
         """
-        return True  # Deshabilitado
+        model = self.rl_adapter.model
+        if model is None or not hasattr(model, 'save'):
+            self.error_occurred.emit("Validación requiere un modelo stable-baselines3 entrenado")
+            return None
+
+        if env_type != 'realistic':
+            print(f"[WARNING] Validación solo soportada en RealPonEnv, ignorando '{env_type}'")
+
+        try:
+            from .parallel_validation import ParallelValidationThread
+
+            # Los procesos trabajadores cargan una copia del modelo desde disco
+            self._cleanup_validation_dir()
+            self._validation_dir = tempfile.TemporaryDirectory(prefix='ponlab_validation_')
+            model_path = os.path.join(self._validation_dir.name, 'model.zip')
+            model.save(model_path)
+
+            episode_duration = self.current_config.get('episode_duration', 1.0)
+            timestep = self.current_config.get('simulation_timestep', 0.001)
+            env_params = {
+                'num_onus': self.current_config.get('num_onus', 4),
+                'traffic_scenario': self.current_config.get('traffic_scenario', 'residential_medium'),
+                'max_episode_steps': int(episode_duration / timestep),
+                'reward_function': self.current_config.get('reward_function', 'balanced')
+            }
+
+            thread = ParallelValidationThread(
+                model_path, type(model).__name__, env_params,
+                n_eval_episodes=n_eval_episodes,
+                base_seed=self.current_config.get('validation_seed', 1000),
+                max_workers=max_workers
+            )
+            thread.episode_completed.connect(self.validation_progress.emit)
+            thread.validation_completed.connect(self._on_validation_completed)
+            thread.validation_cancelled.connect(self._on_validation_cancelled)
+            thread.validation_error.connect(self.error_occurred.emit)
+            # El directorio temporal se borra al terminar el hilo (éxito, cancelación o error)
+            validation_dir = self._validation_dir
+            thread.finished.connect(lambda: self._cleanup_validation_dir(validation_dir))
+            return thread
+
+        except Exception as e:
+            self._cleanup_validation_dir()
+            error_msg = f"Error preparando validación: {str(e)}"
+            print(f"ERROR: {error_msg}")
+            self.error_occurred.emit(error_msg)
+            return None
+
+    def _on_validation_completed(self, validation_results: Dict[str, Any]):
+        """Callback al terminar la validación paralela"""
+        self.latest_validation = validation_results
+        self._save_validation_results(validation_results)
+
+        print(f"[OK] Validación completada: {validation_results.get('n_eval_episodes', 0)} episodios")
+        for metric, stats in validation_results.get('summary', {}).items():
+            print(f"   {metric}: {stats['mean']:.4f} (IC95% {stats['ci_low']:.4f} - {stats['ci_high']:.4f})")
+
+        self.validation_completed.emit(validation_results)
 
-    def _validate_in_environment(self, env_type: str, n_eval_episodes: int = 10):
-        """[DESHABILITADO] Validar en ambiente específico"""
-        return None
+    def _on_validation_cancelled(self, partial_results: Dict[str, Any]):
+        """Callback al detener la validación: los resultados parciales no se guardan"""
+        print(f"[INFO] Validación cancelada tras {partial_results.get('n_eval_episodes', 0)} episodios")
+        self.validation_cancelled.emit(partial_results)
+
+    def _cleanup_validation_dir(self, validation_dir=None):
+        """Borrar el directorio temporal con la copia del modelo de validación"""
+        validation_dir = validation_dir or self._validation_dir
+        if validation_dir is None:
+            return
+        validation_dir.cleanup()
+        if validation_dir is self._validation_dir:
+            self._validation_dir = None
 
     def _save_validation_results(self, validation_results: Dict[str, Any]):
-        """[DESHABILITADO] Guardar resultados de validación"""
-        pass
+        """Guardar resultados de validación en la carpeta models"""
+        try:
+            ponlab_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+            models_dir = os.path.join(ponlab_dir, "models")
+            os.makedirs(models_dir, exist_ok=True)
+
+            session_id = self.current_session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+            results_path = os.path.join(models_dir, f"validation_{session_id}.json")
+            with open(results_path, 'w') as f:
+                json.dump({
+                    'session_id': self.current_session_id,
+                    'timestamp': datetime.now().isoformat(),
+                    'configuration': self.current_config,
+                    **validation_results
+                }, f, indent=2)
+
+            print(f"📄 Validación guardada: {results_path}")
+
+        except Exception as e:
+            print(f"WARNING: Error guardando validación: {e}")
 
     def save_model(self, custom_name: Optional[str] = None) -> bool:
         """
@@ -484,6 +614,7 @@ class TrainingManager(QObject):
                 'timestamp': datetime.now().isoformat(),
                 'canvas_metrics': canvas_metrics,
                 'training_status': training_status,
+                'telemetry': self.latest_telemetry,
                 'session_id': self.current_session_id
             }
             
@@ -508,7 +639,11 @@ class TrainingManager(QObject):
                 'configuration': self.current_config,
                 'model_path': model_path,
                 'total_metrics_samples': len(self.session_metrics),
-                'conversion_stats': {'success_rate': 1.0, 'total_conversions': len(self.session_metrics)}
+                'conversion_stats': {'success_rate': 1.0, 'total_conversions': len(self.session_metrics)},
+                'training_telemetry': {
+                    'final': self.latest_telemetry,
+                    'history': list(self.telemetry_history)
+                }
             }
             
             # Guardar en archivo JSON junto al modelo
@@ -535,6 +670,13 @@ class TrainingManager(QObject):
         
         # Agregar información de sesión
         ponlab_metrics['session_id'] = self.current_session_id
+
+        # Telemetría de rendimiento
+        telemetry = ponlab_metrics.get('telemetry')
+        if telemetry:
+            self.latest_telemetry = telemetry
+            self.telemetry_history.append(telemetry)
+            self.telemetry_updated.emit(telemetry)
         
         # Emitir progreso
         self.training_progress.emit(ponlab_metrics)
@@ -579,6 +721,12 @@ class TrainingManager(QObject):
             if self.is_training:
                 self.stop_training()
             
+            # Detener validación en curso
+            if self.validation_thread is not None and self.validation_thread.isRunning():
+                self.validation_thread.stop()
+                self.validation_thread.wait()
+            self._cleanup_validation_dir()
+
             # Limpiar componentes
             self.rl_adapter.cleanup()
             self.env_bridge.clear_mapping()
@@ -589,6 +737,8 @@ class TrainingManager(QObject):
             # Limpiar estado
             self.current_session_id = None
             self.session_metrics.clear()
+            self.latest_telemetry = {}
+            self.telemetry_history.clear()
             
             print("TrainingManager limpiado")
             
@@ -0,0 +1,193 @@
+"""
+Training Telemetry
+Telemetría de rendimiento del entrenamiento RL: pasos/s, eventos por paso,
+reparto de tiempo entre simulación, observación, inferencia y gradientes
+"""
+
+import os
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Snapshots de telemetría retenidos en los historiales (por entrenamiento)
+TELEMETRY_HISTORY_SIZE = 500
+
+
+def get_process_memory_mb() -> float:
+    """
+    Obtener memoria residente del proceso en MB
+
+    Usa psutil si está disponible; en Unix cae a getrusage (pico de RSS).
+
+    Returns:
+        Memoria en MB (0.0 si no se puede medir)
+    """
+    if PSUTIL_AVAILABLE:
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    if RESOURCE_AVAILABLE:
+        # ru_maxrss está en KB en Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return 0.0
+
+
+class TrainingTelemetry:
+    """
+    Acumulador de telemetría de rendimiento durante model.learn()
+
+    El tiempo de simulación, observación y recompensa lo mide el entorno
+    (get_perf_stats). El tiempo de gradientes se mide envolviendo model.train.
+    La inferencia es el resto del intervalo entre pasos del callback.
+    """
+
+    def __init__(self, env=None, history_size: int = TELEMETRY_HISTORY_SIZE):
+        """
+        Args:
+            env: Entorno RL sin envolver (RealPonEnv expone get_perf_stats)
+            history_size: Número máximo de snapshots guardados en el historial
+        """
+        self.env = env
+        self.history = deque(maxlen=history_size)
+        self.episode_memory = deque(maxlen=history_size)
+        self.reset()
+
+    def reset(self):
+        """Reiniciar contadores de telemetría"""
+        self.start_time = time.perf_counter()
+        self.last_step_time = None
+        self.steps = 0
+        self.episodes = 0
+        self.gradient_time = 0.0
+        self.gradient_updates = 0
+        self.inference_time = 0.0
+        self._gradient_time_at_last_step = 0.0
+        self._env_time_at_last_step = 0.0
+        self.episode_start_memory = get_process_memory_mb()
+        self.history.clear()
+        self.episode_memory.clear()
+
+    def attach_model(self, model):
+        """
+        Envolver model.train para medir el tiempo de actualización de gradientes
+
+        Si el modelo ya fue envuelto por otra telemetría (entrenamiento
+        continuado sobre el mismo modelo), se vuelve a envolver el método
+        original para que los tiempos se acumulen en esta instancia.
+
+        Args:
+            model: Modelo stable-baselines3
+        """
+        original_train = getattr(model, 'train', None)
+        if original_train is None:
+            return
+        original_train = getattr(original_train, '_telemetry_original', original_train)
+
+        def timed_train(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_train(*args, **kwargs)
+            finally:
+                self.gradient_time += time.perf_counter() - start
+                self.gradient_updates += 1
+
+        timed_train._telemetry_original = original_train
+        model.train = timed_train
+
+    def _get_env_stats(self) -> Dict[str, float]:
+        """Obtener estadísticas de rendimiento del entorno (si las expone)"""
+        if self.env is not None and hasattr(self.env, 'get_perf_stats'):
+            return self.env.get_perf_stats()
+        return {}
+
+    def on_step(self, locals_dict: Dict[str, Any]):
+        """
+        Registrar un paso de entorno (llamado desde el callback de entrenamiento)
+
+        Args:
+            locals_dict: locals() de stable-baselines3 en el paso actual
+        """
+        now = time.perf_counter()
+        env_stats = self._get_env_stats()
+        env_time = env_stats.get('step_time_s', 0.0)
+
+        if self.last_step_time is not None:
+            interval = now - self.last_step_time
+            env_delta = env_time - self._env_time_at_last_step
+            gradient_delta = self.gradient_time - self._gradient_time_at_last_step
+            self.inference_time += max(interval - env_delta - gradient_delta, 0.0)
+
+        self.last_step_time = now
+        self._env_time_at_last_step = env_time
+        self._gradient_time_at_last_step = self.gradient_time
+        self.steps += 1
+
+        dones = locals_dict.get('dones')
+        if dones is not None:
+            for done in dones:
+                if done:
+                    self.on_episode_end()
+
+    def on_episode_end(self):
+        """Registrar fin de episodio y crecimiento de memoria durante el mismo"""
+        current_memory = get_process_memory_mb()
+        self.episode_memory.append(current_memory - self.episode_start_memory)
+        self.episode_start_memory = current_memory
+        self.episodes += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Obtener telemetría actual y agregarla al historial
+
+        Returns:
+            Dict con steps_per_second, events_per_step, time_split (s y %) y
+            memory_growth_mb_per_episode
+        """
+        elapsed = time.perf_counter() - self.start_time
+        env_stats = self._get_env_stats()
+        env_steps = env_stats.get('steps', 0)
+
+        time_split = {
+            'simulation': env_stats.get('simulation_time_s', 0.0),
+            'observation': env_stats.get('observation_time_s', 0.0),
+            'reward': env_stats.get('reward_time_s', 0.0),
+            'inference': self.inference_time,
+            'gradient': self.gradient_time
+        }
+        accounted = sum(time_split.values())
+        time_split_percent = {
+            key: (value / accounted) * 100 if accounted > 0 else 0.0
+            for key, value in time_split.items()
+        }
+
+        memory_growth = (sum(self.episode_memory) / len(self.episode_memory)) if self.episode_memory else 0.0
+
+        data = {
+            'elapsed_s': elapsed,
+            'steps': self.steps,
+            'episodes': self.episodes,
+            'steps_per_second': self.steps / elapsed if elapsed > 0 else 0.0,
+            'events_per_step': (env_stats.get('events', 0) / env_steps) if env_steps > 0 else 0.0,
+            'gradient_updates': self.gradient_updates,
+            'time_split_s': time_split,
+            'time_split_percent': time_split_percent,
+            'memory_mb': get_process_memory_mb(),
+            'memory_growth_mb_per_episode': memory_growth
+        }
+
+        self.history.append(data)
+        return data
+
+    def get_history(self):
+        """Obtener historial de snapshots"""
+        return list(self.history)
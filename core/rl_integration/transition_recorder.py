@@ -0,0 +1,204 @@
+"""
+Transition Recorder
+Captura de transiciones (observación, asignación como acción, componentes de
+recompensa) desde simulaciones con DBA heurísticos (IPACT, GIANT, ThreePhases)
+para preentrenamiento offline por behaviour cloning
+"""
+
+import os
+import json
+import glob
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .reward_functions import calculate_pon_reward, get_reward_components
+
+# Orden fijo de componentes de recompensa guardados en cada shard
+REWARD_COMPONENT_KEYS = [
+    'utilization_efficiency',
+    'avg_satisfaction',
+    'fairness',
+    'delay_penalty',
+    'buffer_penalty'
+]
+
+
+class TransitionRecorder:
+    """
+    Grabador de transiciones en shards .npz comprimidos
+
+    Se conecta a HybridOLT._execute_dba_algorithm mediante
+    HybridOLT.enable_transition_recording(). El formato de observación es el
+    mismo que construye RealPonEnv (SmartRLDBAAlgorithm._create_observation) y
+    la acción es la asignación del DBA normalizada a pesos que suman 1, que es
+    como SmartRLDBAAlgorithm interpreta las acciones.
+    """
+
+    def __init__(self, output_dir: str, num_onus: int,
+                 channel_capacity_mbps: float = 1024.0,
+                 shard_size: int = 10000,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            output_dir: Directorio donde se escriben los shards
+            num_onus: Número de ONUs de la observación (debe coincidir con el modelo)
+            channel_capacity_mbps: Capacidad del canal en Mbps
+            shard_size: Transiciones por shard
+            metadata: Información adicional para el manifiesto (algoritmo, escenario...)
+        """
+        self.output_dir = output_dir
+        self.num_onus = num_onus
+        self.channel_capacity = channel_capacity_mbps
+        self.shard_size = shard_size
+        self.metadata = metadata or {}
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.shard_index = len(glob.glob(os.path.join(self.output_dir, 'shard_*.npz')))
+        self.total_transitions = 0
+        self._reset_buffers()
+
+    def _reset_buffers(self):
+        """Vaciar buffers del shard actual"""
+        self._observations: List[np.ndarray] = []
+        self._actions: List[np.ndarray] = []
+        self._rewards: List[float] = []
+        self._components: List[List[float]] = []
+        self._times: List[float] = []
+
+    def record(self, onus: Dict[str, Any], reports: Dict[str, Dict[str, int]],
+               allocations: Dict[str, float], current_time: float):
+        """
+        Registrar una decisión del DBA
+
+        Args:
+            onus: ONUs del OLT {onu_id: HybridONU}
+            reports: Reports del ciclo {onu_id: {tcont_id: bytes}}
+            allocations: Asignaciones del DBA {onu_id: MB}
+            current_time: Tiempo del ciclo de polling
+        """
+        sorted_onu_ids = sorted(onus.keys())[:self.num_onus]
+
+        requests_mb = np.zeros(self.num_onus, dtype=np.float32)
+        delays = np.zeros(self.num_onus, dtype=np.float32)
+        buffers = np.zeros(self.num_onus, dtype=np.float32)
+        allocated_mb = np.zeros(self.num_onus, dtype=np.float32)
+
+        for i, onu_id in enumerate(sorted_onu_ids):
+            onu = onus[onu_id]
+            requests_mb[i] = sum(reports.get(onu_id, {}).values()) / (1024 * 1024)
+
+            total_delay, packet_count = onu.get_pending_delay_stats(current_time)
+            delays[i] = total_delay / packet_count if packet_count > 0 else 0.0
+
+            total_bytes = sum(q.total_bytes for q in onu.queues.values())
+            max_bytes = sum(q.max_bytes for q in onu.queues.values())
+            buffers[i] = total_bytes / max_bytes if max_bytes > 0 else 0.0
+
+            allocated_mb[i] = allocations.get(onu_id, 0.0)
+
+        # Observación: [requests, delays, buffers, utilización] (igual que RealPonEnv)
+        capacity = self.channel_capacity
+        total_utilization = min(requests_mb.sum() / capacity, 1.0)
+        observation = np.concatenate([
+            np.minimum(requests_mb / capacity, 1.0),
+            np.minimum(delays / 0.1, 1.0),
+            buffers,
+            np.array([total_utilization], dtype=np.float32)
+        ]).astype(np.float32)
+
+        # Acción: pesos de asignación normalizados
+        allocation_sum = allocated_mb.sum()
+        if allocation_sum > 0:
+            action = allocated_mb / allocation_sum
+        else:
+            action = np.zeros(self.num_onus, dtype=np.float32)
+
+        # Recompensa con la misma normalización que RealPonEnv
+        onu_requests = np.minimum(requests_mb * 1024 * 1024 / (capacity * 0.001), 1.0)
+        components = get_reward_components(onu_requests, allocated_mb, delays, buffers, capacity)
+        reward = calculate_pon_reward(onu_requests, allocated_mb, delays, buffers, capacity)
+
+        self._observations.append(observation)
+        self._actions.append(action.astype(np.float32))
+        self._rewards.append(reward)
+        self._components.append([components[key] for key in REWARD_COMPONENT_KEYS])
+        self._times.append(current_time)
+        self.total_transitions += 1
+
+        if len(self._observations) >= self.shard_size:
+            self.flush()
+
+    def flush(self) -> Optional[str]:
+        """
+        Escribir las transiciones pendientes en un shard comprimido
+
+        Returns:
+            Ruta del shard escrito o None si no había transiciones
+        """
+        if not self._observations:
+            return None
+
+        shard_path = os.path.join(self.output_dir, f'shard_{self.shard_index:05d}.npz')
+        np.savez_compressed(
+            shard_path,
+            observations=np.stack(self._observations),
+            actions=np.stack(self._actions),
+            rewards=np.asarray(self._rewards, dtype=np.float32),
+            reward_components=np.asarray(self._components, dtype=np.float32),
+            times=np.asarray(self._times, dtype=np.float64)
+        )
+
+        self.shard_index += 1
+        self._reset_buffers()
+        return shard_path
+
+    def close(self):
+        """Escribir el último shard y el manifiesto del dataset"""
+        self.flush()
+
+        manifest = {
+            'num_onus': self.num_onus,
+            'observation_size': self.num_onus * 3 + 1,
+            'action_size': self.num_onus,
+            'channel_capacity_mbps': self.channel_capacity,
+            'reward_component_keys': REWARD_COMPONENT_KEYS,
+            'shards': self.shard_index,
+            'updated': datetime.now().isoformat(),
+            'metadata': self.metadata
+        }
+        manifest_path = os.path.join(self.output_dir, 'manifest.json')
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        print(f"[OK] TransitionRecorder: {self.total_transitions} transiciones guardadas en {self.output_dir}")
+
+
+def load_transition_dataset(dataset_dir: str, num_onus: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Cargar todos los shards .npz de un directorio de transiciones
+
+    Args:
+        dataset_dir: Directorio con shards (se busca recursivamente)
+        num_onus: Si se indica, se descartan shards con otro número de ONUs
+
+    Returns:
+        Dict con observations, actions, rewards, reward_components y times
+    """
+    shard_paths = sorted(glob.glob(os.path.join(dataset_dir, '**', 'shard_*.npz'), recursive=True))
+
+    arrays = {key: [] for key in ('observations', 'actions', 'rewards', 'reward_components', 'times')}
+    for shard_path in shard_paths:
+        with np.load(shard_path) as shard:
+            if num_onus is not None and shard['actions'].shape[1] != num_onus:
+                print(f"[WARNING] Shard omitido (ONUs incompatibles): {shard_path}")
+                continue
+            for key in arrays:
+                arrays[key].append(shard[key])
+
+    if not arrays['observations']:
+        return {}
+
+    return {key: np.concatenate(values) for key, values in arrays.items()}
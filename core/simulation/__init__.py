@@ -9,6 +9,8 @@ from .pon_orchestrator import SimulatorStatus, SimulationResult, PONOrchestrator
 from .pon_cycle_simulator import *
 from .pon_event_simulator import OptimizedHybridPONSimulator
 from .pon_netsim import EventEvaluator as NetSimEventEvaluator, NetSim
+from .live_metrics import LiveMetricsCollector, MetricRing, RecordRing, SlidingWindowArrays
+from .multi_tree import run_multi_tree_simulation, merge_tree_results
 
 __all__ = [
     'SimulationManager',
@@ -19,5 +21,11 @@ __all__ = [
     'PONOrchestrator',
     'OptimizedHybridPONSimulator',
     'NetSimEventEvaluator',
-    'NetSim'
+    'NetSim',
+    'LiveMetricsCollector',
+    'MetricRing',
+    'RecordRing',
+    'SlidingWindowArrays',
+    'run_multi_tree_simulation',
+    'merge_tree_results'
 ]
@@ -0,0 +1,232 @@
+"""
+Live Metrics
+Métricas decimadas durante una simulación por eventos: el simulador agrega
+por intervalos de tiempo simulado (throughput, niveles de buffer, cuantiles
+de delay) y los publica en buffers circulares de capacidad fija que la UI
+consume de forma incremental
+"""
+
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class MetricRing:
+    """
+    Buffer circular de capacidad fija para muestras (tiempo, valores)
+
+    'total' cuenta las muestras escritas desde el inicio y sirve de cursor:
+    cada lector guarda el último total leído y pide solo lo nuevo.
+    """
+
+    def __init__(self, capacity: int, width: int = 1):
+        self.capacity = capacity
+        self.width = width
+        self.times = np.zeros(capacity)
+        self.values = np.zeros((capacity, width))
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def append(self, time: float, values: Sequence[float]):
+        """Escribir una muestra (sobrescribe la más antigua si está lleno)"""
+        with self._lock:
+            slot = self.total % self.capacity
+            self.times[slot] = time
+            self.values[slot] = values
+            self.total += 1
+
+    def read_since(self, cursor: int) -> Tuple[int, np.ndarray, np.ndarray]:
+        """
+        Leer las muestras escritas desde cursor
+
+        Si el lector se retrasó más de la capacidad, recibe solo las últimas
+        'capacity' muestras.
+
+        Returns:
+            (nuevo cursor, tiempos, valores de forma (n, width))
+        """
+        with self._lock:
+            total = self.total
+            start = max(cursor, total - self.capacity)
+            if start >= total:
+                return total, self.times[:0].copy(), self.values[:0].copy()
+
+            slots = np.arange(start, total) % self.capacity
+            return total, self.times[slots], self.values[slots]
+
+
+class RecordRing:
+    """
+    Buffer circular de capacidad fija para registros arbitrarios (dicts, listas)
+
+    Usa el mismo cursor que MetricRing: 'total' cuenta los registros escritos
+    desde el inicio y read_since(cursor) devuelve solo los posteriores.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items: List[Any] = [None] * capacity
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def append(self, item: Any):
+        """Escribir un registro (sobrescribe el más antiguo si está lleno)"""
+        with self._lock:
+            self._items[self.total % self.capacity] = item
+            self.total += 1
+
+    def extend(self, items: Iterable[Any]):
+        """Escribir varios registros"""
+        with self._lock:
+            for item in items:
+                self._items[self.total % self.capacity] = item
+                self.total += 1
+
+    def read_since(self, cursor: int) -> Tuple[int, List[Any]]:
+        """
+        Leer los registros escritos desde cursor (como mucho 'capacity')
+
+        Returns:
+            (nuevo cursor, registros en orden de escritura)
+        """
+        with self._lock:
+            total = self.total
+            start = max(cursor, total - self.capacity, 0)
+            return total, [self._items[i % self.capacity] for i in range(start, total)]
+
+    def latest(self, count: int) -> List[Any]:
+        """Últimos count registros en orden de escritura"""
+        return self.read_since(self.total - count)[1]
+
+    def to_list(self) -> List[Any]:
+        """Todos los registros retenidos"""
+        return self.read_since(0)[1]
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.to_list())
+
+
+class LiveMetricsCollector:
+    """
+    Agregador de métricas en vivo para PONSimulator (modo eventos)
+
+    Acumula bytes y delays del intervalo actual; al cruzar el final del
+    intervalo publica una muestra por serie. El coste en el bucle de eventos
+    es una comparación por evento y un append por transmisión.
+    """
+
+    # Muestras de delay retenidas por intervalo para los cuantiles (decimación)
+    MAX_DELAY_SAMPLES_PER_BIN = 4096
+
+    def __init__(self, bin_seconds: float = 0.01, capacity: int = 4096):
+        """
+        Args:
+            bin_seconds: Duración del intervalo de agregación (tiempo simulado)
+            capacity: Muestras retenidas por serie
+        """
+        self.bin_seconds = bin_seconds
+        self.capacity = capacity
+        self.onu_ids: List[str] = []
+        self.throughput = MetricRing(capacity, 1)      # Mbps por intervalo
+        self.delay_quantiles = MetricRing(capacity, 2)  # P50, P95 (ms)
+        self.buffer_levels = MetricRing(capacity, 1)   # % por ONU
+        self.next_bin_time = bin_seconds
+        self._bin_bytes = 0
+        self._bin_delays: List[float] = []
+
+    def start(self, onu_ids: Sequence[str]):
+        """Reiniciar series para una nueva simulación"""
+        self.onu_ids = [str(onu_id) for onu_id in onu_ids]
+        self.throughput = MetricRing(self.capacity, 1)
+        self.delay_quantiles = MetricRing(self.capacity, 2)
+        self.buffer_levels = MetricRing(self.capacity, max(len(self.onu_ids), 1))
+        self.next_bin_time = self.bin_seconds
+        self._bin_bytes = 0
+        self._bin_delays = []
+
+    def record_transmission(self, transmitted_bytes: int, delays: Sequence[float]):
+        """Acumular una transmisión completada en el intervalo actual"""
+        self._bin_bytes += transmitted_bytes
+        room = self.MAX_DELAY_SAMPLES_PER_BIN - len(self._bin_delays)
+        if room > 0:
+            self._bin_delays.extend(delays[:room])
+
+    def close_bins(self, sim_time: float, buffer_sampler: Callable[[], Sequence[float]]):
+        """
+        Publicar el intervalo terminado (llamar cuando sim_time >= next_bin_time)
+
+        Los intervalos vacíos intermedios no generan muestras; el siguiente
+        intervalo es el que contiene sim_time.
+        """
+        self._publish(self.next_bin_time, buffer_sampler)
+        self.next_bin_time = (np.floor(sim_time / self.bin_seconds) + 1) * self.bin_seconds
+
+    def flush(self, sim_time: float, buffer_sampler: Callable[[], Sequence[float]]):
+        """Publicar el intervalo parcial al terminar la simulación"""
+        bin_start = self.next_bin_time - self.bin_seconds
+        if sim_time > bin_start:
+            self._publish(sim_time, buffer_sampler, duration=sim_time - bin_start)
+
+    def _publish(self, bin_time: float, buffer_sampler: Callable[[], Sequence[float]],
+                 duration: Optional[float] = None):
+        duration = duration or self.bin_seconds
+        self.throughput.append(bin_time, (self._bin_bytes * 8 / duration / 1e6,))
+
+        if self._bin_delays:
+            p50, p95 = np.percentile(self._bin_delays, [50, 95])
+            self.delay_quantiles.append(bin_time, (p50 * 1000, p95 * 1000))
+
+        if self.onu_ids:
+            self.buffer_levels.append(bin_time, buffer_sampler())
+
+        self._bin_bytes = 0
+        self._bin_delays = []
+
+
+class SlidingWindowArrays:
+    """
+    Arrays preasignados para dibujar una serie en vivo (ventana deslizante)
+
+    Las muestras nuevas se copian al final del bloque; cuando se llena, la
+    ventana vigente se mueve al principio (coste amortizado O(1) por muestra).
+    view() devuelve vistas sin copiar para pasarlas a setData().
+    """
+
+    def __init__(self, capacity: int, width: int = 1):
+        self.capacity = capacity
+        self.x = np.zeros(2 * capacity)
+        self.y = np.zeros((2 * capacity, width))
+        self.start = 0
+        self.end = 0
+
+    def append(self, times: np.ndarray, values: np.ndarray):
+        """Añadir muestras (tiempos y valores de forma (n, width))"""
+        n = len(times)
+        if n == 0:
+            return
+        if n >= self.capacity:
+            times, values = times[-self.capacity:], values[-self.capacity:]
+            n = self.capacity
+            self.start = self.end = 0
+
+        if self.end + n > len(self.x):
+            keep = min(self.end - self.start, self.capacity - n)
+            self.x[:keep] = self.x[self.end - keep:self.end]
+            self.y[:keep] = self.y[self.end - keep:self.end]
+            self.start, self.end = 0, keep
+
+        self.x[self.end:self.end + n] = times
+        self.y[self.end:self.end + n] = values
+        self.end += n
+        self.start = max(self.start, self.end - self.capacity)
+
+    def view(self, column: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Vistas (x, y) de la ventana actual para una columna"""
+        return self.x[self.start:self.end], self.y[self.start:self.end, column]
+
+    def __len__(self):
+        return self.end - self.start
@@ -0,0 +1,317 @@
+"""
+Multi Tree
+Simulación de topologías con varios OLT: cada árbol PON (un OLT y sus ONUs)
+se simula en su propio proceso trabajador y los resultados se combinan en un
+resumen de red con el desglose por árbol
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Claves de olt_stats que pesan demasiado para devolverlas entre procesos
+_HEAVY_OLT_STATS = ('transmission_log', 'buffer_snapshots')
+
+
+def group_onus_by_olt(olts: List[Any], onus: List[Any], connection_manager) -> Tuple[Dict[Any, List[Any]], List[Any]]:
+    """
+    Agrupar las ONUs del canvas por el OLT al que están conectadas
+
+    Args:
+        olts: Dispositivos OLT
+        onus: Dispositivos ONU
+        connection_manager: ConnectionManager del canvas
+
+    Returns:
+        ({olt: [onus]} en el orden de olts, ONUs sin OLT conectado)
+    """
+    trees = {olt: [] for olt in olts}
+    unattached = []
+
+    for onu in onus:
+        for connection in connection_manager.get_connections_for_device(onu):
+            other = connection.get_other_device(onu)
+            if other in trees:
+                trees[other].append(onu)
+                break
+        else:
+            unattached.append(onu)
+
+    return trees, unattached
+
+
+def simulate_pon_tree(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Simular un árbol PON en un proceso trabajador
+
+    Args:
+        task: Dict con tree_id, onu_configs, config (de PONAdapter), algorithm,
+            duration y opcionalmente rl_model_path
+
+    Returns:
+        Dict con tree_id, success y results (compactados) o error
+    """
+    from ..pon.pon_adapter import PONAdapter
+
+    tree_id = task['tree_id']
+    adapter = PONAdapter()
+    adapter.config.update(task['config'])
+    adapter.set_simulation_mode("events")
+
+    if task.get('rl_model_path'):
+        success, message = adapter.load_rl_model(task['rl_model_path'])
+        if not success:
+            return {'tree_id': tree_id, 'success': False, 'error': message}
+    adapter.set_dba_algorithm(task['algorithm'])
+
+    onu_configs = task['onu_configs']
+    success, message = adapter._initialize_simulator_from_topology(len(onu_configs), onu_configs)
+    if not success:
+        return {'tree_id': tree_id, 'success': False, 'error': message}
+
+    success, results = adapter.run_event_simulation(task['duration'])
+    if not success:
+        return {'tree_id': tree_id, 'success': False, 'error': results}
+
+    return {'tree_id': tree_id, 'success': True, 'results': _compact_tree_results(results)}
+
+
+def _compact_tree_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reducir los resultados de un árbol a lo necesario para combinarlos
+
+    Se descartan las muestras individuales de delay/throughput y los registros
+    crudos del OLT; los historiales agregados se conservan.
+    """
+    summary = results['simulation_summary']
+    episode_metrics = dict(summary['episode_metrics'])
+    episode_metrics['delay_samples'] = len(episode_metrics.pop('delays', []))
+    episode_metrics.pop('throughputs', None)
+
+    olt_stats = {key: value for key, value in results.get('olt_stats', {}).items()
+                 if key not in _HEAVY_OLT_STATS}
+    if 'olt_stats' in olt_stats:
+        counters = dict(olt_stats['olt_stats'])
+        counters.pop('channel_utilization_samples', None)
+        olt_stats['olt_stats'] = counters
+
+    return {
+        'simulation_summary': {
+            'simulation_stats': dict(summary['simulation_stats']),
+            'performance_metrics': dict(summary['performance_metrics']),
+            'episode_metrics': episode_metrics
+        },
+        'olt_stats': olt_stats
+    }
+
+
+def _merge_history_sum(histories: List[List[Dict[str, float]]]) -> List[Dict[str, float]]:
+    """Sumar historiales {'time', 'value'} punto a punto (hasta el más corto)"""
+    length = min((len(history) for history in histories), default=0)
+    return [
+        {'time': histories[0][i]['time'], 'value': sum(history[i]['value'] for history in histories)}
+        for i in range(length)
+    ]
+
+
+def _merge_history_weighted(histories: List[List[Dict[str, float]]], weights: List[float]) -> List[Dict[str, float]]:
+    """Media ponderada de historiales {'time', 'value'} punto a punto (hasta el más corto)"""
+    length = min((len(history) for history in histories), default=0)
+    total_weight = sum(weights)
+    if total_weight <= 0:
+        weights = [1.0] * len(histories)
+        total_weight = float(len(histories))
+
+    return [
+        {
+            'time': histories[0][i]['time'],
+            'value': sum(history[i]['value'] * weight for history, weight in zip(histories, weights)) / total_weight
+        }
+        for i in range(length)
+    ]
+
+
+def _merge_buffer_histories(tree_histories: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """
+    Combinar buffer_levels_history de varios árboles en snapshots de red
+
+    Los IDs de ONU se prefijan con el árbol solo si se repiten entre árboles.
+    """
+    seen = {}
+    for tree_id, history in tree_histories:
+        if history:
+            for onu_id in history[0]['buffers']:
+                seen[onu_id] = seen.get(onu_id, 0) + 1
+
+    length = min((len(history) for _, history in tree_histories), default=0)
+    merged = []
+    for i in range(length):
+        buffers = {}
+        for tree_id, history in tree_histories:
+            for onu_id, levels in history[i]['buffers'].items():
+                key = f"{tree_id}/{onu_id}" if seen.get(onu_id, 0) > 1 else onu_id
+                buffers[key] = levels
+        merged.append({'time': tree_histories[0][1][i]['time'], 'buffers': buffers})
+    return merged
+
+
+def merge_tree_results(tree_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combinar los resultados de varios árboles en un resumen de red
+
+    Contadores y throughput se suman; el delay medio se pondera por
+    transmisiones exitosas y la utilización es la media de los árboles.
+    El desglose por árbol queda en 'trees'.
+
+    Args:
+        tree_results: Salidas exitosas de simulate_pon_tree()
+
+    Returns:
+        Resultados con el mismo formato que una simulación de un solo árbol
+    """
+    summaries = [r['results']['simulation_summary'] for r in tree_results]
+    stats = [s['simulation_stats'] for s in summaries]
+    performance = [s['performance_metrics'] for s in summaries]
+    episodes = [s['episode_metrics'] for s in summaries]
+    n_trees = len(tree_results)
+
+    total_requests = sum(s['total_requests'] for s in stats)
+    successful = sum(s['successful_requests'] for s in stats)
+    weights = [float(s['successful_requests']) for s in stats]
+    delay_weight = sum(weights)
+
+    if delay_weight > 0:
+        mean_delay = sum(p['mean_delay'] * w for p, w in zip(performance, weights)) / delay_weight
+    else:
+        mean_delay = 0.0
+
+    olt_stats_list = [r['results']['olt_stats'] for r in tree_results]
+    olt_counters = {}
+    for olt_stats in olt_stats_list:
+        for key, value in olt_stats.get('olt_stats', {}).items():
+            if isinstance(value, (int, float)):
+                olt_counters[key] = olt_counters.get(key, 0) + value
+
+    trees = {}
+    for result, summary in zip(tree_results, summaries):
+        trees[result['tree_id']] = {
+            'num_onus': result.get('num_onus', 0),
+            'simulation_stats': summary['simulation_stats'],
+            'performance_metrics': summary['performance_metrics'],
+            'total_transmitted': summary['episode_metrics'].get('total_transmitted', 0.0)
+        }
+
+    return {
+        'simulation_summary': {
+            'simulation_stats': {
+                'total_steps': max((s.get('total_steps', 0) for s in stats), default=0),
+                'simulation_time': max((s.get('simulation_time', 0) for s in stats), default=0),
+                'simulation_duration': max((s.get('simulation_duration', 0) for s in stats), default=0),
+                'total_requests': total_requests,
+                'successful_requests': successful,
+                'success_rate': (successful / max(total_requests, 1)) * 100,
+                'events_processed': sum(s.get('events_processed', 0) for s in stats),
+                'num_trees': n_trees
+            },
+            'performance_metrics': {
+                'mean_delay': mean_delay,
+                'mean_throughput': sum(p['mean_throughput'] for p in performance),
+                'network_utilization': sum(p['network_utilization'] for p in performance) / max(n_trees, 1),
+                'total_capacity_served': sum(p.get('total_capacity_served', 0) for p in performance)
+            },
+            'episode_metrics': {
+                'delays': [],
+                'throughputs': [],
+                'delay_history': _merge_history_weighted(
+                    [e.get('delay_history', []) for e in episodes], weights
+                ),
+                'throughput_history': _merge_history_sum(
+                    [e.get('throughput_history', []) for e in episodes]
+                ),
+                'buffer_levels_history': _merge_buffer_histories(
+                    [(r['tree_id'], e.get('buffer_levels_history', [])) for r, e in zip(tree_results, episodes)]
+                ),
+                'total_transmitted': sum(e.get('total_transmitted', 0) for e in episodes),
+                'total_requests': total_requests
+            }
+        },
+        'olt_stats': {
+            'olt_stats': olt_counters,
+            'current_cycle': max((o.get('current_cycle', 0) for o in olt_stats_list), default=0),
+            'channel_capacity': sum(o.get('channel_capacity', 0) for o in olt_stats_list),
+            'average_utilization': sum(o.get('average_utilization', 0) for o in olt_stats_list) / max(n_trees, 1)
+        },
+        'trees': trees
+    }
+
+
+def run_multi_tree_simulation(tasks: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                              callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Simular cada árbol en un proceso y combinar los resultados
+
+    Args:
+        tasks: Una tarea de simulate_pon_tree() por árbol
+        max_workers: Procesos del pool (None = un proceso por árbol, hasta el número de CPUs)
+        callback: Recibe ("update", progreso) al terminar cada árbol
+
+    Returns:
+        Resultados combinados (ver merge_tree_results) con 'failed_trees'
+    """
+    max_workers = max_workers or min(len(tasks), multiprocessing.cpu_count())
+    duration = max((task['duration'] for task in tasks), default=0)
+    num_onus = {task['tree_id']: len(task['onu_configs']) for task in tasks}
+    completed = []
+    failed = {}
+
+    # 'spawn' evita heredar el estado de Qt del proceso principal
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {executor.submit(simulate_pon_tree, task): task['tree_id'] for task in tasks}
+        for future in as_completed(futures):
+            tree_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'tree_id': tree_id, 'success': False, 'error': str(e)}
+
+            if result['success']:
+                result['num_onus'] = num_onus[tree_id]
+                completed.append(result)
+            else:
+                failed[tree_id] = result['error']
+                print(f"WARNING Árbol PON {tree_id} falló: {result['error']}")
+
+            if callback:
+                callback("update", _progress_summary(completed, len(completed) + len(failed), len(futures), duration))
+
+    if not completed:
+        raise RuntimeError(f"Ningún árbol PON completó la simulación: {failed}")
+
+    # Desglose en el orden de la topología, no en el de finalización
+    order = {task['tree_id']: i for i, task in enumerate(tasks)}
+    completed.sort(key=lambda r: order[r['tree_id']])
+
+    merged = merge_tree_results(completed)
+    merged['failed_trees'] = failed
+    return merged
+
+
+def _progress_summary(completed: List[Dict[str, Any]], finished: int, total_trees: int,
+                      duration: float) -> Dict[str, Any]:
+    """Resumen de progreso con el mismo formato que el del simulador por eventos"""
+    stats = [r['results']['simulation_summary']['simulation_stats'] for r in completed]
+    episodes = [r['results']['simulation_summary']['episode_metrics'] for r in completed]
+    olt_counters = [r['results']['olt_stats'].get('olt_stats', {}) for r in completed]
+    return {
+        'sim_time': duration * finished / total_trees if total_trees else 0.0,
+        'duration': duration,
+        'progress': finished / total_trees * 100 if total_trees else 100.0,
+        'events_processed': sum(s.get('events_processed', 0) for s in stats),
+        'cycles_executed': sum(c.get('cycles_executed', 0) for c in olt_counters),
+        'total_requests': sum(s['total_requests'] for s in stats),
+        'successful_transmissions': sum(s['successful_requests'] for s in stats),
+        'total_transmitted_mb': sum(e.get('total_transmitted', 0) for e in episodes),
+        'trees_completed': finished,
+        'trees_total': total_trees
+    }
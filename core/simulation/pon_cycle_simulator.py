@@ -7,6 +7,7 @@ from typing import Optional, Dict, Any, List
 from ..pon.pon_olt import OLT
 from ..algorithms.pon_dba_cycle import DBACycleManager, DBAResult, DBAAllocation
 from ..data.pon_request import Request
+from ..utilities.cycle_trace import CYCLE_TRACE
 
 
 class EventEvaluator:
@@ -96,9 +97,9 @@ class RealisticNetSim:
                 
                 callback and callback.on_cycle_end(dba_result)
                 
-                # Log periódico
-                if cycle % 100 == 0 and cycle > 0:
-                    self._print_progress_log(cycle)
+                # Traza periódica de progreso
+                if CYCLE_TRACE.progress and cycle % 100 == 0 and cycle > 0:
+                    self._trace_progress(cycle)
                     
             except Exception as e:
                 print(f"ERROR en ciclo {cycle}: {e}")
@@ -202,9 +203,8 @@ class RealisticNetSim:
             success = True  # Por ahora asumimos éxito
             
             if success:
-                # Remover request del buffer de la ONU
-                if request in onu.buffer:
-                    onu.buffer.remove(request)
+                # Remover request del buffer de la ONU (búsqueda por ID)
+                onu.buffer.pop_request(request.id)
                     
                 # Actualizar estadísticas de la ONU (verificar que existe el atributo)
                 if hasattr(onu, 'successful_transmissions'):
@@ -249,15 +249,12 @@ class RealisticNetSim:
         # Actualizar total de ancho de banda usado
         self.total_bandwidth_used += dba_result.total_bandwidth_used
         
-    def _print_progress_log(self, cycle: int):
-        """Imprimir log de progreso"""
-        mean_delay = self.get_mean_delay()
-        mean_throughput = self.get_mean_throughput()
-        
-        print(f"Ciclo {cycle}: t={self.simulation_time*1000:.1f}ms, "
-              f"Delay: {mean_delay*1000:.2f}ms, "
-              f"Throughput: {mean_throughput:.2f}MB/s, "
-              f"Requests: {self.total_requests_processed}")
+    def _trace_progress(self, cycle: int):
+        """Registrar progreso en la traza de ciclos"""
+        CYCLE_TRACE.record('progress', cycle, self.simulation_time,
+                           v0=self.get_mean_delay(),
+                           v1=self.get_mean_throughput(),
+                           v2=self.total_requests_processed)
               
     def _calculate_final_statistics(self) -> Dict[str, Any]:
         """Calcular estadísticas finales de la simulación"""
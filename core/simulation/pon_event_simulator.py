@@ -5,15 +5,15 @@ Versión mejorada que previene consumo excesivo de memoria y CPU
 
 # FORZAR RECARGA - Import version check
 from ._version_buffer_fix import VERSION, BUFFER_TIMESTAMPS_ENABLED
-print(f"[BUFFER-LOG] ===== PON EVENT SIMULATOR LOADING - VERSION: {VERSION} =====")
 
 from typing import Dict, List, Optional, Any, Callable
 import numpy as np
-from ..events.event_queue import EventQueue, EventType
+from ..events.event_queue import EventQueue, EventType, TICKS_PER_SECOND, to_ticks
 from ..events.pon_event_onu import HybridONU
 from ..events.pon_event_olt import HybridOLT
 from ..utilities.pon_traffic import get_traffic_scenario, calculate_realistic_lambda
 from ..algorithms.pon_dba import DBAAlgorithmInterface, FCFSDBAAlgorithm
+from ..utilities.cycle_trace import CYCLE_TRACE
 
 
 class OptimizedHybridPONSimulator:
@@ -86,6 +86,10 @@ class OptimizedHybridPONSimulator:
         # Inicializar componentes con tasas reducidas
         self._initialize_onus_optimized(traffic_scenario)
         self._initialize_olt(dba_algorithm)
+
+        # Contadores incrementales por paso (consumidos por RealPonEnv)
+        self.step_counters = self._new_step_counters()
+        self._last_dropped_packets = {onu_id: 0 for onu_id in self.onus}
     
     def _initialize_onus_optimized(self, traffic_scenario: str):
         """Inicializar ONUs con tasas de tráfico optimizadas"""
@@ -151,9 +155,10 @@ class OptimizedHybridPONSimulator:
         last_progress_time = 0
         last_cleanup_time = 0
         last_queue_sample_time = 0
+        end_tick = to_ticks(duration_seconds)
 
         while (self.event_queue.has_events() and
-               self.event_queue.peek_next_time() <= duration_seconds and
+               self.event_queue.peek_next_tick() <= end_tick and
                self.is_running):
 
             # Control de recursos cada 1000 eventos
@@ -169,7 +174,7 @@ class OptimizedHybridPONSimulator:
             # ANTES de procesar el evento, verificar si debemos ejecutar polling(s)
             # Esto ejecuta todos los ciclos de 125µs que deberían haber ocurrido
             # entre el último evento y este
-            pollings_executed = self.olt.check_and_execute_polling(self.event_queue, self.simulation_time)
+            pollings_executed = self.olt.check_and_execute_polling(self.event_queue, event.tick)
 
             # Ahora sí procesar el evento
             self._process_event(event)
@@ -292,7 +297,7 @@ class OptimizedHybridPONSimulator:
         for i, onu in enumerate(self.onus.values()):
             # Spread inicial para evitar picos
             spread_time = start_time + (i * 0.001)  # 1ms entre ONUs
-            onu.schedule_first_packet(self.event_queue, spread_time)
+            onu.schedule_first_packet(self.event_queue, to_ticks(spread_time))
 
         # NO programar eventos de polling - ahora son automáticos
         # El polling se ejecutará automáticamente cada 125µs
@@ -323,7 +328,7 @@ class OptimizedHybridPONSimulator:
         # Generar paquete si aún estamos dentro del tiempo de simulación
         # NO verificamos el tamaño de la cola para mantener comportamiento determinista
         if event.timestamp < self.simulation_duration:
-            onu.generate_packet(self.event_queue, event.timestamp)
+            onu.generate_packet(self.event_queue, event.tick)
 
             # Advertencia periódica si la cola crece mucho (pero NO detenemos la simulación)
             pending = self.event_queue.get_pending_events_count()
@@ -359,7 +364,7 @@ class OptimizedHybridPONSimulator:
         if len(self.metrics['delays']) < self.MAX_METRICS_STORED:
             for packet in packets:
                 # Delay: desde que el paquete llegó hasta que termina la transmisión
-                delay = float(event.timestamp - packet.arrival_time)
+                delay = (event.tick - packet.arrival_tick) / TICKS_PER_SECOND
 
                 self.metrics['delays'].append({
                     'delay': delay,
@@ -404,14 +409,61 @@ class OptimizedHybridPONSimulator:
         # Total de paquetes “atendidos” (o intentados) en este fin de grant
         self.metrics['total_requests'] += len(packets)
 
+        # Contadores incrementales del paso actual (sin copiar listas de métricas)
+        counters = self.step_counters
+        if transmitted_bytes > 0:
+            counters['bytes_per_onu'][onu_id] = counters['bytes_per_onu'].get(onu_id, 0) + transmitted_bytes
+        for packet in packets:
+            counters['delay_sum'] += (event.tick - packet.arrival_tick) / TICKS_PER_SECOND
+        counters['delay_count'] += len(packets)
+
         # --- 3) Notificar al OLT (mantén tu lógica existente) ---
         self.olt.handle_transmission_complete(event.data, event.timestamp)
 
     
+    def _new_step_counters(self) -> Dict[str, Any]:
+        """Crear contadores vacíos para un paso"""
+        return {
+            'bytes_per_onu': {},
+            'delay_sum': 0.0,
+            'delay_count': 0
+        }
+
+    def collect_step_counters(self) -> Dict[str, Any]:
+        """
+        Obtener y reiniciar los contadores acumulados desde la última llamada
+        
+        El intercambio del diccionario es atómico: los eventos procesados después
+        de esta llamada se acumulan en el siguiente paso. El coste es O(ONUs).
+        
+        Returns:
+            Dict con bytes_per_onu, delay_sum, delay_count, drops_per_onu,
+            buffer_occupancy (fracción 0-1 por ONU) y pending_delays
+            ({onu_id: (suma_delays_espera, paquetes_en_cola)})
+        """
+        counters, self.step_counters = self.step_counters, self._new_step_counters()
+
+        drops_per_onu = {}
+        buffer_occupancy = {}
+        pending_delays = {}
+        for onu_id, onu in self.onus.items():
+            dropped = onu.get_dropped_packets()
+            drops_per_onu[onu_id] = dropped - self._last_dropped_packets.get(onu_id, 0)
+            self._last_dropped_packets[onu_id] = dropped
+
+            total_bytes = sum(q.total_bytes for q in onu.queues.values())
+            max_bytes = sum(q.max_bytes for q in onu.queues.values())
+            buffer_occupancy[onu_id] = total_bytes / max_bytes if max_bytes > 0 else 0.0
+
+            pending_delays[onu_id] = onu.get_pending_delay_stats(self.simulation_time)
+
+        counters['drops_per_onu'] = drops_per_onu
+        counters['buffer_occupancy'] = buffer_occupancy
+        counters['pending_delays'] = pending_delays
+        return counters
+
     def _update_buffer_metrics(self):
         """Actualizar métricas de buffer en MB reales con timestamp"""
-        print(f"[BUFFER-LOG] _update_buffer_metrics() llamado en t={self.simulation_time:.3f}s")
-
         buffer_levels = {}
 
         for onu_id, onu in self.onus.items():
@@ -436,7 +488,13 @@ class OptimizedHybridPONSimulator:
         }
 
         self.metrics['buffer_levels_history'].append(buffer_entry)
-        print(f"[BUFFER-LOG] Buffer entry agregado. Total entries: {len(self.metrics['buffer_levels_history'])}")
+
+        if CYCLE_TRACE.buffer:
+            CYCLE_TRACE.record('buffer', self.olt.stats.get('cycles_executed', 0) if self.olt else 0,
+                               self.simulation_time,
+                               v0=len(buffer_levels),
+                               v1=sum(level['used_mb'] for level in buffer_levels.values()),
+                               v2=len(self.metrics['buffer_levels_history']))
     
     def _calculate_throughput_time_series(self, window_size: float = 0.1) -> List[Dict]:
         """
@@ -499,8 +557,6 @@ class OptimizedHybridPONSimulator:
         olt_stats = self.olt.get_olt_statistics()
         buffer_snapshots = olt_stats.get('buffer_snapshots', [])
 
-        print(f"[BUFFER-COLLECT-POLLING] Extrayendo historiales desde {len(buffer_snapshots)} snapshots del OLT")
-
         # Reorganizar por ONU
         onu_histories = {}
 
@@ -523,13 +579,6 @@ class OptimizedHybridPONSimulator:
 
                 onu_histories[onu_id].append(entry)
 
-        # Log resultado
-        for onu_id, history in onu_histories.items():
-            print(f"[BUFFER-COLLECT-POLLING] ONU {onu_id}: {len(history)} samples desde polling")
-
-        total_samples = sum(len(h) for h in onu_histories.values())
-        print(f"[BUFFER-COLLECT-POLLING] Total: {total_samples} samples de {len(onu_histories)} ONUs")
-
         return onu_histories
 
     def _convert_onu_histories_to_buffer_levels_history(self, onu_histories: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
@@ -546,8 +595,6 @@ class OptimizedHybridPONSimulator:
         if not onu_histories:
             return []
 
-        print(f"[BUFFER-CONVERT] Convirtiendo historiales de ONU a buffer_levels_history")
-
         # Recolectar todos los timestamps únicos
         all_timestamps = set()
         for onu_id, history in onu_histories.items():
@@ -557,8 +604,6 @@ class OptimizedHybridPONSimulator:
         # Ordenar timestamps
         sorted_timestamps = sorted(all_timestamps)
 
-        print(f"[BUFFER-CONVERT] Encontrados {len(sorted_timestamps)} timestamps únicos")
-
         # Construir estructura organizada por timestamp
         buffer_levels_history = []
 
@@ -582,8 +627,6 @@ class OptimizedHybridPONSimulator:
 
             buffer_levels_history.append(snapshot)
 
-        print(f"[BUFFER-CONVERT] Creados {len(buffer_levels_history)} snapshots para graficos")
-
         return buffer_levels_history
 
     def _calculate_final_results(self) -> Dict[str, Any]:
@@ -715,6 +758,10 @@ class OptimizedHybridPONSimulator:
             onu.clear_queues()
         
         self.olt.reset_statistics()
+
+        # Reiniciar contadores por paso
+        self.step_counters = self._new_step_counters()
+        self._last_dropped_packets = {onu_id: 0 for onu_id in self.onus}
     
     def set_dba_algorithm(self, dba_algorithm: DBAAlgorithmInterface):
         """Cambiar algoritmo DBA"""
@@ -4,13 +4,14 @@ Orquestador PON integrado de netPONPy con interfaz mejorada para PonLab
 """
 
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 
 from ..algorithms.pon_dba import DBAAlgorithmInterface, FCFSDBAAlgorithm
 from ..pon.pon_olt import OLT
 from ..pon.pon_onu import ONU
 from ..utilities.pon_traffic import get_traffic_scenario, calculate_realistic_lambda
+from .live_metrics import RecordRing
 
 
 class SimulatorStatus(Enum):
@@ -38,6 +39,9 @@ class PONOrchestrator:
     la lógica de simulación del entorno RL.
     """
     
+    # Muestras retenidas por serie de métricas del episodio (buffers circulares)
+    METRICS_HISTORY_CAPACITY = 100000
+    
     def __init__(self, num_onus: int = 4, traffic_scenario: str = "residential_medium",
                  episode_duration: float = 1.0, simulation_timestep: float = 0.001,
                  onu_configs: Dict[str, Dict] = None):
@@ -70,13 +74,8 @@ class PONOrchestrator:
         self.dba_algorithm = None  # Se configurará después con set_dba_algorithm()
         
         # Métricas acumulativas
-        self.episode_metrics = {
-            'delays': [],
-            'throughputs': [],
-            'total_transmitted': 0,
-            'total_requests': 0,
-            'buffer_levels_history': []
-        }
+        self._metrics_epoch = 0
+        self.episode_metrics = self._new_episode_metrics()
         
         # Control de métricas
         self.cumulative_transmitted = 0.0
@@ -88,6 +87,18 @@ class PONOrchestrator:
         # Inicializar componentes
         self._create_components()
     
+    def _new_episode_metrics(self) -> Dict[str, Any]:
+        """Crear métricas de episodio vacías (series en buffers circulares acotados)"""
+        self._metrics_epoch += 1
+        self.allocated_requests = 0  # Solicitudes con delay > 0 (todo el episodio)
+        return {
+            'delays': RecordRing(self.METRICS_HISTORY_CAPACITY),
+            'throughputs': RecordRing(self.METRICS_HISTORY_CAPACITY),
+            'total_transmitted': 0,
+            'total_requests': 0,
+            'buffer_levels_history': RecordRing(self.METRICS_HISTORY_CAPACITY)
+        }
+    
     def set_log_callback(self, callback):
         """Establecer callback para logging detallado"""
         self.log_callback = callback
@@ -226,7 +237,9 @@ class PONOrchestrator:
         metrics = self._simulate_timestep()
         
         # Actualizar métricas
-        self.episode_metrics['delays'].extend(metrics.get('delays', []))
+        step_delays = metrics.get('delays', [])
+        self.episode_metrics['delays'].extend(step_delays)
+        self.allocated_requests += sum(1 for d in step_delays if d.get('delay', 0) > 0)
         self.episode_metrics['throughputs'].extend(metrics.get('throughputs', []))
         self.episode_metrics['total_transmitted'] += metrics.get('transmitted', 0)
         self.episode_metrics['total_requests'] += metrics.get('requests_processed', 0)
@@ -268,13 +281,7 @@ class PONOrchestrator:
         
         # Reiniciar estado
         self.current_step = 0
-        self.episode_metrics = {
-            'delays': [],
-            'throughputs': [],
-            'total_transmitted': 0,
-            'total_requests': 0,
-            'buffer_levels_history': []
-        }
+        self.episode_metrics = self._new_episode_metrics()
         self.cumulative_transmitted = 0.0
         self.episode_start_time = 0.0
         self._last_status = SimulatorStatus.N_A
@@ -320,11 +327,31 @@ class PONOrchestrator:
     
     def get_delays(self) -> List[Dict[str, Any]]:
         """Obtener delays recientes (últimos 10)"""
-        return self.episode_metrics['delays'][-10:]
+        return self.episode_metrics['delays'].latest(10)
     
     def get_throughputs(self) -> List[Dict[str, Any]]:
         """Obtener throughputs recientes (últimos 10)"""
-        return self.episode_metrics['throughputs'][-10:]
+        return self.episode_metrics['throughputs'].latest(10)
+    
+    def get_metrics_since(self, cursor: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, int], Dict[str, List]]:
+        """
+        Obtener solo las muestras de métricas añadidas desde la última lectura
+        
+        Args:
+            cursor: Cursor devuelto por la llamada anterior (None = desde el inicio)
+            
+        Returns:
+            (nuevo cursor, {'delays', 'throughputs', 'buffer_levels_history': muestras nuevas})
+            Tras un reset el cursor anterior se descarta y se lee desde el inicio.
+        """
+        if not cursor or cursor.get('epoch') != self._metrics_epoch:
+            cursor = {'epoch': self._metrics_epoch}
+        
+        new_cursor = {'epoch': self._metrics_epoch}
+        samples = {}
+        for key in ('delays', 'throughputs', 'buffer_levels_history'):
+            new_cursor[key], samples[key] = self.episode_metrics[key].read_since(cursor.get(key, 0))
+        return new_cursor, samples
     
     def last_request_is_allocated(self) -> SimulatorStatus:
         """Obtener estado de la última solicitud procesada"""
@@ -347,8 +374,8 @@ class PONOrchestrator:
         if total_attempted == 0:
             return 1.0  # Sin solicitudes = 100% éxito de asignación
         
-        # Solicitudes exitosamente asignadas y transmitidas (tienen delays registrados)
-        successfully_allocated = sum(1 for d in self.episode_metrics['delays'] if d.get('delay', 0) > 0)
+        # Solicitudes exitosamente asignadas y transmitidas (contadas en step())
+        successfully_allocated = self.allocated_requests
         
         # Probabilidad de asignación = asignaciones exitosas / total intentadas
         return successfully_allocated / total_attempted
@@ -452,7 +479,10 @@ class PONOrchestrator:
                 'current_step': self.current_step,
                 'steps_per_episode': self.steps_per_episode
             },
-            'episode_metrics': self.episode_metrics.copy(),
+            'episode_metrics': {
+                key: value.to_list() if isinstance(value, RecordRing) else value
+                for key, value in self.episode_metrics.items()
+            },
             'cumulative_transmitted': self.cumulative_transmitted,
             'allocation_probability': self.get_allocation_probability(),
             'blocking_probability': self.get_blocking_probability(),
@@ -3,12 +3,13 @@ PON Simulator - Simulador unificado para redes PON
 Combina simulación por ciclos DBA y por eventos discretos
 """
 
+import time
 from typing import Optional, Dict, Any, List, Callable
 import numpy as np
 from ..pon.pon_olt import OLT
 from ..algorithms.pon_dba_cycle import DBACycleManager, DBAResult, DBAAllocation
 from ..data.pon_request import Request
-from ..events.event_queue import EventQueue, EventType
+from ..events.event_queue import EventQueue, EventType, TICKS_PER_SECOND, to_ticks
 from ..events.pon_event_onu import HybridONU
 from ..events.pon_event_olt import HybridOLT
 from ..utilities.pon_traffic import get_traffic_scenario, calculate_realistic_lambda
@@ -88,6 +89,7 @@ class PONSimulator:
         self.MAX_METRICS_STORED = 100000
         self.MAX_BUFFER_HISTORY = 50000
         self.MIN_CYCLE_INTERVAL = 125e-6
+        self.PROGRESS_CHECK_EVENTS = 64  # Eventos entre consultas del reloj de progreso
         
         # Componentes
         self.event_queue = EventQueue()
@@ -112,6 +114,9 @@ class PONSimulator:
             'metrics_dropped': 0,
             'buffer_samples_dropped': 0
         }
+
+        # Métricas en vivo (LiveMetricsCollector opcional, asignado por PONAdapter)
+        self.live_metrics = None
     
     # ===== CONFIGURACIÓN =====
     
@@ -300,8 +305,19 @@ class PONSimulator:
         print(f"Simulación por ciclos completada: {self.cycles_executed} ciclos")
         return True
     
-    def run_event_simulation(self, duration_seconds: float, callback: Optional[Callable] = None):
-        """Ejecutar simulación por eventos discretos"""
+    def run_event_simulation(self, duration_seconds: float, callback: Optional[Callable] = None,
+                             progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                             progress_interval: float = 0.25):
+        """
+        Ejecutar simulación por eventos discretos
+
+        Args:
+            duration_seconds: Duración en tiempo simulado
+            callback: Callback por evento (event, sim_time); coste en cada evento
+            progress_callback: Recibe un resumen de progreso (ver _progress_snapshot)
+                               como mucho una vez cada progress_interval segundos reales
+            progress_interval: Intervalo mínimo de reloj entre resúmenes
+        """
         if not self.onus or not self.olt:
             raise ValueError("Simulación por eventos no configurada")
         
@@ -310,15 +326,22 @@ class PONSimulator:
         self.simulation_duration = duration_seconds
         self.is_running = True
         self.events_processed = 0
+        self._progress_start_wall = time.perf_counter()
+        next_progress_wall = self._progress_start_wall + progress_interval
         
         # Inicializar eventos
         self._initialize_events()
+
+        live_metrics = getattr(self, 'live_metrics', None)
+        if live_metrics is not None:
+            live_metrics.start(list(self.onus.keys()))
         
-        # Bucle principal de eventos
+        # Bucle principal de eventos (comparaciones en ticks enteros)
         last_progress_time = 0
+        end_tick = to_ticks(duration_seconds)
         
         while (self.event_queue.has_events() and 
-               self.event_queue.peek_next_time() <= duration_seconds and
+               self.event_queue.peek_next_tick() <= end_tick and
                self.is_running):
             
             # Control de recursos cada 1000 eventos
@@ -332,14 +355,25 @@ class PONSimulator:
 
             # ANTES de procesar el evento, ejecutar polling automático si es necesario
             if hasattr(self.olt, 'check_and_execute_polling'):
-                self.olt.check_and_execute_polling(self.event_queue, self.simulation_time)
+                self.olt.check_and_execute_polling(self.event_queue, event.tick)
 
             self._process_event(event)
             self.events_processed += 1
+
+            # Publicar intervalo de métricas en vivo al cruzar su final
+            if live_metrics is not None and self.simulation_time >= live_metrics.next_bin_time:
+                live_metrics.close_bins(self.simulation_time, self._live_buffer_levels)
             
             # Callback externo
             if callback:
                 callback(event, self.simulation_time)
+
+            # Resumen de progreso limitado por reloj (se consulta cada N eventos)
+            if (progress_callback is not None
+                    and self.events_processed % self.PROGRESS_CHECK_EVENTS == 0
+                    and time.perf_counter() >= next_progress_wall):
+                progress_callback(self._progress_snapshot())
+                next_progress_wall = time.perf_counter() + progress_interval
             
             # Progreso cada segundo simulado
             if self.simulation_time - last_progress_time >= 1.0:
@@ -348,6 +382,12 @@ class PONSimulator:
                 last_progress_time = self.simulation_time
         
         self.is_running = False
+
+        if live_metrics is not None:
+            live_metrics.flush(self.simulation_time, self._live_buffer_levels)
+
+        if progress_callback is not None:
+            progress_callback(self._progress_snapshot())
         
         # Generar resumen final
         final_results = self._generate_event_summary()
@@ -579,7 +619,7 @@ class PONSimulator:
         # Programar primer paquete para cada ONU
         for i, onu in enumerate(self.onus.values()):
             spread_time = start_time + (i * 0.001)  # 1ms entre ONUs
-            onu.schedule_first_packet(self.event_queue, spread_time)
+            onu.schedule_first_packet(self.event_queue, to_ticks(spread_time))
 
         # NO programar eventos de polling - ahora son automáticos
         # El polling se ejecutará automáticamente cada 125µs
@@ -603,7 +643,7 @@ class PONSimulator:
         # Generar paquete si aún estamos dentro del tiempo de simulación
         # NO verificamos el tamaño de la cola para mantener comportamiento determinista
         if event.timestamp < self.simulation_duration:
-            onu.generate_packet(self.event_queue, event.timestamp)
+            onu.generate_packet(self.event_queue, event.tick)
 
             # Advertencia periódica si la cola crece mucho (pero NO detenemos la simulación)
             pending = self.event_queue.get_pending_events_count()
@@ -634,7 +674,7 @@ class PONSimulator:
         if len(self.metrics['delays']) < self.MAX_METRICS_STORED:
             for packet in packets:
                 # Delay: desde que el paquete llegó hasta que termina la transmisión
-                delay = event.timestamp - packet.arrival_time
+                delay = (event.tick - packet.arrival_tick) / TICKS_PER_SECOND
 
                 self.metrics['delays'].append({
                     'delay': delay,
@@ -668,6 +708,12 @@ class PONSimulator:
             self.metrics['failed_transmissions'] += 1
         
         self.metrics['total_requests'] += len(packets)
+
+        if self.live_metrics is not None:
+            self.live_metrics.record_transmission(
+                transmitted_bytes,
+                [(event.tick - packet.arrival_tick) / TICKS_PER_SECOND for packet in packets]
+            )
         
         # Notificar al OLT
         self.olt.handle_transmission_complete(event.data, event.timestamp)
@@ -694,6 +740,32 @@ class PONSimulator:
 
         self.metrics['buffer_levels_history'].append(buffer_entry)
     
+    def _progress_snapshot(self) -> Dict[str, Any]:
+        """Resumen de progreso de la simulación por eventos (barato de calcular)"""
+        wall_elapsed = time.perf_counter() - getattr(self, '_progress_start_wall', time.perf_counter())
+        duration = getattr(self, 'simulation_duration', 0) or 0
+        olt_stats = getattr(self.olt, 'stats', {}) or {}
+        return {
+            'sim_time': self.simulation_time,
+            'duration': duration,
+            'progress': min(self.simulation_time / duration * 100, 100.0) if duration > 0 else 0.0,
+            'events_processed': self.events_processed,
+            'events_per_second': self.events_processed / wall_elapsed if wall_elapsed > 0 else 0.0,
+            'cycles_executed': olt_stats.get('cycles_executed', 0),
+            'total_requests': self.metrics['total_requests'],
+            'successful_transmissions': self.metrics['successful_transmissions'],
+            'total_transmitted_mb': self.metrics['total_transmitted']
+        }
+
+    def _live_buffer_levels(self) -> List[float]:
+        """Utilización de buffer (%) por ONU para las métricas en vivo"""
+        levels = []
+        for onu in self.onus.values():
+            total_bytes = sum(queue.total_bytes for queue in onu.queues.values())
+            max_capacity = sum(queue.max_bytes for queue in onu.queues.values())
+            levels.append((total_bytes / max_capacity) * 100 if max_capacity > 0 else 0)
+        return levels
+    
     def _check_resource_limits(self) -> bool:
         """Verificar límites de recursos y aplicar limpieza si es necesario"""
         # Verificar cola de eventos - SOLO advertir, NO detener la simulación
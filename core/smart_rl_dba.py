@@ -7,12 +7,16 @@ import os
 import zipfile
 import json
 import tempfile
+import threading
 import numpy as np
 from typing import Dict, Any, Optional
 
 from .algorithms.pon_dba import DBAAlgorithmInterface
 
-# --- Importación condicional de Stable-Baselines3 ---
+# --- Importación diferida de Stable-Baselines3 ---
+# stable-baselines3 arrastra torch, que domina el arranque de la aplicación:
+# se importa en load_rl_libraries() la primera vez que se necesita (cargar un
+# modelo o la precarga en segundo plano de RLStackLoader).
 RL_AVAILABLE = False
 BaseAlgorithm = None
 PPO = None
@@ -20,27 +24,45 @@ A2C = None
 DQN = None
 SAC = None
 
-try:
-    from stable_baselines3.common.base_class import BaseAlgorithm
-    from stable_baselines3 import PPO, A2C, DQN, SAC
-    RL_AVAILABLE = True
-    print("[INFO] SmartRLDBA: Bibliotecas de Stable-Baselines3 disponibles.")
-except (ImportError, OSError) as e:
-    # ImportError: bibliotecas no instaladas
-    # OSError: problemas con DLLs de PyTorch en Windows
-    print("[WARNING] SmartRLDBA: 'stable-baselines3' o 'torch' no están disponibles.")
-    print(f"[WARNING] Razón: {type(e).__name__}")
-    print("[INFO] Instale con: pip install stable-baselines3 torch")
-    print("[INFO] En Windows, si hay error de DLL, instale: pip install torch --index-url https://download.pytorch.org/whl/cpu")
-# ---------------------------------------------------
+# Mapeo de nombres de algoritmos a clases de SB3 (se rellena al cargar)
+ALGORITHM_MAP = {}
+
+_rl_import_lock = threading.Lock()
+_rl_import_attempted = False
+
+
+def load_rl_libraries() -> bool:
+    """
+    Importar Stable-Baselines3 (y torch) si aún no se intentó
+
+    Es seguro llamarla desde varios hilos; solo el primer intento importa.
 
-# Mapeo de nombres de algoritmos a clases de SB3
-ALGORITHM_MAP = {
-    "PPO": PPO,
-    "A2C": A2C,
-    "DQN": DQN,
-    "SAC": SAC,
-} if RL_AVAILABLE else {}
+    Returns:
+        True si las bibliotecas están disponibles
+    """
+    global RL_AVAILABLE, BaseAlgorithm, PPO, A2C, DQN, SAC, _rl_import_attempted
+
+    with _rl_import_lock:
+        if _rl_import_attempted:
+            return RL_AVAILABLE
+        _rl_import_attempted = True
+
+        try:
+            from stable_baselines3.common.base_class import BaseAlgorithm
+            from stable_baselines3 import PPO, A2C, DQN, SAC
+            RL_AVAILABLE = True
+            ALGORITHM_MAP.update({"PPO": PPO, "A2C": A2C, "DQN": DQN, "SAC": SAC})
+            print("[INFO] SmartRLDBA: Bibliotecas de Stable-Baselines3 disponibles.")
+        except (ImportError, OSError) as e:
+            # ImportError: bibliotecas no instaladas
+            # OSError: problemas con DLLs de PyTorch en Windows
+            print("[WARNING] SmartRLDBA: 'stable-baselines3' o 'torch' no están disponibles.")
+            print(f"[WARNING] Razón: {type(e).__name__}")
+            print("[INFO] Instale con: pip install stable-baselines3 torch")
+            print("[INFO] En Windows, si hay error de DLL, instale: pip install torch --index-url https://download.pytorch.org/whl/cpu")
+
+        return RL_AVAILABLE
+# ---------------------------------------------------
 
 
 class SmartRLDBAAlgorithm(DBAAlgorithmInterface):
@@ -73,7 +95,7 @@ class SmartRLDBAAlgorithm(DBAAlgorithmInterface):
         Carga un modelo de RL desde un archivo .zip compatible.
         El .zip debe contener 'model.json' (metadatos) y 'sb3_model.zip' (el modelo real).
         """
-        if not RL_AVAILABLE:
+        if not load_rl_libraries():
             print("[ERROR] SmartRLDBA: No se pueden cargar modelos porque 'stable-baselines3' no está disponible.")
             return False
 
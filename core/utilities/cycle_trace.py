@@ -0,0 +1,136 @@
+"""
+Cycle Trace
+Trazas estructuradas del simulador por ciclos: registros numéricos por ciclo
+en un buffer circular acotado, con categorías activables por separado y
+volcado opcional a un archivo binario (.npz)
+
+En los caminos calientes cada registro va protegido por una sola consulta
+de atributo, de modo que con la categoría desactivada no hay más coste:
+
+    if CYCLE_TRACE.dba_cycle:
+        CYCLE_TRACE.record('dba_cycle', cycle, time, v0=..., v1=...)
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Categorías y significado de los campos v0/v1/v2 de cada una
+TRACE_CATEGORIES = {
+    'dba_cycle': ('onus_reporting', 'bandwidth_allocated_mb', 'requests_selected'),
+    'dba_onu': ('requests_reported', 'traffic_requested_mb', 'bandwidth_allocated_mb'),
+    'progress': ('mean_delay_s', 'mean_throughput_mbs', 'requests_processed'),
+    'buffer': ('onus', 'buffer_used_mb', 'history_entries'),
+    'drops': ('buffer_occupancy', 'buffer_size', 'lost_packets'),
+}
+
+TRACE_RECORD_DTYPE = np.dtype([
+    ('category', np.uint8),
+    ('cycle', np.int64),
+    ('time', np.float64),
+    ('key', np.int32),      # Etiqueta internada (p.ej. ONU), -1 si no aplica
+    ('v0', np.float64),
+    ('v1', np.float64),
+    ('v2', np.float64),
+])
+
+
+class CycleTracer:
+    """Buffer circular de registros de traza con flags por categoría"""
+
+    def __init__(self, capacity: int = 65536):
+        """
+        Args:
+            capacity: Registros retenidos (los más antiguos se sobrescriben)
+        """
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=TRACE_RECORD_DTYPE)
+        self.total = 0
+        self._category_codes = {name: code for code, name in enumerate(TRACE_CATEGORIES)}
+        self._labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+
+        # Flags de categoría: atributos simples para que la comprobación sea barata
+        for name in TRACE_CATEGORIES:
+            setattr(self, name, False)
+
+    def enable(self, *categories: str):
+        """Activar categorías (todas si no se indica ninguna)"""
+        for name in categories or TRACE_CATEGORIES:
+            if name not in TRACE_CATEGORIES:
+                raise ValueError(f"Categoría de traza desconocida: {name}")
+            setattr(self, name, True)
+
+    def disable(self, *categories: str):
+        """Desactivar categorías (todas si no se indica ninguna)"""
+        for name in categories or TRACE_CATEGORIES:
+            setattr(self, name, False)
+
+    def enabled_categories(self) -> List[str]:
+        return [name for name in TRACE_CATEGORIES if getattr(self, name)]
+
+    def label(self, text) -> int:
+        """Internar una etiqueta (ID de ONU, etc.) y devolver su código"""
+        text = str(text)
+        code = self._label_codes.get(text)
+        if code is None:
+            code = self._label_codes[text] = len(self._labels)
+            self._labels.append(text)
+        return code
+
+    def record(self, category: str, cycle: int, time: float, key: Optional[str] = None,
+               v0: float = 0.0, v1: float = 0.0, v2: float = 0.0):
+        """Añadir un registro (sobrescribe el más antiguo si el buffer está lleno)"""
+        self.records[self.total % self.capacity] = (
+            self._category_codes[category],
+            cycle,
+            time,
+            -1 if key is None else self.label(key),
+            v0, v1, v2
+        )
+        self.total += 1
+
+    def snapshot(self, category: Optional[str] = None) -> np.ndarray:
+        """Registros retenidos en orden cronológico (opcionalmente de una categoría)"""
+        if self.total <= self.capacity:
+            records = self.records[:self.total].copy()
+        else:
+            split = self.total % self.capacity
+            records = np.concatenate([self.records[split:], self.records[:split]])
+
+        if category is not None:
+            records = records[records['category'] == self._category_codes[category]]
+        return records
+
+    def dump(self, path: str) -> str:
+        """
+        Volcar la traza a un archivo binario .npz
+
+        Contiene los registros, las etiquetas internadas y los nombres de
+        categoría/campos necesarios para interpretarlos.
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        if not path.endswith('.npz'):
+            path += '.npz'
+
+        np.savez_compressed(
+            path,
+            records=self.snapshot(),
+            labels=np.array(self._labels, dtype=str),
+            categories=np.array(list(TRACE_CATEGORIES), dtype=str),
+            fields=np.array([list(fields) for fields in TRACE_CATEGORIES.values()], dtype=str),
+            dropped=np.array(max(self.total - self.capacity, 0))
+        )
+        return path
+
+    def clear(self):
+        """Vaciar el buffer (conserva los flags de categoría)"""
+        self.total = 0
+        self._labels = []
+        self._label_codes = {}
+
+
+# Trazador compartido por los componentes del simulador por ciclos
+CYCLE_TRACE = CycleTracer()
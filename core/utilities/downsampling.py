@@ -0,0 +1,117 @@
+"""
+Downsampling
+Reducción de series temporales para graficar: Largest-Triangle-Three-Buckets
+(LTTB) y envolvente min/max por columna de píxeles
+"""
+
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+
+
+def history_arrays(history: Sequence[Any], x_key: str = 'time',
+                   y_key: str = 'value') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convertir un historial [{x_key: ..., y_key: ...}, ...] en dos arrays
+
+    Si el historial es columnar (ColumnarTable de session_store) se usan sus
+    columnas directamente, sin construir un dict por muestra.
+    """
+    column = getattr(history, 'column', None)
+    if column is not None:
+        x = column(x_key)
+        y = column(y_key)
+        if x is not None and y is not None:
+            return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+
+    x = np.fromiter((entry[x_key] for entry in history), dtype=float, count=len(history))
+    y = np.fromiter((entry[y_key] for entry in history), dtype=float, count=len(history))
+    return x, y
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reducir una serie a n_out puntos con Largest-Triangle-Three-Buckets
+
+    Conserva el primer y el último punto; de cada bucket intermedio elige el
+    punto que forma el triángulo de mayor área con el punto anterior elegido
+    y la media del bucket siguiente, preservando picos y forma visual.
+
+    Args:
+        x: Valores del eje X (ordenados)
+        y: Valores del eje Y
+        n_out: Número de puntos de salida
+
+    Returns:
+        (x, y) reducidos (los originales si ya caben en n_out)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # n_out - 2 buckets para los puntos interiores [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        prev_x, prev_y = x[previous], y[previous]
+
+        areas = np.abs((prev_x - avg_x) * (y[start:end] - prev_y)
+                       - (prev_x - x[start:end]) * (avg_y - prev_y))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return x[selected], y[selected]
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reducir una serie a su envolvente min/max en n_buckets columnas
+
+    Cada bucket aporta su mínimo y su máximo en orden temporal, por lo que
+    ningún pico desaparece del gráfico (hasta 2 * n_buckets puntos).
+
+    Args:
+        x: Valores del eje X (ordenados)
+        y: Valores del eje Y
+        n_buckets: Número de columnas (típicamente ancho en píxeles / 2)
+
+    Returns:
+        (x, y) reducidos (los originales si ya caben)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_buckets < 1 or n <= 2 * n_buckets:
+        return x, y
+
+    # Buckets de igual número de muestras; el último se rellena repitiendo
+    # el valor final para poder operar sobre una matriz (n_buckets, tamaño)
+    bucket_size = -(-n // n_buckets)
+    n_buckets = -(-n // bucket_size)
+    padded = np.empty(n_buckets * bucket_size)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    buckets = padded.reshape(n_buckets, bucket_size)
+
+    offsets = np.arange(n_buckets) * bucket_size
+    low = np.minimum(offsets + buckets.argmin(axis=1), n - 1)
+    high = np.minimum(offsets + buckets.argmax(axis=1), n - 1)
+
+    # Orden temporal dentro de cada bucket; buckets planos (min == max)
+    # repiten índice: eliminar duplicados
+    selected = np.unique(np.concatenate([low, high]))
+    return x[selected], y[selected]
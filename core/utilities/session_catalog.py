@@ -0,0 +1,254 @@
+"""
+Session Catalog
+Índice SQLite de sesiones guardadas en simulation_results: permite obtener la
+última sesión, listar y filtrar por configuración sin recorrer directorios ni
+abrir archivos de resultados
+"""
+
+import os
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from .session_store import find_session_data_file
+
+CATALOG_FILENAME = "catalog.sqlite"
+SESSION_DIR_PREFIX = "simulacion_"
+
+# Columnas filtrables (además de la clave session_id)
+_COLUMNS = [
+    'session_dir', 'created_at', 'algorithm', 'traffic_scenario', 'num_onus',
+    'mean_delay', 'mean_throughput', 'network_utilization',
+    'data_file', 'data_format', 'size_mb', 'extra'
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    session_dir TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    algorithm TEXT,
+    traffic_scenario TEXT,
+    num_onus INTEGER,
+    mean_delay REAL,
+    mean_throughput REAL,
+    network_utilization REAL,
+    data_file TEXT,
+    data_format TEXT,
+    size_mb REAL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_config ON sessions (algorithm, traffic_scenario, num_onus);
+"""
+
+
+def _folder_created_at(entry) -> str:
+    """
+    Fecha ISO de una sesión sin metadata.json
+
+    Se toma del nombre de la carpeta (simulacion_YYYYmmdd_HHMMSS) o, si no
+    sigue ese formato, de su fecha de modificación. Debe ser ISO como el resto
+    de filas para que ORDER BY created_at las ordene correctamente.
+    """
+    try:
+        return datetime.strptime(entry.name[len(SESSION_DIR_PREFIX):], "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        return datetime.fromtimestamp(entry.stat().st_mtime).isoformat()
+
+
+class SessionCatalog:
+    """
+    Catálogo de sesiones de simulación
+
+    Cada operación abre (y cierra) su propia conexión, así que puede usarse
+    desde el hilo de guardado y desde la UI a la vez. Las escrituras son transacciones
+    SQLite (atómicas).
+    """
+
+    def __init__(self, base_directory: str = "simulation_results"):
+        self.base_directory = base_directory
+        self.db_path = os.path.join(base_directory, CATALOG_FILENAME)
+        os.makedirs(base_directory, exist_ok=True)
+
+        is_new = not os.path.exists(self.db_path)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+
+        # Catálogo nuevo en un directorio con sesiones previas: indexarlas una vez
+        if is_new:
+            self.rebuild()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def register_session(self, session_dir: str, created_at: str,
+                         session_info: Optional[Dict[str, Any]] = None,
+                         performance_metrics: Optional[Dict[str, Any]] = None,
+                         data_file: Optional[str] = None, data_format: Optional[str] = None,
+                         size_mb: float = 0.0, extra: Optional[Dict[str, Any]] = None):
+        """
+        Insertar o actualizar una sesión en el catálogo
+
+        Args:
+            session_dir: Directorio de la sesión
+            created_at: Fecha ISO de creación
+            session_info: Configuración (algorithm, traffic_scenario, num_onus...)
+            performance_metrics: Métricas principales (mean_delay, mean_throughput...)
+            data_file: Ruta del archivo de datos relativa a la sesión
+            data_format: 'columnar' o 'json'
+            size_mb: Tamaño de los datos guardados
+            extra: Información adicional (se guarda como JSON)
+        """
+        session_info = session_info or {}
+        performance_metrics = performance_metrics or {}
+
+        row = {
+            'session_id': os.path.basename(os.path.normpath(session_dir)),
+            'session_dir': os.path.abspath(session_dir),
+            'created_at': created_at,
+            'algorithm': session_info.get('algorithm'),
+            'traffic_scenario': session_info.get('traffic_scenario'),
+            'num_onus': session_info.get('num_onus'),
+            'mean_delay': performance_metrics.get('mean_delay'),
+            'mean_throughput': performance_metrics.get('mean_throughput'),
+            'network_utilization': performance_metrics.get('network_utilization'),
+            'data_file': data_file,
+            'data_format': data_format,
+            'size_mb': size_mb,
+            'extra': json.dumps(extra or {}, default=str)
+        }
+
+        columns = ', '.join(row.keys())
+        placeholders = ', '.join('?' for _ in row)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO sessions ({columns}) VALUES ({placeholders})",
+                list(row.values())
+            )
+
+    def remove_session(self, session_id: str):
+        """Eliminar una sesión del catálogo"""
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _query(self, limit: Optional[int] = None, offset: int = 0,
+               **filters) -> List[Dict[str, Any]]:
+        clauses = []
+        values = []
+        for key, value in filters.items():
+            if value is None:
+                continue
+            if key not in _COLUMNS:
+                raise ValueError(f"Filtro no soportado: {key}")
+            clauses.append(f"{key} = ?")
+            values.append(value)
+
+        sql = "SELECT * FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+
+        with closing(self._connect()) as connection, connection:
+            rows = connection.execute(sql, values).fetchall()
+
+        sessions = []
+        for row in rows:
+            session = dict(row)
+            session['extra'] = json.loads(session['extra']) if session['extra'] else {}
+            sessions.append(session)
+        return sessions
+
+    def list_sessions(self, limit: Optional[int] = None, **filters) -> List[Dict[str, Any]]:
+        """
+        Listar sesiones (más recientes primero)
+
+        Args:
+            limit: Número máximo de sesiones
+            **filters: Igualdad sobre columnas (algorithm='IPACT', num_onus=8...)
+        """
+        return self._query(limit=limit, **filters)
+
+    def latest_session(self, **filters) -> Optional[Dict[str, Any]]:
+        """Obtener la sesión más reciente que cumpla los filtros"""
+        sessions = self._query(limit=1, **filters)
+        return sessions[0] if sessions else None
+
+    def _iter_latest(self, **filters):
+        """
+        Recorrer sesiones de la más reciente a la más antigua, de una en una
+
+        Solo se consulta la siguiente fila si la anterior no sirvió, así que en
+        el caso normal es una única consulta con LIMIT 1. Las sesiones cuyo
+        directorio ya no existe se eliminan del catálogo al pasar por ellas.
+        """
+        offset = 0
+        while True:
+            sessions = self._query(limit=1, offset=offset, **filters)
+            if not sessions:
+                return
+            session = sessions[0]
+            if os.path.isdir(session['session_dir']):
+                yield session
+                offset += 1
+            else:
+                # Sesión borrada del disco: limpiar el catálogo (la siguiente ocupa su posición)
+                self.remove_session(session['session_id'])
+
+    def latest_existing_session(self, **filters) -> Optional[Dict[str, Any]]:
+        """Sesión más reciente cuyo directorio sigue en disco (limpia las borradas)"""
+        return next(self._iter_latest(**filters), None)
+
+    def latest_data_file(self, **filters) -> Optional[str]:
+        """Ruta absoluta al archivo de datos de la sesión más reciente existente"""
+        for session in self._iter_latest(**filters):
+            if session['data_file']:
+                path = os.path.join(session['session_dir'], session['data_file'])
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def rebuild(self) -> int:
+        """
+        Reindexar sesiones existentes leyendo su metadata.json
+
+        Returns:
+            Número de sesiones indexadas
+        """
+        if not os.path.isdir(self.base_directory):
+            return 0
+
+        count = 0
+        for entry in os.scandir(self.base_directory):
+            if not entry.is_dir() or not entry.name.startswith(SESSION_DIR_PREFIX):
+                continue
+
+            metadata = {}
+            metadata_file = os.path.join(entry.path, 'metadata.json')
+            if os.path.exists(metadata_file):
+                try:
+                    with open(metadata_file, 'r', encoding='utf-8') as f:
+                        metadata = json.load(f)
+                except (OSError, ValueError):
+                    metadata = {}
+
+            data_file = find_session_data_file(entry.path)
+            self.register_session(
+                entry.path,
+                metadata.get('timestamp') or _folder_created_at(entry),
+                session_info=metadata,
+                data_file=os.path.relpath(data_file, entry.path) if data_file else None,
+                data_format=metadata.get('data_format', 'json')
+            )
+            count += 1
+
+        if count:
+            print(f"[INFO] Catálogo de sesiones reconstruido: {count} sesiones")
+        return count
+
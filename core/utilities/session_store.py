@@ -0,0 +1,674 @@
+"""
+Session Store
+Formato columnar de sesiones de simulación: directorio con arrays .npy más un
+manifiesto JSON pequeño con escalares y metadata. Las listas largas de números
+y de registros (transmission_log, delays, buffer_snapshots...) se guardan como
+columnas y se leen con memory-map.
+"""
+
+import os
+import json
+import gzip
+import shutil
+import zlib
+import numbers
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+COLUMNAR_FORMAT_VERSION = 2
+COLUMNAR_DIRNAME = "datos_simulacion"
+MANIFEST_FILENAME = "manifest.json"
+JSON_FILENAME = "datos_simulacion.json"
+JSON_GZ_FILENAME = "datos_simulacion.json.gz"
+
+# Listas más cortas se quedan en el manifiesto JSON
+MIN_COLUMNAR_LENGTH = 64
+
+# Filas materializadas por bloque al iterar una tabla
+_ITER_CHUNK = 4096
+
+# Tamaño de bloque JSON comprimido como miembro gzip independiente
+COMPRESSION_BLOCK_SIZE = 4 * 1024 * 1024
+
+_ARRAY_TAG = "__columnar_array__"
+_TABLE_TAG = "__columnar_table__"
+
+# Enteros mayores no se representan exactamente en float64
+_MAX_EXACT_FLOAT_INT = 2 ** 53
+
+
+class _MixedNumberColumn:
+    """
+    Columna que mezcla int y float: valores en float64 más una máscara de
+    las posiciones que eran enteras, para devolverlas como int al leer
+    """
+
+    KIND = 'mixed'
+
+    def __init__(self, values: np.ndarray, int_mask: np.ndarray):
+        self.values = values
+        self.int_mask = int_mask
+        self.dtype = values.dtype
+
+    def __len__(self):
+        return len(self.values)
+
+    def slice_values(self, index: slice) -> list:
+        values = self.values[index].tolist()
+        for position in np.flatnonzero(self.int_mask[index]).tolist():
+            values[position] = int(values[position])
+        return values
+
+    def value(self, index: int):
+        value = self.values[index].item()
+        return int(value) if self.int_mask[index] else value
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.values, dtype=dtype)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'values': self.values, 'int_mask': self.int_mask}
+
+
+class _StringColumn:
+    """
+    Columna de textos: bytes UTF-8 concatenados más offsets de inicio/fin
+
+    Ocupa lo que miden los textos, en lugar de 4 bytes x longitud máxima por
+    fila de un array '<U'.
+    """
+
+    KIND = 'str'
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+        self.dtype = np.dtype(object)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def slice_values(self, index: slice) -> list:
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            return [self.value(i) for i in range(start, stop, step)]
+        if start >= stop:
+            return []
+        bounds = self.offsets[start:stop + 1].tolist()
+        base = bounds[0]
+        blob = self.data[base:bounds[-1]].tobytes()
+        return [blob[begin - base:end - base].decode('utf-8')
+                for begin, end in zip(bounds[:-1], bounds[1:])]
+
+    def value(self, index: int) -> str:
+        index = range(len(self))[index]
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.slice_values(slice(None)), dtype=dtype or object)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'offsets': self.offsets, 'data': self.data}
+
+    @classmethod
+    def from_strings(cls, values: List[str]) -> '_StringColumn':
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return cls(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+
+_COLUMN_KINDS = {column_class.KIND: column_class for column_class in (_MixedNumberColumn, _StringColumn)}
+
+
+def _column_slice(column, index: slice) -> list:
+    """Valores Python de un tramo de columna (array numpy o columna especial)"""
+    if isinstance(column, np.ndarray):
+        return column[index].tolist()
+    return column.slice_values(index)
+
+
+def _column_value(column, index: int):
+    """Valor Python de una fila de columna (array numpy o columna especial)"""
+    if isinstance(column, np.ndarray):
+        return column[index].item()
+    return column.value(index)
+
+
+class MappedList(Sequence):
+    """Lista de escalares respaldada por una columna (memory-mapped) de numpy"""
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _column_slice(self.array, index)
+        return _column_value(self.array, index)
+
+    def __iter__(self):
+        for start in range(0, len(self.array), _ITER_CHUNK):
+            yield from _column_slice(self.array, slice(start, start + _ITER_CHUNK))
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.array, dtype=dtype)
+
+    def to_list(self) -> list:
+        return _column_slice(self.array, slice(None))
+
+    def close(self):
+        """Soltar los memory-maps (la lista queda vacía)"""
+        self.array = np.empty(0)
+
+    def __repr__(self):
+        return f"MappedList(len={len(self)}, dtype={self.array.dtype})"
+
+
+class ColumnarTable(Sequence):
+    """
+    Lista de registros (dicts) almacenada por columnas
+
+    Se comporta como la lista original de dicts (len, índices, iteración) y
+    además expone cada columna como array para cálculos vectorizados.
+    """
+
+    def __init__(self, paths: List[Tuple[str, ...]], columns: List[np.ndarray]):
+        self.paths = paths
+        self.columns = columns
+        self._length = len(columns[0]) if columns else 0
+
+    def __len__(self):
+        return self._length
+
+    def column(self, *path: str) -> Optional[np.ndarray]:
+        """Obtener la columna para una clave (o ruta de claves anidadas)"""
+        try:
+            column = self.columns[self.paths.index(tuple(path))]
+        except ValueError:
+            return None
+        return column if isinstance(column, np.ndarray) else np.asarray(column)
+
+    def _build_row(self, values) -> Dict[str, Any]:
+        row = {}
+        for path, value in zip(self.paths, values):
+            node = row
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = value
+        return row
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            chunk = [_column_slice(column, index) for column in self.columns]
+            return [self._build_row(values) for values in zip(*chunk)]
+        return self._build_row([_column_value(column, index) for column in self.columns])
+
+    def __iter__(self):
+        for start in range(0, self._length, _ITER_CHUNK):
+            chunk = [_column_slice(column, slice(start, start + _ITER_CHUNK)) for column in self.columns]
+            for values in zip(*chunk):
+                yield self._build_row(values)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def close(self):
+        """Soltar los memory-maps (la tabla queda vacía)"""
+        self.paths = []
+        self.columns = []
+        self._length = 0
+
+    def __repr__(self):
+        return f"ColumnarTable(len={len(self)}, columns={len(self.columns)})"
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, numbers.Number) and not isinstance(value, complex)
+
+
+def _make_column(values: list):
+    """
+    Convertir una lista homogénea de escalares en columna (None si no es posible)
+
+    Returns:
+        Array numpy (bool, int o float), _StringColumn para textos, o
+        _MixedNumberColumn si se mezclan int y float (para no devolver los
+        enteros como float al leer)
+    """
+    first = values[0]
+    if isinstance(first, str):
+        if not all(isinstance(v, str) for v in values):
+            return None
+        return _StringColumn.from_strings(values)
+
+    if isinstance(first, (bool, np.bool_)):
+        if not all(isinstance(v, (bool, np.bool_)) for v in values):
+            return None
+    elif _is_number(first):
+        if not all(_is_number(v) and not isinstance(v, (bool, np.bool_)) for v in values):
+            return None
+    else:
+        return None
+
+    array = np.asarray(values)
+    if array.dtype == object:
+        return None
+
+    if array.dtype.kind == 'f':
+        int_mask = np.fromiter((isinstance(v, (int, np.integer)) for v in values),
+                               dtype=bool, count=len(values))
+        if int_mask.any():
+            if np.abs(array[int_mask]).max() > _MAX_EXACT_FLOAT_INT:
+                return None
+            return _MixedNumberColumn(array, int_mask)
+    return array
+
+
+def _flatten_record(record: Dict, prefix: Tuple[str, ...] = ()) -> Optional[Dict[Tuple[str, ...], Any]]:
+    """Aplanar un dict anidado en {ruta: escalar} (None si contiene listas u objetos)"""
+    flat = {}
+    for key, value in record.items():
+        path = prefix + (str(key),)
+        if isinstance(value, dict):
+            if not value:
+                return None
+            nested = _flatten_record(value, path)
+            if nested is None:
+                return None
+            flat.update(nested)
+        elif isinstance(value, (str, bool, np.bool_)) or _is_number(value):
+            flat[path] = value
+        else:
+            return None
+    return flat
+
+
+def _records_to_columns(records: list) -> Optional[Tuple[List[Tuple[str, ...]], List[np.ndarray]]]:
+    """Convertir una lista de dicts con la misma estructura en columnas"""
+    if not isinstance(records[0], dict):
+        return None
+
+    first = _flatten_record(records[0])
+    if not first:
+        return None
+    paths = list(first.keys())
+    values = {path: [value] for path, value in first.items()}
+
+    for record in records[1:]:
+        if not isinstance(record, dict):
+            return None
+        flat = _flatten_record(record)
+        if flat is None or len(flat) != len(paths):
+            return None
+        try:
+            for path in paths:
+                values[path].append(flat[path])
+        except KeyError:
+            return None
+
+    columns = []
+    for path in paths:
+        column = _make_column(values[path])
+        if column is None:
+            return None
+        columns.append(column)
+    return paths, columns
+
+
+class _ColumnarWriter:
+    """Recorre el dict de resultados separando columnas del manifiesto"""
+
+    def __init__(self, arrays_dir: str):
+        self.arrays_dir = arrays_dir
+        self.file_count = 0
+
+    def _save_array(self, array: np.ndarray) -> str:
+        filename = f"col_{self.file_count:05d}.npy"
+        self.file_count += 1
+        np.save(os.path.join(self.arrays_dir, filename), np.ascontiguousarray(array))
+        return filename
+
+    def _save_column(self, column):
+        """Guardar una columna: nombre de archivo, o dict con kind y sus arrays"""
+        if isinstance(column, np.ndarray):
+            return self._save_array(column)
+        spec = {'kind': column.KIND}
+        for name, array in column.arrays().items():
+            spec[name] = self._save_array(array)
+        return spec
+
+    def encode(self, value):
+        if isinstance(value, dict):
+            return {str(key): self.encode(item) for key, item in value.items()}
+
+        if isinstance(value, MappedList):
+            return {_ARRAY_TAG: self._save_column(value.array)}
+
+        if isinstance(value, ColumnarTable):
+            return self._encode_table(value.paths, value.columns)
+
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            if value.ndim == 1 and len(value) >= MIN_COLUMNAR_LENGTH:
+                return {_ARRAY_TAG: self._save_array(value)}
+            return value.tolist()
+
+        if isinstance(value, (list, tuple)):
+            if len(value) >= MIN_COLUMNAR_LENGTH:
+                column = _make_column(list(value))
+                if column is not None:
+                    return {_ARRAY_TAG: self._save_column(column)}
+
+                table = _records_to_columns(value)
+                if table is not None:
+                    return self._encode_table(*table)
+
+            return [self.encode(item) for item in value]
+
+        if isinstance(value, np.generic):
+            return value.item()
+
+        return value
+
+    def _encode_table(self, paths, columns):
+        return {_TABLE_TAG: {
+            'paths': [list(path) for path in paths],
+            'files': [self._save_column(column) for column in columns],
+            'length': len(columns[0]) if columns else 0
+        }}
+
+
+def save_columnar_session(simulation_data: Dict[str, Any], session_dir: str,
+                          dirname: str = COLUMNAR_DIRNAME) -> Tuple[str, int]:
+    """
+    Guardar resultados de simulación en formato columnar
+
+    Escribe en un directorio temporal y lo renombra al terminar, de modo que
+    un lector nunca ve una sesión a medio escribir.
+
+    Args:
+        simulation_data: Dict completo de resultados
+        session_dir: Directorio de la sesión
+        dirname: Nombre del directorio columnar dentro de la sesión
+
+    Returns:
+        (ruta del directorio columnar, tamaño total en bytes)
+    """
+    final_dir = os.path.join(session_dir, dirname)
+    temp_dir = final_dir + ".tmp"
+    if os.path.exists(temp_dir):
+        shutil.rmtree(temp_dir)
+    os.makedirs(temp_dir)
+
+    writer = _ColumnarWriter(temp_dir)
+    manifest = {
+        'format': 'ponlab-columnar',
+        'version': COLUMNAR_FORMAT_VERSION,
+        'data': writer.encode(simulation_data)
+    }
+
+    with open(os.path.join(temp_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, default=str)
+
+    if os.path.exists(final_dir):
+        shutil.rmtree(final_dir)
+    os.replace(temp_dir, final_dir)
+
+    total_bytes = sum(entry.stat().st_size for entry in os.scandir(final_dir))
+    return final_dir, total_bytes
+
+
+def _load_column(spec, base_dir: str, mmap_mode: Optional[str]):
+    """Cargar una columna guardada por _ColumnarWriter._save_column"""
+    if isinstance(spec, str):
+        return np.load(os.path.join(base_dir, spec), mmap_mode=mmap_mode)
+    arrays = {name: np.load(os.path.join(base_dir, filename), mmap_mode=mmap_mode)
+              for name, filename in spec.items() if name != 'kind'}
+    return _COLUMN_KINDS[spec['kind']](**arrays)
+
+
+def _decode(value, base_dir: str, mmap_mode: Optional[str]):
+    if isinstance(value, dict):
+        if _ARRAY_TAG in value:
+            return MappedList(_load_column(value[_ARRAY_TAG], base_dir, mmap_mode))
+        if _TABLE_TAG in value:
+            table = value[_TABLE_TAG]
+            columns = [_load_column(spec, base_dir, mmap_mode) for spec in table['files']]
+            return ColumnarTable([tuple(path) for path in table['paths']], columns)
+        return {key: _decode(item, base_dir, mmap_mode) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item, base_dir, mmap_mode) for item in value]
+    return value
+
+
+def load_columnar_session(path: str, mmap_mode: Optional[str] = 'r') -> Dict[str, Any]:
+    """
+    Cargar una sesión columnar
+
+    Args:
+        path: Directorio columnar o ruta de su manifest.json
+        mmap_mode: Modo de memory-map de numpy (None = cargar en memoria)
+
+    Returns:
+        Dict con la misma estructura que el JSON original. Las listas largas
+        son MappedList / ColumnarTable (secuencias de solo lectura).
+    """
+    base_dir = os.path.dirname(path) if path.endswith(MANIFEST_FILENAME) else path
+    with open(os.path.join(base_dir, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('version', 0) > COLUMNAR_FORMAT_VERSION:
+        raise ValueError(f"Versión de formato columnar no soportada: {manifest.get('version')}")
+
+    return _decode(manifest['data'], base_dir, mmap_mode)
+
+
+def close_session(data: Any):
+    """
+    Soltar los memory-maps de una sesión cargada con load_columnar_session
+
+    Mientras un array está mapeado, Windows no permite borrar ni
+    sobrescribir la sesión. Tras llamar a esta función las listas columnares
+    de `data` quedan vacías.
+    """
+    if isinstance(data, (MappedList, ColumnarTable)):
+        data.close()
+    elif isinstance(data, dict):
+        for value in data.values():
+            close_session(value)
+    elif isinstance(data, list):
+        for value in data:
+            close_session(value)
+
+
+def find_session_data_file(session_dir: str) -> Optional[str]:
+    """Localizar los datos de una sesión (columnar preferido, luego JSON)"""
+    for name in (os.path.join(COLUMNAR_DIRNAME, MANIFEST_FILENAME), JSON_GZ_FILENAME, JSON_FILENAME):
+        candidate = os.path.join(session_dir, name)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _json_default(value):
+    """Serializar secuencias columnares y escalares numpy; el resto como texto"""
+    if isinstance(value, (MappedList, ColumnarTable)):
+        return value.to_list()
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return str(value)
+
+
+def _compress_gzip_member(block: bytes, compresslevel: int) -> bytes:
+    """Comprimir un bloque como miembro gzip completo (zlib libera el GIL)"""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+    return compressor.compress(block) + compressor.flush()
+
+
+def _is_long_sequence(value) -> bool:
+    """Secuencia que se codifica por bloques de _ITER_CHUNK elementos"""
+    if isinstance(value, np.ndarray):
+        return value.ndim >= 1 and len(value) > _ITER_CHUNK
+    return isinstance(value, (list, tuple, MappedList, ColumnarTable)) and len(value) > _ITER_CHUNK
+
+
+def _iter_json_pieces(data: Any, encoder: json.JSONEncoder):
+    """
+    Generar el JSON de `data` por piezas de tamaño acotado
+
+    Los dicts se recorren clave a clave y las listas largas (transmission_log,
+    delays...) por bloques de _ITER_CHUNK elementos, de modo que nunca se
+    materializa el texto completo de un valor grande. Cada pieza usa el
+    codificador en C (encode) en lugar de iterencode, que recurre a la
+    implementación en Python. El texto resultante es idéntico al de json.dump
+    con los separadores por defecto.
+    """
+    if isinstance(data, dict) and data:
+        separator = '{'
+        for key, value in data.items():
+            yield f"{separator}{encoder.encode(str(key))}: "
+            yield from _iter_json_pieces(value, encoder)
+            separator = ', '
+        yield '}'
+        return
+
+    if _is_long_sequence(data):
+        separator = '['
+        for start in range(0, len(data), _ITER_CHUNK):
+            chunk = data[start:start + _ITER_CHUNK]
+            chunk = chunk.tolist() if isinstance(chunk, np.ndarray) else list(chunk)
+            # encode(lista) -> "[a, b]": se quitan los corchetes del bloque
+            yield separator + encoder.encode(chunk)[1:-1]
+            separator = ', '
+        yield ']'
+        return
+
+    yield encoder.encode(data)
+
+
+def write_json_gzip_parallel(data: Any, path: str, compresslevel: int = 6,
+                             max_workers: Optional[int] = None,
+                             block_size: int = COMPRESSION_BLOCK_SIZE) -> Tuple[int, int]:
+    """
+    Guardar JSON comprimido con gzip usando varios hilos
+
+    El texto se corta en bloques que se comprimen en paralelo como miembros
+    gzip independientes y se escriben en orden. Un archivo gzip con varios
+    miembros concatenados es estándar: gzip.open, gunzip y zcat lo leen igual.
+
+    Args:
+        data: Objeto a serializar
+        path: Ruta del .json.gz
+        compresslevel: Nivel zlib (1 = rápido, 9 = máximo)
+        max_workers: Hilos de compresión (None = número de CPUs, máx. 8)
+        block_size: Bytes de JSON por bloque
+
+    Returns:
+        (bytes sin comprimir, bytes comprimidos)
+    """
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    encoder = json.JSONEncoder(ensure_ascii=False, default=_json_default)
+    temp_path = path + ".tmp"
+    raw_bytes = 0
+    compressed_bytes = 0
+
+    try:
+        with open(temp_path, 'wb') as f, ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            def write_ready(limit: int):
+                nonlocal compressed_bytes
+                while len(pending) > limit:
+                    member = pending.popleft().result()
+                    f.write(member)
+                    compressed_bytes += len(member)
+
+            def submit(block: bytes):
+                nonlocal raw_bytes
+                raw_bytes += len(block)
+                pending.append(executor.submit(_compress_gzip_member, block, compresslevel))
+                # Limitar bloques en vuelo para acotar la memoria
+                write_ready(workers * 2)
+
+            # Agrupar piezas pequeñas y cortar las grandes en bloques de block_size
+            buffered = []
+            buffered_size = 0
+            for piece in _iter_json_pieces(data, encoder):
+                encoded = piece.encode('utf-8')
+                if buffered_size + len(encoded) < block_size:
+                    buffered.append(encoded)
+                    buffered_size += len(encoded)
+                    continue
+
+                offset = block_size - buffered_size
+                buffered.append(encoded[:offset])
+                submit(b''.join(buffered))
+                while len(encoded) - offset >= block_size:
+                    submit(encoded[offset:offset + block_size])
+                    offset += block_size
+                buffered = [encoded[offset:]]
+                buffered_size = len(encoded) - offset
+
+            if buffered_size:
+                submit(b''.join(buffered))
+
+            write_ready(0)
+
+        os.replace(temp_path, path)
+
+    except BaseException:
+        # No dejar un .tmp a medio escribir
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return raw_bytes, compressed_bytes
+
+
+def session_dir_from_data_file(path: str) -> str:
+    """Directorio de sesión a partir de la ruta de sus datos (cualquier formato)"""
+    if os.path.isdir(path):
+        if os.path.exists(os.path.join(path, MANIFEST_FILENAME)):
+            return os.path.dirname(os.path.normpath(path))
+        return path
+    if path.endswith(MANIFEST_FILENAME):
+        return os.path.dirname(os.path.dirname(path))
+    return os.path.dirname(path)
+
+
+def load_simulation_session(path: str, mmap_mode: Optional[str] = 'r') -> Dict[str, Any]:
+    """
+    Cargar resultados de simulación en cualquiera de los formatos guardados
+
+    Args:
+        path: Directorio de sesión, directorio columnar, manifest.json,
+              datos_simulacion.json o datos_simulacion.json.gz
+        mmap_mode: Modo de memory-map para sesiones columnares (None = cargar
+                   en memoria; ver close_session)
+
+    Returns:
+        Dict de resultados de simulación
+    """
+    if os.path.isdir(path):
+        if os.path.exists(os.path.join(path, MANIFEST_FILENAME)):
+            return load_columnar_session(path, mmap_mode)
+        data_file = find_session_data_file(path)
+        if data_file is None:
+            raise FileNotFoundError(f"No hay datos de simulación en {path}")
+        path = data_file
+
+    if path.endswith(MANIFEST_FILENAME):
+        return load_columnar_session(path, mmap_mode)
+
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
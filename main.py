@@ -7,10 +7,10 @@ import sys
 import os
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import QTimer
 from utils.resource_manager import resource_manager
 from ui.splash_screen import SplashScreen
 from ui.main_window import MainWindow
+from core.devices.icon_cache import ICON_CACHE
 
 def main():
     """Función principal de la aplicación"""
@@ -24,18 +24,18 @@ def main():
     
     # Crear y mostrar splash screen
     splash = SplashScreen()
-    splash.show_splash(duration=3000)  # Mostrar por 3 segundos
+    splash.show_splash()
+    app.processEvents()  # Pintar el splash antes de construir la ventana
     
-    # Crear la ventana principal pero no mostrarla aún
-    window = MainWindow()
+    # Precargar iconos de dispositivos en segundo plano mientras se ve el splash
+    ICON_CACHE.preload()
     
-    # Función para mostrar la ventana principal después del splash
-    def show_main_window():
-        window.show()
-        splash.close()
+    # Crear la ventana principal pero no mostrarla aún (la pila RL no se
+    # importa aquí: se carga en segundo plano al entrar en modo RL)
+    window = MainWindow()
     
-    # Usar QTimer para mostrar la ventana principal después del splash
-    QTimer.singleShot(3000, show_main_window)  # Esperar 3 segundos
+    # Mostrar la ventana principal en cuanto está lista, sin temporizador fijo
+    splash.finish_when_ready(window)
     
     # Ejecutar el bucle principal de la aplicación
     sys.exit(app.exec_())
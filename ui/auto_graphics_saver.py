@@ -5,31 +5,60 @@ Sistema de guardado automático de gráficos al finalizar simulación
 
 import os
 import json
-import gzip
 import time
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
 
 from .pon_metrics_charts import PONMetricsChartsPanel
+from core.utilities.session_store import (
+    save_columnar_session, write_json_gzip_parallel, find_session_data_file,
+    COLUMNAR_DIRNAME, MANIFEST_FILENAME
+)
+from core.utilities.session_catalog import SessionCatalog
+from .chart_export import ChartExportThread, FRIENDLY_CHART_NAMES
+from core.pon.sdn_metrics_processor import SDNMetricsProcessor, SDN_METRICS_SIDECAR
+
+# Formatos de guardado de datos de simulación
+DATA_FORMAT_COLUMNAR = 'columnar'   # Directorio de arrays .npy + manifiesto JSON
+DATA_FORMAT_JSON = 'json'           # JSON completo (gzip opcional)
+
+# Perfiles de compresión gzip (nivel zlib)
+COMPRESSION_PROFILES = {
+    'fast': 1,       # Máxima velocidad
+    'balanced': 6,   # Compromiso velocidad / tamaño
+    'max': 9         # Máxima compresión (equivale al gzip.open anterior)
+}
 
 
 class SaveDataThread(QThread):
     """Thread para guardar datos en segundo plano sin bloquear UI"""
 
     # Señales
-    save_complete = pyqtSignal(str, float, float)  # (directorio, tiempo_guardado, tamaño_mb)
+    save_complete = pyqtSignal(str, float, float, float)  # (directorio, tiempo_guardado, tamaño_mb, velocidad_mb_s)
     save_error = pyqtSignal(str)     # Emite error si falla
     save_progress = pyqtSignal(str)  # Emite progreso (opcional)
 
     def __init__(self, session_dir: str, simulation_data: Dict[str, Any],
                  session_info: Optional[Dict[str, Any]] = None,
-                 use_compression: bool = True):
+                 use_compression: bool = True,
+                 data_format: str = DATA_FORMAT_COLUMNAR,
+                 catalog: Optional[SessionCatalog] = None,
+                 compression_profile: str = 'balanced',
+                 compression_workers: Optional[int] = None):
         super().__init__()
         self.session_dir = session_dir
         self.simulation_data = simulation_data
         self.session_info = session_info
         self.use_compression = use_compression
+        self.data_format = data_format
+        self.catalog = catalog
+        self.compression_level = COMPRESSION_PROFILES.get(compression_profile, COMPRESSION_PROFILES['balanced'])
+        self.compression_workers = compression_workers
+        self.throughput_mb_s = 0.0  # MB de datos (sin comprimir) escritos por segundo
+        self.data_file = None
+        self.timestamp = None
         self.start_time = None
         self.file_size_mb = 0
 
@@ -39,9 +68,18 @@ class SaveDataThread(QThread):
             # Iniciar cronómetro
             self.start_time = time.time()
 
-            # 1. Guardar JSON
-            self.save_progress.emit("Guardando datos JSON...")
-            data_file = self._save_json_data()
+            # 1. Guardar datos (columnar o JSON)
+            if self.data_format == DATA_FORMAT_JSON:
+                self.save_progress.emit("Guardando datos JSON...")
+                data_file = self._save_json_data()
+            else:
+                self.save_progress.emit("Guardando datos columnares...")
+                data_file = self._save_columnar_data()
+            self.data_file = data_file
+
+            # 1b. Precalcular métricas SDN (el dashboard las lee sin recalcular)
+            self.save_progress.emit("Precalculando métricas SDN...")
+            self._save_sdn_metrics()
 
             # 2. Guardar resumen TXT
             self.save_progress.emit("Generando resumen...")
@@ -51,11 +89,16 @@ class SaveDataThread(QThread):
             self.save_progress.emit("Guardando metadata...")
             self._save_metadata()
 
+            # 4. Registrar sesión en el catálogo
+            if self.catalog is not None:
+                self.save_progress.emit("Actualizando catálogo de sesiones...")
+                self._update_catalog()
+
             # Calcular tiempo total
             elapsed_time = time.time() - self.start_time
 
             # Emitir señal de completado con métricas
-            self.save_complete.emit(self.session_dir, elapsed_time, self.file_size_mb)
+            self.save_complete.emit(self.session_dir, elapsed_time, self.file_size_mb, self.throughput_mb_s)
 
         except Exception as e:
             self.save_error.emit(f"Error en thread de guardado: {e}")
@@ -64,15 +107,23 @@ class SaveDataThread(QThread):
         """Guardar datos JSON con compresión opcional y medición de tamaño"""
         try:
             if self.use_compression:
-                # Guardar comprimido con gzip
+                # Guardar comprimido con gzip: bloques comprimidos en paralelo
+                # como miembros gzip independientes (legible por cualquier lector gzip)
                 data_file = os.path.join(self.session_dir, "datos_simulacion.json.gz")
-                with gzip.open(data_file, 'wt', encoding='utf-8') as f:
-                    # Sin indent para reducir tamaño ~40%
-                    json.dump(self.simulation_data, f, ensure_ascii=False, default=str)
+                compress_start = time.time()
+                raw_bytes, compressed_bytes = write_json_gzip_parallel(
+                    self.simulation_data, data_file,
+                    compresslevel=self.compression_level,
+                    max_workers=self.compression_workers
+                )
+                compress_time = time.time() - compress_start
 
                 # Obtener tamaño del archivo
-                self.file_size_mb = os.path.getsize(data_file) / (1024 * 1024)
-                print(f"✅ Datos guardados (comprimidos): datos_simulacion.json.gz ({self.file_size_mb:.2f} MB)")
+                self.file_size_mb = compressed_bytes / (1024 * 1024)
+                raw_mb = raw_bytes / (1024 * 1024)
+                self.throughput_mb_s = raw_mb / compress_time if compress_time > 0 else 0.0
+                print(f"✅ Datos guardados (comprimidos): datos_simulacion.json.gz ({self.file_size_mb:.2f} MB, "
+                      f"{raw_mb:.2f} MB sin comprimir a {self.throughput_mb_s:.1f} MB/s)")
             else:
                 # Guardar sin comprimir pero sin indent
                 data_file = os.path.join(self.session_dir, "datos_simulacion.json")
@@ -88,6 +139,38 @@ class SaveDataThread(QThread):
         except Exception as e:
             raise Exception(f"Error guardando JSON: {e}")
 
+    def _save_columnar_data(self) -> str:
+        """Guardar datos en formato columnar (arrays .npy + manifiesto JSON)"""
+        try:
+            write_start = time.time()
+            data_dir, total_bytes = save_columnar_session(self.simulation_data, self.session_dir)
+            write_time = time.time() - write_start
+            self.file_size_mb = total_bytes / (1024 * 1024)
+            self.throughput_mb_s = self.file_size_mb / write_time if write_time > 0 else 0.0
+            print(f"✅ Datos guardados (columnar): {COLUMNAR_DIRNAME}/ ({self.file_size_mb:.2f} MB)")
+            return os.path.join(data_dir, MANIFEST_FILENAME)
+
+        except Exception as e:
+            raise Exception(f"Error guardando datos columnares: {e}")
+
+    def _save_sdn_metrics(self):
+        """Calcular el paquete de métricas SDN y guardarlo como sidecar versionado"""
+        try:
+            processor = SDNMetricsProcessor()
+            processor.set_simulation_data(self.simulation_data)
+            if processor.calculate_sdn_metrics() and processor.save_metrics_sidecar(self.session_dir):
+                print(f"✅ Métricas SDN precalculadas: {SDN_METRICS_SIDECAR}")
+
+        except Exception as e:
+            # El dashboard recalcula si falta el sidecar
+            print(f"⚠️ Error precalculando métricas SDN: {e}")
+
+    def _get_data_file_name(self) -> str:
+        """Ruta relativa (a la sesión) del archivo de datos guardado"""
+        if self.data_file:
+            return os.path.relpath(self.data_file, self.session_dir)
+        return 'datos_simulacion.json.gz' if self.use_compression else 'datos_simulacion.json'
+
     def _save_summary(self, data_file: str):
         """Guardar archivo de resumen TXT"""
         try:
@@ -126,7 +209,8 @@ class SaveDataThread(QThread):
                 # Archivos generados
                 f.write("📁 ARCHIVOS GENERADOS:\n")
                 f.write("-" * 30 + "\n")
-                f.write(f"• Datos completos: {os.path.basename(data_file)}\n")
+                f.write(f"• Datos completos: {self._get_data_file_name()}\n")
+                f.write(f"• Métricas SDN: {SDN_METRICS_SIDECAR}\n")
                 f.write(f"• Resumen: RESUMEN.txt\n")
                 f.write(f"• Metadata: metadata.json\n")
 
@@ -140,11 +224,13 @@ class SaveDataThread(QThread):
         try:
             metadata_file = os.path.join(self.session_dir, "metadata.json")
 
+            self.timestamp = datetime.now().isoformat()
             metadata = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': self.timestamp,
                 'session_dir': os.path.basename(self.session_dir),
                 'compression_used': self.use_compression,
-                'data_file': 'datos_simulacion.json.gz' if self.use_compression else 'datos_simulacion.json'
+                'data_format': self.data_format,
+                'data_file': self._get_data_file_name()
             }
 
             if self.session_info:
@@ -158,6 +244,26 @@ class SaveDataThread(QThread):
         except Exception as e:
             raise Exception(f"Error guardando metadata: {e}")
 
+    def _update_catalog(self):
+        """Registrar la sesión guardada en el catálogo de simulation_results"""
+        try:
+            sim_summary = self.simulation_data.get('simulation_summary', {})
+            self.catalog.register_session(
+                self.session_dir,
+                self.timestamp or datetime.now().isoformat(),
+                session_info=self.session_info,
+                performance_metrics=sim_summary.get('performance_metrics', {}),
+                data_file=self._get_data_file_name(),
+                data_format=self.data_format,
+                size_mb=self.file_size_mb,
+                extra={'simulation_stats': sim_summary.get('simulation_stats', {})}
+            )
+            print(f"✅ Sesión registrada en catálogo: {os.path.basename(self.session_dir)}")
+
+        except Exception as e:
+            # El catálogo es un índice: su fallo no invalida los datos guardados
+            print(f"⚠️ Error actualizando catálogo de sesiones: {e}")
+
 
 class AutoGraphicsSaver(QObject):
     """Gestor de guardado automático de gráficos"""
@@ -166,13 +272,21 @@ class AutoGraphicsSaver(QObject):
     graphics_saved = pyqtSignal(str)  # Directorio donde se guardaron
     save_error = pyqtSignal(str)      # Error al guardar
     save_progress = pyqtSignal(str)   # Progreso del guardado
+    charts_exported = pyqtSignal(str, dict)  # (directorio de gráficos, {chart_id: archivo})
 
-    def __init__(self, use_compression: bool = True):
+    def __init__(self, use_compression: bool = True, data_format: str = DATA_FORMAT_COLUMNAR,
+                 compression_profile: str = 'balanced'):
         super().__init__()
         self.base_directory = "simulation_results"
-        self.use_compression = use_compression  # Usar compresión gzip por defecto
+        self.use_compression = use_compression  # Usar compresión gzip por defecto (formato JSON)
+        self.data_format = data_format  # 'columnar' (por defecto) o 'json'
+        self.compression_profile = compression_profile  # 'fast', 'balanced' o 'max'
         self.save_thread = None  # Thread actual de guardado
+        self.chart_export_thread = None  # Thread actual de exportación de gráficos
+        self._pending_chart_exports = deque()  # (session_dir, max_workers) en espera del thread actual
+        self._export_charts_sessions = set()  # Sesiones que exportan PNG al terminar el guardado
         self.ensure_base_directory()
+        self.catalog = SessionCatalog(self.base_directory)  # Índice de sesiones guardadas
         
     def ensure_base_directory(self):
         """Asegurar que existe el directorio base"""
@@ -195,7 +309,8 @@ class AutoGraphicsSaver(QObject):
     def save_simulation_graphics_and_data(self,
                                         charts_panel: PONMetricsChartsPanel,
                                         simulation_data: Dict[str, Any],
-                                        session_info: Optional[Dict[str, Any]] = None) -> str:
+                                        session_info: Optional[Dict[str, Any]] = None,
+                                        export_charts: bool = False) -> str:
         """
         Guardar automáticamente gráficos y datos de simulación usando QThread.
         El guardado se ejecuta en segundo plano sin bloquear la UI.
@@ -204,6 +319,8 @@ class AutoGraphicsSaver(QObject):
             charts_panel: Panel de gráficos con los charts generados
             simulation_data: Datos completos de la simulación
             session_info: Información adicional de la sesión
+            export_charts: Exportar los gráficos PNG (en procesos aparte) desde
+                           los datos guardados, una vez terminado el guardado
 
         Returns:
             str: Directorio donde se guardará todo (retorna inmediatamente)
@@ -213,9 +330,10 @@ class AutoGraphicsSaver(QObject):
             session_dir = self.create_session_directory()
             print(f"📁 Directorio de sesión creado: {session_dir}")
 
-            # DESACTIVADO: No guardar gráficos PNG automáticamente
-            # if charts_panel and hasattr(charts_panel, 'charts'):
-            #     self._save_graphics_as_images(charts_panel, session_dir)
+            # Los gráficos PNG ya no se guardan desde los widgets: si se piden,
+            # se renderizan desde los datos guardados al completar el guardado
+            if export_charts:
+                self._export_charts_sessions.add(session_dir)
 
             # Iniciar guardado de datos en THREAD SEPARADO
             print(f"🚀 Iniciando guardado en segundo plano...")
@@ -243,7 +361,10 @@ class AutoGraphicsSaver(QObject):
             session_dir,
             simulation_data,
             session_info,
-            use_compression=self.use_compression
+            use_compression=self.use_compression,
+            data_format=self.data_format,
+            catalog=self.catalog,
+            compression_profile=self.compression_profile
         )
 
         # Conectar señales
@@ -254,14 +375,69 @@ class AutoGraphicsSaver(QObject):
         # Iniciar thread
         self.save_thread.start()
 
-    def _on_save_complete(self, session_dir: str, elapsed_time: float, file_size_mb: float):
+    def _on_save_complete(self, session_dir: str, elapsed_time: float, file_size_mb: float,
+                          throughput_mb_s: float):
         """Callback cuando el guardado se completa exitosamente"""
         print(f"✅ Guardado completado en segundo plano: {session_dir}")
         print(f"⏱️  Tiempo de guardado: {elapsed_time:.2f} segundos")
         print(f"💾 Tamaño del archivo: {file_size_mb:.2f} MB")
-        print(f"📊 Velocidad: {file_size_mb/elapsed_time:.2f} MB/s")
+        print(f"📊 Velocidad de escritura de datos: {throughput_mb_s:.2f} MB/s")
         self.graphics_saved.emit(session_dir)
 
+        if session_dir in self._export_charts_sessions:
+            self._export_charts_sessions.discard(session_dir)
+            self.export_session_charts(session_dir)
+
+    def export_session_charts(self, session_dir: str, max_workers: Optional[int] = None) -> bool:
+        """
+        Exportar los gráficos de una sesión guardada a session_dir/graficos
+
+        El renderizado se hace en un pool de procesos (backend Agg) leyendo los
+        datos guardados; la UI no se bloquea ni se tocan sus widgets. Si ya hay
+        una exportación en curso, esta queda en cola y empieza al terminar aquella.
+
+        Returns:
+            True si la exportación se inició o quedó en cola
+        """
+        data_file = find_session_data_file(session_dir)
+        if data_file is None:
+            self.save_error.emit(f"No hay datos guardados para exportar gráficos en {session_dir}")
+            return False
+
+        if self.chart_export_thread and self.chart_export_thread.isRunning():
+            print("⚠️ Exportación de gráficos anterior aún en progreso, se encola")
+            self._pending_chart_exports.append((session_dir, max_workers))
+            return True
+
+        graphics_dir = os.path.join(session_dir, "graficos")
+        self.chart_export_thread = ChartExportThread(
+            graphics_dir,
+            data_path=data_file,
+            filename_pattern="{name}.png",
+            chart_names=FRIENDLY_CHART_NAMES,
+            max_workers=max_workers
+        )
+        self.chart_export_thread.chart_exported.connect(
+            lambda chart_id, filename, done, total: self._on_save_progress(
+                f"Gráfico {done}/{total} guardado: {os.path.basename(filename)}"
+            )
+        )
+        self.chart_export_thread.export_completed.connect(
+            lambda exported: self.charts_exported.emit(graphics_dir, exported)
+        )
+        self.chart_export_thread.export_error.connect(self._on_save_error)
+        self.chart_export_thread.finished.connect(self._start_next_chart_export)
+
+        print(f"🖼️ Exportando gráficos en segundo plano: {graphics_dir}")
+        self.chart_export_thread.start()
+        return True
+
+    def _start_next_chart_export(self):
+        """Iniciar la siguiente exportación en cola (al terminar la actual)"""
+        if self._pending_chart_exports:
+            session_dir, max_workers = self._pending_chart_exports.popleft()
+            self.export_session_charts(session_dir, max_workers)
+
     def _on_save_error(self, error_msg: str):
         """Callback cuando hay un error en el guardado"""
         print(f"❌ Error en guardado asíncrono: {error_msg}")
@@ -272,61 +448,6 @@ class AutoGraphicsSaver(QObject):
         print(f"💾 {progress_msg}")
         self.save_progress.emit(progress_msg)
     
-    def _save_graphics_as_images(self, charts_panel: PONMetricsChartsPanel, session_dir: str) -> Dict[str, str]:
-        """Guardar todos los gráficos como imágenes PNG de alta calidad"""
-        graphics_dir = os.path.join(session_dir, "graficos")
-        os.makedirs(graphics_dir, exist_ok=True)
-        
-        saved_graphics = {}
-        
-        if not hasattr(charts_panel, 'charts') or not charts_panel.charts:
-            print("WARNING No hay graficos para guardar")
-            return saved_graphics
-        
-        # Mapeo de nombres técnicos a nombres amigables
-        chart_names = {
-            'delay': 'evolucion_delay',
-            'throughput': 'evolucion_throughput', 
-            'buffer': 'niveles_buffer_onu',
-            'utilization': 'utilizacion_red',
-            'algorithm': 'rendimiento_algoritmo_dba',
-            'traffic': 'distribucion_trafico'
-        }
-        
-        for chart_id, chart_widget in charts_panel.charts.items():
-            try:
-                friendly_name = chart_names.get(chart_id, chart_id)
-                filename = os.path.join(graphics_dir, f"{friendly_name}.png")
-                
-                # Guardar con alta resolución de forma segura
-                try:
-                    chart_widget.fig.savefig(
-                        filename, 
-                        dpi=300, 
-                        bbox_inches='tight',
-                        facecolor='white',
-                        edgecolor='none',
-                        format='png',
-                        pad_inches=0.1
-                    )
-                except Exception as save_error:
-                    print(f"WARNING Error guardando {friendly_name}, intentando metodo alternativo: {save_error}")
-                    # Método alternativo más seguro
-                    chart_widget.fig.savefig(
-                        filename, 
-                        dpi=150,  # DPI menor para evitar errores de memoria
-                        facecolor='white',
-                        format='png'
-                    )
-                
-                saved_graphics[chart_id] = filename
-                print(f"Grafico guardado: {friendly_name}.png")
-                
-            except Exception as e:
-                print(f"ERROR guardando grafico {chart_id}: {e}")
-        
-        return saved_graphics
-    
     def _save_simulation_data(self, simulation_data: Dict[str, Any], session_dir: str) -> str:
         """Guardar datos completos de simulación como JSON"""
         try:
@@ -445,71 +566,56 @@ class AutoGraphicsSaver(QObject):
         except Exception as e:
             print(f"ERROR guardando metadatos: {e}")
     
-    def get_latest_session_directory(self) -> Optional[str]:
-        """Obtener el directorio de la sesión más reciente"""
+    def get_latest_session_directory(self, **filters) -> Optional[str]:
+        """
+        Obtener el directorio de la sesión más reciente (consulta al catálogo)
+
+        Args:
+            **filters: Filtros opcionales (algorithm, traffic_scenario, num_onus)
+        """
         try:
-            if not os.path.exists(self.base_directory):
-                return None
-            
-            sessions = [d for d in os.listdir(self.base_directory) 
-                       if d.startswith('simulacion_') and 
-                       os.path.isdir(os.path.join(self.base_directory, d))]
-            
-            if not sessions:
-                return None
-            
-            # Ordenar por fecha (el nombre contiene timestamp)
-            sessions.sort(reverse=True)
-            latest_session = os.path.join(self.base_directory, sessions[0])
-            
-            return latest_session
-            
+            session = self.catalog.latest_existing_session(**filters)
+            return session['session_dir'] if session else None
+
         except Exception as e:
             print(f"ERROR buscando sesion mas reciente: {e}")
             return None
-    
-    def list_saved_sessions(self) -> list:
-        """Listar todas las sesiones guardadas con información básica"""
+
+    def list_saved_sessions(self, limit: Optional[int] = None, **filters) -> list:
+        """
+        Listar sesiones guardadas con información básica (consulta al catálogo)
+
+        Args:
+            limit: Número máximo de sesiones
+            **filters: Filtros opcionales (algorithm, traffic_scenario, num_onus)
+        """
         sessions_list = []
-        
+
         try:
-            if not os.path.exists(self.base_directory):
-                return sessions_list
-            
-            for session_name in os.listdir(self.base_directory):
-                session_path = os.path.join(self.base_directory, session_name)
-                
-                if not os.path.isdir(session_path) or not session_name.startswith('simulacion_'):
-                    continue
-                
-                # Leer metadatos si existen
-                metadata_file = os.path.join(session_path, '.metadata.json')
-                metadata = {}
-                
-                if os.path.exists(metadata_file):
-                    try:
-                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                    except:
-                        pass
-                
-                # Información básica de la sesión
-                session_info = {
-                    'name': session_name,
+            for session in self.catalog.list_sessions(limit=limit, **filters):
+                session_path = session['session_dir']
+                sessions_list.append({
+                    'name': session['session_id'],
                     'path': session_path,
-                    'created_at': metadata.get('created_at', 'unknown'),
-                    'configuration': metadata.get('configuration', {}),
+                    'created_at': session['created_at'],
+                    'configuration': {
+                        'algorithm': session['algorithm'],
+                        'traffic_scenario': session['traffic_scenario'],
+                        'num_onus': session['num_onus']
+                    },
+                    'metrics': {
+                        'mean_delay': session['mean_delay'],
+                        'mean_throughput': session['mean_throughput'],
+                        'network_utilization': session['network_utilization']
+                    },
+                    'data_file': session['data_file'],
+                    'size_mb': session['size_mb'],
                     'has_graphics': os.path.exists(os.path.join(session_path, 'graficos')),
-                    'has_data': os.path.exists(os.path.join(session_path, 'datos_simulacion.json')),
+                    'has_data': session['data_file'] is not None,
                     'has_summary': os.path.exists(os.path.join(session_path, 'RESUMEN.txt'))
-                }
-                
-                sessions_list.append(session_info)
-            
-            # Ordenar por fecha de creación (más reciente primero)
-            sessions_list.sort(key=lambda x: x['created_at'], reverse=True)
-            
+                })
+
         except Exception as e:
             print(f"ERROR listando sesiones: {e}")
-        
-        return sessions_list
\ No newline at end of file
+
+        return sessions_list
@@ -0,0 +1,207 @@
+"""
+Chart Export
+Exportación de gráficos PNG en paralelo: cada gráfico se renderiza en un
+proceso trabajador con backend Agg a partir de los datos de sesión guardados,
+sin tocar los widgets de la UI
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Optional, List
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.utilities.session_store import load_simulation_session, save_columnar_session, close_session
+from utils.translation_manager import translation_manager
+
+# Nombres de archivo usados por AutoGraphicsSaver en graficos/
+FRIENDLY_CHART_NAMES = {
+    'delay': 'evolucion_delay',
+    'throughput': 'evolucion_throughput',
+    'buffer': 'niveles_buffer_onu',
+    'utilization': 'utilizacion_red',
+    'mean_delay': 'evolucion_delay_medio',
+    'p95_delay': 'evolucion_delay_p95',
+    'jitter_ipdv': 'evolucion_jitter_ipdv',
+    'onu_tcont_analysis': 'analisis_tcont_onu'
+}
+
+# Datos de sesión cargados en cada proceso trabajador (memory-mapped si son columnares)
+_worker_session_cache: Dict[str, Any] = {}
+
+
+def _load_worker_session(data_path: str) -> Dict[str, Any]:
+    """Cargar (una vez por proceso) los datos de sesión a graficar"""
+    if data_path not in _worker_session_cache:
+        for session in _worker_session_cache.values():
+            close_session(session)
+        _worker_session_cache.clear()
+        _worker_session_cache[data_path] = load_simulation_session(data_path)
+    return _worker_session_cache[data_path]
+
+
+def render_chart_image(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Renderizar un gráfico a PNG en un proceso trabajador
+
+    Args:
+        task: Dict con chart_id, data_path, filename, language y dpi
+
+    Returns:
+        Dict con chart_id, filename y tiempo de renderizado
+    """
+    from .pon_chart_plotter import CHART_SPECS, OffscreenPONChart, normalize_simulation_data
+
+    start_time = time.time()
+    if translation_manager.get_current_language() != task['language']:
+        translation_manager.load_language(task['language'])
+
+    simulation_data = _load_worker_session(task['data_path'])
+    _, method_name, (width, height), normalized = next(
+        spec for spec in CHART_SPECS if spec[0] == task['chart_id']
+    )
+    if normalized:
+        simulation_data = normalize_simulation_data(simulation_data)
+
+    chart = OffscreenPONChart(width=width, height=height, export_dpi=task['dpi'])
+    getattr(chart, method_name)(simulation_data)
+
+    # Guardar con alta resolución de forma segura
+    try:
+        chart.fig.savefig(
+            task['filename'],
+            dpi=task['dpi'],
+            bbox_inches='tight',
+            facecolor='white',
+            edgecolor='none',
+            format='png',
+            pad_inches=0.1
+        )
+    except Exception as save_error:
+        print(f"WARNING Error guardando {task['chart_id']}, intentando metodo alternativo: {save_error}")
+        # Método alternativo más seguro
+        chart.fig.savefig(
+            task['filename'],
+            dpi=150,  # DPI menor para evitar errores de memoria
+            facecolor='white',
+            format='png'
+        )
+
+    return {
+        'chart_id': task['chart_id'],
+        'filename': task['filename'],
+        'render_time': time.time() - start_time
+    }
+
+
+# Intervalo (s) con el que el hilo comprueba si se pidió detener la exportación
+_STOP_POLL_INTERVAL = 0.2
+
+
+class ChartExportThread(QThread):
+    """Hilo que reparte el renderizado de gráficos en un pool de procesos"""
+
+    chart_exported = pyqtSignal(str, str, int, int)  # (chart_id, archivo, completados, total)
+    export_completed = pyqtSignal(dict)              # {chart_id: archivo}
+    export_error = pyqtSignal(str)
+
+    def __init__(self, output_dir: str, data_path: Optional[str] = None,
+                 simulation_data: Optional[Dict[str, Any]] = None,
+                 filename_pattern: str = "grafico_{chart_id}.png",
+                 chart_names: Optional[Dict[str, str]] = None,
+                 chart_ids: Optional[List[str]] = None,
+                 dpi: int = 300, max_workers: Optional[int] = None):
+        """
+        Args:
+            output_dir: Directorio de destino de las imágenes
+            data_path: Sesión guardada (directorio, manifest.json o archivo JSON)
+            simulation_data: Datos en memoria si no hay sesión guardada (se
+                             escriben una vez en formato columnar temporal)
+            filename_pattern: Patrón de nombre ({chart_id} o {name})
+            chart_names: Nombre por chart_id para {name} (por defecto el chart_id)
+            chart_ids: Gráficos a exportar (por defecto todos los del panel)
+            dpi: Resolución de las imágenes
+            max_workers: Procesos del pool (None = número de CPUs)
+        """
+        super().__init__()
+        from .pon_chart_plotter import CHART_SPECS
+
+        if data_path is None and simulation_data is None:
+            raise ValueError("Se requiere data_path o simulation_data")
+
+        self.output_dir = output_dir
+        self.data_path = data_path
+        self.simulation_data = simulation_data
+        self.filename_pattern = filename_pattern
+        self.chart_names = chart_names or {}
+        self.chart_ids = chart_ids or [spec[0] for spec in CHART_SPECS]
+        self.dpi = dpi
+        self.max_workers = max_workers or min(len(self.chart_ids), multiprocessing.cpu_count())
+        self.exported: Dict[str, str] = {}
+        self._stop_requested = False
+
+    def stop(self):
+        """Cancelar gráficos pendientes (run() termina sin esperar a los que están en curso)"""
+        self._stop_requested = True
+
+    def run(self):
+        temp_dir = None
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+
+            data_path = self.data_path
+            if data_path is None:
+                # Datos solo en memoria: volcarlos una vez en formato columnar para
+                # que cada trabajador los mapee en lugar de recibir una copia serializada
+                temp_dir = tempfile.mkdtemp(prefix="ponlab_charts_")
+                data_path, _ = save_columnar_session(self.simulation_data, temp_dir)
+
+            language = translation_manager.get_current_language()
+            tasks = [
+                {
+                    'chart_id': chart_id,
+                    'data_path': data_path,
+                    'filename': os.path.join(self.output_dir, self.filename_pattern.format(
+                        chart_id=chart_id, name=self.chart_names.get(chart_id, chart_id)
+                    )),
+                    'language': language,
+                    'dpi': self.dpi
+                }
+                for chart_id in self.chart_ids
+            ]
+
+            # 'spawn' evita heredar el estado de Qt del proceso principal
+            context = multiprocessing.get_context('spawn')
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            try:
+                pending = {executor.submit(render_chart_image, task) for task in tasks}
+                while pending and not self._stop_requested:
+                    done, pending = wait(pending, timeout=_STOP_POLL_INTERVAL,
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            print(f"ERROR exportando grafico: {e}")
+                            continue
+
+                        self.exported[result['chart_id']] = result['filename']
+                        self.chart_exported.emit(result['chart_id'], result['filename'],
+                                                 len(self.exported), len(tasks))
+            finally:
+                # Sin esperar: al detener no se bloquea hasta que acaben los gráficos en curso
+                executor.shutdown(wait=False, cancel_futures=True)
+
+            if not self._stop_requested:
+                self.export_completed.emit(dict(self.exported))
+
+        except Exception as e:
+            self.export_error.emit(f"Error exportando gráficos: {str(e)}")
+
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
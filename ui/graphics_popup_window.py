@@ -247,6 +247,25 @@ class GraphicsPopupWindow(QDialog):
         
         print(f"🎉 Results window shown, loading graphics...")
     
+    def start_live_charts(self, live_metrics):
+        """
+        Shows the window while the simulation runs, streaming live metrics.
+
+        Args:
+            live_metrics: LiveMetricsCollector attached to the running simulation.
+        """
+        self.session_info_label.setText(tr('graphics_popup.generating_data'))
+        self.show()
+        self.raise_()
+
+        if self.charts_panel:
+            self.charts_panel.start_live_mode(live_metrics)
+
+    def stop_live_charts(self):
+        """Stops live chart refresh (final results are shown afterwards)."""
+        if self.charts_panel:
+            self.charts_panel.stop_live_mode()
+
     def _update_charts_async(self, simulation_data: Dict[str, Any]):
         """Update charts asynchronously (does not block UI)"""
         try:
@@ -405,6 +424,10 @@ class GraphicsPopupWindow(QDialog):
                     files_info.append(f"  📊 {filename} ({size_kb:.1f} KB)")
                 elif filename.endswith('.txt'):
                     files_info.append(f"  📋 {filename}")
+                elif os.path.isdir(filepath) and os.path.exists(os.path.join(filepath, 'manifest.json')):
+                    # Datos en formato columnar (arrays .npy + manifiesto)
+                    size_mb = sum(entry.stat().st_size for entry in os.scandir(filepath)) / (1024 * 1024)
+                    files_info.append(f"  📊 {filename}/ ({size_mb:.2f} MB, columnar)")
                 elif os.path.isdir(filepath) and filename == 'graficos':
                     # Count graphics
                     graphics_count = len([f for f in os.listdir(filepath) if f.endswith('.png')])
@@ -6,6 +6,7 @@ Panel de prueba mejorado que usa el adaptador integrado y muestra gráficos auto
 print("[VERSIÓN] Cargando integrated_pon_test_panel.py v2.0 - con método _update_rl_models_list stub")
 
 import os
+import time
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QComboBox, QSpinBox, QTextEdit,
@@ -15,6 +16,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject, QEvent, QThread, QModelIndex
 from PyQt5.QtGui import QFont, QColor, QStandardItemModel, QStandardItem
 from core import PONAdapter
+from core.rl_integration.rl_stack_loader import RL_STACK
 from .pon_simulation_results_panel import PONResultsPanel
 from .auto_graphics_saver import AutoGraphicsSaver
 from .graphics_popup_window import GraphicsPopupWindow
@@ -144,45 +146,73 @@ class CustomComboBoxView(QListView):
 class SimulationWorker(QThread):
     """
     Worker thread para ejecutar simulación sin bloquear la UI
+
+    Las actualizaciones se acumulan en el worker y se envían a la UI como
+    mucho una vez cada update_interval segundos (solo la más reciente de cada
+    tipo); "init" y "end" se envían siempre, tras vaciar lo pendiente.
     """
     # Señales
     update_signal = pyqtSignal(str, dict)  # (event_type, data)
     finished_signal = pyqtSignal(bool, object)  # (success, result)
 
-    def __init__(self, adapter, use_hybrid=True, duration=10, steps=1000):
+    # Tipos de actualización que no se agrupan
+    IMMEDIATE_EVENTS = ("init", "end")
+
+    def __init__(self, adapter, use_hybrid=True, duration=10, steps=1000, update_interval=0.25):
         super().__init__()
         self.adapter = adapter
         self.use_hybrid = use_hybrid
         self.duration = duration
         self.steps = steps
+        self.update_interval = update_interval
         self._is_running = True
+        self._pending_updates = {}
+        self._last_emit_time = 0.0
+
+    def _queue_update(self, event_type, data):
+        """Agrupar actualizaciones y emitirlas a ritmo limitado"""
+        if not self._is_running:
+            return
+
+        if event_type in self.IMMEDIATE_EVENTS:
+            self._flush_updates()
+            self.update_signal.emit(event_type, data)
+            return
+
+        self._pending_updates[event_type] = data
+        now = time.perf_counter()
+        if now - self._last_emit_time >= self.update_interval:
+            self._flush_updates(now)
+
+    def _flush_updates(self, now=None):
+        """Emitir la última actualización pendiente de cada tipo"""
+        pending, self._pending_updates = self._pending_updates, {}
+        for event_type, data in pending.items():
+            if self._is_running:
+                self.update_signal.emit(event_type, data)
+        self._last_emit_time = now if now is not None else time.perf_counter()
 
     def run(self):
         """Ejecutar simulación en thread separado"""
         try:
             if self.use_hybrid:
-                # Simulación híbrida por eventos
-                def callback(event_type, data):
-                    if self._is_running:
-                        self.update_signal.emit(event_type, data)
-
+                # Simulación híbrida por eventos (el simulador ya limita el progreso por reloj)
                 success, result = self.adapter.run_hybrid_simulation(
                     duration_seconds=self.duration,
-                    callback=callback
+                    callback=self._queue_update,
+                    progress_interval=self.update_interval
                 )
+                self._flush_updates()
 
                 if self._is_running:
                     self.finished_signal.emit(success, result)
             else:
                 # Simulación clásica por pasos
-                def callback(event_type, data):
-                    if self._is_running:
-                        self.update_signal.emit(event_type, data)
-
                 success = self.adapter.run_netsim_simulation(
                     timesteps=self.steps,
-                    callback=callback
+                    callback=self._queue_update
                 )
+                self._flush_updates()
 
                 if self._is_running:
                     self.finished_signal.emit(success, None)
@@ -1826,6 +1856,9 @@ class IntegratedPONTestPanel(QWidget):
 
     def load_smart_rl_model(self):
         """Cargar modelo RL entrenado para Smart RL DBA"""
+        # Empezar a importar stable-baselines3/torch mientras se elige el archivo
+        RL_STACK.ensure_loaded()
+        
         # Diálogo para seleccionar archivo
         file_path, _ = QFileDialog.getOpenFileName(
             self,
@@ -1846,6 +1879,12 @@ class IntegratedPONTestPanel(QWidget):
                 'simulation_timestep': 0.0005
             }
 
+            # Esperar lo que quede de la carga de la pila RL antes de usar el modelo
+            if RL_STACK.state == RL_STACK.LOADING:
+                self.rl_status_label.setText(tr("rl_config_panel.rl_stack_loading"))
+                self.rl_status_label.repaint()
+                RL_STACK.wait()
+
             # Cargar modelo usando PONAdapter
             success, message = self.adapter.load_rl_model(file_path, env_params)
 
@@ -2159,12 +2198,18 @@ class IntegratedPONTestPanel(QWidget):
             self.results_panel.add_log_message(f"🏃 Ejecutando simulación híbrida: {duration}s (en background)...")
 
             # Crear worker thread
+            self._last_logged_cycle_block = 0
             self.simulation_worker = SimulationWorker(
                 adapter=self.adapter,
                 use_hybrid=True,
                 duration=duration,
                 steps=0
             )
+
+            # Métricas en vivo: la ventana emergente las grafica mientras simula
+            live_metrics = self.adapter.enable_live_metrics()
+            if live_metrics is not None and self.popup_window_checkbox.isChecked():
+                self._start_live_popup(live_metrics)
         else:
             # Simulación clásica por pasos
             steps = self.steps_spinbox.value()
@@ -2194,35 +2239,36 @@ class IntegratedPONTestPanel(QWidget):
         if use_hybrid:
             # Simulación híbrida
             if event_type == "update":
-                # Actualizar progreso basado en tiempo simulado
+                # Resumen de progreso agrupado (ritmo limitado por el worker)
                 duration = self.duration_spinbox.value()
                 sim_time = data.get('sim_time', 0)
                 progress = min(int((sim_time / duration) * 100), 100)
                 self.progress_bar.setValue(progress)
 
-                # Log eventos importantes
-                if data.get('event_type') == 'polling_cycle':
-                    cycle_num = data.get('data', {}).get('cycle_number', 0)
-                    if cycle_num % 100 == 0:  # Log cada 100 ciclos
-                        self.results_panel.add_log_message(f"Ciclo DBA: {cycle_num}")
-                        # Actualizar dashboard SDN durante la simulación
-                        sdn_metrics = self.adapter.get_sdn_metrics()
-                        if sdn_metrics:
-                            self.results_panel.add_log_message(f"📊 Actualizando métricas SDN (ciclo {cycle_num})")
-                            self.parent().update_sdn_metrics(sdn_metrics)
-                        else:
-                            self.results_panel.add_log_message("⚠️ No hay métricas SDN disponibles")
+                # Log al cruzar cada bloque de 100 ciclos DBA desde el último resumen
+                cycle_num = data.get('cycles_executed', 0)
+                if cycle_num // 100 > getattr(self, '_last_logged_cycle_block', 0):
+                    self._last_logged_cycle_block = cycle_num // 100
+                    self.results_panel.add_log_message(
+                        f"Ciclo DBA: {cycle_num} ({data.get('events_per_second', 0):,.0f} eventos/s)"
+                    )
+                    # Actualizar dashboard SDN durante la simulación
+                    sdn_metrics = self.adapter.get_sdn_metrics()
+                    if sdn_metrics:
+                        self.results_panel.add_log_message(f"📊 Actualizando métricas SDN (ciclo {cycle_num})")
+                        self.parent().update_sdn_metrics(sdn_metrics)
+                    else:
+                        self.results_panel.add_log_message("⚠️ No hay métricas SDN disponibles")
         else:
             # Simulación clásica
             if event_type == "init":
                 self.results_panel.add_log_message("Simulacion NetSim iniciada")
 
             elif event_type == "update":
-                current_step = data.get('steps', 0)
-                if current_step % 100 == 0:  # Actualizar cada 100 pasos
-                    self.progress_bar.setValue(current_step)
-                    # Actualizar métricas en tiempo real
-                    self.update_realtime_metrics(data)
+                # Las actualizaciones ya llegan agrupadas: usar siempre la última
+                self.progress_bar.setValue(data.get('steps', 0))
+                # Actualizar métricas en tiempo real
+                self.update_realtime_metrics(data)
 
     def _on_simulation_finished_worker(self, success: bool, result):
         """Callback cuando el worker thread termina la simulación"""
@@ -2231,6 +2277,9 @@ class IntegratedPONTestPanel(QWidget):
         self.progress_bar.setValue(self.progress_bar.maximum())
         self.simulation_running = False
 
+        if self.popup_window:
+            self.popup_window.stop_live_charts()
+
         if success:
             if use_hybrid:
                 self.results_panel.add_log_message("✅ Simulación híbrida completada")
@@ -2506,6 +2555,19 @@ class IntegratedPONTestPanel(QWidget):
             self.results_panel.add_log_message(f"ERROR mostrando ventana emergente: {e}")
             print(f"ERROR en show_graphics_popup_window: {e}")
     
+    def _start_live_popup(self, live_metrics):
+        """Abrir la ventana emergente en modo vivo durante la simulación híbrida"""
+        try:
+            if not self.popup_window:
+                self.popup_window = GraphicsPopupWindow(parent=self)
+                self.popup_window.window_closed.connect(self.on_popup_window_closed)
+                self.popup_window.graphics_exported.connect(self.on_additional_graphics_exported)
+
+            self.popup_window.start_live_charts(live_metrics)
+
+        except Exception as e:
+            print(f"ERROR en _start_live_popup: {e}")
+
     def on_popup_window_closed(self):
         """Callback cuando se cierra la ventana emergente"""
         self.results_panel.add_log_message("Ventana emergente de graficos cerrada")
@@ -527,18 +527,20 @@ class MainWindow(QMainWindow, MainWindowSDNMixin):
             self,
             tr('menu.file.open_simulation'),
             'simulation_results',  # Directorio por defecto
-            'Archivos de Simulación (*.json.gz);;Todos los archivos (*.*)'
+            'Archivos de Simulación (manifest.json *.json.gz);;Todos los archivos (*.*)'
         )
         
         if not file_path:
             return  # Usuario canceló
         
         try:
-            # 2. Descomprimir y cargar JSON
+            # 2. Cargar datos (columnar con memory-map, o JSON comprimido)
+            from core.utilities.session_store import load_simulation_session, MANIFEST_FILENAME
             self.statusBar().showMessage('Cargando simulación...', 2000)
             
-            with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                simulation_data = json.load(f)
+            # En memoria (sin memory-map): la ventana conserva los datos y la
+            # sesión debe poder borrarse o sobrescribirse mientras se muestra
+            simulation_data = load_simulation_session(file_path, mmap_mode=None)
             
             # 3. Validar que tenga la estructura esperada
             if 'simulation_summary' not in simulation_data:
@@ -553,6 +555,9 @@ class MainWindow(QMainWindow, MainWindowSDNMixin):
             
             # 4. Obtener directorio de la simulación (para archivos relacionados)
             session_directory = os.path.dirname(file_path)
+            if file_path.endswith(MANIFEST_FILENAME):
+                # El manifiesto columnar está dentro de <sesión>/datos_simulacion/
+                session_directory = os.path.dirname(session_directory)
             
             # 5. Extraer session_info si existe
             session_info = simulation_data.get('session_info', {})
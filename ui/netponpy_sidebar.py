@@ -12,13 +12,9 @@ from utils.translation_manager import tr
 from .integrated_pon_test_panel import IntegratedPONTestPanel
 from .rl_config_panel import RLConfigPanel
 
-# Importar TrainingManager con manejo de errores
-try:
-    from core.rl_integration.training_manager import TrainingManager
-    TRAINING_MANAGER_AVAILABLE = True
-except ImportError as e:
-    TRAINING_MANAGER_AVAILABLE = False
-    print(f"[WARNING] TrainingManager no disponible: {e}")
+# TrainingManager (gymnasium/stable-baselines3/torch) se importa en segundo
+# plano la primera vez que se entra en modo RL
+from core.rl_integration.rl_stack_loader import RL_STACK
 
 
 class NetPONPySidebar(QWidget):
@@ -36,11 +32,13 @@ class NetPONPySidebar(QWidget):
         self.dark_theme = False
         self.current_mode = 'simulation'  # Modo inicial: simulación
         
-        # Training Manager para RL
+        # Training Manager para RL (se crea cuando la pila RL termina de cargar)
         self.training_manager = None
-        self._initialize_training_manager()
+        self.canvas = None
         
         self.setup_ui()
+        
+        RL_STACK.state_changed.connect(self._on_rl_stack_state_changed)
     
     def setup_ui(self):
         """Configurar la interfaz del sidebar derecho"""
@@ -95,9 +93,8 @@ class NetPONPySidebar(QWidget):
         self.rl_panel = RLConfigPanel()
         self.rl_panel.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
-        # Conectar panel RL con TrainingManager
-        if self.training_manager:
-            self.rl_panel.set_training_manager(self.training_manager)
+        # El TrainingManager se conecta al terminar la carga de la pila RL
+        # (_on_rl_stack_state_changed)
             
         # Conectar señales del panel RL
         self.rl_panel.training_started.connect(self.rl_training_started.emit)
@@ -127,18 +124,33 @@ class NetPONPySidebar(QWidget):
         # Ajustar ancho después de inicializar
         QTimer.singleShot(100, self.adjust_width_for_content)
     
-    def _initialize_training_manager(self):
-        """Inicializar TrainingManager si está disponible"""
-        if TRAINING_MANAGER_AVAILABLE:
-            try:
-                self.training_manager = TrainingManager(self)
-                print("[OK] TrainingManager inicializado exitosamente")
-            except Exception as e:
-                print(f"[ERROR] Error inicializando TrainingManager: {e}")
-                self.training_manager = None
-        else:
+    def _on_rl_stack_state_changed(self, state, message):
+        """Reflejar la carga de la pila RL y crear el TrainingManager al terminar"""
+        self.rl_panel.set_rl_stack_state(state, message)
+        
+        if state == RL_STACK.READY and self.training_manager is None:
+            self._initialize_training_manager()
+        elif state == RL_STACK.UNAVAILABLE:
             print("[WARNING] TrainingManager no disponible - funciones RL limitadas")
     
+    def _initialize_training_manager(self):
+        """Inicializar TrainingManager (módulo ya importado por RL_STACK)"""
+        try:
+            from core.rl_integration.training_manager import TrainingManager
+            self.training_manager = TrainingManager(self)
+            print("[OK] TrainingManager inicializado exitosamente")
+        except Exception as e:
+            print(f"[ERROR] Error inicializando TrainingManager: {e}")
+            self.training_manager = None
+            return
+        
+        # Conectar paneles y canvas con el nuevo TrainingManager
+        self.rl_panel.set_training_manager(self.training_manager)
+        self.simulation_panel.training_manager = self.training_manager
+        if self.canvas is not None and hasattr(self.training_manager, 'env_bridge'):
+            self.training_manager.env_bridge.set_canvas_reference(self.canvas)
+            print("[OK] Canvas conectado con TrainingManager")
+    
     def toggle_mode(self):
         """Alternar entre modo simulación y aprendizaje reforzado"""
         if self.current_mode == 'simulation':
@@ -150,6 +162,9 @@ class NetPONPySidebar(QWidget):
         """Cambiar a modo Aprendizaje Reforzado"""
         self.current_mode = 'reinforcement_learning'
         
+        # Primera entrada en modo RL: cargar la pila RL en segundo plano
+        RL_STACK.ensure_loaded()
+        
         # Actualizar UI
         self.title_label.setText(tr('netponpy_sidebar.title_rl'))
         self.mode_toggle_button.setText("📊")
@@ -310,6 +325,8 @@ class NetPONPySidebar(QWidget):
     
     def set_canvas_reference(self, canvas):
         """Establecer referencia al canvas para ambos paneles"""
+        self.canvas = canvas
+        
         # Panel de simulación
         if hasattr(self, 'simulation_panel') and self.simulation_panel:
             self.simulation_panel.set_canvas_reference(canvas)
@@ -0,0 +1,1203 @@
+"""
+PON Chart Plotter
+Lógica de graficado de métricas PON sobre una figura de matplotlib, sin
+dependencias de Qt: la usan los widgets de PONMetricsChartsPanel y la
+exportación de imágenes en procesos trabajadores (backend Agg)
+"""
+
+import numpy as np
+from typing import Dict, List, Any
+from utils.translation_manager import tr
+from core.utilities.downsampling import history_arrays, lttb_downsample, minmax_downsample
+
+try:
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    MATPLOTLIB_AVAILABLE = False
+
+
+# Gráficos del panel: (id, método de PONChartPlotter, tamaño en pulgadas,
+# usa datos normalizados). Es el mismo conjunto que crea PONMetricsChartsPanel.
+CHART_SPECS = [
+    ('delay', 'plot_delay_evolution', (10, 4), True),
+    ('throughput', 'plot_throughput_evolution', (10, 4), True),
+    ('buffer', 'plot_onu_buffer_levels', (8, 5), True),
+    ('utilization', 'plot_network_utilization', (8, 5), True),
+    ('mean_delay', 'plot_mean_delay_evolution', (8, 5), False),
+    ('p95_delay', 'plot_p95_delay_evolution', (8, 5), False),
+    ('jitter_ipdv', 'plot_jitter_ipdv_evolution', (8, 5), False),
+    ('onu_tcont_analysis', 'plot_onu_tcont_analysis', (12, 8), False),
+]
+
+
+def detect_simulation_format(simulation_data: Dict[str, Any]) -> str:
+    """Detectar si los datos provienen de simulación híbrida o clásica"""
+    # Detectar formato híbrido por la presencia de timestamps en delays/throughputs
+    episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
+    delays = episode_metrics.get('delays', [])
+
+    if delays and isinstance(delays[0], dict) and 'timestamp' in delays[0]:
+        return 'hybrid'
+    return 'classic'
+
+
+def normalize_simulation_data(simulation_data: Dict[str, Any], simulation_format: str = None) -> Dict[str, Any]:
+    """Normalizar datos de simulación para compatibilidad con gráficos"""
+    if simulation_format is None:
+        simulation_format = detect_simulation_format(simulation_data)
+
+    if simulation_format == 'hybrid':
+        # Convertir formato híbrido al formato esperado por gráficos clásicos
+        return convert_hybrid_to_classic_format(simulation_data)
+    # Datos clásicos, devolverlos tal como están
+    return simulation_data
+
+
+def convert_hybrid_to_classic_format(hybrid_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convertir datos híbridos al formato clásico para compatibilidad"""
+    converted_data = hybrid_data.copy()
+
+    episode_metrics = hybrid_data.get('simulation_summary', {}).get('episode_metrics', {})
+
+    # Convertir buffer levels: mantener formato nuevo con MB y timestamps
+    buffer_history = episode_metrics.get('buffer_levels_history', [])
+    first_step = buffer_history[0] if buffer_history else None
+    if isinstance(first_step, dict) and 'time' in first_step and 'buffers' in first_step:
+        # Formato nuevo con timestamps: ya es compatible. Se conserva el mismo
+        # objeto (sin copiar) para que las cachés de los gráficos sigan válidas.
+        pass
+    elif buffer_history:
+        converted_buffer_history = []
+        for step_data in buffer_history:
+            # Detectar formato: nuevo (con 'time' y 'buffers') vs antiguo (solo buffers)
+            if isinstance(step_data, dict) and 'time' in step_data and 'buffers' in step_data:
+                # Formato nuevo con timestamps - mantener tal cual
+                converted_buffer_history.append(step_data)
+            else:
+                # Formato antiguo sin timestamps - convertir
+                converted_step = {}
+                for onu_id, level_data in step_data.items():
+                    # Manejar formato nuevo (dict) y antiguo (número)
+                    if isinstance(level_data, dict):
+                        # Ya está en formato nuevo con MB - mantener
+                        converted_step[onu_id] = level_data
+                    else:
+                        # Formato antiguo (fracción/porcentaje) - convertir a formato MB
+                        # Estimar 3.5MB total por ONU (512KB + 512KB + 1MB + 1MB + 256KB)
+                        used_mb = level_data * 3.5 if level_data <= 1 else level_data * 3.5 / 100
+                        converted_step[onu_id] = {
+                            'used_mb': used_mb,
+                            'capacity_mb': 3.5,
+                            'utilization_percent': level_data * 100 if level_data <= 1 else level_data
+                        }
+                converted_buffer_history.append(converted_step)
+
+        # Actualizar en la estructura convertida
+        if 'simulation_summary' not in converted_data:
+            converted_data['simulation_summary'] = {}
+        if 'episode_metrics' not in converted_data['simulation_summary']:
+            converted_data['simulation_summary']['episode_metrics'] = {}
+
+        converted_data['simulation_summary']['episode_metrics']['buffer_levels_history'] = converted_buffer_history
+
+    # Los delays y throughputs híbridos ya tienen formato compatible
+    # (incluso mejor con timestamp, onu_id, tcont_id)
+
+    return converted_data
+
+
+class PONChartPlotter:
+    """
+    Métodos de graficado de métricas PON
+
+    Las subclases aportan self.fig (matplotlib Figure) y draw(); los
+    resultados se dibujan siempre sobre self.fig.
+    """
+
+    def _init_plot_caches(self):
+        # Cachés de nivel de detalle: arrays extraídos por serie y series
+        # reducidas por (serie, resolución). Redibujar por cambio de tema o
+        # idioma con los mismos datos no vuelve a recorrer los historiales.
+        self._series_cache = {}
+        self._lod_cache = {}
+
+    def _plot_width_px(self) -> int:
+        """Ancho actual del gráfico en píxeles (resolución objetivo del downsampling)"""
+        return max(int(self.fig.bbox.width), 100)
+
+    def _cached_series(self, name: str, source, build):
+        """
+        Resultado de build() cacheado mientras la fuente sea el mismo objeto
+
+        Args:
+            name: Nombre de la serie
+            source: Historial original (lista o tabla columnar)
+            build: Función que extrae los arrays desde source
+        """
+        entry = self._series_cache.get(name)
+        if entry is not None and entry[0] is source and entry[1] == len(source):
+            return entry[2]
+
+        result = build()
+        self._series_cache[name] = (source, len(source), result)
+        return result
+
+    def _downsample_cached(self, name: str, x: np.ndarray, y: np.ndarray, mode: str = 'lttb'):
+        """
+        Reducir una serie al ancho del gráfico, cacheando por serie y resolución
+
+        La caché acierta mientras y sea el mismo array, así que los llamadores
+        deben pasar arrays cacheados con _cached_series. Las series que ya caben
+        en el ancho (p. ej. las sintéticas de 100 puntos) no pasan por la caché.
+
+        Args:
+            name: Nombre de la serie
+            x, y: Arrays completos
+            mode: 'lttb' (forma de la curva) o 'minmax' (envolvente, conserva picos)
+        """
+        width = self._plot_width_px()
+        if len(y) <= width:
+            return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+
+        key = (name, width, mode)
+        entry = self._lod_cache.get(key)
+        if entry is not None and entry[0] is y:
+            return entry[1], entry[2]
+
+        if mode == 'minmax':
+            x_out, y_out = minmax_downsample(x, y, width // 2)
+        else:
+            x_out, y_out = lttb_downsample(x, y, width)
+
+        if len(self._lod_cache) >= 64:
+            # Redimensionados sucesivos: descartar resoluciones antiguas
+            self._lod_cache.clear()
+        self._lod_cache[key] = (y, x_out, y_out)
+        return x_out, y_out
+
+    @staticmethod
+    def _metric_history_arrays(history, simulation_duration: float) -> tuple:
+        """Arrays (tiempo, valor) de un historial con timestamps o de valores sueltos"""
+        if isinstance(history[0], dict):
+            return history_arrays(history)
+        return np.linspace(0, simulation_duration, len(history)), np.asarray(history, dtype=float)
+
+    def _delay_history_arrays(self, delay_history) -> tuple:
+        """Arrays (tiempo, delay) del historial de delays, cacheados"""
+        return self._cached_series('delay_history', delay_history,
+                                   lambda: history_arrays(delay_history))
+
+    def plot_delay_evolution(self, simulation_data: Dict[str, Any]):
+        """Graficar evolución de delays durante la simulación"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self.fig.clear()
+
+        # Obtener datos de delay
+        simulation_summary = simulation_data.get('simulation_summary', {})
+        if not simulation_summary:
+            self._plot_no_data("Sin datos de simulación")
+            return
+
+        simulation_stats = simulation_summary.get('simulation_stats', {})
+        episode_metrics = simulation_summary.get('episode_metrics', {})
+        performance_metrics = simulation_summary.get('performance_metrics', {})
+
+        # Obtener duración real y delay history
+        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
+        delay_history = episode_metrics.get('delay_history', [])
+        mean_delay = performance_metrics.get('mean_delay', 0)
+
+        if not delay_history and mean_delay == 0:
+            self._plot_no_data("Sin datos de delay disponibles")
+            return
+
+        # Usar datos reales si están disponibles
+        if delay_history:
+            time_points, delay_values = self._delay_history_arrays(delay_history)
+            delays = self._cached_series('delay_seconds', delay_values,
+                                         lambda: delay_values / 1000)  # Convertir ms a segundos
+        else:
+            # Fallback: generar evolución simulada con duración correcta
+            print(f"[ADVERTENCIA] No hay delay_history, usando datos sintéticos")
+            time_points = np.linspace(0, simulation_duration, 100)
+            delays = self._simulate_delay_evolution(mean_delay, len(time_points))
+
+        # Reducir al ancho del gráfico (LTTB conserva primer y último punto)
+        plot_times, plot_delays = self._downsample_cached('delay', time_points, delays)
+
+        ax = self.fig.add_subplot(111)
+        ax.plot(plot_times, plot_delays, 'b-', linewidth=2, label=tr('pon_metrics_charts.legend_delay_avg'))
+        ax.fill_between(plot_times, plot_delays, alpha=0.3, color='blue')
+
+        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
+        ax.set_ylabel(tr('pon_metrics_charts.axis_delay'))
+        ax.set_title(tr('pon_metrics_charts.chart_delay_title').format(f"{simulation_duration:.1f}"))
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+        # Agregar estadísticas
+        final_delay = delays[-1] if len(delays) > 0 else mean_delay
+        ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_final_delay').format(f"{final_delay:.6f}"),
+                transform=ax.transAxes, verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+        self.fig.tight_layout()
+        self.draw()
+    
+    def plot_throughput_evolution(self, simulation_data: Dict[str, Any]):
+        """Graficar evolución de throughput durante la simulación"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self.fig.clear()
+
+        simulation_summary = simulation_data.get('simulation_summary', {})
+        if not simulation_summary:
+            self._plot_no_data("Sin datos de simulación")
+            return
+
+        simulation_stats = simulation_summary.get('simulation_stats', {})
+        episode_metrics = simulation_summary.get('episode_metrics', {})
+        performance_metrics = simulation_summary.get('performance_metrics', {})
+
+        # Obtener duración real y throughput history
+        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
+        throughput_history = episode_metrics.get('throughput_history', [])
+        mean_throughput = performance_metrics.get('mean_throughput', 0)
+
+        if not throughput_history and mean_throughput == 0:
+            self._plot_no_data("Sin datos de throughput disponibles")
+            return
+
+        # Usar datos reales si están disponibles
+        if throughput_history:
+            time_points = np.array([d['time'] for d in throughput_history])
+            throughputs = np.array([d['value'] for d in throughput_history])
+        else:
+            # Fallback: generar evolución simulada con duración correcta
+            print(f"[ADVERTENCIA] No hay throughput_history, usando datos sintéticos")
+            time_points = np.linspace(0, simulation_duration, 100)
+            throughputs = self._simulate_throughput_evolution(mean_throughput, len(time_points))
+
+        ax = self.fig.add_subplot(111)
+        ax.plot(time_points, throughputs, 'g-', linewidth=2, label=tr('pon_metrics_charts.legend_throughput_avg'))
+        ax.fill_between(time_points, throughputs, alpha=0.3, color='green')
+
+        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
+        ax.set_ylabel(tr('pon_metrics_charts.axis_throughput'))
+        ax.set_title(tr('pon_metrics_charts.chart_throughput_title').format(f"{simulation_duration:.1f}"))
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+        # Agregar estadísticas
+        final_throughput = throughputs[-1] if len(throughputs) > 0 else mean_throughput
+        ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_final_throughput').format(f"{final_throughput:.3f}"),
+                transform=ax.transAxes, verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.8))
+
+        self.fig.tight_layout()
+        self.draw()
+    
+    def plot_event_queue_evolution(self, simulation_data: Dict[str, Any]):
+        """Graficar evolución de eventos pendientes en la cola vs tiempo"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self.fig.clear()
+        ax = self.fig.add_subplot(111)
+
+        # Obtener datos
+        simulation_summary = simulation_data.get('simulation_summary', {})
+        episode_metrics = simulation_summary.get('episode_metrics', {})
+        simulation_stats = simulation_summary.get('simulation_stats', {})
+
+        event_queue_history = episode_metrics.get('event_queue_history', [])
+
+        if not event_queue_history:
+            self._plot_no_data("Sin historial de cola de eventos disponible")
+            return
+
+        # Extraer datos
+        times = [entry['time'] for entry in event_queue_history]
+        pending_events = [entry['pending_events'] for entry in event_queue_history]
+
+        # Graficar eventos pendientes
+        ax.plot(times, pending_events, 'b-', linewidth=2, label='Eventos Pendientes')
+        ax.fill_between(times, pending_events, alpha=0.3, color='blue')
+
+        # Línea de referencia del límite (1M)
+        max_limit = 1000000
+        ax.axhline(y=max_limit, color='r', linestyle='--', linewidth=2,
+                   label=f'Límite Máximo ({max_limit:,})', alpha=0.7)
+
+        ax.set_xlabel('Tiempo Simulado (s)')
+        ax.set_ylabel('Eventos Pendientes')
+        ax.set_title('Evolución de la Cola de Eventos Durante la Simulación')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+        # Formatear eje Y con separadores de miles
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{int(x):,}'))
+
+        # Estadísticas
+        max_pending = max(pending_events) if pending_events else 0
+        avg_pending = np.mean(pending_events) if pending_events else 0
+        final_pending = pending_events[-1] if pending_events else 0
+
+        # Detectar crecimiento exponencial
+        growth_type = "DESCONOCIDO"
+        if len(pending_events) > 10:
+            # Comparar primera mitad vs segunda mitad
+            mid = len(pending_events) // 2
+            first_half_avg = np.mean(pending_events[:mid])
+            second_half_avg = np.mean(pending_events[mid:])
+
+            if second_half_avg > first_half_avg * 2:
+                growth_type = "⚠️ EXPONENCIAL"
+                color = 'red'
+            elif second_half_avg > first_half_avg * 1.2:
+                growth_type = "⚠️ LINEAL CRECIENTE"
+                color = 'orange'
+            else:
+                growth_type = "✓ ESTABLE/CONSTANTE"
+                color = 'green'
+        else:
+            color = 'black'
+
+        stats_text = (f'Tipo: {growth_type}\n'
+                     f'Máximo: {max_pending:,}\n'
+                     f'Promedio: {avg_pending:,.0f}\n'
+                     f'Final: {final_pending:,}')
+
+        ax.text(0.02, 0.98, stats_text,
+                transform=ax.transAxes, verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='white', edgecolor=color, linewidth=2, alpha=0.9),
+                fontsize=10, fontweight='bold')
+
+        self.fig.tight_layout()
+        self.draw()
+
+    def plot_onu_buffer_levels(self, simulation_data: Dict[str, Any]):
+        """Graficar evolución temporal de los niveles de buffer por ONU"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self.fig.clear()
+
+        # Obtener datos históricos de buffer
+        # Primero intentar desde simulation_summary.episode_metrics (estructura más común)
+        simulation_summary = simulation_data.get('simulation_summary', {})
+        episode_metrics = simulation_summary.get('episode_metrics', {})
+        buffer_history = episode_metrics.get('buffer_levels_history', [])
+
+        # Si no hay datos, intentar desde la raíz (estructura alternativa)
+        if not buffer_history:
+            episode_metrics_root = simulation_data.get('episode_metrics', {})
+            buffer_history = episode_metrics_root.get('buffer_levels_history', [])
+
+        if not buffer_history:
+            self._plot_no_data("Sin historial de buffer")
+            return
+
+        ax = self.fig.add_subplot(111)
+
+        # Verificar estructura de datos
+        if not buffer_history or len(buffer_history) == 0:
+            self._plot_no_data("Historial de buffer vacío")
+            return
+
+        # Obtener número de ONUs desde la primera entrada
+        first_entry = buffer_history[0]
+        if not isinstance(first_entry, dict):
+            self._plot_no_data("Formato de datos de buffer inválido")
+            return
+
+        # Detectar formato: nuevo (con 'time' y 'buffers') vs antiguo (solo buffers)
+        has_timestamps = 'time' in first_entry and 'buffers' in first_entry
+
+        if has_timestamps:
+            onu_ids = list(buffer_history[0]['buffers'].keys())
+        else:
+            onu_ids = list(first_entry.keys())
+
+        # Extraer (una vez por historial) los niveles de todas las ONUs
+        time_steps, onu_levels = self._cached_series(
+            'buffer_levels', buffer_history,
+            lambda: self._extract_buffer_levels(buffer_history, onu_ids, has_timestamps)
+        )
+        
+        # Colores distintivos para cada ONU
+        colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray', 'olive', 'cyan']
+
+        # Graficar una línea por cada ONU
+        for i, onu_id in enumerate(onu_ids):
+            # Envolvente min/max por columna de píxeles: no se pierden picos de ocupación
+            plot_times, buffer_levels_percent = self._downsample_cached(
+                f"buffer_{onu_id}", time_steps, onu_levels[onu_id], mode='minmax'
+            )
+
+            # Usar color cíclico si hay más ONUs que colores
+            color = colors[i % len(colors)]
+
+            # Graficar línea para esta ONU
+            ax.plot(plot_times, buffer_levels_percent,
+                   color=color, linewidth=2, marker='o', markersize=3,
+                   label=tr('pon_metrics_charts.legend_onu').format(onu_id), alpha=0.8)
+
+        # Etiquetar ejes según el formato de datos
+        if has_timestamps:
+            ax.set_xlabel(tr('pon_metrics_charts.axis_simulation_time'))
+        else:
+            ax.set_xlabel(tr('pon_metrics_charts.axis_simulation_steps'))
+
+        ax.set_ylabel(tr('pon_metrics_charts.axis_buffer_level'))
+        ax.set_title(tr('pon_metrics_charts.chart_buffer_title'))
+        ax.set_ylim(0, 100)  # Porcentaje de 0 a 100%
+        ax.grid(True, alpha=0.3)
+        
+        # Líneas de referencia en porcentaje
+        ax.axhline(y=50, color='orange', linestyle='--', alpha=0.7, 
+                  label=tr('pon_metrics_charts.legend_medium_level'))
+        ax.axhline(y=80, color='red', linestyle='--', alpha=0.7, 
+                  label=tr('pon_metrics_charts.legend_high_level'))
+        
+        # Leyenda - manejar muchas ONUs
+        if len(onu_ids) <= 8:
+            ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        else:
+            ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', ncol=2, fontsize=8)
+        
+        self.fig.tight_layout()
+        self.draw()
+    
+    def _extract_buffer_levels(self, buffer_history: List[Dict], onu_ids: List[str],
+                               has_timestamps: bool) -> tuple:
+        """
+        Extraer tiempos y niveles de buffer (%) por ONU desde el historial
+
+        Returns:
+            (array de tiempos, {onu_id: array de porcentajes})
+        """
+        if has_timestamps:
+            # Formato nuevo: {'time': t, 'buffers': {onu_id: data}}
+            time_steps = np.array([entry['time'] for entry in buffer_history], dtype=float)
+        else:
+            # Formato antiguo: {onu_id: data} sin timestamps
+            time_steps = np.arange(len(buffer_history), dtype=float)
+
+        levels = {onu_id: np.empty(len(buffer_history)) for onu_id in onu_ids}
+        for step, step_data in enumerate(buffer_history):
+            # Obtener datos de buffer según el formato
+            buffers = step_data.get('buffers', {}) if has_timestamps else step_data
+
+            for onu_id in onu_ids:
+                onu_buffer_data = buffers.get(onu_id, {})
+
+                # Manejar formato de datos de buffer (dict con utilization_percent o número)
+                if isinstance(onu_buffer_data, dict):
+                    # Usar directamente el porcentaje de utilización
+                    buffer_percent = onu_buffer_data.get('utilization_percent', 0)
+                else:
+                    # Formato antiguo (ya es porcentaje o fracción)
+                    buffer_percent = onu_buffer_data * 100 if onu_buffer_data <= 1 else onu_buffer_data
+
+                levels[onu_id][step] = buffer_percent
+
+        return time_steps, levels
+
+    def plot_network_utilization(self, simulation_data: Dict[str, Any]):
+        """Graficar distribución de tráfico real en formato dona"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+            
+        self.fig.clear()
+        
+        # Obtener datos de utilización para el centro
+        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
+        network_utilization = performance_metrics.get('network_utilization', 0)
+        
+        # Obtener datos reales de tráfico desde episode_metrics
+        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
+        throughputs = episode_metrics.get('throughputs', [])
+        
+        if not throughputs:
+            # Si no hay datos, usar estructura alternativa
+            episode_metrics_root = simulation_data.get('episode_metrics', {})
+            throughputs = episode_metrics_root.get('throughputs', [])
+        
+        if not throughputs:
+            self._plot_no_data(tr('pon_metrics_charts.no_traffic_data'))
+            return
+        
+        # Calcular distribución real de tipos de tráfico basada en throughputs
+        tcont_counts = {'highest': 0, 'high': 0, 'medium': 0, 'low': 0, 'lowest': 0}
+        
+        for throughput_entry in throughputs:
+            tcont_type = throughput_entry.get('tcont_id', 'medium').lower()
+            if tcont_type in tcont_counts:
+                tcont_counts[tcont_type] += 1
+        
+        # Convertir a porcentajes
+        total_entries = sum(tcont_counts.values())
+        if total_entries == 0:
+            self._plot_no_data(tr('pon_metrics_charts.no_traffic_types'))
+            return
+        
+        # Calcular porcentajes reales
+        traffic_types = [
+            tr('pon_metrics_charts.traffic_highest'),
+            tr('pon_metrics_charts.traffic_high'),
+            tr('pon_metrics_charts.traffic_medium'),
+            tr('pon_metrics_charts.traffic_low'),
+            tr('pon_metrics_charts.traffic_lowest')
+        ]
+        tcont_keys = ['highest', 'high', 'medium', 'low', 'lowest']
+        values = [(tcont_counts[key] / total_entries) * 100 for key in tcont_keys]
+        
+        # Filtrar tipos de tráfico con valores > 0 para el gráfico
+        filtered_types = []
+        filtered_values = []
+        filtered_colors = []
+        base_colors = ['#ff4444', '#ff8800', '#ffdd00', '#4488ff', '#888888']
+        
+        for i, (traffic_type, value) in enumerate(zip(traffic_types, values)):
+            if value > 0:
+                filtered_types.append(traffic_type)
+                filtered_values.append(value)
+                filtered_colors.append(base_colors[i])
+        
+        if not filtered_values:
+            self._plot_no_data(tr('pon_metrics_charts.no_traffic_detected'))
+            return
+        
+        # Crear gráfico de dona
+        ax = self.fig.add_subplot(111)
+        wedges, texts, autotexts = ax.pie(filtered_values, labels=filtered_types, colors=filtered_colors, 
+                                         autopct='%1.1f%%', startangle=90, 
+                                         pctdistance=0.85,
+                                         wedgeprops={'width': 0.4})
+        
+        # Agregar porcentaje de utilización en el centro
+        if network_utilization > 0:
+            ax.text(0, 0, f'{network_utilization:.1f}%\n{tr("pon_metrics_charts.utilization")}', 
+                    ha='center', va='center', fontsize=16, fontweight='bold')
+        else:
+            ax.text(0, 0, f'N/A\n{tr("pon_metrics_charts.utilization")}', 
+                    ha='center', va='center', fontsize=16, fontweight='bold')
+        
+        # Título con información adicional
+        total_packets = len(throughputs)
+        ax.set_title(tr('pon_metrics_charts.network_util_title').format(f"{network_utilization:.1f}", total_packets), 
+                    fontsize=14, pad=20)
+        
+        self.fig.tight_layout()
+        self.draw()
+    
+    def plot_algorithm_performance(self, simulation_data: Dict[str, Any]):
+        """Graficar rendimiento del algoritmo DBA"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+            
+        self.fig.clear()
+        
+        orchestrator_stats = simulation_data.get('orchestrator_stats', {})
+        network_stats = simulation_data.get('simulation_summary', {}).get('network_stats', {})
+        
+        algorithm = network_stats.get('dba_algorithm', 'N/A')
+        
+        # Métricas del algoritmo
+        allocation_prob = orchestrator_stats.get('allocation_probability', 0)
+        blocking_prob = orchestrator_stats.get('blocking_probability', 0)
+        success_rate = network_stats.get('success_rate', 0)
+        
+        # Gráfico de barras horizontal
+        ax = self.fig.add_subplot(111)
+        
+        metrics = ['Prob. Asignación', 'Tasa de Éxito', 'Prob. No Bloqueo']
+        values = [allocation_prob * 100, success_rate, (1 - blocking_prob) * 100]
+        colors = ['blue', 'green', 'purple']
+        
+        bars = ax.barh(metrics, values, color=colors, alpha=0.7)
+        
+        # Agregar valores en las barras
+        for bar, value in zip(bars, values):
+            width = bar.get_width()
+            ax.text(width + 1, bar.get_y() + bar.get_height()/2,
+                   f'{value:.1f}%', ha='left', va='center', fontweight='bold')
+        
+        ax.set_xlabel('Porcentaje (%)')
+        ax.set_title(f'Rendimiento del Algoritmo DBA: {algorithm}')
+        ax.set_xlim(0, 105)
+        ax.grid(True, alpha=0.3)
+        
+        self.fig.tight_layout()
+        self.draw()
+    
+    def plot_traffic_distribution(self, simulation_data: Dict[str, Any]):
+        """Graficar distribución de tráfico real en formato dona"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+            
+        self.fig.clear()
+        
+        # Obtener datos de utilización para el centro
+        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
+        network_utilization = performance_metrics.get('network_utilization', 0)
+        
+        # Obtener datos reales de tráfico desde episode_metrics
+        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
+        throughputs = episode_metrics.get('throughputs', [])
+        
+        if not throughputs:
+            # Si no hay datos, usar estructura alternativa
+            episode_metrics_root = simulation_data.get('episode_metrics', {})
+            throughputs = episode_metrics_root.get('throughputs', [])
+        
+        if not throughputs:
+            self._plot_no_data(tr('pon_metrics_charts.no_traffic_data'))
+            return
+        
+        # Calcular distribución real de tipos de tráfico basada en throughputs
+        tcont_counts = {'highest': 0, 'high': 0, 'medium': 0, 'low': 0, 'lowest': 0}
+        
+        for throughput_entry in throughputs:
+            tcont_type = throughput_entry.get('tcont_id', 'medium').lower()
+            if tcont_type in tcont_counts:
+                tcont_counts[tcont_type] += 1
+        
+        # Convertir a porcentajes
+        total_entries = sum(tcont_counts.values())
+        if total_entries == 0:
+            self._plot_no_data(tr('pon_metrics_charts.no_traffic_types'))
+            return
+        
+        # Calcular porcentajes reales
+        traffic_types = [
+            tr('pon_metrics_charts.traffic_highest'),
+            tr('pon_metrics_charts.traffic_high'),
+            tr('pon_metrics_charts.traffic_medium'),
+            tr('pon_metrics_charts.traffic_low'),
+            tr('pon_metrics_charts.traffic_lowest')
+        ]
+        tcont_keys = ['highest', 'high', 'medium', 'low', 'lowest']
+        values = [(tcont_counts[key] / total_entries) * 100 for key in tcont_keys]
+        
+        # Filtrar tipos de tráfico con valores > 0 para el gráfico
+        filtered_types = []
+        filtered_values = []
+        filtered_colors = []
+        base_colors = ['#ff4444', '#ff8800', '#ffdd00', '#4488ff', '#888888']
+        
+        for i, (traffic_type, value) in enumerate(zip(traffic_types, values)):
+            if value > 0:
+                filtered_types.append(traffic_type)
+                filtered_values.append(value)
+                filtered_colors.append(base_colors[i])
+        
+        if not filtered_values:
+            self._plot_no_data(tr('pon_metrics_charts.no_traffic_detected'))
+            return
+        
+        # Crear gráfico de dona
+        ax = self.fig.add_subplot(111)
+        wedges, texts, autotexts = ax.pie(filtered_values, labels=filtered_types, colors=filtered_colors, 
+                                         autopct='%1.1f%%', startangle=90, 
+                                         pctdistance=0.85,
+                                         wedgeprops={'width': 0.4})
+        
+        # Agregar porcentaje de utilización en el centro
+        if network_utilization > 0:
+            ax.text(0, 0, f'{network_utilization:.1f}%\n{tr("pon_metrics_charts.utilization")}', 
+                    ha='center', va='center', fontsize=16, fontweight='bold')
+        else:
+            ax.text(0, 0, f'N/A\n{tr("pon_metrics_charts.utilization")}', 
+                    ha='center', va='center', fontsize=16, fontweight='bold')
+        
+        # Título con información adicional
+        total_packets = len(throughputs)
+        ax.set_title(tr('pon_metrics_charts.network_util_title').format(f"{network_utilization:.1f}", total_packets), 
+                    fontsize=14, pad=20)
+        
+        self.fig.tight_layout()
+        self.draw()
+    
+    def plot_mean_delay_evolution(self, simulation_data: Dict[str, Any]):
+        """Graficar evolución del Mean Delay vs Tiempo"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self.fig.clear()
+        ax = self.fig.add_subplot(111)
+
+        # Obtener datos de métricas
+        simulation_stats = simulation_data.get('simulation_summary', {}).get('simulation_stats', {})
+        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
+        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
+
+        # Obtener duración real de la simulación
+        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
+        mean_delay = performance_metrics.get('mean_delay', 0)
+        delay_history = episode_metrics.get('delay_history', [])
+
+        # Usar datos reales si están disponibles
+        if delay_history:
+            # Extraer timestamps y valores reales
+            time_points = np.array([d['time'] for d in delay_history])
+            delay_values = np.array([d['value'] for d in delay_history])
+        elif mean_delay > 0:
+            # Fallback: generar evolución simulada SOLO si no hay datos reales
+            print(f"[ADVERTENCIA] No hay delay_history disponible, usando datos sintéticos")
+            time_points = np.linspace(0, simulation_duration, 100)
+            delay_values = self._simulate_metric_evolution(mean_delay * 1000, len(time_points), 'delay')
+        else:
+            # Sin datos disponibles
+            time_points = np.linspace(0, simulation_duration, 10)
+            delay_values = np.zeros(10)
+
+        # Graficar
+        ax.plot(time_points, delay_values, 'b-', linewidth=2, label=tr('pon_metrics_charts.legend_mean_delay'), marker='o', markersize=3)
+        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
+        ax.set_ylabel(tr('pon_metrics_charts.axis_delay'))
+        ax.set_title(tr('pon_metrics_charts.chart_mean_delay_title').format(f"{simulation_duration:.1f}"))
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+        # Estadísticas en el gráfico
+        if len(delay_values) > 0:
+            avg_delay = np.mean(delay_values)
+            max_delay = np.max(delay_values)
+            ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_avg').format(f"{avg_delay:.3f}") + '\n' + 
+                    tr('pon_metrics_charts.stats_max').format(f"{max_delay:.3f}"),
+                    transform=ax.transAxes, verticalalignment='top',
+                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+        self.fig.tight_layout()
+        self.draw()
+
+    def plot_p95_delay_evolution(self, simulation_data: Dict[str, Any]):
+        """Graficar evolución del P95 Delay vs Tiempo"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self.fig.clear()
+        ax = self.fig.add_subplot(111)
+
+        # Obtener datos de métricas
+        simulation_stats = simulation_data.get('simulation_summary', {}).get('simulation_stats', {})
+        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
+        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
+
+        # Obtener duración real de la simulación
+        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
+
+        # Obtener P95 delay
+        p95_delay = performance_metrics.get('p95_delay', 0)
+        delay_percentiles = episode_metrics.get('delay_percentiles', {})
+        p95_history = delay_percentiles.get('p95', [])
+
+        # Calcular P95 desde delay_history si está disponible
+        delay_history = episode_metrics.get('delay_history', [])
+        if delay_history and not p95_history:
+            # Calcular P95 desde datos reales (cacheado por historial)
+            p95_history = self._cached_series('p95_history', delay_history,
+                                              lambda: self._calculate_p95_from_history(delay_history))
+
+        if p95_history:
+            # Usar datos reales (arrays cacheados por historial para que el LOD acierte)
+            time_points, p95_values = self._cached_series(
+                'p95_arrays', p95_history,
+                lambda: self._metric_history_arrays(p95_history, simulation_duration)
+            )
+        elif p95_delay > 0:
+            # Fallback: generar evolución simulada
+            print(f"[ADVERTENCIA] No hay p95_history disponible, usando datos sintéticos")
+            time_points = np.linspace(0, simulation_duration, 100)
+            p95_values = self._simulate_metric_evolution(p95_delay * 1000, len(time_points), 'percentile')
+        else:
+            # Sin datos, usar mean_delay como aproximación
+            mean_delay = performance_metrics.get('mean_delay', 0)
+            time_points = np.linspace(0, simulation_duration, 100)
+            # P95 típicamente es ~1.5x el mean delay
+            p95_approx = mean_delay * 1.5 * 1000 if mean_delay > 0 else 0
+            p95_values = self._simulate_metric_evolution(p95_approx, len(time_points), 'percentile')
+
+        # Graficar (reducido al ancho del gráfico; estadísticas sobre la serie completa)
+        plot_times, plot_values = self._downsample_cached('p95', time_points, p95_values)
+        ax.plot(plot_times, plot_values, 'r-', linewidth=2, label=tr('pon_metrics_charts.legend_p95_delay'), marker='s', markersize=3)
+        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
+        ax.set_ylabel(tr('pon_metrics_charts.axis_delay'))
+        ax.set_title(tr('pon_metrics_charts.chart_p95_delay_title').format(f"{simulation_duration:.1f}"))
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+        # Estadísticas en el gráfico
+        if len(p95_values) > 0:
+            avg_p95 = np.mean(p95_values)
+            max_p95 = np.max(p95_values)
+            ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_avg_p95').format(f"{avg_p95:.3f}") + '\n' + 
+                    tr('pon_metrics_charts.stats_max_p95').format(f"{max_p95:.3f}"),
+                    transform=ax.transAxes, verticalalignment='top',
+                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+        self.fig.tight_layout()
+        self.draw()
+
+    def plot_jitter_ipdv_evolution(self, simulation_data: Dict[str, Any]):
+        """Graficar evolución del Jitter IPDV Mean vs Tiempo"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self.fig.clear()
+        ax = self.fig.add_subplot(111)
+
+        # Obtener datos de métricas
+        simulation_stats = simulation_data.get('simulation_summary', {}).get('simulation_stats', {})
+        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
+        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
+
+        # Obtener duración real de la simulación
+        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
+
+        # Buscar datos de jitter en diferentes ubicaciones
+        jitter_mean = performance_metrics.get('jitter_ipdv_mean', 0)
+        if not jitter_mean:
+            jitter_mean = performance_metrics.get('jitter_mean', 0)
+        if not jitter_mean:
+            jitter_mean = performance_metrics.get('jitter', 0)
+
+        jitter_history = episode_metrics.get('jitter_history', [])
+        if not jitter_history:
+            jitter_history = episode_metrics.get('jitter_ipdv', [])
+
+        # Calcular jitter desde delay_history si está disponible
+        delay_history = episode_metrics.get('delay_history', [])
+        if delay_history and not jitter_history:
+            jitter_history = self._cached_series('jitter_history', delay_history,
+                                                 lambda: self._calculate_jitter_from_delays(delay_history))
+
+        if jitter_history:
+            # Usar datos reales (arrays cacheados por historial para que el LOD acierte)
+            time_points, jitter_values = self._cached_series(
+                'jitter_arrays', jitter_history,
+                lambda: self._metric_history_arrays(jitter_history, simulation_duration)
+            )
+        elif jitter_mean > 0:
+            # Fallback: generar evolución simulada
+            print(f"[ADVERTENCIA] No hay jitter_history disponible, usando datos sintéticos")
+            time_points = np.linspace(0, simulation_duration, 100)
+            jitter_values = self._simulate_metric_evolution(jitter_mean * 1000, len(time_points), 'jitter')
+        else:
+            # Estimar jitter basado en delay si no hay datos específicos
+            mean_delay = performance_metrics.get('mean_delay', 0)
+            time_points = np.linspace(0, simulation_duration, 100)
+            # Jitter típicamente es ~10-20% del mean delay
+            jitter_approx = mean_delay * 0.15 * 1000 if mean_delay > 0 else 0
+            jitter_values = self._simulate_metric_evolution(jitter_approx, len(time_points), 'jitter')
+
+        # Graficar (reducido al ancho del gráfico; estadísticas sobre la serie completa)
+        plot_times, plot_values = self._downsample_cached('jitter', time_points, jitter_values)
+        ax.plot(plot_times, plot_values, 'g-', linewidth=2, label=tr('pon_metrics_charts.legend_jitter_ipdv'), marker='^', markersize=3)
+        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
+        ax.set_ylabel('Jitter (ms)')
+        ax.set_title(tr('pon_metrics_charts.chart_jitter_title').format(f"{simulation_duration:.1f}"))
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+        # Estadísticas en el gráfico
+        if len(jitter_values) > 0:
+            avg_jitter = np.mean(jitter_values)
+            max_jitter = np.max(jitter_values)
+            ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_avg').format(f"{avg_jitter:.3f}") + '\n' + 
+                    tr('pon_metrics_charts.stats_max').format(f"{max_jitter:.3f}"),
+                    transform=ax.transAxes, verticalalignment='top',
+                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+        self.fig.tight_layout()
+        self.draw()
+    
+    def plot_onu_tcont_analysis(self, simulation_data: Dict[str, Any]):
+        """Graficar análisis de tipos de TCONT por ONU"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+            
+        self.fig.clear()
+        
+        # Obtener datos de delays que contienen onu_id y tcont_id
+        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
+        delays_data = episode_metrics.get('delays', [])
+        
+        if not delays_data:
+            # Intentar desde la raíz del objeto
+            delays_data = simulation_data.get('episode_metrics', {}).get('delays', [])
+        
+        if not delays_data:
+            self._plot_no_data(tr('pon_metrics_charts.no_onus_tconts_data'))
+            return
+        
+        # Analizar datos para extraer ONUs y sus TCONTs
+        onu_tcont_counts = {}
+        
+        for delay_entry in delays_data:
+            onu_id = delay_entry.get('onu_id', 'unknown')
+            tcont_id = delay_entry.get('tcont_id', 'unknown')
+            
+            if onu_id not in onu_tcont_counts:
+                onu_tcont_counts[onu_id] = {
+                    'lowest': 0, 'low': 0, 'medium': 0, 'high': 0, 'highest': 0
+                }
+            
+            if tcont_id in onu_tcont_counts[onu_id]:
+                onu_tcont_counts[onu_id][tcont_id] += 1
+        
+        if not onu_tcont_counts:
+            self._plot_no_data(tr('pon_metrics_charts.no_onus_found'))
+            return
+        
+        # Crear subgráficas para cada ONU
+        num_onus = len(onu_tcont_counts)
+        
+        if num_onus == 1:
+            # Una sola ONU
+            rows, cols = 1, 1
+        elif num_onus == 2:
+            # Dos ONUs horizontalmente
+            rows, cols = 1, 2
+        elif num_onus <= 4:
+            # Hasta 4 ONUs en 2x2
+            rows, cols = 2, 2
+        elif num_onus <= 6:
+            # Hasta 6 ONUs en 2x3
+            rows, cols = 2, 3
+        else:
+            # Más ONUs en 3x3
+            rows, cols = 3, 3
+        
+        # Tipos de TCONT y colores
+        tcont_types = ['lowest', 'low', 'medium', 'high', 'highest']
+        tcont_colors = ['#ff4444', '#ff8800', '#ffdd00', '#4488ff', '#00aa44']
+        tcont_labels = [
+            tr('pon_metrics_charts.traffic_lowest'),
+            tr('pon_metrics_charts.traffic_low'),
+            tr('pon_metrics_charts.traffic_medium'),
+            tr('pon_metrics_charts.traffic_high'),
+            tr('pon_metrics_charts.traffic_highest')
+        ]
+        
+        # Crear gráficas para cada ONU
+        for i, (onu_id, tcont_data) in enumerate(onu_tcont_counts.items()):
+            if i >= rows * cols:  # Limitar número de gráficas
+                break
+                
+            ax = self.fig.add_subplot(rows, cols, i + 1)
+            
+            # Datos para la gráfica de barras
+            values = [tcont_data[tcont_type] for tcont_type in tcont_types]
+            
+            # Crear gráfica de barras
+            bars = ax.bar(tcont_labels, values, color=tcont_colors, alpha=0.7, edgecolor='black', linewidth=0.5)
+            
+            # Agregar valores encima de las barras
+            for bar, value in zip(bars, values):
+                if value > 0:
+                    height = bar.get_height()
+                    ax.text(bar.get_x() + bar.get_width()/2., height + max(values) * 0.01,
+                           f'{int(value)}', ha='center', va='bottom', fontweight='bold')
+            
+            # Configurar gráfica
+            ax.set_title(tr('pon_metrics_charts.chart_onu_tcont_title').format(onu_id), fontweight='bold')
+            ax.set_xlabel(tr('pon_metrics_charts.axis_tcont_type'))
+            ax.set_ylabel(tr('pon_metrics_charts.axis_quantity'))
+            ax.grid(True, alpha=0.3, axis='y')
+            
+            # Rotar etiquetas si es necesario
+            if num_onus > 2:
+                ax.tick_params(axis='x', rotation=45)
+            
+            # Agregar estadísticas
+            total_tconts = sum(values)
+            max_tcont = max(values) if values else 0
+            most_used = tcont_labels[values.index(max_tcont)] if max_tcont > 0 else 'N/A'
+            
+            ax.text(0.02, 0.98, tr('pon_metrics_charts.onu_stats_total').format(total_tconts) + '\n' + 
+                    tr('pon_metrics_charts.onu_stats_most_used').format(most_used), 
+                    transform=ax.transAxes, verticalalignment='top',
+                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+                    fontsize=8)
+        
+        # Título general
+        self.fig.suptitle(tr('pon_metrics_charts.onu_analysis_title').format(num_onus), 
+                         fontsize=14, fontweight='bold')
+        
+        self.fig.tight_layout()
+        self.draw()
+    
+    def _simulate_delay_evolution(self, final_delay: float, num_points: int) -> np.ndarray:
+        """Simular evolución realista de delay"""
+        # Crear curva que converge al delay final
+        t = np.linspace(0, 1, num_points)
+        
+        # Delay inicial más alto que converge al final
+        initial_delay = final_delay * 3 if final_delay > 0 else 0.001
+        
+        # Función exponencial decreciente con ruido
+        delays = initial_delay * np.exp(-3 * t) + final_delay
+        
+        # Agregar ruido realista
+        noise = np.random.normal(0, final_delay * 0.1, num_points) if final_delay > 0 else np.zeros(num_points)
+        delays += noise
+        
+        # Asegurar valores positivos
+        delays = np.maximum(delays, 0)
+        
+        return delays
+    
+    def _simulate_throughput_evolution(self, final_throughput: float, num_points: int) -> np.ndarray:
+        """Simular evolución realista de throughput"""
+        t = np.linspace(0, 1, num_points)
+        
+        # Throughput que crece desde 0 al valor final
+        throughputs = final_throughput * (1 - np.exp(-4 * t))
+        
+        # Agregar variabilidad realista
+        if final_throughput > 0:
+            noise = np.random.normal(0, final_throughput * 0.05, num_points)
+            throughputs += noise
+        
+        # Asegurar valores positivos
+        throughputs = np.maximum(throughputs, 0)
+        
+        return throughputs
+    
+    def _calculate_p95_from_history(self, delay_history: List[Dict]) -> List[Dict[str, float]]:
+        """
+        Calcular P95 delay desde historial de delays usando ventanas deslizantes
+
+        Args:
+            delay_history: Lista de diccionarios con 'time' y 'value'
+
+        Returns:
+            Lista de diccionarios con 'time' y 'value' (P95)
+        """
+        if not delay_history or len(delay_history) < 10:
+            return []
+
+        # Usar ventanas de ~20 puntos para calcular P95
+        window_size = max(10, len(delay_history) // 10)
+        p95_history = []
+
+        times, values = self._delay_history_arrays(delay_history)
+        for i in range(0, len(delay_history), window_size // 2):
+            window_values = values[i:i + window_size]
+            if len(window_values) >= 5:  # Mínimo 5 puntos para calcular P95
+                p95_value = np.percentile(window_values, 95)
+                avg_time = np.mean(times[i:i + window_size])
+
+                p95_history.append({
+                    'time': avg_time,
+                    'value': p95_value
+                })
+
+        return p95_history
+
+    def _calculate_jitter_from_delays(self, delay_history: List[Dict]) -> List[Dict[str, float]]:
+        """
+        Calcular jitter (IPDV) desde historial de delays
+
+        Args:
+            delay_history: Lista de diccionarios con 'time' y 'value'
+
+        Returns:
+            Lista de diccionarios con 'time' y 'value' (jitter)
+        """
+        if not delay_history or len(delay_history) < 2:
+            return []
+
+        jitter_history = []
+        window_size = max(5, len(delay_history) // 20)
+
+        times, values = self._delay_history_arrays(delay_history)
+        for i in range(window_size, len(delay_history), window_size // 2):
+            delays = values[i - window_size:i]
+            if len(delays) >= 2:
+                # Jitter como desviación estándar de los delays en la ventana
+                jitter_value = np.std(delays)
+                avg_time = np.mean(times[i - window_size:i])
+
+                jitter_history.append({
+                    'time': avg_time,
+                    'value': jitter_value
+                })
+
+        return jitter_history
+
+    def _simulate_metric_evolution(self, final_value: float, num_points: int, metric_type: str) -> np.ndarray:
+        """Simular evolución realista de métricas según el tipo"""
+        if num_points <= 1:
+            return np.array([final_value])
+            
+        t = np.linspace(0, 1, num_points)
+        
+        if metric_type == 'delay':
+            # Delay: inicio alto, converge gradualmente
+            base_curve = 1 - np.exp(-3 * t)
+            noise = np.random.normal(0, 0.1, num_points) * final_value * 0.1
+            values = final_value * base_curve + noise
+            
+        elif metric_type == 'percentile':
+            # P95: más variabilidad que mean delay
+            base_curve = 1 - np.exp(-2.5 * t)
+            noise = np.random.normal(0, 0.15, num_points) * final_value * 0.15
+            values = final_value * base_curve + noise
+            
+        elif metric_type == 'jitter':
+            # Jitter: más oscilante, tiende a estabilizarse
+            base_curve = 1 - np.exp(-4 * t)
+            oscillation = np.sin(10 * t) * 0.2 * np.exp(-2 * t)
+            noise = np.random.normal(0, 0.2, num_points) * final_value * 0.2
+            values = final_value * (base_curve + oscillation) + noise
+            
+        else:
+            # Curva genérica
+            values = final_value * (1 - np.exp(-3 * t))
+        
+        # Asegurar que todos los valores sean no negativos
+        values = np.maximum(values, 0)
+        
+        return values
+    
+    def _plot_no_data(self, message: str):
+        """Mostrar mensaje cuando no hay datos"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+            
+        ax = self.fig.add_subplot(111)
+        ax.text(0.5, 0.5, message, ha='center', va='center', 
+                transform=ax.transAxes, fontsize=16, 
+                bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8))
+        ax.set_xticks([])
+        ax.set_yticks([])
+        self.draw()
+
+
+class OffscreenPONChart(PONChartPlotter):
+    """Gráfico PON sin widget: figura con canvas Agg para exportar imágenes"""
+
+    def __init__(self, width=8, height=6, dpi=100, export_dpi=300):
+        self.fig = Figure(figsize=(width, height), dpi=dpi, facecolor='white', tight_layout=True)
+        FigureCanvasAgg(self.fig)
+        self.fig.patch.set_edgecolor('none')
+        self.export_dpi = export_dpi
+        self._init_plot_caches()
+
+    def draw(self):
+        """Sin pantalla: el renderizado ocurre en savefig()"""
+        pass
+
+    def _plot_width_px(self) -> int:
+        # Reducir a la resolución de la imagen exportada, no a la de pantalla
+        return max(int(self.fig.get_figwidth() * self.export_dpi), 100)
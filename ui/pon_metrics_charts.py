@@ -8,9 +8,12 @@ from typing import Dict, List, Any
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QTabWidget, QGroupBox, QGridLayout, QScrollArea,
                              QSplitter, QPushButton, QComboBox, QCheckBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPixmap, QCursor
 from utils.translation_manager import tr
+from core.utilities.downsampling import minmax_downsample
+from core.simulation.live_metrics import SlidingWindowArrays
+from .pon_chart_plotter import PONChartPlotter, detect_simulation_format, normalize_simulation_data
 
 # Intentar importar PyQtGraph para visualización de grants
 try:
@@ -53,7 +56,7 @@ except Exception as e:
     print(f"WARNING Error configurando matplotlib: {e}")
 
 
-class PONMetricsChart(FigureCanvas):
+class PONMetricsChart(PONChartPlotter, FigureCanvas):
     """Widget de gráfico individual para métricas PON"""
     
     def __init__(self, parent=None, width=8, height=6, dpi=100):
@@ -76,974 +79,8 @@ class PONMetricsChart(FigureCanvas):
         # Variables para datos
         self.data_history = []
         self.chart_type = "line"
-        
-    def plot_delay_evolution(self, simulation_data: Dict[str, Any]):
-        """Graficar evolución de delays durante la simulación"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-
-        self.fig.clear()
-
-        # Obtener datos de delay
-        simulation_summary = simulation_data.get('simulation_summary', {})
-        if not simulation_summary:
-            self._plot_no_data("Sin datos de simulación")
-            return
-
-        simulation_stats = simulation_summary.get('simulation_stats', {})
-        episode_metrics = simulation_summary.get('episode_metrics', {})
-        performance_metrics = simulation_summary.get('performance_metrics', {})
-
-        # Obtener duración real y delay history
-        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
-        delay_history = episode_metrics.get('delay_history', [])
-        mean_delay = performance_metrics.get('mean_delay', 0)
-
-        if not delay_history and mean_delay == 0:
-            self._plot_no_data("Sin datos de delay disponibles")
-            return
-
-        # Usar datos reales si están disponibles
-        if delay_history:
-            time_points = np.array([d['time'] for d in delay_history])
-            delays = np.array([d['value'] / 1000 for d in delay_history])  # Convertir ms a segundos
-        else:
-            # Fallback: generar evolución simulada con duración correcta
-            print(f"[ADVERTENCIA] No hay delay_history, usando datos sintéticos")
-            time_points = np.linspace(0, simulation_duration, 100)
-            delays = self._simulate_delay_evolution(mean_delay, len(time_points))
-
-        ax = self.fig.add_subplot(111)
-        ax.plot(time_points, delays, 'b-', linewidth=2, label=tr('pon_metrics_charts.legend_delay_avg'))
-        ax.fill_between(time_points, delays, alpha=0.3, color='blue')
-
-        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
-        ax.set_ylabel(tr('pon_metrics_charts.axis_delay'))
-        ax.set_title(tr('pon_metrics_charts.chart_delay_title').format(f"{simulation_duration:.1f}"))
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-
-        # Agregar estadísticas
-        final_delay = delays[-1] if len(delays) > 0 else mean_delay
-        ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_final_delay').format(f"{final_delay:.6f}"),
-                transform=ax.transAxes, verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-
-        self.fig.tight_layout()
-        self.draw()
-    
-    def plot_throughput_evolution(self, simulation_data: Dict[str, Any]):
-        """Graficar evolución de throughput durante la simulación"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-
-        self.fig.clear()
-
-        simulation_summary = simulation_data.get('simulation_summary', {})
-        if not simulation_summary:
-            self._plot_no_data("Sin datos de simulación")
-            return
-
-        simulation_stats = simulation_summary.get('simulation_stats', {})
-        episode_metrics = simulation_summary.get('episode_metrics', {})
-        performance_metrics = simulation_summary.get('performance_metrics', {})
-
-        # Obtener duración real y throughput history
-        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
-        throughput_history = episode_metrics.get('throughput_history', [])
-        mean_throughput = performance_metrics.get('mean_throughput', 0)
-
-        if not throughput_history and mean_throughput == 0:
-            self._plot_no_data("Sin datos de throughput disponibles")
-            return
-
-        # Usar datos reales si están disponibles
-        if throughput_history:
-            time_points = np.array([d['time'] for d in throughput_history])
-            throughputs = np.array([d['value'] for d in throughput_history])
-        else:
-            # Fallback: generar evolución simulada con duración correcta
-            print(f"[ADVERTENCIA] No hay throughput_history, usando datos sintéticos")
-            time_points = np.linspace(0, simulation_duration, 100)
-            throughputs = self._simulate_throughput_evolution(mean_throughput, len(time_points))
-
-        ax = self.fig.add_subplot(111)
-        ax.plot(time_points, throughputs, 'g-', linewidth=2, label=tr('pon_metrics_charts.legend_throughput_avg'))
-        ax.fill_between(time_points, throughputs, alpha=0.3, color='green')
-
-        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
-        ax.set_ylabel(tr('pon_metrics_charts.axis_throughput'))
-        ax.set_title(tr('pon_metrics_charts.chart_throughput_title').format(f"{simulation_duration:.1f}"))
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-
-        # Agregar estadísticas
-        final_throughput = throughputs[-1] if len(throughputs) > 0 else mean_throughput
-        ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_final_throughput').format(f"{final_throughput:.3f}"),
-                transform=ax.transAxes, verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.8))
-
-        self.fig.tight_layout()
-        self.draw()
-    
-    def plot_event_queue_evolution(self, simulation_data: Dict[str, Any]):
-        """Graficar evolución de eventos pendientes en la cola vs tiempo"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
-
-        # Obtener datos
-        simulation_summary = simulation_data.get('simulation_summary', {})
-        episode_metrics = simulation_summary.get('episode_metrics', {})
-        simulation_stats = simulation_summary.get('simulation_stats', {})
-
-        event_queue_history = episode_metrics.get('event_queue_history', [])
-
-        if not event_queue_history:
-            self._plot_no_data("Sin historial de cola de eventos disponible")
-            return
-
-        # Extraer datos
-        times = [entry['time'] for entry in event_queue_history]
-        pending_events = [entry['pending_events'] for entry in event_queue_history]
-
-        # Graficar eventos pendientes
-        ax.plot(times, pending_events, 'b-', linewidth=2, label='Eventos Pendientes')
-        ax.fill_between(times, pending_events, alpha=0.3, color='blue')
-
-        # Línea de referencia del límite (1M)
-        max_limit = 1000000
-        ax.axhline(y=max_limit, color='r', linestyle='--', linewidth=2,
-                   label=f'Límite Máximo ({max_limit:,})', alpha=0.7)
-
-        ax.set_xlabel('Tiempo Simulado (s)')
-        ax.set_ylabel('Eventos Pendientes')
-        ax.set_title('Evolución de la Cola de Eventos Durante la Simulación')
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-
-        # Formatear eje Y con separadores de miles
-        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
-
-        # Estadísticas
-        max_pending = max(pending_events) if pending_events else 0
-        avg_pending = np.mean(pending_events) if pending_events else 0
-        final_pending = pending_events[-1] if pending_events else 0
-
-        # Detectar crecimiento exponencial
-        growth_type = "DESCONOCIDO"
-        if len(pending_events) > 10:
-            # Comparar primera mitad vs segunda mitad
-            mid = len(pending_events) // 2
-            first_half_avg = np.mean(pending_events[:mid])
-            second_half_avg = np.mean(pending_events[mid:])
-
-            if second_half_avg > first_half_avg * 2:
-                growth_type = "⚠️ EXPONENCIAL"
-                color = 'red'
-            elif second_half_avg > first_half_avg * 1.2:
-                growth_type = "⚠️ LINEAL CRECIENTE"
-                color = 'orange'
-            else:
-                growth_type = "✓ ESTABLE/CONSTANTE"
-                color = 'green'
-        else:
-            color = 'black'
-
-        stats_text = (f'Tipo: {growth_type}\n'
-                     f'Máximo: {max_pending:,}\n'
-                     f'Promedio: {avg_pending:,.0f}\n'
-                     f'Final: {final_pending:,}')
-
-        ax.text(0.02, 0.98, stats_text,
-                transform=ax.transAxes, verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor='white', edgecolor=color, linewidth=2, alpha=0.9),
-                fontsize=10, fontweight='bold')
-
-        self.fig.tight_layout()
-        self.draw()
-
-    def plot_onu_buffer_levels(self, simulation_data: Dict[str, Any]):
-        """Graficar evolución temporal de los niveles de buffer por ONU"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-
-        self.fig.clear()
-
-        # Obtener datos históricos de buffer
-        # Primero intentar desde simulation_summary.episode_metrics (estructura más común)
-        simulation_summary = simulation_data.get('simulation_summary', {})
-        episode_metrics = simulation_summary.get('episode_metrics', {})
-        buffer_history = episode_metrics.get('buffer_levels_history', [])
-
-        # Si no hay datos, intentar desde la raíz (estructura alternativa)
-        if not buffer_history:
-            episode_metrics_root = simulation_data.get('episode_metrics', {})
-            buffer_history = episode_metrics_root.get('buffer_levels_history', [])
-
-        if not buffer_history:
-            self._plot_no_data("Sin historial de buffer")
-            return
-
-        ax = self.fig.add_subplot(111)
-
-        # Verificar estructura de datos
-        if not buffer_history or len(buffer_history) == 0:
-            self._plot_no_data("Historial de buffer vacío")
-            return
-
-        # Obtener número de ONUs desde la primera entrada
-        first_entry = buffer_history[0]
-        if not isinstance(first_entry, dict):
-            self._plot_no_data("Formato de datos de buffer inválido")
-            return
-
-        # Detectar formato: nuevo (con 'time' y 'buffers') vs antiguo (solo buffers)
-        has_timestamps = 'time' in first_entry and 'buffers' in first_entry
-
-        if has_timestamps:
-            # Formato nuevo: {'time': t, 'buffers': {onu_id: data}}
-            time_steps = np.array([entry['time'] for entry in buffer_history])
-            onu_ids = list(buffer_history[0]['buffers'].keys())
-        else:
-            # Formato antiguo: {onu_id: data} sin timestamps
-            time_steps = np.arange(len(buffer_history))
-            onu_ids = list(first_entry.keys())
-        
-        # Colores distintivos para cada ONU
-        colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray', 'olive', 'cyan']
-
-        # Graficar una línea por cada ONU
-        for i, onu_id in enumerate(onu_ids):
-            # Extraer niveles de buffer para esta ONU a lo largo del tiempo
-            buffer_levels_percent = []
-            for step_data in buffer_history:
-                # Obtener datos de buffer según el formato
-                if has_timestamps:
-                    # Formato nuevo: step_data = {'time': t, 'buffers': {onu_id: data}}
-                    onu_buffer_data = step_data.get('buffers', {}).get(onu_id, {})
-                else:
-                    # Formato antiguo: step_data = {onu_id: data}
-                    onu_buffer_data = step_data.get(onu_id, {})
-
-                # Manejar formato de datos de buffer (dict con utilization_percent o número)
-                if isinstance(onu_buffer_data, dict):
-                    # Usar directamente el porcentaje de utilización
-                    buffer_percent = onu_buffer_data.get('utilization_percent', 0)
-                else:
-                    # Formato antiguo (ya es porcentaje o fracción)
-                    buffer_percent = onu_buffer_data * 100 if onu_buffer_data <= 1 else onu_buffer_data
-
-                buffer_levels_percent.append(buffer_percent)
-
-            # Usar color cíclico si hay más ONUs que colores
-            color = colors[i % len(colors)]
-
-            # Graficar línea para esta ONU
-            ax.plot(time_steps, buffer_levels_percent,
-                   color=color, linewidth=2, marker='o', markersize=3,
-                   label=tr('pon_metrics_charts.legend_onu').format(onu_id), alpha=0.8)
-
-        # Etiquetar ejes según el formato de datos
-        if has_timestamps:
-            ax.set_xlabel(tr('pon_metrics_charts.axis_simulation_time'))
-        else:
-            ax.set_xlabel(tr('pon_metrics_charts.axis_simulation_steps'))
-
-        ax.set_ylabel(tr('pon_metrics_charts.axis_buffer_level'))
-        ax.set_title(tr('pon_metrics_charts.chart_buffer_title'))
-        ax.set_ylim(0, 100)  # Porcentaje de 0 a 100%
-        ax.grid(True, alpha=0.3)
-        
-        # Líneas de referencia en porcentaje
-        ax.axhline(y=50, color='orange', linestyle='--', alpha=0.7, 
-                  label=tr('pon_metrics_charts.legend_medium_level'))
-        ax.axhline(y=80, color='red', linestyle='--', alpha=0.7, 
-                  label=tr('pon_metrics_charts.legend_high_level'))
-        
-        # Leyenda - manejar muchas ONUs
-        if len(onu_ids) <= 8:
-            ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        else:
-            ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', ncol=2, fontsize=8)
-        
-        self.fig.tight_layout()
-        self.draw()
-    
-    def plot_network_utilization(self, simulation_data: Dict[str, Any]):
-        """Graficar distribución de tráfico real en formato dona"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-            
-        self.fig.clear()
-        
-        # Obtener datos de utilización para el centro
-        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
-        network_utilization = performance_metrics.get('network_utilization', 0)
-        
-        # Obtener datos reales de tráfico desde episode_metrics
-        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
-        throughputs = episode_metrics.get('throughputs', [])
-        
-        if not throughputs:
-            # Si no hay datos, usar estructura alternativa
-            episode_metrics_root = simulation_data.get('episode_metrics', {})
-            throughputs = episode_metrics_root.get('throughputs', [])
-        
-        if not throughputs:
-            self._plot_no_data(tr('pon_metrics_charts.no_traffic_data'))
-            return
-        
-        # Calcular distribución real de tipos de tráfico basada en throughputs
-        tcont_counts = {'highest': 0, 'high': 0, 'medium': 0, 'low': 0, 'lowest': 0}
-        
-        for throughput_entry in throughputs:
-            tcont_type = throughput_entry.get('tcont_id', 'medium').lower()
-            if tcont_type in tcont_counts:
-                tcont_counts[tcont_type] += 1
-        
-        # Convertir a porcentajes
-        total_entries = sum(tcont_counts.values())
-        if total_entries == 0:
-            self._plot_no_data(tr('pon_metrics_charts.no_traffic_types'))
-            return
-        
-        # Calcular porcentajes reales
-        traffic_types = [
-            tr('pon_metrics_charts.traffic_highest'),
-            tr('pon_metrics_charts.traffic_high'),
-            tr('pon_metrics_charts.traffic_medium'),
-            tr('pon_metrics_charts.traffic_low'),
-            tr('pon_metrics_charts.traffic_lowest')
-        ]
-        tcont_keys = ['highest', 'high', 'medium', 'low', 'lowest']
-        values = [(tcont_counts[key] / total_entries) * 100 for key in tcont_keys]
-        
-        # Filtrar tipos de tráfico con valores > 0 para el gráfico
-        filtered_types = []
-        filtered_values = []
-        filtered_colors = []
-        base_colors = ['#ff4444', '#ff8800', '#ffdd00', '#4488ff', '#888888']
-        
-        for i, (traffic_type, value) in enumerate(zip(traffic_types, values)):
-            if value > 0:
-                filtered_types.append(traffic_type)
-                filtered_values.append(value)
-                filtered_colors.append(base_colors[i])
-        
-        if not filtered_values:
-            self._plot_no_data(tr('pon_metrics_charts.no_traffic_detected'))
-            return
-        
-        # Crear gráfico de dona
-        ax = self.fig.add_subplot(111)
-        wedges, texts, autotexts = ax.pie(filtered_values, labels=filtered_types, colors=filtered_colors, 
-                                         autopct='%1.1f%%', startangle=90, 
-                                         pctdistance=0.85,
-                                         wedgeprops={'width': 0.4})
-        
-        # Agregar porcentaje de utilización en el centro
-        if network_utilization > 0:
-            ax.text(0, 0, f'{network_utilization:.1f}%\n{tr("pon_metrics_charts.utilization")}', 
-                    ha='center', va='center', fontsize=16, fontweight='bold')
-        else:
-            ax.text(0, 0, f'N/A\n{tr("pon_metrics_charts.utilization")}', 
-                    ha='center', va='center', fontsize=16, fontweight='bold')
-        
-        # Título con información adicional
-        total_packets = len(throughputs)
-        ax.set_title(tr('pon_metrics_charts.network_util_title').format(f"{network_utilization:.1f}", total_packets), 
-                    fontsize=14, pad=20)
-        
-        self.fig.tight_layout()
-        self.draw()
-    
-    def plot_algorithm_performance(self, simulation_data: Dict[str, Any]):
-        """Graficar rendimiento del algoritmo DBA"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-            
-        self.fig.clear()
-        
-        orchestrator_stats = simulation_data.get('orchestrator_stats', {})
-        network_stats = simulation_data.get('simulation_summary', {}).get('network_stats', {})
-        
-        algorithm = network_stats.get('dba_algorithm', 'N/A')
-        
-        # Métricas del algoritmo
-        allocation_prob = orchestrator_stats.get('allocation_probability', 0)
-        blocking_prob = orchestrator_stats.get('blocking_probability', 0)
-        success_rate = network_stats.get('success_rate', 0)
-        
-        # Gráfico de barras horizontal
-        ax = self.fig.add_subplot(111)
-        
-        metrics = ['Prob. Asignación', 'Tasa de Éxito', 'Prob. No Bloqueo']
-        values = [allocation_prob * 100, success_rate, (1 - blocking_prob) * 100]
-        colors = ['blue', 'green', 'purple']
-        
-        bars = ax.barh(metrics, values, color=colors, alpha=0.7)
-        
-        # Agregar valores en las barras
-        for bar, value in zip(bars, values):
-            width = bar.get_width()
-            ax.text(width + 1, bar.get_y() + bar.get_height()/2,
-                   f'{value:.1f}%', ha='left', va='center', fontweight='bold')
-        
-        ax.set_xlabel('Porcentaje (%)')
-        ax.set_title(f'Rendimiento del Algoritmo DBA: {algorithm}')
-        ax.set_xlim(0, 105)
-        ax.grid(True, alpha=0.3)
-        
-        self.fig.tight_layout()
-        self.draw()
-    
-    def plot_traffic_distribution(self, simulation_data: Dict[str, Any]):
-        """Graficar distribución de tráfico real en formato dona"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-            
-        self.fig.clear()
-        
-        # Obtener datos de utilización para el centro
-        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
-        network_utilization = performance_metrics.get('network_utilization', 0)
-        
-        # Obtener datos reales de tráfico desde episode_metrics
-        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
-        throughputs = episode_metrics.get('throughputs', [])
-        
-        if not throughputs:
-            # Si no hay datos, usar estructura alternativa
-            episode_metrics_root = simulation_data.get('episode_metrics', {})
-            throughputs = episode_metrics_root.get('throughputs', [])
-        
-        if not throughputs:
-            self._plot_no_data(tr('pon_metrics_charts.no_traffic_data'))
-            return
-        
-        # Calcular distribución real de tipos de tráfico basada en throughputs
-        tcont_counts = {'highest': 0, 'high': 0, 'medium': 0, 'low': 0, 'lowest': 0}
-        
-        for throughput_entry in throughputs:
-            tcont_type = throughput_entry.get('tcont_id', 'medium').lower()
-            if tcont_type in tcont_counts:
-                tcont_counts[tcont_type] += 1
-        
-        # Convertir a porcentajes
-        total_entries = sum(tcont_counts.values())
-        if total_entries == 0:
-            self._plot_no_data(tr('pon_metrics_charts.no_traffic_types'))
-            return
-        
-        # Calcular porcentajes reales
-        traffic_types = [
-            tr('pon_metrics_charts.traffic_highest'),
-            tr('pon_metrics_charts.traffic_high'),
-            tr('pon_metrics_charts.traffic_medium'),
-            tr('pon_metrics_charts.traffic_low'),
-            tr('pon_metrics_charts.traffic_lowest')
-        ]
-        tcont_keys = ['highest', 'high', 'medium', 'low', 'lowest']
-        values = [(tcont_counts[key] / total_entries) * 100 for key in tcont_keys]
-        
-        # Filtrar tipos de tráfico con valores > 0 para el gráfico
-        filtered_types = []
-        filtered_values = []
-        filtered_colors = []
-        base_colors = ['#ff4444', '#ff8800', '#ffdd00', '#4488ff', '#888888']
-        
-        for i, (traffic_type, value) in enumerate(zip(traffic_types, values)):
-            if value > 0:
-                filtered_types.append(traffic_type)
-                filtered_values.append(value)
-                filtered_colors.append(base_colors[i])
-        
-        if not filtered_values:
-            self._plot_no_data(tr('pon_metrics_charts.no_traffic_detected'))
-            return
-        
-        # Crear gráfico de dona
-        ax = self.fig.add_subplot(111)
-        wedges, texts, autotexts = ax.pie(filtered_values, labels=filtered_types, colors=filtered_colors, 
-                                         autopct='%1.1f%%', startangle=90, 
-                                         pctdistance=0.85,
-                                         wedgeprops={'width': 0.4})
-        
-        # Agregar porcentaje de utilización en el centro
-        if network_utilization > 0:
-            ax.text(0, 0, f'{network_utilization:.1f}%\n{tr("pon_metrics_charts.utilization")}', 
-                    ha='center', va='center', fontsize=16, fontweight='bold')
-        else:
-            ax.text(0, 0, f'N/A\n{tr("pon_metrics_charts.utilization")}', 
-                    ha='center', va='center', fontsize=16, fontweight='bold')
-        
-        # Título con información adicional
-        total_packets = len(throughputs)
-        ax.set_title(tr('pon_metrics_charts.network_util_title').format(f"{network_utilization:.1f}", total_packets), 
-                    fontsize=14, pad=20)
-        
-        self.fig.tight_layout()
-        self.draw()
-    
-    def plot_mean_delay_evolution(self, simulation_data: Dict[str, Any]):
-        """Graficar evolución del Mean Delay vs Tiempo"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
-
-        # Obtener datos de métricas
-        simulation_stats = simulation_data.get('simulation_summary', {}).get('simulation_stats', {})
-        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
-        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
-
-        # Obtener duración real de la simulación
-        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
-        mean_delay = performance_metrics.get('mean_delay', 0)
-        delay_history = episode_metrics.get('delay_history', [])
-
-        # Usar datos reales si están disponibles
-        if delay_history:
-            # Extraer timestamps y valores reales
-            time_points = np.array([d['time'] for d in delay_history])
-            delay_values = np.array([d['value'] for d in delay_history])
-        elif mean_delay > 0:
-            # Fallback: generar evolución simulada SOLO si no hay datos reales
-            print(f"[ADVERTENCIA] No hay delay_history disponible, usando datos sintéticos")
-            time_points = np.linspace(0, simulation_duration, 100)
-            delay_values = self._simulate_metric_evolution(mean_delay * 1000, len(time_points), 'delay')
-        else:
-            # Sin datos disponibles
-            time_points = np.linspace(0, simulation_duration, 10)
-            delay_values = np.zeros(10)
-
-        # Graficar
-        ax.plot(time_points, delay_values, 'b-', linewidth=2, label=tr('pon_metrics_charts.legend_mean_delay'), marker='o', markersize=3)
-        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
-        ax.set_ylabel(tr('pon_metrics_charts.axis_delay'))
-        ax.set_title(tr('pon_metrics_charts.chart_mean_delay_title').format(f"{simulation_duration:.1f}"))
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-
-        # Estadísticas en el gráfico
-        if len(delay_values) > 0:
-            avg_delay = np.mean(delay_values)
-            max_delay = np.max(delay_values)
-            ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_avg').format(f"{avg_delay:.3f}") + '\n' + 
-                    tr('pon_metrics_charts.stats_max').format(f"{max_delay:.3f}"),
-                    transform=ax.transAxes, verticalalignment='top',
-                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-        self.fig.tight_layout()
-        self.draw()
-
-    def plot_p95_delay_evolution(self, simulation_data: Dict[str, Any]):
-        """Graficar evolución del P95 Delay vs Tiempo"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
-
-        # Obtener datos de métricas
-        simulation_stats = simulation_data.get('simulation_summary', {}).get('simulation_stats', {})
-        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
-        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
-
-        # Obtener duración real de la simulación
-        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
-
-        # Obtener P95 delay
-        p95_delay = performance_metrics.get('p95_delay', 0)
-        delay_percentiles = episode_metrics.get('delay_percentiles', {})
-        p95_history = delay_percentiles.get('p95', [])
-
-        # Calcular P95 desde delay_history si está disponible
-        delay_history = episode_metrics.get('delay_history', [])
-        if delay_history and not p95_history:
-            # Calcular P95 desde datos reales
-            p95_history = self._calculate_p95_from_history(delay_history)
-
-        if p95_history:
-            # Usar datos reales con timestamps
-            if isinstance(p95_history[0], dict):
-                time_points = np.array([d['time'] for d in p95_history])
-                p95_values = np.array([d['value'] for d in p95_history])
-            else:
-                time_points = np.linspace(0, simulation_duration, len(p95_history))
-                p95_values = np.array(p95_history)
-        elif p95_delay > 0:
-            # Fallback: generar evolución simulada
-            print(f"[ADVERTENCIA] No hay p95_history disponible, usando datos sintéticos")
-            time_points = np.linspace(0, simulation_duration, 100)
-            p95_values = self._simulate_metric_evolution(p95_delay * 1000, len(time_points), 'percentile')
-        else:
-            # Sin datos, usar mean_delay como aproximación
-            mean_delay = performance_metrics.get('mean_delay', 0)
-            time_points = np.linspace(0, simulation_duration, 100)
-            # P95 típicamente es ~1.5x el mean delay
-            p95_approx = mean_delay * 1.5 * 1000 if mean_delay > 0 else 0
-            p95_values = self._simulate_metric_evolution(p95_approx, len(time_points), 'percentile')
-
-        # Graficar
-        ax.plot(time_points, p95_values, 'r-', linewidth=2, label=tr('pon_metrics_charts.legend_p95_delay'), marker='s', markersize=3)
-        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
-        ax.set_ylabel(tr('pon_metrics_charts.axis_delay'))
-        ax.set_title(tr('pon_metrics_charts.chart_p95_delay_title').format(f"{simulation_duration:.1f}"))
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-
-        # Estadísticas en el gráfico
-        if len(p95_values) > 0:
-            avg_p95 = np.mean(p95_values)
-            max_p95 = np.max(p95_values)
-            ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_avg_p95').format(f"{avg_p95:.3f}") + '\n' + 
-                    tr('pon_metrics_charts.stats_max_p95').format(f"{max_p95:.3f}"),
-                    transform=ax.transAxes, verticalalignment='top',
-                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-        self.fig.tight_layout()
-        self.draw()
-
-    def plot_jitter_ipdv_evolution(self, simulation_data: Dict[str, Any]):
-        """Graficar evolución del Jitter IPDV Mean vs Tiempo"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
-
-        # Obtener datos de métricas
-        simulation_stats = simulation_data.get('simulation_summary', {}).get('simulation_stats', {})
-        performance_metrics = simulation_data.get('simulation_summary', {}).get('performance_metrics', {})
-        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
-
-        # Obtener duración real de la simulación
-        simulation_duration = simulation_stats.get('simulation_duration', simulation_stats.get('simulation_time', 10))
 
-        # Buscar datos de jitter en diferentes ubicaciones
-        jitter_mean = performance_metrics.get('jitter_ipdv_mean', 0)
-        if not jitter_mean:
-            jitter_mean = performance_metrics.get('jitter_mean', 0)
-        if not jitter_mean:
-            jitter_mean = performance_metrics.get('jitter', 0)
-
-        jitter_history = episode_metrics.get('jitter_history', [])
-        if not jitter_history:
-            jitter_history = episode_metrics.get('jitter_ipdv', [])
-
-        # Calcular jitter desde delay_history si está disponible
-        delay_history = episode_metrics.get('delay_history', [])
-        if delay_history and not jitter_history:
-            jitter_history = self._calculate_jitter_from_delays(delay_history)
-
-        if jitter_history:
-            # Usar datos reales con timestamps
-            if isinstance(jitter_history[0], dict):
-                time_points = np.array([d['time'] for d in jitter_history])
-                jitter_values = np.array([d['value'] for d in jitter_history])
-            else:
-                time_points = np.linspace(0, simulation_duration, len(jitter_history))
-                jitter_values = np.array(jitter_history)
-        elif jitter_mean > 0:
-            # Fallback: generar evolución simulada
-            print(f"[ADVERTENCIA] No hay jitter_history disponible, usando datos sintéticos")
-            time_points = np.linspace(0, simulation_duration, 100)
-            jitter_values = self._simulate_metric_evolution(jitter_mean * 1000, len(time_points), 'jitter')
-        else:
-            # Estimar jitter basado en delay si no hay datos específicos
-            mean_delay = performance_metrics.get('mean_delay', 0)
-            time_points = np.linspace(0, simulation_duration, 100)
-            # Jitter típicamente es ~10-20% del mean delay
-            jitter_approx = mean_delay * 0.15 * 1000 if mean_delay > 0 else 0
-            jitter_values = self._simulate_metric_evolution(jitter_approx, len(time_points), 'jitter')
-
-        # Graficar
-        ax.plot(time_points, jitter_values, 'g-', linewidth=2, label=tr('pon_metrics_charts.legend_jitter_ipdv'), marker='^', markersize=3)
-        ax.set_xlabel(tr('pon_metrics_charts.axis_time'))
-        ax.set_ylabel('Jitter (ms)')
-        ax.set_title(tr('pon_metrics_charts.chart_jitter_title').format(f"{simulation_duration:.1f}"))
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-
-        # Estadísticas en el gráfico
-        if len(jitter_values) > 0:
-            avg_jitter = np.mean(jitter_values)
-            max_jitter = np.max(jitter_values)
-            ax.text(0.02, 0.98, tr('pon_metrics_charts.stats_avg').format(f"{avg_jitter:.3f}") + '\n' + 
-                    tr('pon_metrics_charts.stats_max').format(f"{max_jitter:.3f}"),
-                    transform=ax.transAxes, verticalalignment='top',
-                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-        self.fig.tight_layout()
-        self.draw()
-    
-    def plot_onu_tcont_analysis(self, simulation_data: Dict[str, Any]):
-        """Graficar análisis de tipos de TCONT por ONU"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-            
-        self.fig.clear()
-        
-        # Obtener datos de delays que contienen onu_id y tcont_id
-        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
-        delays_data = episode_metrics.get('delays', [])
-        
-        if not delays_data:
-            # Intentar desde la raíz del objeto
-            delays_data = simulation_data.get('episode_metrics', {}).get('delays', [])
-        
-        if not delays_data:
-            self._plot_no_data(tr('pon_metrics_charts.no_onus_tconts_data'))
-            return
-        
-        # Analizar datos para extraer ONUs y sus TCONTs
-        onu_tcont_counts = {}
-        
-        for delay_entry in delays_data:
-            onu_id = delay_entry.get('onu_id', 'unknown')
-            tcont_id = delay_entry.get('tcont_id', 'unknown')
-            
-            if onu_id not in onu_tcont_counts:
-                onu_tcont_counts[onu_id] = {
-                    'lowest': 0, 'low': 0, 'medium': 0, 'high': 0, 'highest': 0
-                }
-            
-            if tcont_id in onu_tcont_counts[onu_id]:
-                onu_tcont_counts[onu_id][tcont_id] += 1
-        
-        if not onu_tcont_counts:
-            self._plot_no_data(tr('pon_metrics_charts.no_onus_found'))
-            return
-        
-        # Crear subgráficas para cada ONU
-        num_onus = len(onu_tcont_counts)
-        
-        if num_onus == 1:
-            # Una sola ONU
-            rows, cols = 1, 1
-        elif num_onus == 2:
-            # Dos ONUs horizontalmente
-            rows, cols = 1, 2
-        elif num_onus <= 4:
-            # Hasta 4 ONUs en 2x2
-            rows, cols = 2, 2
-        elif num_onus <= 6:
-            # Hasta 6 ONUs en 2x3
-            rows, cols = 2, 3
-        else:
-            # Más ONUs en 3x3
-            rows, cols = 3, 3
-        
-        # Tipos de TCONT y colores
-        tcont_types = ['lowest', 'low', 'medium', 'high', 'highest']
-        tcont_colors = ['#ff4444', '#ff8800', '#ffdd00', '#4488ff', '#00aa44']
-        tcont_labels = [
-            tr('pon_metrics_charts.traffic_lowest'),
-            tr('pon_metrics_charts.traffic_low'),
-            tr('pon_metrics_charts.traffic_medium'),
-            tr('pon_metrics_charts.traffic_high'),
-            tr('pon_metrics_charts.traffic_highest')
-        ]
-        
-        # Crear gráficas para cada ONU
-        for i, (onu_id, tcont_data) in enumerate(onu_tcont_counts.items()):
-            if i >= rows * cols:  # Limitar número de gráficas
-                break
-                
-            ax = self.fig.add_subplot(rows, cols, i + 1)
-            
-            # Datos para la gráfica de barras
-            values = [tcont_data[tcont_type] for tcont_type in tcont_types]
-            
-            # Crear gráfica de barras
-            bars = ax.bar(tcont_labels, values, color=tcont_colors, alpha=0.7, edgecolor='black', linewidth=0.5)
-            
-            # Agregar valores encima de las barras
-            for bar, value in zip(bars, values):
-                if value > 0:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height + max(values) * 0.01,
-                           f'{int(value)}', ha='center', va='bottom', fontweight='bold')
-            
-            # Configurar gráfica
-            ax.set_title(tr('pon_metrics_charts.chart_onu_tcont_title').format(onu_id), fontweight='bold')
-            ax.set_xlabel(tr('pon_metrics_charts.axis_tcont_type'))
-            ax.set_ylabel(tr('pon_metrics_charts.axis_quantity'))
-            ax.grid(True, alpha=0.3, axis='y')
-            
-            # Rotar etiquetas si es necesario
-            if num_onus > 2:
-                ax.tick_params(axis='x', rotation=45)
-            
-            # Agregar estadísticas
-            total_tconts = sum(values)
-            max_tcont = max(values) if values else 0
-            most_used = tcont_labels[values.index(max_tcont)] if max_tcont > 0 else 'N/A'
-            
-            ax.text(0.02, 0.98, tr('pon_metrics_charts.onu_stats_total').format(total_tconts) + '\n' + 
-                    tr('pon_metrics_charts.onu_stats_most_used').format(most_used), 
-                    transform=ax.transAxes, verticalalignment='top',
-                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
-                    fontsize=8)
-        
-        # Título general
-        self.fig.suptitle(tr('pon_metrics_charts.onu_analysis_title').format(num_onus), 
-                         fontsize=14, fontweight='bold')
-        
-        self.fig.tight_layout()
-        self.draw()
-    
-    def _simulate_delay_evolution(self, final_delay: float, num_points: int) -> np.ndarray:
-        """Simular evolución realista de delay"""
-        # Crear curva que converge al delay final
-        t = np.linspace(0, 1, num_points)
-        
-        # Delay inicial más alto que converge al final
-        initial_delay = final_delay * 3 if final_delay > 0 else 0.001
-        
-        # Función exponencial decreciente con ruido
-        delays = initial_delay * np.exp(-3 * t) + final_delay
-        
-        # Agregar ruido realista
-        noise = np.random.normal(0, final_delay * 0.1, num_points) if final_delay > 0 else np.zeros(num_points)
-        delays += noise
-        
-        # Asegurar valores positivos
-        delays = np.maximum(delays, 0)
-        
-        return delays
-    
-    def _simulate_throughput_evolution(self, final_throughput: float, num_points: int) -> np.ndarray:
-        """Simular evolución realista de throughput"""
-        t = np.linspace(0, 1, num_points)
-        
-        # Throughput que crece desde 0 al valor final
-        throughputs = final_throughput * (1 - np.exp(-4 * t))
-        
-        # Agregar variabilidad realista
-        if final_throughput > 0:
-            noise = np.random.normal(0, final_throughput * 0.05, num_points)
-            throughputs += noise
-        
-        # Asegurar valores positivos
-        throughputs = np.maximum(throughputs, 0)
-        
-        return throughputs
-    
-    def _calculate_p95_from_history(self, delay_history: List[Dict]) -> List[Dict[str, float]]:
-        """
-        Calcular P95 delay desde historial de delays usando ventanas deslizantes
-
-        Args:
-            delay_history: Lista de diccionarios con 'time' y 'value'
-
-        Returns:
-            Lista de diccionarios con 'time' y 'value' (P95)
-        """
-        if not delay_history or len(delay_history) < 10:
-            return []
-
-        # Usar ventanas de ~20 puntos para calcular P95
-        window_size = max(10, len(delay_history) // 10)
-        p95_history = []
-
-        for i in range(0, len(delay_history), window_size // 2):
-            window = delay_history[i:i + window_size]
-            if len(window) >= 5:  # Mínimo 5 puntos para calcular P95
-                values = [d['value'] for d in window]
-                p95_value = np.percentile(values, 95)
-                avg_time = np.mean([d['time'] for d in window])
-
-                p95_history.append({
-                    'time': avg_time,
-                    'value': p95_value
-                })
-
-        return p95_history
-
-    def _calculate_jitter_from_delays(self, delay_history: List[Dict]) -> List[Dict[str, float]]:
-        """
-        Calcular jitter (IPDV) desde historial de delays
-
-        Args:
-            delay_history: Lista de diccionarios con 'time' y 'value'
-
-        Returns:
-            Lista de diccionarios con 'time' y 'value' (jitter)
-        """
-        if not delay_history or len(delay_history) < 2:
-            return []
-
-        jitter_history = []
-        window_size = max(5, len(delay_history) // 20)
-
-        for i in range(window_size, len(delay_history), window_size // 2):
-            window = delay_history[i - window_size:i]
-            if len(window) >= 2:
-                delays = [d['value'] for d in window]
-                # Jitter como desviación estándar de los delays en la ventana
-                jitter_value = np.std(delays)
-                avg_time = np.mean([d['time'] for d in window])
-
-                jitter_history.append({
-                    'time': avg_time,
-                    'value': jitter_value
-                })
-
-        return jitter_history
-
-    def _simulate_metric_evolution(self, final_value: float, num_points: int, metric_type: str) -> np.ndarray:
-        """Simular evolución realista de métricas según el tipo"""
-        if num_points <= 1:
-            return np.array([final_value])
-            
-        t = np.linspace(0, 1, num_points)
-        
-        if metric_type == 'delay':
-            # Delay: inicio alto, converge gradualmente
-            base_curve = 1 - np.exp(-3 * t)
-            noise = np.random.normal(0, 0.1, num_points) * final_value * 0.1
-            values = final_value * base_curve + noise
-            
-        elif metric_type == 'percentile':
-            # P95: más variabilidad que mean delay
-            base_curve = 1 - np.exp(-2.5 * t)
-            noise = np.random.normal(0, 0.15, num_points) * final_value * 0.15
-            values = final_value * base_curve + noise
-            
-        elif metric_type == 'jitter':
-            # Jitter: más oscilante, tiende a estabilizarse
-            base_curve = 1 - np.exp(-4 * t)
-            oscillation = np.sin(10 * t) * 0.2 * np.exp(-2 * t)
-            noise = np.random.normal(0, 0.2, num_points) * final_value * 0.2
-            values = final_value * (base_curve + oscillation) + noise
-            
-        else:
-            # Curva genérica
-            values = final_value * (1 - np.exp(-3 * t))
-        
-        # Asegurar que todos los valores sean no negativos
-        values = np.maximum(values, 0)
-        
-        return values
-    
-    def _plot_no_data(self, message: str):
-        """Mostrar mensaje cuando no hay datos"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-            
-        ax = self.fig.add_subplot(111)
-        ax.text(0.5, 0.5, message, ha='center', va='center', 
-                transform=ax.transAxes, fontsize=16, 
-                bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8))
-        ax.set_xticks([])
-        ax.set_yticks([])
-        self.draw()
+        self._init_plot_caches()
 
 
 class PONMetricsChartsPanel(QWidget):
@@ -1208,6 +245,9 @@ class PONMetricsChartsPanel(QWidget):
         # Tab 5: Análisis OLT (Grants)
         self.setup_olt_analysis_tab()
         
+        # Tab 6: Métricas en vivo durante la simulación
+        self.setup_live_charts_tab()
+        
     def setup_temporal_charts_tab(self):
         """Configurar tab de gráficos temporales"""
         tab = QWidget()
@@ -1432,6 +472,7 @@ class PONMetricsChartsPanel(QWidget):
             self.onu_checkboxes = {}
             self.priority_checkboxes = {}
             self.grants_scatter_items = {}
+            self.grants_groups = {}
             
             # Aplicar tema actual al gráfico PyQtGraph
             if hasattr(self, 'dark_theme'):
@@ -1441,6 +482,142 @@ class PONMetricsChartsPanel(QWidget):
         
         self.tabs.addTab(tab, tr('pon_metrics_charts.tab_olt_analysis'))
     
+    def setup_live_charts_tab(self):
+        """Configurar tab de métricas en vivo (PyQtGraph, actualización incremental)"""
+        if not PYQTGRAPH_AVAILABLE:
+            return
+        
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        self.live_plot_widget = pg.GraphicsLayoutWidget()
+        layout.addWidget(self.live_plot_widget)
+        
+        self.live_throughput_plot = self.live_plot_widget.addPlot(
+            row=0, col=0, title=tr('pon_metrics_charts.live_throughput_title')
+        )
+        self.live_buffer_plot = self.live_plot_widget.addPlot(
+            row=1, col=0, title=tr('pon_metrics_charts.live_buffer_title')
+        )
+        self.live_delay_plot = self.live_plot_widget.addPlot(
+            row=2, col=0, title=tr('pon_metrics_charts.live_delay_title')
+        )
+        self.live_delay_plot.setLabel('bottom', tr('pon_metrics_charts.axis_time'))
+        self.live_buffer_plot.setYRange(0, 100)
+        
+        for plot in (self.live_throughput_plot, self.live_buffer_plot, self.live_delay_plot):
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            # Solo se dibuja lo visible, reducido al ancho en píxeles
+            plot.setClipToView(True)
+            plot.setDownsampling(auto=True, mode='peak')
+        self.live_buffer_plot.setXLink(self.live_throughput_plot)
+        self.live_delay_plot.setXLink(self.live_throughput_plot)
+        
+        self.live_metrics = None
+        self.live_timer = QTimer(self)
+        self.live_timer.timeout.connect(self._poll_live_metrics)
+        
+        self.live_tab_index = self.tabs.addTab(tab, tr('pon_metrics_charts.tab_live'))
+    
+    def start_live_mode(self, live_metrics, interval_ms: int = 200):
+        """
+        Mostrar en vivo las métricas publicadas por un LiveMetricsCollector
+        
+        Cada tick lee solo las muestras nuevas de los buffers circulares y las
+        añade a arrays preasignados; las curvas se actualizan con setData().
+        
+        Args:
+            live_metrics: LiveMetricsCollector del PONAdapter
+            interval_ms: Periodo de refresco de la UI
+        """
+        if not PYQTGRAPH_AVAILABLE or not hasattr(self, 'live_plot_widget'):
+            return
+        
+        self.stop_live_mode()
+        self.live_metrics = live_metrics
+        self._live_cursors = {'throughput': 0, 'buffer_levels': 0, 'delay_quantiles': 0}
+        self._live_rings = {}
+        self._live_windows = {}
+        self._live_curves = {}
+        self._live_onu_count = 0
+        
+        for plot in (self.live_throughput_plot, self.live_buffer_plot, self.live_delay_plot):
+            plot.clear()
+        self.live_delay_plot.addLegend()
+        
+        capacity = live_metrics.capacity
+        self._live_windows['throughput'] = SlidingWindowArrays(capacity, 1)
+        self._live_windows['delay_quantiles'] = SlidingWindowArrays(capacity, 2)
+        self._live_curves['throughput'] = [
+            self.live_throughput_plot.plot(pen=pg.mkPen((50, 150, 255), width=2))
+        ]
+        self._live_curves['delay_quantiles'] = [
+            self.live_delay_plot.plot(pen=pg.mkPen((0, 170, 0), width=2), name='P50'),
+            self.live_delay_plot.plot(pen=pg.mkPen((255, 60, 60), width=2), name='P95')
+        ]
+        
+        self.tabs.setCurrentIndex(self.live_tab_index)
+        self.live_timer.start(interval_ms)
+    
+    def stop_live_mode(self):
+        """Detener el refresco en vivo (con una última lectura)"""
+        if not hasattr(self, 'live_timer') or self.live_metrics is None:
+            return
+        
+        self.live_timer.stop()
+        self._poll_live_metrics()
+        self.live_metrics = None
+    
+    def _setup_live_buffer_curves(self, onu_ids: List[str]):
+        """Crear una curva por ONU cuando el simulador publica su lista de ONUs"""
+        colors = [(0, 0, 255), (255, 0, 0), (0, 128, 0), (255, 165, 0), (128, 0, 128),
+                  (165, 42, 42), (255, 105, 180), (128, 128, 128), (128, 128, 0), (0, 200, 200)]
+        self.live_buffer_plot.clear()
+        self.live_buffer_plot.addLegend()
+        self._live_windows['buffer_levels'] = SlidingWindowArrays(
+            self.live_metrics.capacity, len(onu_ids)
+        )
+        self._live_curves['buffer_levels'] = [
+            self.live_buffer_plot.plot(
+                pen=pg.mkPen(colors[i % len(colors)], width=2),
+                name=tr('pon_metrics_charts.legend_onu').format(onu_id)
+            )
+            for i, onu_id in enumerate(onu_ids)
+        ]
+        self._live_onu_count = len(onu_ids)
+    
+    def _poll_live_metrics(self):
+        """Añadir a los gráficos en vivo solo las muestras nuevas"""
+        live_metrics = self.live_metrics
+        if live_metrics is None:
+            return
+        
+        if live_metrics.onu_ids and self._live_onu_count != len(live_metrics.onu_ids):
+            self._setup_live_buffer_curves(live_metrics.onu_ids)
+            self._live_rings.pop('buffer_levels', None)
+        
+        for name in ('throughput', 'buffer_levels', 'delay_quantiles'):
+            window = self._live_windows.get(name)
+            if window is None:
+                continue
+            
+            ring = getattr(live_metrics, name)
+            if ring is not self._live_rings.get(name):
+                # El colector reinicia sus buffers al comenzar cada simulación
+                self._live_rings[name] = ring
+                self._live_cursors[name] = 0
+                window.start = window.end = 0
+            
+            cursor, times, values = ring.read_since(self._live_cursors[name])
+            self._live_cursors[name] = cursor
+            if len(times) == 0:
+                continue
+            
+            window.append(times, values)
+            for column, curve in enumerate(self._live_curves[name]):
+                x, y = window.view(column)
+                curve.setData(x, y)
+    
     def update_charts_with_data(self, simulation_data: Dict[str, Any]):
         """Actualizar todos los gráficos con nuevos datos"""
         if not MATPLOTLIB_AVAILABLE:
@@ -1525,73 +702,14 @@ class PONMetricsChartsPanel(QWidget):
     
     def _detect_simulation_format(self, simulation_data: Dict[str, Any]):
         """Detectar si los datos provienen de simulación híbrida o clásica"""
-        # Detectar formato híbrido por la presencia de timestamps en delays/throughputs
-        episode_metrics = simulation_data.get('simulation_summary', {}).get('episode_metrics', {})
-        delays = episode_metrics.get('delays', [])
-        
-        if delays and isinstance(delays[0], dict) and 'timestamp' in delays[0]:
-            self.simulation_format = 'hybrid'
-        else:
-            self.simulation_format = 'classic'
+        self.simulation_format = detect_simulation_format(simulation_data)
     
     def _normalize_data_format(self, simulation_data: Dict[str, Any]) -> Dict[str, Any]:
         """Normalizar datos de simulación para compatibilidad con gráficos"""
         if not hasattr(self, 'simulation_format'):
             self._detect_simulation_format(simulation_data)
         
-        if self.simulation_format == 'hybrid':
-            # Convertir formato híbrido al formato esperado por gráficos clásicos
-            return self._convert_hybrid_to_classic_format(simulation_data)
-        else:
-            # Datos clásicos, devolverlos tal como están
-            return simulation_data
-    
-    def _convert_hybrid_to_classic_format(self, hybrid_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Convertir datos híbridos al formato clásico para compatibilidad"""
-        converted_data = hybrid_data.copy()
-        
-        episode_metrics = hybrid_data.get('simulation_summary', {}).get('episode_metrics', {})
-        
-        # Convertir buffer levels: mantener formato nuevo con MB y timestamps
-        buffer_history = episode_metrics.get('buffer_levels_history', [])
-        if buffer_history:
-            converted_buffer_history = []
-            for step_data in buffer_history:
-                # Detectar formato: nuevo (con 'time' y 'buffers') vs antiguo (solo buffers)
-                if isinstance(step_data, dict) and 'time' in step_data and 'buffers' in step_data:
-                    # Formato nuevo con timestamps - mantener tal cual
-                    converted_buffer_history.append(step_data)
-                else:
-                    # Formato antiguo sin timestamps - convertir
-                    converted_step = {}
-                    for onu_id, level_data in step_data.items():
-                        # Manejar formato nuevo (dict) y antiguo (número)
-                        if isinstance(level_data, dict):
-                            # Ya está en formato nuevo con MB - mantener
-                            converted_step[onu_id] = level_data
-                        else:
-                            # Formato antiguo (fracción/porcentaje) - convertir a formato MB
-                            # Estimar 3.5MB total por ONU (512KB + 512KB + 1MB + 1MB + 256KB)
-                            used_mb = level_data * 3.5 if level_data <= 1 else level_data * 3.5 / 100
-                            converted_step[onu_id] = {
-                                'used_mb': used_mb,
-                                'capacity_mb': 3.5,
-                                'utilization_percent': level_data * 100 if level_data <= 1 else level_data
-                            }
-                    converted_buffer_history.append(converted_step)
-            
-            # Actualizar en la estructura convertida
-            if 'simulation_summary' not in converted_data:
-                converted_data['simulation_summary'] = {}
-            if 'episode_metrics' not in converted_data['simulation_summary']:
-                converted_data['simulation_summary']['episode_metrics'] = {}
-
-            converted_data['simulation_summary']['episode_metrics']['buffer_levels_history'] = converted_buffer_history
-        
-        # Los delays y throughputs híbridos ya tienen formato compatible
-        # (incluso mejor con timestamp, onu_id, tcont_id)
-        
-        return converted_data
+        return normalize_simulation_data(simulation_data, self.simulation_format)
 
     def retranslate_ui(self):
         """Actualizar todos los textos traducibles del panel"""
@@ -1614,6 +732,15 @@ class PONMetricsChartsPanel(QWidget):
             self.tabs.setTabText(2, tr('pon_metrics_charts.tab_analysis'))
             self.tabs.setTabText(3, tr('pon_metrics_charts.tab_onu_analysis'))
             self.tabs.setTabText(4, tr('pon_metrics_charts.tab_olt_analysis'))
+            if hasattr(self, 'live_tab_index'):
+                self.tabs.setTabText(self.live_tab_index, tr('pon_metrics_charts.tab_live'))
+        
+        # Títulos de gráficos en vivo
+        if hasattr(self, 'live_throughput_plot'):
+            self.live_throughput_plot.setTitle(tr('pon_metrics_charts.live_throughput_title'))
+            self.live_buffer_plot.setTitle(tr('pon_metrics_charts.live_buffer_title'))
+            self.live_delay_plot.setTitle(tr('pon_metrics_charts.live_delay_title'))
+            self.live_delay_plot.setLabel('bottom', tr('pon_metrics_charts.axis_time'))
         
         # GroupBoxes del tab temporal
         if hasattr(self, 'delay_group'):
@@ -1661,76 +788,95 @@ class PONMetricsChartsPanel(QWidget):
         if hasattr(self, 'current_data') and self.current_data:
             self.update_charts_with_data(self.current_data)
     
-    def _extract_grants_from_simulation_data(self, data: Dict[str, Any]) -> List[Dict]:
+    # Paleta de colores para prioridades (misma que visualize_grants.py)
+    PRIORITY_COLORS = {
+        'lowest': (100, 100, 255),   # Azul claro
+        'low': (50, 150, 255),        # Azul medio
+        'medium': (255, 200, 0),      # Amarillo/Naranja
+        'high': (255, 100, 0),        # Naranja
+        'highest': (255, 0, 0),       # Rojo
+    }
+
+    # Símbolos para cada ONU
+    ONU_MARKERS = {
+        '0': 'o',  # círculo
+        '1': 's',  # cuadrado
+        '2': 't',  # triángulo
+        '3': 'd',  # diamante
+    }
+
+    def _extract_grants_from_simulation_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extraer información de grants desde los datos de simulación en RAM
         Estrategia 1: transmission_log (más completo)
         Estrategia 2: delays (fallback)
+
+        Returns:
+            Dict columnar: arrays 'sequence', 'bytes', 'timestamp', 'onu_codes' y
+            'priority_codes' (índices en 'onu_labels' / 'priority_labels')
         """
-        grants = []
-        
         # Estrategia 1: Buscar en transmission_log del OLT
-        if 'olt_stats' in data and 'transmission_log' in data['olt_stats']:
-            transmissions = data['olt_stats']['transmission_log']
-            
-            for idx, trans in enumerate(transmissions):
-                # Convertir data_size_mb a bytes
-                bytes_val = trans.get('data_size_mb', 0) * 1024 * 1024
-                
-                grants.append({
-                    'sequence': idx,
-                    'onu_id': str(trans.get('onu_id', '?')),
-                    'priority': trans.get('tcont_id', 'unknown'),
-                    'timestamp': trans.get('start_time', 0),
-                    'bytes': int(bytes_val),
-                    'duration': trans.get('duration', 0)
-                })
-        
+        transmissions = data.get('olt_stats', {}).get('transmission_log', [])
+        if len(transmissions) > 0:
+            return self._grants_columns(
+                transmissions, onu_key='onu_id', priority_key='tcont_id', time_key='start_time',
+                bytes_key='data_size_mb', bytes_scale=1024 * 1024  # Convertir data_size_mb a bytes
+            )
+
         # Estrategia 2: Buscar en delays (fallback)
-        if not grants and 'simulation_summary' in data and 'episode_metrics' in data['simulation_summary']:
-            delays = data['simulation_summary']['episode_metrics'].get('delays', [])
-            
-            for idx, delay_entry in enumerate(delays):
-                grants.append({
-                    'sequence': idx,
-                    'onu_id': str(delay_entry.get('onu_id', '?')),
-                    'priority': delay_entry.get('tcont_id', 'unknown'),
-                    'timestamp': delay_entry.get('timestamp', 0),
-                    'bytes': delay_entry.get('bytes', 0),
-                    'delay': delay_entry.get('delay', 0)
-                })
-        
-        return grants
-    
+        delays = data.get('simulation_summary', {}).get('episode_metrics', {}).get('delays', [])
+        if len(delays) > 0:
+            return self._grants_columns(
+                delays, onu_key='onu_id', priority_key='tcont_id', time_key='timestamp',
+                bytes_key='bytes', bytes_scale=1
+            )
+
+        return {}
+
+    def _grants_columns(self, records, onu_key: str, priority_key: str, time_key: str,
+                        bytes_key: str, bytes_scale: float) -> Dict[str, Any]:
+        """Convertir registros de grants en columnas (sin un dict por grant)"""
+        column = getattr(records, 'column', None)
+
+        def extract(key, default):
+            # Tablas columnares (session_store): usar la columna directamente
+            if column is not None:
+                values = column(key)
+                if values is not None:
+                    return values
+            return np.array([record.get(key, default) for record in records])
+
+        onu_ids = extract(onu_key, '?').astype(str)
+        priorities = extract(priority_key, 'unknown').astype(str)
+        onu_labels, onu_codes = np.unique(onu_ids, return_inverse=True)
+        priority_labels, priority_codes = np.unique(priorities, return_inverse=True)
+
+        grant_bytes = extract(bytes_key, 0).astype(float) * bytes_scale
+        if bytes_scale != 1:
+            grant_bytes = grant_bytes.astype(np.int64)
+
+        return {
+            'sequence': np.arange(len(records), dtype=float),
+            'bytes': grant_bytes,
+            'timestamp': extract(time_key, 0).astype(float),
+            'onu_codes': onu_codes,
+            'priority_codes': priority_codes,
+            'onu_labels': onu_labels.tolist(),
+            'priority_labels': priority_labels.tolist()
+        }
+
     def update_grants_visualization(self, simulation_data: Dict[str, Any]):
         """Actualizar visualización de grants OLT usando datos en RAM"""
         if not PYQTGRAPH_AVAILABLE or not hasattr(self, 'grants_plot'):
             return
         
-        # Extraer grants de los datos en RAM
+        # Extraer grants de los datos en RAM (columnas numpy)
         grants = self._extract_grants_from_simulation_data(simulation_data)
         
-        if not grants:
+        if not grants or len(grants['sequence']) == 0:
             print("WARNING: No se encontraron datos de grants en la simulación")
             return
         
-        # Paleta de colores para prioridades (misma que visualize_grants.py)
-        PRIORITY_COLORS = {
-            'lowest': (100, 100, 255),   # Azul claro
-            'low': (50, 150, 255),        # Azul medio
-            'medium': (255, 200, 0),      # Amarillo/Naranja
-            'high': (255, 100, 0),        # Naranja
-            'highest': (255, 0, 0),       # Rojo
-        }
-        
-        # Símbolos para cada ONU
-        ONU_MARKERS = {
-            '0': 'o',  # círculo
-            '1': 's',  # cuadrado
-            '2': 't',  # triángulo
-            '3': 'd',  # diamante
-        }
-        
         # Limpiar plot anterior
         self.grants_plot.clear()
         self.grants_plot.setTitle(tr('pon_metrics_charts.olt_grants_title'))
@@ -1738,52 +884,99 @@ class PONMetricsChartsPanel(QWidget):
         self.grants_plot.setLabel('bottom', tr('pon_metrics_charts.olt_axis_sequence'))
         self.grants_plot.showGrid(x=True, y=True, alpha=0.3)
         
-        # Agrupar por ONU y prioridad
-        data_by_group = {}
-        for grant in grants:
-            onu_id = grant['onu_id']
-            priority = grant['priority']
-            key = (onu_id, priority)
-            
-            if key not in data_by_group:
-                data_by_group[key] = {'x': [], 'y': [], 'color': None, 'symbol': None}
-            
-            data_by_group[key]['x'].append(grant['sequence'])
-            data_by_group[key]['y'].append(grant['bytes'])
-            data_by_group[key]['color'] = PRIORITY_COLORS.get(priority, (128, 128, 128))
-            data_by_group[key]['symbol'] = ONU_MARKERS.get(onu_id, 'o')
+        # Agrupar por ONU y prioridad: ordenación estable por código de grupo,
+        # así cada grupo conserva sus grants ordenados por secuencia
+        n_priorities = len(grants['priority_labels'])
+        group_codes = grants['onu_codes'] * n_priorities + grants['priority_codes']
+        order = np.argsort(group_codes, kind='stable')
+        boundaries = np.flatnonzero(np.diff(group_codes[order])) + 1
         
-        # Crear scatter plots para cada grupo
+        # Crear un scatter por grupo; los puntos se cargan según el rango visible
         self.grants_scatter_items = {}
-        for (onu_id, priority), group_data in data_by_group.items():
+        self.grants_groups = {}
+        for indices in np.split(order, boundaries):
+            code = int(group_codes[indices[0]])
+            onu_id = grants['onu_labels'][code // n_priorities]
+            priority = grants['priority_labels'][code % n_priorities]
+            style = {
+                'size': 8,
+                'pen': pg.mkPen(None),
+                'brush': pg.mkBrush(*self.PRIORITY_COLORS.get(priority, (128, 128, 128))),
+                'symbol': self.ONU_MARKERS.get(onu_id, 'o')
+            }
             scatter = pg.ScatterPlotItem(
-                x=group_data['x'],
-                y=group_data['y'],
-                size=8,
-                pen=pg.mkPen(None),
-                brush=pg.mkBrush(*group_data['color']),
-                symbol=group_data['symbol'],
-                name=f"{onu_id} - {priority}"  # onu_id ya contiene "ONU_1", "ONU_2", etc.
+                name=f"{onu_id} - {priority}",  # onu_id ya contiene "ONU_1", "ONU_2", etc.
+                **style
             )
             self.grants_plot.addItem(scatter)
             self.grants_scatter_items[(onu_id, priority)] = scatter
+            self.grants_groups[(onu_id, priority)] = {
+                'x': grants['sequence'][indices],
+                'y': grants['bytes'][indices],
+                'indices': indices,
+                'style': style
+            }
+        self.grants_data = grants
+        
+        # Rango inicial: todos los grants (agregados si son densos)
+        self.grants_plot.disableAutoRange()
+        self.grants_plot.setXRange(0, len(grants['sequence']) - 1, padding=0.02)
+        self.grants_plot.setYRange(0, float(grants['bytes'].max()) or 1.0, padding=0.05)
+        self._connect_grants_range_changed()
+        self._render_visible_grants()
         
         # Actualizar panel de control
         self._update_grants_control_panel(grants)
         
         # Actualizar información del panel
-        unique_onus = sorted(set(g['onu_id'] for g in grants))
         summary_text = f"""
         <b>{tr('pon_metrics_charts.olt_summary_title')}</b><br>
-        {tr('pon_metrics_charts.olt_total_grants').format(len(grants))}<br>
-        {tr('pon_metrics_charts.olt_total_onus').format(len(unique_onus))}
+        {tr('pon_metrics_charts.olt_total_grants').format(len(grants['sequence']))}<br>
+        {tr('pon_metrics_charts.olt_total_onus').format(len(grants['onu_labels']))}
         """
         self.grants_info_label.setText(summary_text)
         
         # Conectar evento de movimiento del mouse para hover
         self._setup_grants_hover(grants)
+
+    def _connect_grants_range_changed(self):
+        """Re-renderizar los grants visibles al hacer zoom o desplazar (limitado a 30 Hz)"""
+        if hasattr(self, '_grants_range_proxy'):
+            return
+
+        self._grants_range_proxy = pg.SignalProxy(
+            self.grants_plot.vb.sigXRangeChanged,
+            rateLimit=30,
+            slot=lambda evt: self._render_visible_grants()
+        )
+
+    def _render_visible_grants(self):
+        """
+        Cargar en cada scatter solo los grants dentro del rango X visible
+
+        Si un grupo tiene más grants visibles que columnas de píxeles se
+        agrega con la envolvente min/max de bytes por columna, de modo que
+        el número de puntos dibujados depende del ancho del gráfico y no del
+        número de grants.
+        """
+        if not getattr(self, 'grants_groups', None):
+            return
+
+        (x_min, x_max), _ = self.grants_plot.vb.viewRange()
+        max_points = max(int(self.grants_plot.vb.width()), 100)
+
+        for key, group in self.grants_groups.items():
+            x, y = group['x'], group['y']
+            start = np.searchsorted(x, x_min, side='left')
+            end = np.searchsorted(x, x_max, side='right')
+            visible_x, visible_y = x[start:end], y[start:end]
+
+            if len(visible_x) > max_points:
+                visible_x, visible_y = minmax_downsample(visible_x, visible_y, max_points // 2)
+
+            self.grants_scatter_items[key].setData(x=visible_x, y=visible_y, **group['style'])
     
-    def _update_grants_control_panel(self, grants: List[Dict]):
+    def _update_grants_control_panel(self, grants: Dict[str, Any]):
         """Actualizar panel de control con checkboxes de ONUs y prioridades"""
         if not hasattr(self, 'onu_checkboxes_layout'):
             return
@@ -1802,9 +995,12 @@ class PONMetricsChartsPanel(QWidget):
         self.onu_checkboxes = {}
         self.priority_checkboxes = {}
         
+        # Contadores de grants por ONU y por prioridad
+        onu_counts = np.bincount(grants['onu_codes'], minlength=len(grants['onu_labels']))
+        priority_counts = np.bincount(grants['priority_codes'], minlength=len(grants['priority_labels']))
+        
         # Crear checkboxes para ONUs
-        unique_onus = sorted(set(str(g['onu_id']) for g in grants))
-        for onu_id in unique_onus:
+        for onu_id, count in sorted(zip(grants['onu_labels'], onu_counts.tolist())):
             checkbox = QCheckBox(tr('pon_metrics_charts.olt_onu_label').format(onu_id))
             checkbox.setChecked(True)
             checkbox.stateChanged.connect(lambda state, oid=onu_id: self._toggle_onu(oid, state))
@@ -1813,42 +1009,31 @@ class PONMetricsChartsPanel(QWidget):
             self.onu_checkboxes[onu_id] = checkbox
             
             # Contador de grants
-            count = sum(1 for g in grants if str(g['onu_id']) == onu_id)
             count_label = QLabel(f"   {tr('pon_metrics_charts.olt_grants_count').format(count)}")
             count_label.setStyleSheet("color: gray; margin-left: 20px;")
             self.onu_checkboxes_layout.addWidget(count_label)
         
         # Crear checkboxes para prioridades
-        unique_priorities = sorted(set(g['priority'] for g in grants))
+        priority_count_map = dict(zip(grants['priority_labels'], priority_counts.tolist()))
         
         # Ordenar prioridades de mayor a menor (highest -> lowest)
         priority_order = {'highest': 0, 'high': 1, 'medium': 2, 'low': 3, 'lowest': 4}
-        unique_priorities = sorted(unique_priorities, key=lambda p: priority_order.get(p, 999))
-        
-        PRIORITY_COLORS = {
-            'lowest': (100, 100, 255),
-            'low': (50, 150, 255),
-            'medium': (255, 200, 0),
-            'high': (255, 100, 0),
-            'highest': (255, 0, 0),
-        }
+        unique_priorities = sorted(priority_count_map, key=lambda p: priority_order.get(p, 999))
         
         for priority in unique_priorities:
             checkbox = QCheckBox(priority)
             checkbox.setChecked(True)
             checkbox.stateChanged.connect(lambda state, p=priority: self._toggle_priority(p, state))
             
-            color = PRIORITY_COLORS.get(priority, (128, 128, 128))
+            color = self.PRIORITY_COLORS.get(priority, (128, 128, 128))
             checkbox.setStyleSheet(f"font-size: 13px; color: rgb{color};")
             self.priority_checkboxes_layout.addWidget(checkbox)
             self.priority_checkboxes[priority] = checkbox
             
             # Contador de grants
-            count = sum(1 for g in grants if g['priority'] == priority)
-            count_label = QLabel(f"   {tr('pon_metrics_charts.olt_grants_count').format(count)}")
+            count_label = QLabel(f"   {tr('pon_metrics_charts.olt_grants_count').format(priority_count_map[priority])}")
             count_label.setStyleSheet("color: gray; margin-left: 20px;")
             self.priority_checkboxes_layout.addWidget(count_label)
-        
         # Conectar botones de acción rápida (desconectar primero si ya están conectados)
         try:
             self.show_all_onus_btn.clicked.disconnect()
@@ -1903,29 +1088,37 @@ class PONMetricsChartsPanel(QWidget):
                 else:
                     scatter.hide()
     
-    def _setup_grants_hover(self, grants: List[Dict]):
+    def _setup_grants_hover(self, grants: Dict[str, Any]):
         """Configurar evento de hover para mostrar información de grants"""
         def mouse_moved(evt):
             pos = evt[0]
             if self.grants_plot.sceneBoundingRect().contains(pos):
                 mouse_point = self.grants_plot.vb.mapSceneToView(pos)
+                mouse_x = mouse_point.x()
                 
-                # Buscar el punto más cercano
+                # Buscar el punto más cercano entre los grupos visibles:
+                # búsqueda binaria sobre las secuencias ordenadas de cada grupo
                 min_dist = float('inf')
-                closest_grant = None
-                for grant in grants:
-                    dist = abs(grant['sequence'] - mouse_point.x())
-                    if dist < min_dist:
-                        min_dist = dist
-                        closest_grant = grant
+                closest_index = None
+                for key, group in self.grants_groups.items():
+                    if not self.grants_scatter_items[key].isVisible():
+                        continue
+                    x = group['x']
+                    position = int(np.searchsorted(x, mouse_x))
+                    for candidate in (position - 1, position):
+                        if 0 <= candidate < len(x):
+                            dist = abs(x[candidate] - mouse_x)
+                            if dist < min_dist:
+                                min_dist = dist
+                                closest_index = int(group['indices'][candidate])
                 
-                if closest_grant and min_dist < 50:  # Radio de detección
+                if closest_index is not None and min_dist < 50:  # Radio de detección
                     info_text = tr('pon_metrics_charts.olt_grant_info').format(
-                        closest_grant['sequence'],
-                        closest_grant['onu_id'],
-                        closest_grant['priority'],
-                        closest_grant['bytes'],
-                        closest_grant.get('timestamp', 0)
+                        closest_index,
+                        grants['onu_labels'][grants['onu_codes'][closest_index]],
+                        grants['priority_labels'][grants['priority_codes'][closest_index]],
+                        grants['bytes'][closest_index],
+                        grants['timestamp'][closest_index]
                     )
                     self.grants_info_label.setText(info_text)
         
@@ -1941,4 +1134,3 @@ class PONMetricsChartsPanel(QWidget):
             rateLimit=60, 
             slot=mouse_moved
         )
-
@@ -1100,18 +1100,16 @@ class PONSDNDashboard(QWidget):
                 self._show_error_message("No se encontró la carpeta 'simulation_results'.\nEjecuta una simulación primero.")
                 return
             
-            # Buscar archivos datos_simulacion.json y datos_simulacion.json.gz
-            json_files = list(sim_results_path.rglob("datos_simulacion.json"))
-            json_gz_files = list(sim_results_path.rglob("datos_simulacion.json.gz"))
-            all_files = json_files + json_gz_files
+            # Consultar el catálogo de sesiones (sin recorrer el árbol de resultados)
+            from core.utilities.session_catalog import SessionCatalog
+            latest_data_file = SessionCatalog(str(sim_results_path)).latest_data_file()
 
-            if not all_files:
+            if not latest_data_file:
                 print("❌ No se encontraron archivos de simulación")
                 self._show_error_message("No se encontraron archivos de simulación.\nEjecuta una simulación primero.")
                 return
 
-            # Obtener el archivo más reciente (puede ser .json o .json.gz)
-            latest_file = max(all_files, key=lambda p: p.stat().st_mtime)
+            latest_file = Path(latest_data_file)
             
             print(f"📂 Archivo encontrado: {latest_file.parent.name}/{latest_file.name}")
             print(f"📍 Ruta completa: {latest_file}")
@@ -1119,9 +1117,12 @@ class PONSDNDashboard(QWidget):
             # Crear procesador de métricas SDN
             processor = SDNMetricsProcessor()
             
-            # Cargar datos de simulación
-            print("⏳ Cargando datos de simulación...")
-            if not processor.load_simulation_data(str(latest_file)):
+            # Métricas precalculadas al guardar (sidecar); si no hay o la versión
+            # no coincide, se cargan los datos y se recalculan
+            print("⏳ Cargando métricas SDN de la sesión...")
+            sdn_metrics = processor.load_or_calculate(str(latest_file))
+
+            if not sdn_metrics and processor.simulation_data is None:
                 print("❌ Error: El archivo no contiene datos de simulación válidos")
                 # Verificar si el error fue por archivo incompleto (guardado en progreso)
                 import time
@@ -1135,21 +1136,12 @@ class PONSDNDashboard(QWidget):
                     self._show_error_message("El archivo de simulación no contiene datos válidos.")
                 return
             
-            print("⚙️ Calculando métricas SDN desde datos reales...")
-            print("   - Analizando transmission_log...")
-            print("   - Calculando métricas por ONU...")
-            print("   - Calculando compliance SLA...")
-            print("   - Calculando métricas del controlador...")
-            
-            # Calcular métricas SDN
-            sdn_metrics = processor.calculate_sdn_metrics()
-            
             if not sdn_metrics:
                 print("❌ Error calculando métricas SDN")
                 self._show_error_message("No se pudieron calcular las métricas SDN.")
                 return
             
-            print("✅ Métricas SDN calculadas exitosamente desde datos reales")
+            print("✅ Métricas SDN obtenidas desde datos reales")
             
             # Mostrar resumen
             global_metrics = sdn_metrics.get('global_metrics', {})
@@ -3,6 +3,7 @@ PON Simulation Results Panel
 Panel de visualización de resultados de simulación PON integrado
 """
 
+import os
 import json
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QTextEdit, QTabWidget, QTableWidget,
@@ -12,6 +13,7 @@ from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 from core import PONAdapter
 from .pon_metrics_charts import PONMetricsChartsPanel
+from .chart_export import ChartExportThread
 
 # Importar sistema de traducciones
 from utils.translation_manager import translation_manager
@@ -23,6 +25,8 @@ class PONResultsPanel(QWidget):
     
     # Señales
     results_updated = pyqtSignal(dict)
+    charts_exported = pyqtSignal(str, dict)   # (directorio, {chart_id: archivo}) al terminar start_chart_export
+    charts_export_failed = pyqtSignal(str)    # Error en start_chart_export
     
     def __init__(self):
         super().__init__()
@@ -524,7 +528,7 @@ class PONResultsPanel(QWidget):
                 self,
                 "Seleccionar datos_simulacion.json",
                 str(default_path),
-                "JSON files (*.json);;All files (*.*)"
+                "Datos de simulación (manifest.json datos_simulacion.json datos_simulacion.json.gz);;JSON files (*.json *.json.gz);;All files (*.*)"
             )
             
             if not filename:
@@ -558,6 +562,7 @@ class PONResultsPanel(QWidget):
             
             # Calcular métricas SDN
             sdn_metrics = processor.calculate_sdn_metrics()
+            processor.release_simulation_data()
             
             if not sdn_metrics:
                 self.add_log_message("❌ Error calculando métricas SDN")
@@ -619,17 +624,55 @@ class PONResultsPanel(QWidget):
             self.charts_panel.update_charts_with_data(self.current_results)
             self.add_log_message("📊 Gráficos actualizados automáticamente al finalizar simulación")
     
-    def export_charts_to_directory(self, directory):
-        """Exportar gráficos a directorio"""
-        if hasattr(self, 'charts_panel'):
-            success = self.charts_panel.export_charts(directory)
-            if success:
-                self.add_log_message(f"📁 Gráficos exportados a: {directory}")
-                return True
-            else:
-                self.add_log_message("❌ Error exportando gráficos")
-                return False
-        return False
+    def start_chart_export(self, directory, data_path=None):
+        """
+        Iniciar la exportación asíncrona de gráficos a un directorio
+
+        Los gráficos se renderizan en procesos aparte (backend Agg) desde los
+        datos de la sesión; la UI sigue respondiendo y el progreso se muestra
+        en el log. Retorna True si la exportación se inició: el resultado llega
+        después por charts_exported o charts_export_failed.
+
+        Args:
+            directory: Directorio de destino
+            data_path: Sesión guardada a graficar (por defecto, los resultados actuales)
+        """
+        if data_path is None and not self.current_results:
+            self.add_log_message("❌ No hay resultados para exportar gráficos")
+            return False
+
+        if getattr(self, 'chart_export_thread', None) and self.chart_export_thread.isRunning():
+            self.add_log_message("⚠️ Ya hay una exportación de gráficos en curso")
+            return False
+
+        self.chart_export_thread = ChartExportThread(
+            directory,
+            data_path=data_path,
+            simulation_data=None if data_path else self.current_results
+        )
+        self.chart_export_thread.chart_exported.connect(
+            lambda chart_id, filename, done, total: self.add_log_message(
+                f"🖼️ Gráfico {done}/{total} exportado: {os.path.basename(filename)}"
+            )
+        )
+        self.chart_export_thread.export_completed.connect(
+            lambda exported: self._on_charts_exported(directory, exported)
+        )
+        self.chart_export_thread.export_error.connect(self._on_chart_export_error)
+
+        self.add_log_message(f"🖼️ Exportando gráficos en segundo plano a: {directory}")
+        self.chart_export_thread.start()
+        return True
+
+    def _on_charts_exported(self, directory, exported):
+        """Callback al terminar la exportación de gráficos"""
+        self.add_log_message(f"📁 {len(exported)} gráficos exportados a: {directory}")
+        self.charts_exported.emit(directory, exported)
+
+    def _on_chart_export_error(self, error):
+        """Callback si falla la exportación de gráficos"""
+        self.add_log_message(f"❌ {error}")
+        self.charts_export_failed.emit(error)
     
     def update_status(self, status):
         """Actualizar estado general"""
@@ -638,6 +681,11 @@ class PONResultsPanel(QWidget):
     def cleanup(self):
         """Limpiar recursos del panel de resultados"""
         try:
+            # Cancelar exportación de gráficos en curso
+            if getattr(self, 'chart_export_thread', None) and self.chart_export_thread.isRunning():
+                self.chart_export_thread.stop()
+                self.chart_export_thread.wait()
+
             # Parar timer de actualización de forma segura
             if hasattr(self, 'update_timer') and self.update_timer:
                 if self.update_timer.isActive():
@@ -50,6 +50,10 @@ class RLConfigPanel(QWidget):
 
         # Training Manager (se asignará externamente)
         self.training_manager = None
+        
+        # Estado de carga de la pila RL (gymnasium/stable-baselines3/torch)
+        self.rl_stack_state = 'not_loaded'
+        self.rl_stack_message = ""
 
         # Ventana emergente de gráficos RL
         self.rl_graphics_window = None
@@ -70,6 +74,11 @@ class RLConfigPanel(QWidget):
         self.info_label.setWordWrap(True)
         main_layout.addWidget(self.info_label)
 
+        # Disponibilidad del módulo RL (se carga en segundo plano al entrar en modo RL)
+        self.rl_stack_label = QLabel()
+        self.rl_stack_label.setWordWrap(True)
+        main_layout.addWidget(self.rl_stack_label)
+
         # Pestaña de Entrenamiento RL solamente (simulación movida a pestaña principal)
         self.tab_widget = QTabWidget()
 
@@ -83,6 +92,29 @@ class RLConfigPanel(QWidget):
 
         # Actualizar lista de modelos después de que todo esté configurado
         self.refresh_models_list()
+        self.set_rl_stack_state(self.rl_stack_state, self.rl_stack_message)
+    
+    def set_rl_stack_state(self, state, message=""):
+        """Mostrar el estado de carga del módulo RL y habilitar el entrenamiento al estar listo"""
+        self.rl_stack_state = state
+        self.rl_stack_message = message
+        
+        if state == 'ready':
+            text = tr("rl_config_panel.rl_stack_ready")
+            style = "color: #2E7D32; padding: 4px;"
+        elif state == 'unavailable':
+            text = tr("rl_config_panel.rl_stack_unavailable")
+            style = "color: #C62828; padding: 4px;"
+        else:
+            text = tr("rl_config_panel.rl_stack_loading")
+            style = "color: #EF6C00; padding: 4px;"
+        
+        self.rl_stack_label.setText(text)
+        self.rl_stack_label.setToolTip(message)
+        self.rl_stack_label.setStyleSheet(style)
+        
+        if hasattr(self, 'train_button') and not self.training_active:
+            self.train_button.setEnabled(state == 'ready')
     
     def set_training_manager(self, training_manager):
         """Establecer referencia al TrainingManager"""
@@ -95,6 +127,7 @@ class RLConfigPanel(QWidget):
             self.training_manager.training_status_changed.connect(self.update_training_status)
             self.training_manager.error_occurred.connect(self.handle_training_error)
             self.training_manager.training_completed.connect(self.handle_training_completed)
+            self.training_manager.telemetry_updated.connect(self.handle_training_telemetry)
 
             # Señales de simulación
             self.training_manager.simulation_progress.connect(self.update_simulation_metrics_from_manager)
@@ -1366,6 +1399,20 @@ class RLConfigPanel(QWidget):
         except Exception as e:
             print(f"❌ Error actualizando métricas: {e}")
     
+    def handle_training_telemetry(self, telemetry):
+        """Reenviar telemetría de entrenamiento al gráfico en vivo de la ventana RL"""
+        try:
+            if not self.rl_graphics_window:
+                self.rl_graphics_window = RLGraphicsPopupWindow(self)
+                self.rl_graphics_window.window_closed.connect(self.on_graphics_window_closed)
+                self.rl_graphics_window.graphics_exported.connect(self.on_graphics_exported)
+                self.rl_graphics_window.set_theme(self.dark_theme)
+
+            self.rl_graphics_window.update_training_telemetry(telemetry)
+
+        except Exception as e:
+            print(f"❌ Error actualizando telemetría: {e}")
+
     def update_training_status(self, status):
         """Actualizar estado del entrenamiento desde el TrainingManager"""
         try:
@@ -1597,6 +1644,8 @@ class RLConfigPanel(QWidget):
         # Mensaje informativo
         if hasattr(self, 'info_label'):
             self.info_label.setText(tr("rl_config_panel.info_message"))
+        if hasattr(self, 'rl_stack_label'):
+            self.set_rl_stack_state(self.rl_stack_state, self.rl_stack_message)
         
         # Sección de selección de modelo
         if hasattr(self, 'model_selection_group'):
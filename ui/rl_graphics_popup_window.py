@@ -4,6 +4,7 @@ Ventana emergente que muestra gráficos de simulación RL automáticamente
 """
 
 import os
+from collections import deque
 from typing import Dict, Any, Optional
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QTabWidget, QScrollArea, QWidget,
@@ -13,6 +14,14 @@ from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
 from .pon_metrics_charts import PONMetricsChartsPanel
+from core.rl_integration.training_telemetry import TELEMETRY_HISTORY_SIZE
+
+# PyQtGraph opcional para el gráfico en vivo de telemetría
+try:
+    import pyqtgraph as pg
+    PYQTGRAPH_AVAILABLE = True
+except ImportError:
+    PYQTGRAPH_AVAILABLE = False
 
 
 class RLGraphicsPopupWindow(QDialog):
@@ -33,6 +42,10 @@ class RLGraphicsPopupWindow(QDialog):
         self.rl_results = {}
         self.charts_panel = None
 
+        # Historial de telemetría de entrenamiento
+        self.telemetry_history = deque(maxlen=TELEMETRY_HISTORY_SIZE)
+        self.telemetry_plot = None
+
         # Configurar interfaz
         self.setup_ui()
 
@@ -91,6 +104,9 @@ class RLGraphicsPopupWindow(QDialog):
         # Tab 3: Comparación con simulación tradicional
         self.setup_comparison_tab()
 
+        # Tab 4: Telemetría de rendimiento del entrenamiento
+        self.setup_telemetry_tab()
+
         layout.addWidget(self.tabs)
 
     def setup_graphics_tab(self):
@@ -179,6 +195,87 @@ class RLGraphicsPopupWindow(QDialog):
 
         self.tabs.addTab(tab, "⚖️ Comparación")
 
+    def setup_telemetry_tab(self):
+        """Configurar tab de telemetría de rendimiento del entrenamiento"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        # Gráfico en vivo de pasos por segundo
+        chart_group = QGroupBox("🚀 Pasos de Entorno por Segundo")
+        chart_group.setObjectName("popup_group")
+        chart_layout = QVBoxLayout(chart_group)
+
+        if PYQTGRAPH_AVAILABLE:
+            self.telemetry_plot = pg.PlotWidget()
+            self.telemetry_plot.setLabel('left', 'pasos/s')
+            self.telemetry_plot.setLabel('bottom', 'paso de entrenamiento')
+            self.telemetry_plot.showGrid(x=True, y=True, alpha=0.3)
+            self.telemetry_curve = self.telemetry_plot.plot([], [], pen=pg.mkPen('#2196F3', width=2))
+            chart_layout.addWidget(self.telemetry_plot)
+        else:
+            unavailable_label = QLabel("PyQtGraph no disponible: pip install pyqtgraph>=0.12.0")
+            unavailable_label.setObjectName("popup_instructions_label")
+            chart_layout.addWidget(unavailable_label)
+
+        layout.addWidget(chart_group)
+
+        # Reparto de tiempo y memoria
+        split_group = QGroupBox("⏱️ Reparto de Tiempo (Simulador vs Aprendiz)")
+        split_group.setObjectName("popup_group")
+        self.telemetry_layout = QGridLayout(split_group)
+        layout.addWidget(split_group)
+
+        layout.addStretch()
+
+        self.tabs.addTab(tab, "⏱️ Telemetría")
+
+    def update_training_telemetry(self, telemetry: Dict[str, Any]):
+        """
+        Agregar un snapshot de telemetría de entrenamiento al gráfico en vivo
+
+        Args:
+            telemetry: Snapshot de TrainingTelemetry.snapshot()
+        """
+        try:
+            if not telemetry:
+                return
+
+            self.telemetry_history.append(telemetry)
+
+            if self.telemetry_plot is not None:
+                steps = [t.get('steps', 0) for t in self.telemetry_history]
+                rates = [t.get('steps_per_second', 0.0) for t in self.telemetry_history]
+                self.telemetry_curve.setData(steps, rates)
+
+            # Limpiar layout anterior
+            for i in reversed(range(self.telemetry_layout.count())):
+                self.telemetry_layout.itemAt(i).widget().setParent(None)
+
+            split_s = telemetry.get('time_split_s', {})
+            split_percent = telemetry.get('time_split_percent', {})
+            rows = [
+                ("🚀 Pasos por Segundo", f"{telemetry.get('steps_per_second', 0):.1f}"),
+                ("📨 Eventos por Paso", f"{telemetry.get('events_per_step', 0):.1f}"),
+            ]
+            for key, label_text in [('simulation', "🧮 Simulación"),
+                                    ('observation', "👁️ Observación"),
+                                    ('reward', "🏆 Recompensa"),
+                                    ('inference', "🤖 Inferencia"),
+                                    ('gradient', "📉 Gradientes")]:
+                rows.append((label_text, f"{split_s.get(key, 0):.1f}s ({split_percent.get(key, 0):.1f}%)"))
+            rows.append(("💾 Memoria por Episodio", f"{telemetry.get('memory_growth_mb_per_episode', 0):+.2f} MB"))
+
+            for row, (label_text, value) in enumerate(rows):
+                label = QLabel(label_text)
+                value_label = QLabel(value)
+                value_label.setStyleSheet("font-weight: bold; color: #2196F3;")
+
+                self.telemetry_layout.addWidget(label, row, 0)
+                self.telemetry_layout.addWidget(value_label, row, 1)
+
+        except Exception as e:
+            print(f"❌ Error actualizando telemetría: {e}")
+
     def setup_footer(self, layout):
         """Configurar footer con controles"""
         footer_layout = QHBoxLayout()
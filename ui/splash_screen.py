@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QSplashScreen, QLabel, QVBoxLayout, QWidget
-from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QElapsedTimer
 from PyQt5.QtGui import QPixmap, QFont, QPainter, QColor, QLinearGradient
 import os
 
@@ -132,16 +132,34 @@ class SplashScreen(QSplashScreen):
         progress_fill = int(progress_width * self.opacity_effect)
         painter.fillRect(progress_x, progress_y, progress_fill, progress_height, QColor(226, 8, 215))  # #e208d7
     
-    def show_splash(self, duration=2000):
-        """Show the splash screen for the specified duration"""
+    def show_splash(self, duration=None):
+        """Show the splash screen (for a fixed duration, or until finish_when_ready)"""
         self.show()
+        self.shown_timer = QElapsedTimer()
+        self.shown_timer.start()
         
         # Start appearance animation
         self.fade_animation.finished.connect(self.start_scale_animation)
         self.fade_animation.start()
         
         # Configure timer to close
-        self.timer.start(duration)
+        if duration is not None:
+            self.timer.start(duration)
+    
+    def finish_when_ready(self, window, min_duration=800):
+        """
+        Show the main window and close the splash once the application is ready
+        
+        Called when the main window has been built. The splash stays at least
+        min_duration ms (the fade-in) so it does not just flash on fast starts.
+        """
+        remaining = max(0, min_duration - self.shown_timer.elapsed())
+        
+        def show_window():
+            window.show()
+            self.close_splash()
+        
+        QTimer.singleShot(remaining, show_window)
     
     def start_scale_animation(self):
         """Start the icon scale animation"""